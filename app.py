@@ -2,19 +2,26 @@
 Flask 백엔드 - 최신 RESTful API
 """
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, request, jsonify, render_template, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import os
 import sys
+import json
+import time
 
 # 모듈 경로 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from modules.file_handler import FileHandler
 from modules.code_validator import CodeValidator
+from modules.module_index import ModuleIndex
+from modules.static_checker import StaticChecker
+from modules.validation_session import ValidationSessionStore
 from modules.code_executor import CodeExecutor
+from modules.async_executor import AsyncCodeExecutor, ExecutorBusyError
 from modules.error_analyzer import ErrorAnalyzer
 from modules.error_database import ErrorDatabase
+from modules.db_maintenance import HistoryMaintenance
 from modules.rag_orchestrator import RAGOrchestrator
 from modules.config import Config
 
@@ -31,6 +38,13 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 # 데이터베이스 초기화
 db = ErrorDatabase()
 
+# 에러 히스토리 정리 (MAINTENANCE_INTERVAL_HOURS > 0일 때만 백그라운드 스레드 시작)
+maintenance = HistoryMaintenance(db)
+maintenance.start()
+
+# 설치 모듈 인덱스 (요청 처리 중 생성하지 않도록 시작 시 로드)
+ModuleIndex.shared()
+
 # RAG Orchestrator 초기화
 try:
     rag_orchestrator = RAGOrchestrator(use_rag=Config.RAG_ENABLED)
@@ -122,17 +136,30 @@ def analyze_code():
             
             # 2. 실행 (옵션)
             if execute:
-                exec_result = CodeExecutor.safe_execute(code)
+                # 정적 검사로 확정된 오류가 있으면 실행해도 같은 오류이므로 실행 생략
+                static_error = (validation_result.get('static') or {}).get('deterministic_error')
+                if static_error:
+                    exec_result = StaticChecker.execution_result(static_error)
+                else:
+                    exec_result = CodeExecutor.safe_execute(code)
                 result['analysis']['execution'] = exec_result
                 
                 # 에러 분석
                 if not exec_result['success'] and exec_result['stderr']:
-                    error_analysis = ErrorAnalyzer.analyze_error(
+                    error_analysis = static_error or ErrorAnalyzer.analyze_error(
                         exec_result['stderr'], 
                         code
                     )
                     result['analysis']['error_analysis'] = error_analysis
                     
+                    # 이미 본 에러면 이전 분석 / 검증된 해결책 첨부 (저장 전에 조회)
+                    try:
+                        known = db.lookup_fingerprint(error_analysis.get('fingerprint'))
+                        if known:
+                            result['analysis']['known_issue'] = known
+                    except Exception as e:
+                        print(f"⚠️ 지문 조회 실패: {e}")
+                    
                     # 히스토리 저장 (옵션)
                     save_history = data.get('save_history', True)
                     if save_history:
@@ -143,7 +170,7 @@ def analyze_code():
                     
                     # 유사 에러 검색
                     try:
-                        similar_errors = db.find_similar_errors(error_analysis, limit=3)
+                        similar_errors = db.find_similar_errors(error_analysis, limit=3, code=code)
                         if similar_errors:
                             result['analysis']['similar_errors'] = similar_errors
                     except Exception as e:
@@ -158,6 +185,282 @@ def analyze_code():
         }), 500
 
 
+def _request_timeout(data) -> float:
+    """
+    요청 본문의 timeout (초) - 없으면 Config.EXECUTION_TIMEOUT, 서버 상한을 넘으면 상한으로 줄임
+    
+    Raises:
+        ValueError: 숫자가 아니거나 0 이하인 경우
+    """
+    value = data.get('timeout', Config.EXECUTION_TIMEOUT)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0:
+        raise ValueError(f'timeout은 0보다 큰 숫자여야 합니다 (받은 값: {value!r})')
+    return min(float(value), Config.EXECUTION_TIMEOUT)
+
+
+@app.route('/api/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """
+    여러 코드 동시 분석 API (공용 AsyncCodeExecutor로 동시 실행)
+    
+    Request Body:
+        {
+            "codes": [str],
+            "timeout": number (optional, 배치 전체 마감 시간 (초), 최대 / 기본값: Config.EXECUTION_TIMEOUT)
+        }
+    
+    Returns:
+        {
+            "success": bool,
+            "results": [{"validation": {...}, "execution": {...}, "error_analysis": {...}} 또는 {"error": str}],
+            "error": str (if failed)
+        }
+        실행 대기열이 가득 차면 503
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('codes'), list) or not data['codes']:
+            return jsonify({
+                'success': False,
+                'error': '코드 목록이 제공되지 않았습니다'
+            }), 400
+        
+        executor = AsyncCodeExecutor.shared()
+        codes = data['codes']
+        if len(codes) > executor.max_queue_depth:
+            return jsonify({
+                'success': False,
+                'error': f'한 번에 최대 {executor.max_queue_depth}개까지 분석할 수 있습니다'
+            }), 400
+        
+        try:
+            timeout = _request_timeout(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        deadline = time.time() + timeout
+        
+        # 1. 입력 검증 + 정적 분석
+        results = []
+        runnable = []
+        for index, code in enumerate(codes):
+            validation = FileHandler.validate_code_input(code, 'python') if isinstance(code, str) \
+                else {'valid': False, 'error': '코드는 문자열이어야 합니다'}
+            if not validation['valid']:
+                results.append({'error': validation['error']})
+                continue
+            
+            validation_result = CodeValidator.full_validation(code)
+            results.append({'validation': validation_result})
+            if validation_result['syntax']['valid']:
+                runnable.append(index)
+        
+        # 2. 동시 실행
+        executions = executor.map([codes[i] for i in runnable], timeout, deadline=deadline)
+        
+        # 3. 에러 분석
+        for index, exec_result in zip(runnable, executions):
+            results[index]['execution'] = exec_result
+            if not exec_result['success'] and exec_result['stderr']:
+                results[index]['error_analysis'] = ErrorAnalyzer.analyze_error(
+                    exec_result['stderr'],
+                    codes[index]
+                )
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+        
+    except ExecutorBusyError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류: {str(e)}'
+        }), 500
+
+
+@app.route('/api/profile', methods=['POST'])
+def profile_code():
+    """
+    프로파일 API - 코드를 cProfile + tracemalloc으로 실행하여 핫스팟 반환
+    
+    Request Body:
+        {
+            "code": str,
+            "top_n": int (optional, default: Config.PROFILE_TOP_N),
+            "timeout": number (optional, 초, 최대 / 기본값: Config.EXECUTION_TIMEOUT)
+        }
+    
+    Returns:
+        {
+            "success": bool,
+            "execution": {...} (실행 결과, profile 제외),
+            "profile": {"wall_time", "peak_memory_kb", "functions": [...], "allocations": [...]} 또는 null,
+            "error": str (if failed)
+        }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or 'code' not in data:
+            return jsonify({
+                'success': False,
+                'error': '코드가 제공되지 않았습니다'
+            }), 400
+        
+        code = data['code']
+        validation = FileHandler.validate_code_input(code, 'python')
+        if not validation['valid']:
+            return jsonify({
+                'success': False,
+                'error': validation['error']
+            }), 400
+        
+        syntax = CodeValidator.validate_syntax(code)
+        if not syntax['valid']:
+            return jsonify({
+                'success': False,
+                'error': f"Syntax 에러 (line {syntax.get('line')}): {syntax['error']}",
+                'syntax': syntax
+            }), 400
+        
+        try:
+            timeout = _request_timeout(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        exec_result = CodeExecutor.profile_code(code, timeout, data.get('top_n'))
+        profile = exec_result.pop('profile', None)
+        
+        return jsonify({
+            'success': True,
+            'execution': exec_result,
+            'profile': profile
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류: {str(e)}'
+        }), 500
+
+
+def _sse_event(event: str, data) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.route('/api/execute-stream', methods=['POST'])
+def execute_stream():
+    """
+    실행 출력 스트리밍 API (Server-Sent Events)
+    
+    Request Body:
+        {
+            "code": str,
+            "save_history": bool (optional, default: true)
+        }
+    
+    Events:
+        validation: 정적 분석 결과
+        stdout / stderr: 실행 중 출력 청크 (str)
+        result: 실행 결과 (타임아웃 시 부분 출력 포함, 정적 검사 생략 / 캐시 적중은 이 이벤트 하나)
+        analysis: {"error_analysis": {...}, "known_issue": {...} (이미 본 에러), "similar_errors": [...]}
+        done: 스트림 종료
+    """
+    data = request.get_json()
+    
+    if not data or 'code' not in data:
+        return jsonify({
+            'success': False,
+            'error': '코드가 제공되지 않았습니다'
+        }), 400
+    
+    code = data['code']
+    save_history = data.get('save_history', True)
+    
+    validation = FileHandler.validate_code_input(code, 'python')
+    if not validation['valid']:
+        return jsonify({
+            'success': False,
+            'error': validation['error']
+        }), 400
+    
+    def generate():
+        try:
+            validation_result = CodeValidator.full_validation(code)
+            yield _sse_event('validation', validation_result)
+            
+            # Syntax 에러가 있으면 실행하지 않음
+            if not validation_result['syntax']['valid']:
+                yield _sse_event('done', {})
+                return
+            
+            # 정적 검사로 확정된 오류는 실행 생략, 나머지는 캐시 조회 후 실행 출력을 청크로 전달
+            static_error = (validation_result.get('static') or {}).get('deterministic_error')
+            exec_result = None
+            if static_error:
+                exec_result = StaticChecker.execution_result(static_error)
+                yield _sse_event('result', exec_result)
+            else:
+                for event in CodeExecutor.safe_stream(code):
+                    if event['event'] == 'result':
+                        exec_result = event['data']
+                    yield _sse_event(event['event'], event['data'])
+            
+            # 에러 분석
+            if exec_result and not exec_result['success'] and exec_result['stderr']:
+                error_analysis = static_error or ErrorAnalyzer.analyze_error(exec_result['stderr'], code)
+                analysis = {'error_analysis': error_analysis}
+                
+                try:
+                    known = db.lookup_fingerprint(error_analysis.get('fingerprint'))
+                    if known:
+                        analysis['known_issue'] = known
+                except Exception as e:
+                    print(f"⚠️ 지문 조회 실패: {e}")
+                
+                if save_history:
+                    try:
+                        db.save_error(code, error_analysis)
+                    except Exception as e:
+                        print(f"⚠️ DB 저장 실패: {e}")
+                
+                try:
+                    similar_errors = db.find_similar_errors(error_analysis, limit=3, code=code)
+                    if similar_errors:
+                        analysis['similar_errors'] = similar_errors
+                except Exception as e:
+                    print(f"⚠️ 유사 에러 검색 실패: {e}")
+                
+                yield _sse_event('analysis', analysis)
+            
+            yield _sse_event('done', {})
+            
+        except Exception as e:
+            yield _sse_event('error', {'error': f'서버 오류: {str(e)}'})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 @app.route('/api/analyze-rag', methods=['POST'])
 def analyze_with_rag():
     """
@@ -310,6 +613,50 @@ def get_statistics():
         }), 500
 
 
+@app.route('/api/history', methods=['GET'])
+def get_history():
+    """
+    에러 히스토리 조회 API (키셋 페이지네이션)
+    
+    Query Parameters:
+        type: 예외 타입
+        since / until: 생성 시각 범위 (ISO 8601, 시간대 없으면 UTC)
+        fingerprint: 에러 지문
+        q: 메시지 / 코드 / 해결책 검색어
+        limit: 페이지 크기 (default: 50, 최대 200)
+        cursor: 이전 응답의 next_cursor
+    
+    Returns:
+        {
+            "success": bool,
+            "items": [...],
+            "next_cursor": str | null,
+            "has_more": bool
+        }
+    """
+    try:
+        page = db.query_history(
+            error_type=request.args.get('type'),
+            since=request.args.get('since'),
+            until=request.args.get('until'),
+            fingerprint=request.args.get('fingerprint'),
+            text=request.args.get('q'),
+            limit=request.args.get('limit', 50, type=int),
+            cursor=request.args.get('cursor')
+        )
+        return jsonify({'success': True, **page})
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/validate', methods=['POST'])
 def validate_only():
     """
@@ -339,6 +686,93 @@ def validate_only():
         }), 500
 
 
+
+@app.route('/api/validate-incremental', methods=['POST'])
+def validate_incremental():
+    """
+    입력 중 실시간 검증 (세션에 편집만 보내고 바뀐 최상위 문장만 다시 파싱)
+    
+    Request Body:
+        {
+            "code": str (optional, 세션 시작 / 재동기화 시 전체 코드),
+            "session_id": str (optional),
+            "version": int (edits를 보낼 때 클라이언트가 알고 있는 세션 버전),
+            "edits": [{"start": int, "end": int, "lines": [str]}] (optional, 0부터 시작하는 줄 범위 교체)
+        }
+    
+    Returns:
+        {
+            "success": bool,
+            "session_id": str,
+            "version": int,
+            "validation": {...} (full_validation 형식, 정적 검사 제외),
+            "reparsed_lines": int,
+            "elapsed_ms": float
+        }
+        세션이 없거나 버전이 다르면 409 + "resync": true (전체 코드를 다시 보내야 함)
+    """
+    try:
+        data = request.get_json() or {}
+        store = ValidationSessionStore.shared()
+        start_time = time.perf_counter()
+        
+        code = data.get('code')
+        if code is not None and not isinstance(code, str):
+            raise TypeError("'code'는 문자열이어야 합니다")
+        session = store.get(data['session_id']) if data.get('session_id') else None
+        
+        if session is None:
+            if code is None:
+                return jsonify({
+                    'success': False,
+                    'resync': True,
+                    'error': '세션이 없거나 만료되었습니다. 전체 코드를 다시 보내주세요'
+                }), 409
+            session = store.create(code)
+            code = None  # 생성 시 이미 전체 코드로 구성됨
+        
+        with session.lock:
+            if code is not None:
+                session.reset(code)
+            elif 'edits' in data:
+                if data.get('version') != session.version or not isinstance(data['edits'], list):
+                    return jsonify({
+                        'success': False,
+                        'resync': True,
+                        'error': '세션 버전이 일치하지 않습니다. 전체 코드를 다시 보내주세요'
+                    }), 409
+                try:
+                    session.apply_edits(data['edits'])
+                except (ValueError, KeyError, TypeError):
+                    # 일부만 적용되었을 수 있으므로 세션을 버리고 클라이언트가 재동기화
+                    store.discard(session.session_id)
+                    raise
+            
+            validation_result = session.validate()
+            version = session.version
+            reparsed_lines = session.reparsed_lines
+        
+        return jsonify({
+            'success': True,
+            'session_id': session.session_id,
+            'version': version,
+            'validation': validation_result,
+            'reparsed_lines': reparsed_lines,
+            'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 3)
+        })
+        
+    except (ValueError, KeyError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'잘못된 편집 요청: {e}'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("🔍 Python Error Analyzer - Web Server")
@@ -0,0 +1,416 @@
+"""
+비동기 실행기 모듈 - asyncio 기반 동시 코드 실행
+자식 프로세스마다 읽기 스레드를 두는 대신 이벤트 루프 하나가 모든 파이프와
+종료 이벤트(pidfd)를 감시하여, 전역 동시 실행 수 / 대기열 깊이 / 호출별 마감 시각을 관리
+"""
+
+import os
+import time
+import atexit
+import signal
+import asyncio
+import threading
+import subprocess
+import concurrent.futures
+from typing import Dict, List, Optional
+
+from .code_executor import CodeExecutor
+from . import sandbox
+
+
+class ExecutorBusyError(Exception):
+    """대기열이 가득 차서 실행 요청을 받을 수 없음"""
+
+
+class AsyncCodeExecutor:
+    """동시 실행 수가 제한된 asyncio 코드 실행기"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_queue_depth: int = 64):
+        """
+        Args:
+            max_concurrency: 동시에 실행할 자식 프로세스 수 (None이면 CPU 개수)
+            max_queue_depth: 실행 대기 중인 요청 최대 개수 (초과 시 ExecutorBusyError)
+        """
+        self.max_concurrency = max_concurrency or os.cpu_count() or 4
+        self.max_queue_depth = max_queue_depth
+
+        # 세마포어 / 카운터는 이벤트 루프 스레드에서만 다룸
+        self._semaphore = None
+        self._waiting = 0
+        self._running = 0
+        self._stats = {'executed': 0, 'rejected': 0, 'queue_timeouts': 0, 'timeouts': 0}
+
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def shared() -> 'AsyncCodeExecutor':
+        """프로세스 공용 실행기 (Config 기준, 최초 호출 시 생성)"""
+        from .config import Config
+
+        with AsyncCodeExecutor._shared_lock:
+            if AsyncCodeExecutor._shared is None:
+                AsyncCodeExecutor._shared = AsyncCodeExecutor(
+                    max_concurrency=Config.ASYNC_MAX_CONCURRENCY,
+                    max_queue_depth=Config.ASYNC_MAX_QUEUE_DEPTH
+                )
+        return AsyncCodeExecutor._shared
+
+    # ========== 코루틴 API ==========
+
+    async def execute_python_code(self,
+                                  code: str,
+                                  timeout: float = CodeExecutor.DEFAULT_TIMEOUT,
+                                  deadline: Optional[float] = None,
+                                  transport: Optional[str] = None) -> Dict[str, any]:
+        """
+        Python 코드를 별도 프로세스에서 실행 (동시 실행 수 제한 적용)
+
+        Args:
+            code: 실행할 Python 코드
+            timeout: 실행 타임아웃 (초)
+            deadline: 대기열 대기 시간까지 포함한 마감 시각 (time.time() 기준)
+                      None이면 대기 / 실행 각각 timeout까지 허용
+            transport: 코드 전달 방식 (CodeExecutor.resolve_transport 참고)
+
+        Returns:
+            CodeExecutor.execute_python_code와 동일 (+ 'queue_time': 대기열 대기 시간)
+
+        Raises:
+            ExecutorBusyError: 대기열이 가득 찬 경우
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        queued_at = time.time()
+        run_deadline = deadline
+        if deadline is None:
+            # 마감 시각을 주지 않으면 대기와 실행에 각각 timeout까지 허용
+            deadline = queued_at + timeout
+
+        if not self._semaphore.locked():
+            # 빈 슬롯이 있으면 대기 없이 바로 획득
+            await self._semaphore.acquire()
+        else:
+            if self._waiting >= self.max_queue_depth:
+                self._stats['rejected'] += 1
+                raise ExecutorBusyError(f'실행 대기열이 가득 찼습니다 (최대 {self.max_queue_depth}개)')
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), max(deadline - time.time(), 0))
+            except asyncio.TimeoutError:
+                self._stats['queue_timeouts'] += 1
+                result = CodeExecutor.error_result('실행 대기 중 마감 시간을 초과하여 실행하지 않았습니다.')
+                result['timed_out'] = True
+                result['queue_time'] = time.time() - queued_at
+                return result
+            finally:
+                self._waiting -= 1
+
+        self._running += 1
+        try:
+            now = time.time()
+            queue_time = now - queued_at
+            # 대기열에서 기다린 만큼 실행 시간 예산이 줄어듦
+            if run_deadline is None or run_deadline >= now + timeout:
+                run_timeout = timeout
+            else:
+                run_timeout = round(max(run_deadline - now, 0), 2)
+
+            if os.name == 'posix':
+                result = await self._run_posix(code, run_timeout, transport)
+            else:
+                # Windows 파이프는 이벤트 루프에서 감시할 수 없으므로 스레드에서 실행
+                result = await asyncio.to_thread(
+                    CodeExecutor.execute_python_code, code, run_timeout, transport
+                )
+
+            self._stats['executed'] += 1
+            if result.get('timed_out'):
+                self._stats['timeouts'] += 1
+            result['queue_time'] = queue_time
+            return result
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+
+    async def safe_execute(self,
+                           code: str,
+                           timeout: float = CodeExecutor.DEFAULT_TIMEOUT,
+                           deadline: Optional[float] = None) -> Dict[str, any]:
+        """
+        CodeExecutor.safe_execute의 비동기 버전
+        (위험 코드 차단 + 결과 캐시, 웜 워커 풀 대신 cold 실행을 동시에 진행)
+
+        Raises:
+            ExecutorBusyError: 대기열이 가득 찬 경우
+        """
+        blocked = CodeExecutor.check_dangerous_code(code)
+        if blocked is not None:
+            return blocked
+
+        cache = CodeExecutor.get_result_cache()
+        cache_key = CodeExecutor.result_cache_key(code, timeout) if cache is not None else None
+        if cache_key is not None:
+            cached = await asyncio.to_thread(cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self.execute_python_code(code, timeout, deadline)
+
+        if cache_key is not None:
+            await asyncio.to_thread(cache.put, cache_key, result)
+        result['cache_hit'] = False
+
+        return result
+
+    async def _run_posix(self, code: str, timeout: float, transport: Optional[str]) -> Dict[str, any]:
+        """자식 프로세스 하나를 실행하고 출력 / 종료를 이벤트 루프에서 대기"""
+        loop = asyncio.get_running_loop()
+        launch = CodeExecutor.prepare_launch(code, transport, unbuffered=False)
+
+        process = None
+        stdin_transport = None
+        try:
+            start_time = time.time()
+            deadline = start_time + timeout
+
+            try:
+                process = subprocess.Popen(
+                    launch['command'],
+                    stdin=subprocess.PIPE if launch['stdin_code'] else subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env=CodeExecutor.child_environment(),
+                    pass_fds=launch['pass_fds']
+                )
+            except Exception as e:
+                return CodeExecutor.error_result(f'실행 중 오류: {str(e)}')
+
+            if launch['stdin_code']:
+                # 쓰기 트랜스포트가 버퍼링하므로 파이프보다 큰 코드도 막히지 않음
+                stdin_transport, _ = await loop.connect_write_pipe(asyncio.Protocol, process.stdin)
+                stdin_transport.write(code.encode('utf-8'))
+                stdin_transport.close()
+
+            captures = sandbox.create_captures(CodeExecutor.get_output_limits())
+            readers = asyncio.gather(
+                self._read_pipe(process.stdout, captures['stdout']),
+                self._read_pipe(process.stderr, captures['stderr'])
+            )
+
+            timed_out = False
+            try:
+                # 타임아웃이면 readers가 취소되지만 그때까지 읽은 출력은 captures에 남음
+                await asyncio.wait_for(readers, max(deadline - time.time(), 0))
+            except asyncio.TimeoutError:
+                self._kill(process)
+                timed_out = True
+
+            rusage, reap_timed_out = await self._wait_exit(process, deadline)
+            timed_out = timed_out or reap_timed_out
+            execution_time = time.time() - start_time
+
+            result, _ = CodeExecutor.finish_result(
+                captures['stdout'].getvalue(),
+                captures['stderr'].getvalue(),
+                process.returncode,
+                timed_out,
+                timeout,
+                execution_time,
+                rusage,
+                {name: capture.truncated_bytes for name, capture in captures.items()}
+            )
+            return result
+        finally:
+            if stdin_transport is not None and stdin_transport.get_write_buffer_size():
+                # 자식이 코드를 다 읽기 전에 끝난 경우 남은 버퍼 폐기
+                stdin_transport.abort()
+            if process is not None and process.returncode is None:
+                process.kill()
+                process.wait()
+            CodeExecutor.release_launch(launch)
+
+    @staticmethod
+    async def _read_pipe(pipe, capture: sandbox.OutputCapture):
+        """파이프를 EOF까지 읽어 capture에 추가"""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), pipe
+        )
+        try:
+            while True:
+                chunk = await reader.read(CodeExecutor.STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                capture.write(chunk)
+        finally:
+            transport.close()
+
+    @staticmethod
+    def _kill(process: subprocess.Popen):
+        """
+        자식 강제 종료
+        (Popen.kill()은 내부에서 poll()로 자식을 회수해 버려 wait4의 rusage를 잃으므로 직접 시그널 전송,
+         회수 전까지는 pid가 재사용되지 않으므로 안전)
+        """
+        try:
+            os.kill(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    async def _wait_exit(process: subprocess.Popen, deadline: float):
+        """
+        자식 종료 대기 (pidfd를 이벤트 루프에 등록, 미지원이면 WNOHANG 폴링)
+        종료 후 os.wait4로 회수하여 리소스 사용량 수집
+
+        Returns:
+            (rusage, deadline 초과 여부)
+        """
+        loop = asyncio.get_running_loop()
+        timed_out = False
+
+        pidfd = None
+        if hasattr(os, 'pidfd_open'):
+            try:
+                pidfd = os.pidfd_open(process.pid)
+            except OSError:
+                pidfd = None
+
+        if pidfd is not None:
+            exited = loop.create_future()
+            loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+            try:
+                try:
+                    await asyncio.wait_for(asyncio.shield(exited), max(deadline - time.time(), 0))
+                except asyncio.TimeoutError:
+                    AsyncCodeExecutor._kill(process)
+                    timed_out = True
+                    await exited
+            finally:
+                loop.remove_reader(pidfd)
+                os.close(pidfd)
+
+            pid, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return rusage, timed_out
+
+        delay = 0.0005
+        while True:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                process.returncode = os.waitstatus_to_exitcode(status)
+                return rusage, timed_out
+
+            if not timed_out and time.time() >= deadline:
+                AsyncCodeExecutor._kill(process)
+                timed_out = True
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    # ========== 동기 코드용 API (공용 이벤트 루프 스레드) ==========
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """백그라운드 이벤트 루프 스레드 (최초 호출 시 시작)"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name='async-executor', daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.shutdown)
+        return self._loop
+
+    def submit(self, code: str, timeout: float = CodeExecutor.DEFAULT_TIMEOUT) -> concurrent.futures.Future:
+        """
+        다른 스레드(Flask 요청 등)에서 safe_execute 예약
+
+        Returns:
+            concurrent.futures.Future (대기열 초과 시 result()에서 ExecutorBusyError)
+        """
+        return asyncio.run_coroutine_threadsafe(self.safe_execute(code, timeout), self._ensure_loop())
+
+    def map(self,
+            codes: List[str],
+            timeout: float = CodeExecutor.DEFAULT_TIMEOUT,
+            concurrency: Optional[int] = None,
+            deadline: Optional[float] = None) -> List[Dict[str, any]]:
+        """
+        여러 코드를 동시에 실행하고 입력 순서대로 결과 반환
+        (배치 전체를 한 번에 대기열에 넣지 않고 concurrency개씩만 넣으므로
+         배치 크기가 max_queue_depth보다 커도 거부되지 않음)
+
+        Args:
+            codes: Python 코드 리스트
+            timeout: 코드별 타임아웃 (초)
+            concurrency: 이 배치의 동시 실행 수 (None이면 max_concurrency, 전역 제한은 그대로 적용)
+            deadline: 배치 전체의 마감 시각 (time.time() 기준, None이면 코드별 timeout만 적용)
+
+        Returns:
+            safe_execute 결과 리스트
+
+        Raises:
+            ExecutorBusyError: 다른 요청으로 대기열이 가득 찬 경우
+        """
+        async def run_all():
+            slots = asyncio.Semaphore(min(concurrency or self.max_concurrency, self.max_concurrency))
+
+            async def run_one(code):
+                async with slots:
+                    return await self.safe_execute(code, timeout, deadline)
+
+            return await asyncio.gather(*(run_one(code) for code in codes))
+
+        if not codes:
+            return []
+        return asyncio.run_coroutine_threadsafe(run_all(), self._ensure_loop()).result()
+
+    def get_statistics(self) -> Dict:
+        """실행 통계 / 현재 상태"""
+        stats = dict(self._stats)
+        stats['max_concurrency'] = self.max_concurrency
+        stats['max_queue_depth'] = self.max_queue_depth
+        stats['running'] = self._running
+        stats['waiting'] = self._waiting
+        return stats
+
+    def shutdown(self):
+        """이벤트 루프 스레드 종료"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("⚡ 비동기 실행기 테스트")
+    print("=" * 60)
+
+    executor = AsyncCodeExecutor(max_concurrency=4, max_queue_depth=8)
+    codes = [f"import time\ntime.sleep(0.5)\nprint('job {i}')" for i in range(8)]
+
+    start = time.time()
+    results = executor.map(codes, timeout=5)
+    print(f"8개 실행 (동시 4개): {time.time() - start:.2f}초")
+    for result in results:
+        print(f"   {result['stdout'].strip()} (대기 {result['queue_time']*1000:.0f}ms)")
+
+    result = executor.submit("while True: pass", timeout=1).result()
+    print(f"타임아웃: {result['timed_out']} / {result['stderr'].strip()}")
+
+    print(f"\n📊 {executor.get_statistics()}")
+    executor.shutdown()
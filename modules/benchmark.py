@@ -0,0 +1,666 @@
+"""
+벤치마크 모듈 - 실행 / 분석 경로별 성능 측정
+"""
+
+import os
+import time
+import tempfile
+import threading
+import statistics
+from typing import Callable, Dict, List, Any
+
+from .code_executor import CodeExecutor
+from .error_analyzer import ErrorAnalyzer
+from .error_rules import ErrorRule, ErrorRuleRegistry
+from .error_database import ErrorDatabase
+from .db_connection import ConnectionManager
+from .db_maintenance import HistoryMaintenance
+from .db_transfer import HistoryTransfer
+from .content_store import ContentStore
+from .pattern_learner import PatternLearner
+from .config import Config
+
+
+class _LinearRuleRegistry(ErrorRuleRegistry):
+    """비교용: 같은 컴파일된 규칙을 예외 타입 색인 없이 전체 목록에서 순서대로 탐색 (색인 도입 전 방식)"""
+
+    def __init__(self, specs: List[tuple]):
+        self._rules = []
+        super().__init__(specs)
+
+    def add(self, rule: ErrorRule):
+        self._rules.append(rule)
+        # 색인 레지스트리와 같은 적용 순서 (priority 내림차순, 같으면 등록 순서)
+        self._rules.sort(key=lambda r: -r.priority)
+        self._count += 1
+
+    def has_rules(self, exception: str) -> bool:
+        return any(rule.exception == exception for rule in self._rules)
+
+    def rules_for(self, exception: str) -> List[ErrorRule]:
+        return [rule for rule in self._rules if rule.exception == exception]
+
+    def match(self, exception: str, message: str):
+        for rule in self._rules:
+            if rule.exception == exception:
+                groups = rule.match(message)
+                if groups is not None:
+                    return rule, groups
+        return None
+
+
+class Benchmark:
+    """성능 측정 스위트"""
+
+    # 측정용 기본 스니펫 (인터프리터 기동 비용이 지배적인 짧은 코드)
+    SAMPLE_CODE = """
+import json
+data = {'values': [i * i for i in range(100)]}
+print(json.dumps(data)[:40])
+"""
+
+    # 프로파일 오버헤드 측정용 (함수 호출 + 할당이 많은 코드)
+    PROFILE_SAMPLE_CODE = """
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+rows = [{'id': i, 'name': str(i) * 4} for i in range(20000)]
+print(fib(18), len(rows))
+"""
+
+    @staticmethod
+    def _measure(func: Callable[[], Any], runs: int, warmup: int = 1) -> Dict[str, float]:
+        """
+        함수를 runs번 실행하여 소요 시간 통계 계산
+
+        Returns:
+            {'runs', 'mean_ms', 'median_ms', 'p95_ms', 'min_ms', 'max_ms'}
+        """
+        for _ in range(warmup):
+            func()
+
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return Benchmark._summarize(samples)
+
+    @staticmethod
+    def _summarize(samples: List[float]) -> Dict[str, float]:
+        """측정값(ms) 리스트 → 통계"""
+        samples = sorted(samples)
+        return {
+            'runs': len(samples),
+            'mean_ms': statistics.mean(samples),
+            'median_ms': statistics.median(samples),
+            'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'min_ms': samples[0],
+            'max_ms': samples[-1]
+        }
+
+    @staticmethod
+    def bench_transports(runs: int = 20, code: str = SAMPLE_CODE) -> Dict[str, Dict]:
+        """
+        코드 전달 방식별 cold 실행 비교 (tempfile vs pipe vs memfd) + 웜 워커 풀
+
+        Args:
+            runs: 방식별 반복 횟수
+            code: 실행할 코드
+
+        Returns:
+            {방식: 통계}
+        """
+        results = {}
+
+        transports = ['tempfile', 'pipe']
+        if CodeExecutor.resolve_transport('memfd') == 'memfd':
+            transports.append('memfd')
+
+        for transport in transports:
+            results[transport] = Benchmark._measure(
+                lambda: CodeExecutor.execute_python_code(code, transport=transport),
+                runs
+            )
+
+        pool = CodeExecutor.get_worker_pool()
+        if pool is not None:
+            results['warm_pool'] = Benchmark._measure(
+                lambda: CodeExecutor.execute_warm(code),
+                runs,
+                warmup=3
+            )
+
+        return results
+
+    @staticmethod
+    def bench_profile_overhead(runs: int = 20, code: str = PROFILE_SAMPLE_CODE) -> Dict[str, Dict]:
+        """
+        프로파일 모드(cProfile + tracemalloc) 오버헤드 측정
+        (같은 코드를 일반 / 프로파일 모드로 실행, 웜 워커 풀이 있으면 웜 실행도 비교)
+
+        Returns:
+            {케이스: 통계}
+        """
+        results = {
+            'cold': Benchmark._measure(
+                lambda: CodeExecutor.execute_python_code(code), runs
+            ),
+            'cold_profiled': Benchmark._measure(
+                lambda: CodeExecutor.execute_python_code(code, profile_top_n=Config.PROFILE_TOP_N), runs
+            )
+        }
+
+        pool = CodeExecutor.get_worker_pool()
+        if pool is not None:
+            results['warm'] = Benchmark._measure(
+                lambda: CodeExecutor.execute_warm(code), runs, warmup=3
+            )
+            results['warm_profiled'] = Benchmark._measure(
+                lambda: CodeExecutor.execute_warm(code, profile_top_n=Config.PROFILE_TOP_N), runs, warmup=3
+            )
+
+        return results
+
+    # 규칙 엔진 측정용 stderr (깊은 스택 + 마지막 예외 줄)
+    RULE_SAMPLE_ERRORS = [
+        "Traceback (most recent call last):\n" + '  File "main.py", line 3, in f\n    f()\n' * 50
+        + "RecursionError: maximum recursion depth exceeded",
+        "Traceback (most recent call last):\n  File \"main.py\", line 1, in <module>\n    import numpyy\n"
+        "ModuleNotFoundError: No module named 'numpyy'",
+        "Traceback (most recent call last):\n  File \"main.py\", line 2, in <module>\n    print('a' + 1)\n"
+        "TypeError: can only concatenate str (not \"int\") to str",
+        "Traceback (most recent call last):\n  File \"main.py\", line 4, in <module>\n    run()\n"
+        "CustomFailure: something odd"
+    ]
+
+    @staticmethod
+    def _synthetic_rules(count: int) -> List[tuple]:
+        """예외 타입 count // 5개에 각각 패턴 규칙 5개씩 (실제 규칙 뒤에 추가)"""
+        specs = []
+        for i in range(count):
+            specs.append(({
+                'exception': f'Synthetic{i // 5}Error',
+                'pattern': rf'synthetic message {i} (?P<value>\w+)',
+                'description': f'synthetic rule {i}',
+                'solutions': ['{value}']
+            }, 'benchmark'))
+        return specs
+
+    @staticmethod
+    def bench_rule_engine(runs: int = 20, rule_counts: tuple = (0, 500, 2000), batch: int = 200) -> Dict[str, Dict]:
+        """
+        ErrorAnalyzer 규칙 엔진 마이크로벤치마크
+        기본 규칙 + 합성 규칙 N개(rule_counts)마다 같은 analyze_error 경로를
+        예외 타입 색인 레지스트리(indexed_*)와 같은 규칙의 색인 없는 선형 탐색(linear_*)으로 측정
+        (indexed_*는 규칙 수가 늘어도 평평하고 linear_*만 규칙 수에 비례해 늘어나야 함)
+
+        Args:
+            runs: 반복 횟수
+            rule_counts: 추가할 합성 규칙 수 목록
+            batch: 1회 측정당 분석 횟수 (샘플 stderr를 순환)
+
+        Returns:
+            {케이스: 통계} (1회 = batch번 분석, 케이스 이름의 숫자 = 전체 규칙 수)
+        """
+        samples = Benchmark.RULE_SAMPLE_ERRORS
+        base_specs = ErrorRuleRegistry.read_specs(ErrorRuleRegistry.default_paths())
+
+        def analyze(registry):
+            return lambda: [ErrorAnalyzer.analyze_error(samples[i % len(samples)], rules=registry)
+                            for i in range(batch)]
+
+        results = {}
+        for count in rule_counts:
+            specs = Benchmark._synthetic_rules(count) + base_specs
+            indexed = ErrorRuleRegistry(specs)
+            results[f'indexed_{len(indexed)}'] = Benchmark._measure(analyze(indexed), runs)
+            results[f'linear_{len(indexed)}'] = Benchmark._measure(analyze(_LinearRuleRegistry(specs)), runs)
+        return results
+
+    @staticmethod
+    def _database_workload(db: ErrorDatabase, threads: int, ops: int) -> int:
+        """스레드 threads개가 각각 ops번 저장 / 지문 조회 / 유사 검색 / 통계를 섞어 실행 (발생한 오류 수 반환)"""
+        samples = [ErrorAnalyzer.analyze_error(stderr) for stderr in Benchmark.RULE_SAMPLE_ERRORS]
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(ops):
+                    analysis = samples[(n + i) % len(samples)]
+                    db.save_error(f'# worker {n}\nvalue = {i}', analysis)
+                    db._known.clear()  # 메모리 캐시 대신 DB 조회 측정
+                    db.lookup_fingerprint(analysis['fingerprint'])
+                    db.find_similar_errors(analysis, limit=3)
+                    if i % 10 == 0:
+                        PatternLearner.get_error_statistics(db, limit=5)
+            except Exception as e:
+                errors.append(e)
+
+        pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        return len(errors)
+
+    @staticmethod
+    def bench_database(runs: int = 20, threads: int = 8, ops: int = 25) -> Dict[str, Dict]:
+        """
+        ErrorDatabase 동시 접근 스트레스 테스트
+        (공용 연결 풀 + WAL vs 매번 새 연결 + rollback 저널)
+
+        Args:
+            runs: 반복 횟수
+            threads: 동시 스레드 수 (Flask 요청 / CLI --jobs 대응)
+            ops: 스레드당 작업 반복 횟수
+
+        Returns:
+            {케이스: 통계 + 'errors' (잠금 오류 등 실패한 스레드 수)}
+        """
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            cases = {
+                'pooled_wal': lambda path: ConnectionManager(path),
+                'per_call_delete': lambda path: ConnectionManager(
+                    path, pool_size=0, journal_mode='DELETE', synchronous='FULL'
+                )
+            }
+            for case, make_manager in cases.items():
+                path = os.path.join(tmp, f'{case}.db')
+                manager = make_manager(path)
+                db = ErrorDatabase(path, connections=manager, write_mode='sync')
+                errors = []
+                stats = Benchmark._measure(
+                    lambda: errors.append(Benchmark._database_workload(db, threads, ops)), runs
+                )
+                stats['errors'] = sum(errors)
+                results[case] = stats
+                manager.close_all()
+        return results
+
+    @staticmethod
+    def bench_writes(runs: int = 20, threads: int = 8, saves: int = 25) -> Dict[str, Dict]:
+        """
+        에러 저장 지연 비교 (save_error 안에서 커밋 vs 쓰기 큐 + 백그라운드 배치 커밋)
+
+        Args:
+            runs: 반복 횟수
+            threads: 동시에 저장하는 스레드 수 (Flask 요청 대응)
+            saves: 스레드당 save_error 호출 수
+
+        Returns:
+            {케이스: 통계} (1회 = 모든 스레드의 save_error 반환까지,
+             async_flushed는 큐가 디스크에 모두 기록될 때까지 포함, 비동기 케이스는 'batches' = 커밋 횟수)
+        """
+        samples = [ErrorAnalyzer.analyze_error(stderr) for stderr in Benchmark.RULE_SAMPLE_ERRORS]
+
+        def burst(db, flush):
+            def worker(n):
+                for i in range(saves):
+                    db.save_error(f'# worker {n}\nvalue = {i}', samples[(n + i) % len(samples)])
+
+            pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+            if flush:
+                db.flush()
+
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for case, mode, flush in (('sync', 'sync', False),
+                                      ('async', 'async', False),
+                                      ('async_flushed', 'async', True)):
+                manager = ConnectionManager(os.path.join(tmp, f'{case}.db'))
+                db = ErrorDatabase(manager.db_path, connections=manager, write_mode=mode)
+                results[case] = Benchmark._measure(lambda: burst(db, flush), runs)
+                db.close()
+                if db.writer is not None:
+                    results[case]['batches'] = db.writer.get_statistics()['batches']
+                manager.close_all()
+        return results
+
+    # 합성 히스토리의 예외 타입 분포 (앞쪽일수록 흔함)
+    HISTORY_ERROR_TYPES = [
+        'NameError', 'NameError', 'NameError', 'TypeError', 'TypeError',
+        'KeyError', 'ModuleNotFoundError', 'IndexError', 'AttributeError', 'ValueError'
+    ]
+
+    @staticmethod
+    def _populate_history(db: ErrorDatabase, rows: int):
+        """
+        합성 에러 히스토리 생성 (SQL 안에서 행 생성 - rows개 에러, 4개 중 1개에 해결책 2개, 패턴 5000개)
+        에러 1개 = 30초 간격 created_at, 지문 / 메시지 / stderr는 5000가지, 코드 본문은 20000가지를 순환
+        """
+        types = Benchmark.HISTORY_ERROR_TYPES
+        type_case = 'CASE n % {} {} END'.format(
+            len(types), ' '.join(f"WHEN {i} THEN '{t}'" for i, t in enumerate(types))
+        )
+        code_texts = [f'value_{k % 97} = compute(item_{k})' for k in range(20000)]
+        stderr_texts = [
+            f'Traceback (most recent call last):\n  File "main.py", line {k % 200}, in <module>\n'
+            f'{types[k % len(types)]}: synthetic message {k}'
+            for k in range(5000)
+        ]
+        with db.connections.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('CREATE TEMP TABLE bench_code (k INTEGER PRIMARY KEY, hash TEXT)')
+            cursor.execute('CREATE TEMP TABLE bench_stderr (k INTEGER PRIMARY KEY, hash TEXT)')
+            cursor.executemany('INSERT INTO bench_code VALUES (?, ?)',
+                               enumerate(ContentStore.store(cursor, code_texts)))
+            cursor.executemany('INSERT INTO bench_stderr VALUES (?, ?)',
+                               enumerate(ContentStore.store(cursor, stderr_texts)))
+            conn.execute(f'''
+                WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+                INSERT INTO error_history
+                (code_hash, error_type, error_message, line_number, code_blob, stderr_blob, fingerprint,
+                 code_terms, occurrence_count, created_at, last_seen)
+                SELECT
+                    printf('%032x', n),
+                    {type_case},
+                    {type_case} || ': synthetic message ' || (n % 5000),
+                    n % 200,
+                    (SELECT hash FROM bench_code WHERE k = n % 20000),
+                    (SELECT hash FROM bench_stderr WHERE k = n % 5000),
+                    printf('%040x', n % 5000),
+                    'value_' || (n % 20000 % 97) || ' compute item_' || (n % 20000),
+                    1 + n % 3,
+                    datetime('2024-01-01', '+' || (n * 30) || ' seconds'),
+                    datetime('2024-01-01', '+' || (n * 30 + n % 3 * 3600) || ' seconds')
+                FROM seq
+            ''', (rows,))
+            cursor.execute('DROP TABLE bench_code')
+            cursor.execute('DROP TABLE bench_stderr')
+            conn.execute('''
+                INSERT INTO solutions (error_id, solution_text, solution_type, applied, success)
+                SELECT id, 'synthetic solution ' || (id % 50), 'auto_generated', id % 3 = 0, NULLIF(id % 3, 2)
+                FROM error_history WHERE id % 4 = 0
+                UNION ALL
+                SELECT id, 'synthetic alternative ' || (id % 7), 'auto_generated', 0, NULL
+                FROM error_history WHERE id % 4 = 0
+            ''')
+            conn.execute('''
+                INSERT OR IGNORE INTO error_patterns (error_type, pattern, occurrence_count)
+                SELECT error_type, error_message, COUNT(*) FROM error_history
+                WHERE id <= 50000 GROUP BY error_type, error_message
+            ''')
+            conn.execute('ANALYZE')
+
+    # 롤업 테이블 도입 전 get_statistics / get_error_statistics가 실행하던 집계
+    SCAN_STATISTICS_SQL = (
+        'SELECT SUM(occurrence_count) FROM error_history',
+        'SELECT error_type, SUM(occurrence_count) AS count FROM error_history GROUP BY error_type ORDER BY count DESC',
+        '''SELECT error_type, error_message, SUM(occurrence_count) AS count FROM error_history
+           GROUP BY error_type, error_message ORDER BY count DESC LIMIT 10'''
+    )
+
+    @staticmethod
+    def bench_history(runs: int = 20, rows: int = 1_000_000) -> Dict[str, Dict]:
+        """
+        대용량 에러 히스토리 조회 벤치마크 + EXPLAIN QUERY PLAN 회귀 검사
+        (rows행 합성 DB에서 인덱스 사용 조회를 측정한 뒤, v3 이전 인덱스 구성과 비교)
+
+        Args:
+            runs: 반복 횟수 (인덱스 없는 경우는 runs // 5, 최소 2)
+            rows: 합성 에러 수
+
+        Returns:
+            {케이스: 통계} (no_index_* = 인덱스 없는 전체 스캔, scan_statistics = 롤업 없이 히스토리 집계,
+             offset_deep_page = history_deep_page와 같은 위치를 OFFSET으로 읽은 경우)
+
+        Raises:
+            RuntimeError: 조회 쿼리가 인덱스 없이 테이블 전체를 스캔하는 경우 (플랜 회귀)
+        """
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = ConnectionManager(os.path.join(tmp, 'history.db'))
+            db = ErrorDatabase(manager.db_path, connections=manager)
+            Benchmark._populate_history(db, rows)
+
+            plans = db.explain_query_plans({**ErrorDatabase.QUERY_PLAN_CHECKS, **PatternLearner.QUERY_PLAN_CHECKS})
+            regressions = {name: plan['plan'] for name, plan in plans.items() if not plan['ok']}
+            if regressions:
+                manager.close_all()
+                raise RuntimeError(f'쿼리 플랜 회귀: {regressions}')
+
+            sample = {'error_type': 'KeyError', 'fingerprint': f'{1234:040x}'}
+            search_sample = {'error_type': 'KeyError', 'error_message': 'KeyError: synthetic message 1235'}
+            cases = {
+                'similar': lambda: db.find_similar_errors(sample, limit=5),
+                'similar_ranked': lambda: db.find_similar_errors(search_sample, limit=5, code='value_71 = compute(item_1235)'),
+                'fingerprint': lambda: db._load_fingerprint(sample['fingerprint']),
+                'recent': lambda: db.get_recent_errors(limit=10),
+                'statistics': lambda: db.get_statistics(),
+                'pattern_statistics': lambda: PatternLearner.get_error_statistics(db, limit=10)
+            }
+            # 히스토리 페이지: 중간 위치의 커서 (OFFSET이었다면 rows // 2행을 건너뛰어야 하는 위치)
+            with manager.connection() as conn:
+                middle = conn.execute(
+                    'SELECT created_at, id FROM error_history ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?',
+                    (rows // 2,)
+                ).fetchone()
+            deep_cursor = ErrorDatabase._encode_cursor(middle['created_at'], middle['id'])
+            cases.update({
+                'history_page': lambda: db.query_history(limit=50),
+                'history_deep_page': lambda: db.query_history(limit=50, cursor=deep_cursor),
+                'history_filtered': lambda: db.query_history(
+                    error_type='KeyError', since='2024-01-02', fingerprint=sample['fingerprint'], limit=50
+                ),
+                'history_text': lambda: db.query_history(text='synthetic item_1235', limit=50)
+            })
+            for case, func in cases.items():
+                results[case] = Benchmark._measure(func, runs)
+
+            # 비교: OFFSET 페이지네이션 (건너뛴 행을 모두 읽음)
+            def offset_deep_page():
+                with manager.connection() as conn:
+                    conn.execute(
+                        'SELECT * FROM error_history ORDER BY created_at DESC, id DESC LIMIT 50 OFFSET ?', (rows // 2,)
+                    ).fetchall()
+
+            results['offset_deep_page'] = Benchmark._measure(offset_deep_page, max(2, runs // 5))
+
+            # 비교: 롤업 테이블 이전의 통계 (매번 히스토리 전체 집계)
+            def scan_statistics():
+                with manager.connection() as conn:
+                    for sql in Benchmark.SCAN_STATISTICS_SQL:
+                        conn.execute(sql).fetchall()
+
+            results['scan_statistics'] = Benchmark._measure(scan_statistics, max(2, runs // 5))
+
+            # 비교: 스키마 v3 이전 인덱스 구성으로 되돌림 (지문 인덱스 + solutions.error_id 단일 인덱스)
+            with manager.transaction() as conn:
+                for (name,) in conn.execute('''
+                    SELECT name FROM sqlite_master
+                    WHERE type = 'index' AND name IN (
+                        'idx_error_history_type_created', 'idx_error_history_created',
+                        'idx_error_history_type_message', 'idx_solutions_error_covering', 'idx_error_patterns_count'
+                    )
+                ''').fetchall():
+                    conn.execute(f'DROP INDEX {name}')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_solutions_error_id ON solutions(error_id)')
+                conn.execute('ANALYZE')
+            slow_runs = max(2, runs // 5)
+            for case in ('similar', 'recent'):
+                results[f'no_index_{case}'] = Benchmark._measure(cases[case], slow_runs)
+            manager.close_all()
+        return results
+
+    SAVE_INTERVAL = 0.005  # 정리 중 save_error 간격 (초, 초당 약 200건의 요청)
+
+    @staticmethod
+    def bench_maintenance(runs: int = 20, rows: int = 200_000) -> Dict[str, Dict]:
+        """
+        정리 작업 중 에러 저장 지연 (합성 히스토리 전체가 보관 기간을 지난 상태에서 아카이브 + 정리)
+
+        Args:
+            runs: 정리 작업 없이 측정할 save_error 횟수 (정리 중에는 끝날 때까지 SAVE_INTERVAL 간격으로 반복)
+            rows: 합성 에러 수
+
+        Returns:
+            {'save_idle', 'save_during_maintenance': save_error 1회 통계,
+             'maintenance': 정리 1회 소요 시간 (+ 'archived' = 옮긴 에러 수)}
+        """
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = ConnectionManager(os.path.join(tmp, 'history.db'))
+            db = ErrorDatabase(manager.db_path, connections=manager, write_mode='sync')
+            Benchmark._populate_history(db, rows)
+            sample = ErrorAnalyzer.analyze_error(Benchmark.RULE_SAMPLE_ERRORS[0])
+            counter = iter(range(10 ** 9))
+
+            def save():
+                db.save_error(f'value = {next(counter)}', sample)
+
+            results['save_idle'] = Benchmark._measure(save, runs)
+
+            maintenance = HistoryMaintenance(db, retention_days=180, archive_path=os.path.join(tmp, 'archive.db'))
+            report = {}
+            worker = threading.Thread(target=lambda: report.update(maintenance.run()))
+            started = time.perf_counter()
+            worker.start()
+            samples = []
+            while worker.is_alive():
+                start = time.perf_counter()
+                save()
+                samples.append((time.perf_counter() - start) * 1000)
+                time.sleep(Benchmark.SAVE_INTERVAL)
+            worker.join()
+            if not report.get('success'):
+                raise RuntimeError(f"정리 작업 실패: {report.get('error')}")
+
+            results['save_during_maintenance'] = Benchmark._summarize(samples)
+            results['maintenance'] = Benchmark._summarize([(time.perf_counter() - started) * 1000])
+            results['maintenance']['archived'] = report['archived_errors']
+            maintenance.archive.close_all()
+            manager.close_all()
+        return results
+
+    EMBEDDING_DIM = 384  # 기본 임베딩 함수(all-MiniLM-L6-v2) 차원
+
+    @staticmethod
+    def bench_transfer(runs: int = 20, rows: int = 100_000, embeddings: int = 20_000) -> Dict[str, Dict]:
+        """
+        지식 베이스 내보내기 / 빈 DB로 가져오기 (배치 트랜잭션) vs 에러 1개씩 save_error
+
+        Args:
+            runs: save_error 측정 횟수 (내보내기 / 가져오기는 1회)
+            rows: 합성 에러 수
+            embeddings: 합성 임베딩 수 (chromadb가 없으면 측정하지 않음)
+
+        Returns:
+            {'export', 'import', 'embeddings_import': 1회 소요 시간 (+ 'rows_per_sec'),
+             'save_error_per_row': save_error 1회 통계}
+        """
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            source_manager = ConnectionManager(os.path.join(tmp, 'source.db'))
+            source = ErrorDatabase(source_manager.db_path, connections=source_manager, write_mode='sync')
+            Benchmark._populate_history(source, rows)
+
+            vector_db = None
+            if embeddings:
+                try:
+                    from .vector_database import VectorDatabase
+                    vector_db = VectorDatabase(os.path.join(tmp, 'chroma'), 'bench_source')
+                    vector_db.upsert_records([
+                        {'id': f'error_{i}', 'embedding': [((i * 7 + d) % 97) / 97 for d in range(Benchmark.EMBEDDING_DIM)],
+                         'document': f'NameError {i}', 'metadata': {'error_type': 'NameError'}}
+                        for i in range(embeddings)
+                    ])
+                except ImportError:
+                    vector_db = None
+
+            bundle = os.path.join(tmp, 'bundle')
+            started = time.perf_counter()
+            manifest = HistoryTransfer(source, vector_db).export_bundle(bundle)
+            elapsed = time.perf_counter() - started
+            results['export'] = Benchmark._summarize([elapsed * 1000])
+            results['export']['rows_per_sec'] = manifest['tables']['error_history']['rows'] / elapsed
+
+            target_manager = ConnectionManager(os.path.join(tmp, 'target.db'))
+            target = ErrorDatabase(target_manager.db_path, connections=target_manager, write_mode='sync')
+            target_vectors = None
+            if vector_db is not None:
+                target_vectors = VectorDatabase(os.path.join(tmp, 'chroma_target'), 'bench_target')
+
+            transfer = HistoryTransfer(target)
+            started = time.perf_counter()
+            report = transfer.import_bundle(bundle, include_embeddings=False)
+            elapsed = time.perf_counter() - started
+            results['import'] = Benchmark._summarize([elapsed * 1000])
+            results['import']['rows_per_sec'] = report['tables']['error_history']['rows'] / elapsed
+
+            if target_vectors is not None:
+                started = time.perf_counter()
+                count = 0
+                for batch in transfer._iter_embeddings(bundle, manifest):
+                    count += target_vectors.upsert_records(batch)
+                elapsed = time.perf_counter() - started
+                results['embeddings_import'] = Benchmark._summarize([elapsed * 1000])
+                results['embeddings_import']['rows_per_sec'] = count / elapsed
+
+            sample = ErrorAnalyzer.analyze_error(Benchmark.RULE_SAMPLE_ERRORS[0])
+            counter = iter(range(10 ** 9))
+            results['save_error_per_row'] = Benchmark._measure(
+                lambda: target.save_error(f'value = {next(counter)}', sample), runs
+            )
+            source_manager.close_all()
+            target_manager.close_all()
+        return results
+
+    # 스위트 이름 → 측정 메서드 이름
+    SUITES = {
+        'transport': 'bench_transports',
+        'profile': 'bench_profile_overhead',
+        'rules': 'bench_rule_engine',
+        'database': 'bench_database',
+        'writes': 'bench_writes',
+        'history': 'bench_history',
+        'maintenance': 'bench_maintenance',
+        'transfer': 'bench_transfer'
+    }
+
+    @staticmethod
+    def run(suites: List[str] = None, runs: int = 20) -> Dict[str, Dict]:
+        """
+        벤치마크 스위트 실행
+
+        Args:
+            suites: 실행할 스위트 이름 리스트 (None이면 전체)
+            runs: 반복 횟수
+
+        Returns:
+            {스위트: {케이스: 통계}}
+        """
+        suites = suites or list(Benchmark.SUITES)
+        return {
+            name: getattr(Benchmark, Benchmark.SUITES[name])(runs=runs)
+            for name in suites
+        }
+
+    @staticmethod
+    def format_report(results: Dict[str, Dict]) -> str:
+        """벤치마크 결과를 표 형식으로 포맷"""
+        lines = []
+        for suite, cases in results.items():
+            lines.append(f"\n📊 {suite}")
+            lines.append(f"   {'case':<20}{'mean':>10}{'median':>10}{'p95':>10}{'min':>10}")
+            for case, stats in cases.items():
+                lines.append(
+                    f"   {case:<20}"
+                    f"{stats['mean_ms']:>8.2f}ms"
+                    f"{stats['median_ms']:>8.2f}ms"
+                    f"{stats['p95_ms']:>8.2f}ms"
+                    f"{stats['min_ms']:>8.2f}ms"
+                )
+        return "\n".join(lines)
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("⏱️  벤치마크")
+    print("=" * 60)
+    print(Benchmark.format_report(Benchmark.run(runs=10)))
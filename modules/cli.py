@@ -4,6 +4,7 @@ CLI 모듈 - 커맨드라인 인터페이스
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 from modules.file_handler import FileHandler
@@ -15,6 +16,11 @@ from modules.code_fixer import CodeFixer
 from modules.project_scanner import ProjectScanner
 from modules.pattern_learner import PatternLearner
 from modules.advanced_analyzer import AdvancedAnalyzer
+from modules.benchmark import Benchmark
+from modules.db_maintenance import HistoryMaintenance
+from modules.db_transfer import HistoryTransfer
+from modules.db_checks import DatabaseChecks
+from modules.config import Config
 import shutil
 
 
@@ -22,7 +28,8 @@ class ErrorAnalyzerCLI:
     """CLI 인터페이스"""
     
     def __init__(self):
-        self.db = ErrorDatabase()
+        # 한 번 실행하고 끝나는 프로세스이므로 저장 즉시 커밋
+        self.db = ErrorDatabase(write_mode='sync')
     
     def analyze_file(self, filepath, output_format='text', save_history=True):
         """
@@ -71,7 +78,7 @@ class ErrorAnalyzerCLI:
                         self.db.save_error(code, error_analysis)
                     
                     # 유사 에러 검색
-                    similar_errors = self.db.find_similar_errors(error_analysis, limit=3)
+                    similar_errors = self.db.find_similar_errors(error_analysis, limit=3, code=code)
                     if similar_errors:
                         result['similar_errors'] = similar_errors
             
@@ -243,20 +250,21 @@ class ErrorAnalyzerCLI:
             print(f"❌ 에러: {e}")
             return 1
     
-    def batch_analyze(self, files, output_format='text'):
+    def batch_analyze(self, files, output_format='text', jobs=1):
         """
         여러 파일을 배치로 분석
         
         Args:
             files: 분석할 파일 경로 리스트
             output_format: 'text' 또는 'json'
+            jobs: 동시에 실행할 파일 수
         """
         try:
             print(f"📦 배치 분석 시작: {len(files)}개 파일")
             print("=" * 60)
             
             # 배치 분석 실행
-            results = ProjectScanner.analyze_multiple_files(files)
+            results = ProjectScanner.analyze_multiple_files(files, concurrency=jobs)
             
             # 출력
             if output_format == 'json':
@@ -270,7 +278,7 @@ class ErrorAnalyzerCLI:
             print(f"❌ 에러: {e}")
             return 1
     
-    def scan_directory(self, directory, recursive=False, output_format='text'):
+    def scan_directory(self, directory, recursive=False, output_format='text', jobs=1):
         """
         디렉토리를 스캔하여 분석
         
@@ -278,6 +286,7 @@ class ErrorAnalyzerCLI:
             directory: 스캔할 디렉토리 경로
             recursive: 하위 디렉토리 포함 여부
             output_format: 'text' 또는 'json'
+            jobs: 동시에 실행할 파일 수
         """
         try:
             print(f"🔍 디렉토리 스캔: {directory}")
@@ -295,7 +304,7 @@ class ErrorAnalyzerCLI:
             print(f"✅ {len(files)}개 파일 발견\n")
             
             # 배치 분석 실행
-            results = ProjectScanner.analyze_multiple_files(files)
+            results = ProjectScanner.analyze_multiple_files(files, concurrency=jobs)
             
             # 출력
             if output_format == 'json':
@@ -319,6 +328,8 @@ class ErrorAnalyzerCLI:
         print(f"분석 완료: {results['analyzed']}")
         print(f"✅ 성공: {results['success']}")
         print(f"❌ 에러: {results['errors']}")
+        if results.get('cache_hits'):
+            print(f"🗃️  캐시 적중: {results['cache_hits']}")
         
         # 에러 타입별 통계
         if results['error_types']:
@@ -406,6 +417,304 @@ class ErrorAnalyzerCLI:
             print(f"❌ 에러: {e}")
             return 1
     
+    def profile_file(self, filepath, top_n=None, timeout=None, output_format='text'):
+        """
+        파일을 프로파일 모드로 실행하여 핫스팟 출력
+        
+        Args:
+            filepath: 실행할 파일 경로
+            top_n: 요약 항목 수 (None이면 Config.PROFILE_TOP_N)
+            timeout: 타임아웃 (None이면 Config.EXECUTION_TIMEOUT)
+            output_format: 'text' 또는 'json'
+        """
+        try:
+            file_result = FileHandler.read_file(filepath)
+            
+            if not file_result['success']:
+                raise ValueError(file_result.get('error', 'File read failed'))
+            
+            code = file_result['content']
+            
+            validation = CodeValidator.validate_syntax(code)
+            if not validation['valid']:
+                raise ValueError(f"Syntax 에러 (line {validation.get('line')}): {validation['error']}")
+            
+            result = CodeExecutor.profile_code(code, timeout or Config.EXECUTION_TIMEOUT, top_n)
+            
+            if output_format == 'json':
+                print(json.dumps({'file': str(filepath), **result}, indent=2, ensure_ascii=False))
+            else:
+                self._print_profile_result(filepath, result)
+            
+            return 0 if result['success'] else 1
+            
+        except Exception as e:
+            if output_format == 'json':
+                print(json.dumps({'error': str(e)}, ensure_ascii=False))
+            else:
+                print(f"❌ 에러: {e}")
+            return 1
+    
+    def _print_profile_result(self, filepath, result):
+        """프로파일 결과 텍스트 출력"""
+        print("=" * 60)
+        print(f"🔬 프로파일: {filepath}")
+        print("=" * 60)
+        
+        if result['success']:
+            print(f"✅ 실행 완료 ({result['execution_time']:.3f}초)")
+        else:
+            last_line = result['stderr'].strip().split('\n')[-1] if result['stderr'] else ''
+            print(f"❌ 실행 실패: {last_line}")
+        
+        profile = result.get('profile')
+        if not profile:
+            print("\n⚠️  프로파일 결과가 없습니다 (타임아웃 또는 강제 종료)")
+            return
+        
+        print(f"   측정 시간: {profile['wall_time']:.3f}초 (프로파일러 오버헤드 포함)")
+        print(f"   최대 메모리: {profile['peak_memory_kb']:.1f} KB")
+        
+        print(f"\n⏱️  누적 시간 상위 함수:")
+        print(f"   {'cumulative':>12}{'own':>10}{'calls':>10}  function")
+        for func in profile['functions']:
+            location = f"{os.path.basename(func['file'])}:{func['line']}" if func['line'] else func['file']
+            print(
+                f"   {func['cumulative_time']:>11.4f}s"
+                f"{func['total_time']:>9.4f}s"
+                f"{func['calls']:>10}  {func['function']} ({location})"
+            )
+        
+        if profile['allocations']:
+            print(f"\n💾 메모리 할당 위치 (종료 시점):")
+            for alloc in profile['allocations']:
+                print(f"   {alloc['size_kb']:>10.1f} KB {alloc['count']:>8}개  "
+                      f"{os.path.basename(alloc['file'])}:{alloc['line']}")
+        
+        print("\n" + "=" * 60)
+    
+    def run_benchmark(self, suites=None, runs=20, output_format='text'):
+        """
+        성능 벤치마크 실행
+        
+        Args:
+            suites: 실행할 스위트 리스트 (None이면 전체)
+            runs: 반복 횟수
+            output_format: 'text' 또는 'json'
+        """
+        try:
+            results = Benchmark.run(suites, runs)
+            
+            if output_format == 'json':
+                print(json.dumps(results, indent=2, ensure_ascii=False))
+            else:
+                print("=" * 60)
+                print(f"⏱️  벤치마크 ({runs}회 반복)")
+                print("=" * 60)
+                print(Benchmark.format_report(results))
+                print("\n" + "=" * 60)
+            
+            return 0
+        except Exception as e:
+            print(f"❌ 에러: {e}")
+            return 1
+    
+    def show_history(self, error_type=None, since=None, until=None, fingerprint=None, text=None,
+                     limit=20, cursor=None, output_format='text'):
+        """
+        에러 히스토리 페이지 조회 (필터 + 커서)
+        
+        Args:
+            error_type / since / until / fingerprint / text: 필터 (ErrorDatabase.query_history)
+            limit: 페이지 크기
+            cursor: 이전 출력의 다음 페이지 커서
+            output_format: 'text' 또는 'json'
+        """
+        try:
+            page = self.db.query_history(error_type, since, until, fingerprint, text, limit, cursor)
+            
+            if output_format == 'json':
+                print(json.dumps(page, indent=2, ensure_ascii=False))
+                return 0
+            
+            print("=" * 60)
+            print(f"🗂️  에러 히스토리 ({len(page['items'])}개)")
+            print("=" * 60)
+            
+            if not page['items']:
+                print("\n조건에 맞는 에러가 없습니다" + (" (이 범위에서)" if page['has_more'] else ""))
+            for item in page['items']:
+                repeat = f" x{item['occurrence_count']}" if item['occurrence_count'] > 1 else ""
+                print(f"\n#{item['id']}  {item['created_at']}  [{item['error_type']}]{repeat}")
+                print(f"   {(item['error_message'] or '')[:100]}")
+                if item['fingerprint']:
+                    print(f"   지문: {item['fingerprint'][:12]}...")
+            
+            if page['next_cursor']:
+                print(f"\n➡️  다음 페이지: --cursor {page['next_cursor']}")
+            
+            print("\n" + "=" * 60)
+            return 0
+        except ValueError as e:
+            print(f"❌ 잘못된 입력: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ 에러: {e}")
+            return 1
+    
+    def maintain_history(self, retention_days=None, archive_path=None, dry_run=False,
+                         full_vacuum=False, output_format='text'):
+        """
+        에러 히스토리 정리 (보관 기간 지난 에러 아카이브 + 일별 집계, 고아 행 정리, 증분 VACUUM)
+        
+        Args:
+            retention_days: 보관 기간 (일, None이면 HISTORY_RETENTION_DAYS)
+            archive_path: 아카이브 DB 경로 (None이면 HISTORY_ARCHIVE_PATH, 빈 문자열이면 아카이브 없이 삭제)
+            dry_run: 정리하지 않고 대상 개수만 출력
+            full_vacuum: 전체 VACUUM으로 auto_vacuum=INCREMENTAL 전환 (실행 중 다른 쓰기가 대기)
+            output_format: 'text' 또는 'json'
+        """
+        try:
+            maintenance = HistoryMaintenance(self.db, retention_days=retention_days, archive_path=archive_path)
+            result = maintenance.plan() if dry_run else maintenance.run(full_vacuum=full_vacuum)
+            
+            if output_format == 'json':
+                print(json.dumps(result, indent=2, ensure_ascii=False))
+                return 0 if result.get('success', True) else 1
+            
+            print("=" * 60)
+            print("🧹 에러 히스토리 정리" + (" (dry run)" if dry_run else ""))
+            print("=" * 60)
+            
+            if dry_run:
+                print(f"\n보관 기간: {result['retention_days']}일" +
+                      (f" ({result['cutoff']} 이전 발생)" if result['cutoff'] else " (무기한)"))
+                print(f"   - 아카이브 대상 에러: {result['expired_errors']}개")
+                print(f"   - 만료된 시간별 통계: {result['expired_hourly']}개")
+                print(f"   - 고아 해결책 / 본문: {result['orphan_solutions']}개 / {result['orphan_blobs']}개")
+                print(f"   - 빈 페이지: {result['free_pages']}개 (auto_vacuum={result['auto_vacuum']})")
+            elif not result['success']:
+                print(f"\n❌ 정리 실패: {result['error']}")
+            else:
+                print(f"\n✅ 완료 ({result['elapsed']:.1f}초, 트랜잭션 {result['batches']}개)")
+                print(f"   - 아카이브: 에러 {result['archived_errors']}개, 해결책 {result['archived_solutions']}개"
+                      f" → {result['archive_path'] or '(삭제, 아카이브 없음)'}")
+                print(f"   - 일별 집계 갱신: {result['daily_rollups']}개")
+                print(f"   - 만료된 시간별 통계: {result['hourly_pruned']}개")
+                print(f"   - 고아 해결책 / 본문: {result['orphan_solutions']}개 / {result['orphan_blobs']}개")
+                print(f"   - VACUUM: {result['vacuumed_pages']}페이지, {result['freed_bytes'] / 1024:.0f}KB 반환")
+                if result.get('auto_vacuum') != 'incremental':
+                    print("\n💡 auto_vacuum이 꺼진 DB입니다. 'maintain --full-vacuum'을 한 번 실행하면 "
+                          "이후 정리부터 빈 공간이 파일에서 반환됩니다.")
+            
+            print("\n" + "=" * 60)
+            return 0 if result.get('success', True) else 1
+        except Exception as e:
+            print(f"❌ 에러: {e}")
+            return 1
+    
+    def _open_vector_db(self):
+        """벡터 DB (chromadb가 없거나 열 수 없으면 None - 테이블만 옮김)"""
+        try:
+            from modules.vector_database import VectorDatabase
+            return VectorDatabase(Config.VECTOR_DB_PATH, Config.VECTOR_COLLECTION_NAME)
+        except Exception as e:
+            print(f"⚠️ 벡터 DB를 열 수 없어 임베딩은 제외합니다: {e}", file=sys.stderr)
+            return None
+    
+    def export_history(self, path, fmt='jsonl', compress=False, include_embeddings=True, output_format='text'):
+        """
+        에러 지식 베이스 내보내기 (에러 / 해결책 / 패턴 / 지문 / 일별 집계 + 벡터 임베딩)
+        
+        Args:
+            path: 번들 디렉토리
+            fmt: 'jsonl' 또는 'arrow' (pyarrow 필요)
+            compress: 조각 파일 gzip 압축
+            include_embeddings: 벡터 임베딩 포함
+            output_format: 'text' 또는 'json'
+        """
+        try:
+            vector_db = self._open_vector_db() if include_embeddings else None
+            manifest = HistoryTransfer(self.db, vector_db).export_bundle(path, fmt, compress, include_embeddings)
+            
+            if output_format == 'json':
+                print(json.dumps(manifest, indent=2, ensure_ascii=False))
+                return 0
+            
+            print("=" * 60)
+            print(f"📤 내보내기 완료: {path} ({manifest['elapsed']:.1f}초)")
+            print("=" * 60)
+            for table, entry in manifest['tables'].items():
+                print(f"   - {table}: {entry['rows']}행 (파일 {len(entry['files'])}개)")
+            if 'embeddings' in manifest:
+                print(f"   - 임베딩: {manifest['embeddings']['rows']}개 (파일 {len(manifest['embeddings']['files'])}개)")
+            print("\n" + "=" * 60)
+            return 0
+        except Exception as e:
+            print(f"❌ 에러: {e}")
+            return 1
+    
+    def import_history(self, path, include_embeddings=True, output_format='text'):
+        """
+        에러 지식 베이스 가져오기 (현재 DB에 병합, 이미 가져온 번들은 건너뛰고 중단된 번들은 이어서)
+        
+        Args:
+            path: export로 만든 번들 디렉토리
+            include_embeddings: 번들의 벡터 임베딩도 가져옴
+            output_format: 'text' 또는 'json'
+        """
+        try:
+            vector_db = self._open_vector_db() if include_embeddings else None
+            report = HistoryTransfer(self.db, vector_db).import_bundle(path, include_embeddings)
+            
+            if output_format == 'json':
+                print(json.dumps(report, indent=2, ensure_ascii=False))
+                return 0
+            
+            if report['already_imported']:
+                print(f"💡 이미 가져온 번들입니다 ({report['bundle_id']}) - 변경 없음")
+                return 0
+            
+            print("=" * 60)
+            print(f"📥 가져오기 완료: {path} ({report['elapsed']:.1f}초)")
+            print("=" * 60)
+            for table, counts in report['tables'].items():
+                resumed = f", 이전 실행에서 반영 {counts['resumed']}" if counts['resumed'] else ''
+                print(f"   - {table}: {counts['rows']}행 (추가 {counts['inserted']}, 병합 {counts['merged']}{resumed})")
+            print(f"   - 임베딩: {report['embeddings']}개")
+            if report['id_offset']:
+                print(f"\n💡 기존 에러와 겹치지 않게 에러 ID를 {report['id_offset']}만큼 옮겨 저장했습니다.")
+            print("\n" + "=" * 60)
+            return 0
+        except Exception as e:
+            print(f"❌ 에러: {e}")
+            return 1
+    
+    def run_checks(self, names=None, output_format='text'):
+        """
+        에러 DB 자동 점검 (임시 DB 사용, 하나라도 실패하면 종료 코드 1)
+        
+        Args:
+            names: 실행할 점검 리스트 (None이면 전체)
+            output_format: 'text' 또는 'json'
+        """
+        results = DatabaseChecks.run(names)
+        failed = [name for name, result in results.items() if not result['ok']]
+        
+        if output_format == 'json':
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            print("=" * 60)
+            print("🩺 에러 DB 점검")
+            print("=" * 60)
+            for name, result in results.items():
+                print(f"\n{'✅' if result['ok'] else '❌'} {name} ({result['elapsed']:.2f}초)")
+                if not result['ok']:
+                    print(f"   {result['error']}")
+            print("\n" + "=" * 60)
+        
+        return 1 if failed else 0
+    
     def _print_deep_analysis(self, results):
         """고급 분석 결과 텍스트 출력"""
         print("\n" + "=" * 60)
@@ -482,12 +791,14 @@ def main():
     batch_parser = subparsers.add_parser('batch', help='여러 파일 분석')
     batch_parser.add_argument('files', nargs='+', help='파일 목록')
     batch_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    batch_parser.add_argument('--jobs', '-j', type=int, default=1, help='동시 실행 파일 수 (ASYNC_MAX_CONCURRENCY 이하, 기본값: 1)')
     
     # scan 명령
     scan_parser = subparsers.add_parser('scan', help='프로젝트 스캔')
     scan_parser.add_argument('directory', help='스캔할 디렉토리')
     scan_parser.add_argument('--recursive', action='store_true', help='하위 디렉토리 포함')
     scan_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    scan_parser.add_argument('--jobs', '-j', type=int, default=1, help='동시 실행 파일 수 (ASYNC_MAX_CONCURRENCY 이하, 기본값: 1)')
     
     # stats 명령
     stats_parser = subparsers.add_parser('stats', help='에러 통계 조회')
@@ -503,6 +814,61 @@ def main():
     deep_parser.add_argument('--json', action='store_true', help='JSON 출력')
     deep_parser.add_argument('--fix', action='store_true', help='Ruff 자동 수정 적용')
     
+    # profile 명령
+    profile_parser = subparsers.add_parser('profile', help='프로파일 모드로 실행 (느린 함수 / 메모리 할당 위치)')
+    profile_parser.add_argument('file', help='실행할 파일')
+    profile_parser.add_argument('--top', type=int, default=None, help='상위 N개 (기본값: PROFILE_TOP_N)')
+    profile_parser.add_argument('--timeout', type=int, default=None, help='타임아웃 (초)')
+    profile_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    
+    # bench 명령
+    bench_parser = subparsers.add_parser('bench', help='성능 벤치마크')
+    bench_parser.add_argument('--suite', nargs='+', choices=list(Benchmark.SUITES),
+                              help='실행할 스위트 (기본값: 전체)')
+    bench_parser.add_argument('--runs', type=int, default=20, help='반복 횟수 (기본값: 20)')
+    bench_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    
+    # history 명령
+    history_parser = subparsers.add_parser('history', help='에러 히스토리 조회 (필터 + 페이지)')
+    history_parser.add_argument('--type', dest='error_type', default=None, help='예외 타입')
+    history_parser.add_argument('--since', default=None, help='이 시각 이후 (ISO 8601, 시간대 없으면 UTC)')
+    history_parser.add_argument('--until', default=None, help='이 시각 이전 (ISO 8601, 시간대 없으면 UTC)')
+    history_parser.add_argument('--fingerprint', default=None, help='에러 지문')
+    history_parser.add_argument('--text', default=None, help='메시지 / 코드 / 해결책 검색어')
+    history_parser.add_argument('--limit', type=int, default=20, help='페이지 크기 (기본값: 20)')
+    history_parser.add_argument('--cursor', default=None, help='다음 페이지 커서 (이전 출력의 next_cursor)')
+    history_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    
+    # maintain 명령
+    maintain_parser = subparsers.add_parser('maintain', help='에러 히스토리 정리 (아카이브 / 고아 행 / VACUUM)')
+    maintain_parser.add_argument('--retention-days', type=int, default=None,
+                                 help='보관 기간 (일, 0이면 아카이브 안 함, 기본값: HISTORY_RETENTION_DAYS)')
+    maintain_parser.add_argument('--archive', default=None, help='아카이브 DB 경로 (기본값: HISTORY_ARCHIVE_PATH)')
+    maintain_parser.add_argument('--no-archive', action='store_true', help='아카이브 없이 일별 집계만 남기고 삭제')
+    maintain_parser.add_argument('--dry-run', action='store_true', help='정리하지 않고 대상 개수만 출력')
+    maintain_parser.add_argument('--full-vacuum', action='store_true',
+                                 help='전체 VACUUM (auto_vacuum=INCREMENTAL 전환, 실행 중 쓰기 대기)')
+    maintain_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    
+    # export 명령
+    export_parser = subparsers.add_parser('export', help='에러 지식 베이스 내보내기 (JSONL / Arrow 번들)')
+    export_parser.add_argument('path', help='번들 디렉토리')
+    export_parser.add_argument('--format', choices=['jsonl', 'arrow'], default='jsonl', help='파일 형식 (arrow는 pyarrow 필요)')
+    export_parser.add_argument('--gzip', action='store_true', help='조각 파일 gzip 압축')
+    export_parser.add_argument('--no-embeddings', action='store_true', help='벡터 임베딩 제외')
+    export_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    
+    # import 명령
+    import_parser = subparsers.add_parser('import', help='에러 지식 베이스 가져오기 (현재 DB에 병합, 같은 번들은 한 번만)')
+    import_parser.add_argument('path', help='export로 만든 번들 디렉토리')
+    import_parser.add_argument('--no-embeddings', action='store_true', help='벡터 임베딩 제외')
+    import_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    
+    # check 명령
+    check_parser = subparsers.add_parser('check', help='에러 DB 자동 점검 (동시 쓰기 / 쿼리 플랜, 실패 시 종료 코드 1)')
+    check_parser.add_argument('--only', nargs='+', choices=list(DatabaseChecks.CHECKS), help='실행할 점검')
+    check_parser.add_argument('--json', action='store_true', help='JSON 출력')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -521,11 +887,11 @@ def main():
     
     elif args.command == 'batch':
         output_format = 'json' if args.json else 'text'
-        return cli.batch_analyze(args.files, output_format)
+        return cli.batch_analyze(args.files, output_format, args.jobs)
     
     elif args.command == 'scan':
         output_format = 'json' if args.json else 'text'
-        return cli.scan_directory(args.directory, args.recursive, output_format)
+        return cli.scan_directory(args.directory, args.recursive, output_format, args.jobs)
     
     elif args.command == 'stats':
         output_format = 'json' if args.json else 'text'
@@ -535,6 +901,36 @@ def main():
         output_format = 'json' if args.json else 'text'
         return cli.deep_analyze_file(args.file, args.engines, output_format, args.fix)
     
+    elif args.command == 'profile':
+        output_format = 'json' if args.json else 'text'
+        return cli.profile_file(args.file, args.top, args.timeout, output_format)
+    
+    elif args.command == 'bench':
+        output_format = 'json' if args.json else 'text'
+        return cli.run_benchmark(args.suite, args.runs, output_format)
+    
+    elif args.command == 'history':
+        output_format = 'json' if args.json else 'text'
+        return cli.show_history(args.error_type, args.since, args.until, args.fingerprint, args.text,
+                                args.limit, args.cursor, output_format)
+    
+    elif args.command == 'maintain':
+        output_format = 'json' if args.json else 'text'
+        archive_path = '' if args.no_archive else args.archive
+        return cli.maintain_history(args.retention_days, archive_path, args.dry_run, args.full_vacuum, output_format)
+    
+    elif args.command == 'export':
+        output_format = 'json' if args.json else 'text'
+        return cli.export_history(args.path, args.format, args.gzip, not args.no_embeddings, output_format)
+    
+    elif args.command == 'import':
+        output_format = 'json' if args.json else 'text'
+        return cli.import_history(args.path, not args.no_embeddings, output_format)
+    
+    elif args.command == 'check':
+        output_format = 'json' if args.json else 'text'
+        return cli.run_checks(args.only, output_format)
+    
     return 0
 
 
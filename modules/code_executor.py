@@ -3,27 +3,112 @@
 안전한 환경에서 Python 코드 실행 및 출력/에러 캡처
 """
 
+import ast
 import subprocess
 import tempfile
+import queue
 import os
 import time
 import sys
-from typing import Dict, Optional
+import threading
+from typing import Dict, Iterator, Optional
+
+from .config import Config
+from . import sandbox
+from .worker_pool import WarmWorkerPool
+from .result_cache import ExecutionCache
+from .code_validator import CodeValidator
+from .code_policy import CodePolicy
 
 
 class CodeExecutor:
     """안전한 Python 코드 실행"""
     
     DEFAULT_TIMEOUT = 30  # 초
+    STREAM_CHUNK_SIZE = 4096  # 스트리밍 읽기 단위 (바이트)
+    
+    _worker_pool = None
+    _result_cache = None
+    _pool_lock = threading.Lock()
+    
+    @staticmethod
+    def get_result_cache() -> Optional[ExecutionCache]:
+        """
+        실행 결과 캐시 (최초 호출 시 생성)
+        
+        Returns:
+            ExecutionCache 또는 None (Config.ENABLE_CACHE가 False)
+        """
+        if not Config.ENABLE_CACHE:
+            return None
+        
+        with CodeExecutor._pool_lock:
+            if CodeExecutor._result_cache is None:
+                CodeExecutor._result_cache = ExecutionCache(
+                    db_path=Config.CACHE_DB_PATH,
+                    max_entries=Config.CACHE_MAX_ENTRIES,
+                    ttl=Config.CACHE_TTL
+                )
+        return CodeExecutor._result_cache
+    
+    @staticmethod
+    def get_worker_pool() -> Optional[WarmWorkerPool]:
+        """
+        웜 워커 풀 (최초 호출 시 생성)
+        
+        Returns:
+            WarmWorkerPool 또는 None (비활성화 / 미지원 플랫폼)
+        """
+        if not Config.WORKER_POOL_ENABLED or not WarmWorkerPool.is_supported():
+            return None
+        
+        with CodeExecutor._pool_lock:
+            if CodeExecutor._worker_pool is None:
+                CodeExecutor._worker_pool = WarmWorkerPool(
+                    size=Config.WORKER_POOL_SIZE,
+                    max_runs=Config.WORKER_MAX_RUNS,
+                    max_lifetime=Config.WORKER_MAX_LIFETIME,
+                    recycle_on_timeout=Config.WORKER_RECYCLE_ON_TIMEOUT,
+                    acquire_timeout=Config.WORKER_ACQUIRE_TIMEOUT
+                )
+        return CodeExecutor._worker_pool
+    
+    @staticmethod
+    def execute_warm(code: str, timeout: int = DEFAULT_TIMEOUT, profile_top_n: int = 0) -> Dict[str, any]:
+        """
+        웜 워커 풀에서 실행 (풀을 쓸 수 없으면 execute_python_code로 cold 실행)
+        
+        Args:
+            code: 실행할 Python 코드
+            timeout: 타임아웃 (초)
+            profile_top_n: 0보다 크면 프로파일 모드 (execute_python_code 참고)
+            
+        Returns:
+            execute_python_code와 동일 (+ 'warm': 웜 워커 사용 여부)
+        """
+        pool = CodeExecutor.get_worker_pool()
+        if pool is not None:
+            result = pool.execute(code, timeout, CodeExecutor.get_resource_limits(),
+                                  CodeExecutor.get_output_limits(), profile_top_n)
+            if result is not None:
+                return result
+        
+        return CodeExecutor.execute_python_code(code, timeout, profile_top_n=profile_top_n)
     
     @staticmethod
-    def execute_python_code(code: str, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, any]:
+    def execute_python_code(code: str,
+                            timeout: int = DEFAULT_TIMEOUT,
+                            transport: Optional[str] = None,
+                            profile_top_n: int = 0) -> Dict[str, any]:
         """
         Python 코드를 별도 프로세스에서 실행
         
         Args:
             code: 실행할 Python 코드
             timeout: 타임아웃 (초)
+            transport: 코드 전달 방식 (stream_python_code 참고)
+            profile_top_n: 0보다 크면 프로파일 모드 - 자식에서 cProfile + tracemalloc으로 측정하고
+                           상위 N개 함수 / 메모리 할당 위치를 'profile'로 반환 (POSIX 전용)
             
         Returns:
             {
@@ -32,60 +117,449 @@ class CodeExecutor:
                 'stderr': str (에러 출력),
                 'exit_code': int,
                 'execution_time': float (초),
-                'timed_out': bool
+                'timed_out': bool,
+                'warm': bool (웜 워커 사용 여부, 여기서는 항상 False),
+                'resource_usage': {'peak_rss_kb', 'user_time', 'sys_time', 'wall_time'},
+                'limit_exceeded': str (초과한 rlimit 이름) 또는 None,
+                'truncated_bytes': {'stdout': int, 'stderr': int} (출력 한도로 생략된 바이트 수),
+                'profile': sandbox.SnippetProfiler.report() 결과 또는 None (프로파일 모드에서만)
             }
         """
-        # 임시 파일에 코드 저장
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-            temp_file = f.name
-            f.write(code)
-        
         try:
-            start_time = time.time()
+            result = None
+            for event in CodeExecutor.stream_python_code(code, timeout, unbuffered=False,
+                                                         transport=transport, profile_top_n=profile_top_n):
+                if event['event'] == 'result':
+                    result = event['data']
+            return result
+        except Exception as e:
+            return CodeExecutor.error_result(f'실행 중 오류: {str(e)}')
+    
+    @staticmethod
+    def result_cache_key(code: str, timeout: float) -> Optional[str]:
+        """
+        현재 실행 한도(rlimit / 출력 캡처)를 포함한 결과 캐시 키
+        
+        Returns:
+            ExecutionCache.make_key() 결과 (None이면 캐시하지 않음)
+        """
+        return ExecutionCache.make_key(
+            code, timeout, CodeExecutor.get_resource_limits(), CodeExecutor.get_output_limits()
+        )
+    
+    @staticmethod
+    def get_resource_limits() -> Optional[Dict[str, int]]:
+        """
+        자식 프로세스에 적용할 rlimit (Config 기준)
+        
+        Returns:
+            sandbox.apply_limits()에 넘길 dict 또는 None (비활성화)
+        """
+        if not Config.SANDBOX_LIMITS_ENABLED:
+            return None
+        
+        return {
+            'cpu_time': Config.LIMIT_CPU_TIME,
+            'address_space': Config.LIMIT_MEMORY_MB * 1024 * 1024,
+            'file_size': Config.LIMIT_FILE_SIZE_MB * 1024 * 1024,
+            'processes': Config.LIMIT_PROCESSES
+        }
+    
+    @staticmethod
+    def get_output_limits() -> Dict[str, int]:
+        """
+        출력 캡처 한도 (Config 기준, 스트림별 앞 / 뒷부분 바이트)
+        
+        Returns:
+            sandbox.create_captures()에 넘길 dict
+        """
+        return {
+            'head': Config.OUTPUT_HEAD_BYTES,
+            'tail': Config.OUTPUT_TAIL_BYTES
+        }
+    
+    @staticmethod
+    def _wait_process(process: subprocess.Popen, deadline: float):
+        """
+        자식 프로세스 종료 대기 (가능하면 os.wait4로 리소스 사용량 수집)
+        출력 파이프를 닫고 계속 실행되는 경우를 대비해 deadline이 지나면 강제 종료
+        
+        Returns:
+            (rusage 또는 None, deadline 초과 여부)
+        """
+        if not hasattr(os, 'wait4'):
+            try:
+                process.wait(timeout=max(deadline - time.time(), 0))
+                return None, False
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                return None, True
+        
+        timed_out = False
+        delay = 0.0005
+        while True:
+            try:
+                pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            except ChildProcessError:
+                process.wait()
+                return None, timed_out
             
-            # subprocess로 실행
-            result = subprocess.run(
-                [sys.executable, temp_file],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            if pid:
+                process.returncode = os.waitstatus_to_exitcode(status)
+                return rusage, timed_out
             
-            execution_time = time.time() - start_time
+            if not timed_out and time.time() >= deadline:
+                process.kill()
+                timed_out = True
             
-            return {
-                'success': result.returncode == 0,
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'exit_code': result.returncode,
-                'execution_time': execution_time,
-                'timed_out': False
-            }
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+    
+    @staticmethod
+    def _feed_stdin(stream, code: str):
+        """stdin 파이프로 코드 전달 후 닫기 (파이프 버퍼보다 큰 코드도 막히지 않도록 별도 스레드)"""
+        try:
+            stream.write(code.encode('utf-8'))
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except (BrokenPipeError, OSError):
+                pass
+    
+    @staticmethod
+    def _pump_stream(stream, name: str, capture: sandbox.OutputCapture, lock: threading.Lock, events: queue.Queue):
+        """
+        파이프에서 읽은 청크를 캡처에 바로 기록하고 head에 들어간 텍스트만 이벤트 큐로 전달 (EOF면 None)
+        (소비자가 멈춰 있어도 큐에는 head 한도까지만 쌓이고 나머지는 캡처의 tail로만 보관)
+        """
+        try:
+            while True:
+                chunk = stream.read1(CodeExecutor.STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                with lock:
+                    text = capture.write(chunk)
+                if text:
+                    events.put((name, text))
+        except (OSError, ValueError):
+            pass
+        finally:
+            events.put((name, None))
+    
+    @staticmethod
+    def resolve_transport(transport: Optional[str] = None) -> str:
+        """
+        코드 전달 방식 결정
+        
+        Args:
+            transport: 'tempfile' | 'pipe' | 'memfd' | 'auto' (None이면 Config 값)
             
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'stdout': '',
-                'stderr': f'코드 실행이 {timeout}초를 초과하여 중단되었습니다.',
-                'exit_code': -1,
-                'execution_time': timeout,
-                'timed_out': True
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'stdout': '',
-                'stderr': f'실행 중 오류: {str(e)}',
-                'exit_code': -1,
-                'execution_time': 0,
-                'timed_out': False
+        Returns:
+            실제 사용할 방식 ('auto'는 memfd 지원 시 memfd, 아니면 pipe)
+        """
+        transport = transport or Config.EXECUTION_TRANSPORT
+        if transport == 'auto':
+            return 'memfd' if hasattr(os, 'memfd_create') else 'pipe'
+        if transport == 'memfd' and not hasattr(os, 'memfd_create'):
+            return 'pipe'
+        return transport
+    
+    @staticmethod
+    def prepare_launch(code: str,
+                       transport: Optional[str] = None,
+                       unbuffered: bool = True,
+                       profile_fd: Optional[int] = None,
+                       profile_top_n: int = 0) -> Dict[str, any]:
+        """
+        코드 전달 방식에 맞게 자식 프로세스 실행 준비
+        (stream_python_code와 AsyncCodeExecutor가 공유)
+        
+        Args:
+            code: 실행할 Python 코드
+            transport: 코드 전달 방식 (resolve_transport 참고)
+            unbuffered: 자식 출력 버퍼링 해제 (-u)
+            profile_fd: 프로파일 모드 - 자식이 요약을 쓸 파이프 fd (sandbox.run_snippet 참고)
+            profile_top_n: 프로파일 요약 항목 수
+            
+        Returns:
+            {
+                'command': list (실행 명령),
+                'stdin_code': bool (stdin 파이프로 코드를 넘겨야 하는지),
+                'pass_fds': tuple (자식에 넘길 fd),
+                'temp_file': str 또는 None,
+                'code_fd': int 또는 None
             }
-        finally:
-            # 임시 파일 삭제
+            사용 후 release_launch()로 정리
+        """
+        transport = CodeExecutor.resolve_transport(transport)
+        interpreter = [sys.executable, '-u'] if unbuffered else [sys.executable]
+        
+        # 프로파일 모드는 sandbox 런타임이 필요하므로 임시 파일 대신 파이프로 전달
+        if profile_fd is not None and transport == 'tempfile':
+            transport = 'pipe'
+        
+        launch = {'stdin_code': False, 'pass_fds': (), 'temp_file': None, 'code_fd': None}
+        
+        if transport == 'tempfile':
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
+                launch['temp_file'] = f.name
+                f.write(code)
+            launch['command'] = interpreter + [sandbox.__file__, '--run-file', launch['temp_file']]
+        elif transport == 'memfd':
+            # traceback 파일 이름은 sandbox.SNIPPET_FILENAME으로 유지
+            code_fd = os.memfd_create('snippet', os.MFD_CLOEXEC)
+            os.write(code_fd, code.encode('utf-8'))
+            os.lseek(code_fd, 0, os.SEEK_SET)
+            launch['code_fd'] = code_fd
+            launch['pass_fds'] = (code_fd,)
+            launch['command'] = interpreter + [sandbox.__file__, '--run', sandbox.SNIPPET_FILENAME, str(code_fd)]
+        else:
+            launch['stdin_code'] = True
+            launch['command'] = interpreter + [sandbox.__file__, '--run', sandbox.SNIPPET_FILENAME]
+        
+        if profile_fd is not None:
+            launch['command'] += ['--profile', str(profile_fd), str(profile_top_n)]
+            launch['pass_fds'] += (profile_fd,)
+        
+        # rlimit은 sandbox 런타임이 코드를 읽기 전에 직접 적용 (preexec_fn은 멀티스레드 부모에서 교착 위험)
+        limits = CodeExecutor.get_resource_limits()
+        if limits and os.name == 'posix':
+            launch['command'] += ['--limits', sandbox.format_limits(limits)]
+        
+        return launch
+    
+    @staticmethod
+    def _close_code_fd(launch: Dict[str, any]):
+        """자식에 넘긴 memfd는 부모 쪽에서 바로 닫기"""
+        if launch['code_fd'] is not None:
+            os.close(launch['code_fd'])
+            launch['code_fd'] = None
+    
+    @staticmethod
+    def release_launch(launch: Dict[str, any]):
+        """prepare_launch()에서 만든 임시 파일 / fd 정리"""
+        CodeExecutor._close_code_fd(launch)
+        if launch['temp_file'] is not None:
             try:
-                os.unlink(temp_file)
+                os.unlink(launch['temp_file'])
             except:
                 pass
+            launch['temp_file'] = None
+    
+    @staticmethod
+    def child_environment() -> Dict[str, str]:
+        """자식 프로세스 환경 변수"""
+        return dict(os.environ, PYTHONIOENCODING='utf-8')
+    
+    @staticmethod
+    def error_result(message: str) -> Dict[str, any]:
+        """실행 자체가 실패했을 때의 결과 (finish_result와 같은 키)"""
+        return {
+            'success': False,
+            'stdout': '',
+            'stderr': message,
+            'exit_code': -1,
+            'execution_time': 0,
+            'timed_out': False,
+            'warm': False,
+            'resource_usage': sandbox.usage_from_rusage(None, 0),
+            'limit_exceeded': None,
+            'truncated_bytes': {'stdout': 0, 'stderr': 0}
+        }
+    
+    @staticmethod
+    def finish_result(stdout: str,
+                      stderr: str,
+                      returncode: Optional[int],
+                      timed_out: bool,
+                      timeout: float,
+                      execution_time: float,
+                      rusage=None,
+                      truncated: Optional[Dict[str, int]] = None):
+        """
+        수집한 출력과 종료 상태로 실행 결과 구성
+        (타임아웃 / rlimit 초과 시 안내 메시지를 stderr 끝에 추가)
+        
+        Args:
+            truncated: 스트림별 생략된 바이트 수 ({'stdout': int, 'stderr': int})
+        
+        Returns:
+            (결과 dict, 추가된 안내 메시지 또는 '')
+        """
+        limit_exceeded = None
+        if timed_out:
+            message = f'코드 실행이 {timeout}초를 초과하여 중단되었습니다.'
+        else:
+            limit_exceeded = sandbox.describe_limit_exit(returncode, stderr)
+            message = sandbox.LIMIT_MESSAGES[limit_exceeded] if limit_exceeded and returncode < 0 else ''
+        
+        if message:
+            if stderr and not stderr.endswith('\n'):
+                stderr += '\n'
+            stderr += message
+        
+        return {
+            'success': not timed_out and returncode == 0,
+            'stdout': stdout,
+            'stderr': stderr,
+            'exit_code': -1 if timed_out else returncode,
+            'execution_time': timeout if timed_out else execution_time,
+            'timed_out': timed_out,
+            'warm': False,
+            'resource_usage': sandbox.usage_from_rusage(rusage, execution_time),
+            'limit_exceeded': limit_exceeded,
+            'truncated_bytes': truncated or {'stdout': 0, 'stderr': 0}
+        }, message
+    
+    @staticmethod
+    def stream_python_code(code: str,
+                           timeout: int = DEFAULT_TIMEOUT,
+                           unbuffered: bool = True,
+                           transport: Optional[str] = None,
+                           profile_top_n: int = 0) -> Iterator[Dict[str, any]]:
+        """
+        Python 코드를 실행하면서 출력을 청크 단위로 전달
+        (타임아웃 시에도 그때까지의 출력은 유지)
+        
+        Args:
+            code: 실행할 Python 코드
+            timeout: 타임아웃 (초)
+            unbuffered: 자식 출력 버퍼링 해제 (-u, 실시간 전달용)
+            transport: 코드 전달 방식 (resolve_transport 참고)
+                - tempfile: 임시 파일에 저장 후 실행
+                - pipe: stdin 파이프로 전달 (디스크 쓰기 없음)
+                - memfd: 메모리 fd로 전달 (Linux, 디스크 쓰기 없음)
+            profile_top_n: 0보다 크면 프로파일 모드 (execute_python_code 참고)
+            
+        Yields:
+            {'event': 'stdout' | 'stderr', 'data': str (출력 청크)}
+            (Config.OUTPUT_HEAD_BYTES를 넘는 출력은 실시간으로 보내지 않고 종료 후 생략 표시 + 끝부분만 전달)
+            마지막으로 {'event': 'result', 'data': execute_python_code와 같은 형식의 결과}
+        """
+        if profile_top_n and os.name != 'posix':
+            yield {'event': 'result', 'data': CodeExecutor.error_result('프로파일 모드는 Windows에서 지원되지 않습니다.')}
+            return
+        
+        profile_r, profile_w = os.pipe() if profile_top_n else (None, None)
+        launch = CodeExecutor.prepare_launch(code, transport, unbuffered, profile_w, profile_top_n)
+        
+        process = None
+        try:
+            start_time = time.time()
+            
+            try:
+                process = subprocess.Popen(
+                    launch['command'],
+                    stdin=subprocess.PIPE if launch['stdin_code'] else subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env=CodeExecutor.child_environment(),
+                    pass_fds=launch['pass_fds']
+                )
+            except Exception as e:
+                yield {'event': 'result', 'data': CodeExecutor.error_result(f'실행 중 오류: {str(e)}')}
+                return
+            
+            CodeExecutor._close_code_fd(launch)
+            if profile_w is not None:
+                os.close(profile_w)
+                profile_w = None
+            
+            # 스트림별 앞 / 뒷부분만 보관 (head 구간만 실시간 전달)
+            captures = sandbox.create_captures(CodeExecutor.get_output_limits())
+            capture_lock = threading.Lock()
+            
+            # Windows 파이프는 select를 쓸 수 없으므로 스트림마다 읽기 스레드 사용
+            # (읽기 스레드가 캡처에 직접 기록하므로 큐에는 실시간 전달할 head 텍스트만 들어감)
+            events = queue.Queue()
+            if launch['stdin_code']:
+                threading.Thread(target=CodeExecutor._feed_stdin,
+                                 args=(process.stdin, code), daemon=True).start()
+            readers = [
+                threading.Thread(target=CodeExecutor._pump_stream,
+                                 args=(process.stdout, 'stdout', captures['stdout'], capture_lock, events), daemon=True),
+                threading.Thread(target=CodeExecutor._pump_stream,
+                                 args=(process.stderr, 'stderr', captures['stderr'], capture_lock, events), daemon=True)
+            ]
+            for reader in readers:
+                reader.start()
+            
+            open_streams = len(readers)
+            deadline = start_time + timeout
+            timed_out = False
+            
+            while open_streams:
+                remaining = deadline - time.time()
+                try:
+                    if remaining <= 0:
+                        raise queue.Empty
+                    name, text = events.get(timeout=remaining)
+                except queue.Empty:
+                    timed_out = True
+                    break
+                
+                if text is None:
+                    open_streams -= 1
+                    continue
+                
+                yield {'event': name, 'data': text}
+            
+            if timed_out:
+                process.kill()
+            rusage, reap_timed_out = CodeExecutor._wait_process(process, deadline)
+            timed_out = timed_out or reap_timed_out
+            execution_time = time.time() - start_time
+            
+            # 종료 직전에 나온 출력까지 수집
+            for reader in readers:
+                reader.join(timeout=1)
+            while True:
+                try:
+                    name, text = events.get_nowait()
+                except queue.Empty:
+                    break
+                if text:
+                    yield {'event': name, 'data': text}
+            
+            # 실시간으로 전달하지 않은 나머지 (생략 표시 + tail)
+            # (손자 프로세스가 파이프를 잡고 있으면 읽기 스레드가 남아 있을 수 있으므로 잠금 안에서 마무리)
+            with capture_lock:
+                finished = {name: capture.finish() for name, capture in captures.items()}
+                stdout = captures['stdout'].getvalue()
+                stderr = captures['stderr'].getvalue()
+                truncated = {name: capture.truncated_bytes for name, capture in captures.items()}
+            for name, text in finished.items():
+                if text:
+                    yield {'event': name, 'data': text}
+            
+            result, message = CodeExecutor.finish_result(
+                stdout,
+                stderr,
+                process.returncode,
+                timed_out,
+                timeout,
+                execution_time,
+                rusage,
+                truncated
+            )
+            if profile_r is not None:
+                result['profile'] = sandbox.read_profile_report(profile_r)
+                profile_r = None
+            if message:
+                yield {'event': 'stderr', 'data': message}
+            yield {'event': 'result', 'data': result}
+        finally:
+            # 클라이언트 연결이 끊겨 제너레이터가 닫힌 경우에도 정리
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()
+            for fd in (profile_r, profile_w):
+                if fd is not None:
+                    os.close(fd)
+            CodeExecutor.release_launch(launch)
     
     @staticmethod
     def execute_python_file(file_path: str, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, any]:
@@ -104,56 +578,134 @@ class CodeExecutor:
                 code = f.read()
             return CodeExecutor.execute_python_code(code, timeout)
         except Exception as e:
-            return {
-                'success': False,
-                'stdout': '',
-                'stderr': f'파일 읽기 실패: {str(e)}',
-                'exit_code': -1,
-                'execution_time': 0,
-                'timed_out': False
-            }
+            return CodeExecutor.error_result(f'파일 읽기 실패: {str(e)}')
+    
+    @staticmethod
+    def check_dangerous_code(code: str, tree: Optional[ast.AST] = None) -> Optional[Dict[str, any]]:
+        """
+        위험한 코드 사전 차단 (CodePolicy로 AST 검사)
+        
+        Args:
+            code: Python 코드
+            tree: 이미 파싱한 AST (None이면 검증 단계의 ParsedModule을 재사용하고 검사 결과도 보관)
+            
+        Returns:
+            차단된 경우 실행 결과 형식의 dict ('blocked': True, 'violations': 위반 리스트), 아니면 None
+        """
+        policy = CodePolicy.default()
+        if tree is not None:
+            violations = policy.check(tree)
+        else:
+            parsed = CodeValidator.parse_module(code)
+            if not parsed.valid:
+                # 파싱되지 않는 코드는 실행해도 SyntaxError로 끝나므로 차단하지 않음
+                return None
+            violations = [dict(v) for v in parsed.cached(('policy', id(policy)), lambda p: policy.check(p.tree))]
+        
+        if not violations:
+            return None
+        
+        rules = {'call': '호출', 'import': 'import', 'attribute': '속성 접근'}
+        lines = [f"  line {v['line']}: {v['name']} {rules[v['rule']]}" for v in violations]
+        return {
+            **CodeExecutor.error_result(
+                '⚠️ 보안: 허용되지 않는 코드가 감지되었습니다.\n' + '\n'.join(lines) + '\n실행이 차단되었습니다.'
+            ),
+            'blocked': True,
+            'violations': violations
+        }
     
     @staticmethod
     def safe_execute(code: str, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, any]:
         """
         안전 장치를 추가한 실행
-        (위험한 코드 패턴 사전 차단)
+        (CodePolicy로 위험한 코드 사전 차단)
         
         Args:
             code: Python 코드
             timeout: 타임아웃
             
         Returns:
-            실행 결과
-        """
-        # 위험한 패턴 체크
-        dangerous_patterns = [
-            'os.system',
-            'subprocess.call',
-            'subprocess.Popen',
-            'eval(',
-            'exec(',
-            '__import__',
-            'open(',  # 파일 시스템 접근
-            'rmdir',
-            'unlink',
-            'remove'
-        ]
-        
-        for pattern in dangerous_patterns:
-            if pattern in code:
-                return {
-                    'success': False,
-                    'stdout': '',
-                    'stderr': f'⚠️ 보안: 위험한 코드 패턴이 감지되었습니다: {pattern}\n실행이 차단되었습니다.',
-                    'exit_code': -1,
-                    'execution_time': 0,
-                    'timed_out': False,
-                    'blocked': True
-                }
-        
-        return CodeExecutor.execute_python_code(code, timeout)
+            실행 결과 (+ 'cache_hit': 캐시에서 반환했는지 여부)
+        """
+        blocked = CodeExecutor.check_dangerous_code(code)
+        if blocked is not None:
+            return blocked
+        
+        # 캐시 조회 (같은 코드 + 같은 실행 환경이면 재실행하지 않음)
+        cache = CodeExecutor.get_result_cache()
+        cache_key = CodeExecutor.result_cache_key(code, timeout) if cache is not None else None
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        result = CodeExecutor.execute_warm(code, timeout)
+        
+        if cache_key is not None:
+            cache.put(cache_key, result)
+        result['cache_hit'] = False
+        
+        return result
 
+    
+    @staticmethod
+    def safe_stream(code: str, timeout: int = DEFAULT_TIMEOUT) -> Iterator[Dict[str, any]]:
+        """
+        safe_execute의 스트리밍 버전 (SSE 실행 API용)
+        차단 / 캐시 적중은 'result' 이벤트 하나로 끝나고, 나머지는 cold 실행 출력을 청크로 전달
+        (웜 워커는 끝난 뒤에야 결과를 돌려주므로 실시간 출력이 필요한 이 경로에서는 쓰지 않음)
+        
+        Args:
+            code: Python 코드
+            timeout: 타임아웃
+            
+        Yields:
+            stream_python_code와 같은 형식 (결과에 'cache_hit' 포함)
+        """
+        blocked = CodeExecutor.check_dangerous_code(code)
+        if blocked is not None:
+            yield {'event': 'result', 'data': blocked}
+            return
+        
+        cache = CodeExecutor.get_result_cache()
+        cache_key = CodeExecutor.result_cache_key(code, timeout) if cache is not None else None
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                yield {'event': 'result', 'data': cached}
+                return
+        
+        result = None
+        for event in CodeExecutor.stream_python_code(code, timeout):
+            if event['event'] != 'result':
+                yield event
+            else:
+                result = event['data']
+        
+        if cache_key is not None:
+            cache.put(cache_key, result)
+        result['cache_hit'] = False
+        yield {'event': 'result', 'data': result}
+    
+    @staticmethod
+    def profile_code(code: str, timeout: int = DEFAULT_TIMEOUT, top_n: Optional[int] = None) -> Dict[str, any]:
+        """
+        프로파일 모드 실행 ("왜 느린가" 분석용, 결과 캐시는 사용하지 않음)
+        
+        Args:
+            code: Python 코드
+            timeout: 타임아웃
+            top_n: 요약 항목 수 (None이면 Config.PROFILE_TOP_N)
+            
+        Returns:
+            실행 결과 + 'profile' (타임아웃 등으로 측정하지 못하면 None)
+        """
+        blocked = CodeExecutor.check_dangerous_code(code)
+        if blocked is not None:
+            return blocked
+        
+        return CodeExecutor.execute_warm(code, timeout, profile_top_n=top_n or Config.PROFILE_TOP_N)
 
 # 테스트용
 if __name__ == '__main__':
@@ -0,0 +1,204 @@
+"""
+코드 정책 모듈 - 실행 전 위험 코드 차단
+CodeValidator가 파싱한 AST를 한 번 순회하며 금지된 호출 / import / 속성 접근을 찾아
+줄 번호와 함께 보고 (import 별칭은 풀어서 비교)
+"""
+
+import ast
+import json
+import fnmatch
+import threading
+from typing import Dict, List, Optional
+
+
+class CodePolicy:
+    """AST 기반 실행 정책"""
+
+    # 기본 규칙 (fnmatch 패턴, 호출 이름은 import 별칭을 풀어낸 전체 이름)
+    DEFAULT_RULES = {
+        'denied_calls': [
+            'eval', 'exec', '__import__', 'open',
+            'builtins.*', 'io.open', 'importlib.import_module',
+            'os.system', 'os.popen', 'os.open', 'os.exec*', 'os.spawn*', 'os.fork', 'os.kill',
+            'os.remove', 'os.unlink', 'os.rmdir', 'os.removedirs',
+            'shutil.rmtree', 'subprocess.*',
+            '*.unlink', '*.rmdir', '*.open', '*.write_text', '*.write_bytes'  # pathlib.Path 등 객체 메서드
+        ],
+        'denied_imports': ['subprocess', 'ctypes', 'pty'],
+        'denied_attributes': [
+            '__subclasses__', '__globals__', '__builtins__', '__code__',
+            'f_globals', 'f_builtins'
+        ]
+    }
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            rules: DEFAULT_RULES와 같은 형식 (없는 키는 기본값 사용)
+        """
+        rules = dict(CodePolicy.DEFAULT_RULES, **(rules or {}))
+
+        # 와일드카드 없는 이름은 set 조회, 나머지만 fnmatch
+        self._calls = self._compile(rules['denied_calls'])
+        self._imports = self._compile(rules['denied_imports'])
+        self._attributes = set(rules['denied_attributes'])
+
+    @staticmethod
+    def _compile(patterns: List[str]):
+        exact = {p for p in patterns if not any(c in p for c in '*?[')}
+        globs = [p for p in patterns if p not in exact]
+        return exact, globs
+
+    @staticmethod
+    def _matches(name: str, compiled) -> bool:
+        exact, globs = compiled
+        return name in exact or any(fnmatch.fnmatchcase(name, p) for p in globs)
+
+    @staticmethod
+    def load(path: str) -> 'CodePolicy':
+        """JSON 규칙 파일에서 정책 생성"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return CodePolicy(json.load(f))
+
+    @staticmethod
+    def default() -> 'CodePolicy':
+        """Config 기준 공용 정책 (CODE_POLICY_FILE이 있으면 해당 규칙, 최초 호출 시 생성)"""
+        from .config import Config
+
+        with CodePolicy._default_lock:
+            if CodePolicy._default is None:
+                if Config.CODE_POLICY_FILE:
+                    CodePolicy._default = CodePolicy.load(Config.CODE_POLICY_FILE)
+                else:
+                    CodePolicy._default = CodePolicy()
+        return CodePolicy._default
+
+    def is_denied_call(self, name: str) -> bool:
+        return self._matches(name, self._calls)
+
+    def is_denied_import(self, module: str) -> bool:
+        """모듈 또는 상위 패키지가 금지되었는지 (subprocess → subprocess.x 도 금지)"""
+        parts = module.split('.')
+        return any(self._matches('.'.join(parts[:i]), self._imports) for i in range(1, len(parts) + 1))
+
+    def is_denied_attribute(self, attr: str) -> bool:
+        return attr in self._attributes
+
+    def check(self, tree: ast.AST) -> List[Dict[str, any]]:
+        """
+        AST 검사 (한 번 순회)
+
+        Args:
+            tree: CodeValidator.parse() / ParsedModule.tree
+
+        Returns:
+            위반 리스트 (줄 번호 순)
+            [{'rule': 'call' | 'import' | 'attribute', 'name': str, 'line': int, 'col': int}]
+        """
+        visitor = _PolicyVisitor(self)
+        visitor.visit(tree)
+        return sorted(visitor.violations, key=lambda v: (v['line'], v['col']))
+
+
+class _PolicyVisitor(ast.NodeVisitor):
+    """정책 위반 수집 (소스 순서대로 방문하므로 import 별칭이 사용보다 먼저 기록됨)"""
+
+    def __init__(self, policy: CodePolicy):
+        self.policy = policy
+        self.aliases = {}
+        self.violations = []
+
+    def _report(self, node: ast.AST, rule: str, name: str):
+        self.violations.append({
+            'rule': rule,
+            'name': name,
+            'line': node.lineno,
+            'col': node.col_offset + 1
+        })
+
+    def _resolve(self, node: ast.AST) -> Optional[str]:
+        """Name / Attribute 체인을 별칭을 풀어낸 전체 이름으로 (알 수 없는 객체는 '?')"""
+        if isinstance(node, ast.Name):
+            return self.aliases.get(node.id, node.id)
+        if isinstance(node, ast.Attribute):
+            return f"{self._resolve(node.value) or '?'}.{node.attr}"
+        return None
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if self.policy.is_denied_import(alias.name):
+                self._report(node, 'import', alias.name)
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.level:  # 상대 import는 스니펫에서 의미 없음
+            return
+        module = node.module or ''
+        if self.policy.is_denied_import(module):
+            self._report(node, 'import', module)
+        for alias in node.names:
+            if alias.name != '*':
+                self.aliases[alias.asname or alias.name] = f'{module}.{alias.name}'
+
+    def visit_Name(self, node: ast.Name):
+        # __builtins__ 처럼 이름으로 바로 닿는 금지 속성 (__builtins__.__dict__['eval'] 우회 방지)
+        if self.policy.is_denied_attribute(node.id):
+            self._report(node, 'attribute', node.id)
+        # 호출하지 않고 참조만 해도 차단 (f = eval; f(...) 우회 방지)
+        elif isinstance(node.ctx, ast.Load):
+            name = self._resolve(node)
+            if self.policy.is_denied_call(name):
+                self._report(node, 'call', name)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        if self.policy.is_denied_attribute(node.attr):
+            self._report(node, 'attribute', node.attr)
+        elif isinstance(node.ctx, ast.Load):
+            name = self._resolve(node)
+            if self.policy.is_denied_call(name):
+                self._report(node, 'call', name)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        # getattr(obj, 'name') 형태의 문자열 속성 접근
+        if (self._resolve(node.func) == 'getattr' and len(node.args) >= 2
+                and isinstance(node.args[1], ast.Constant) and isinstance(node.args[1].value, str)):
+            attr = node.args[1].value
+            if self.policy.is_denied_attribute(attr):
+                self._report(node, 'attribute', attr)
+            else:
+                name = f"{self._resolve(node.args[0]) or '?'}.{attr}"
+                if self.policy.is_denied_call(name):
+                    self._report(node, 'call', name)
+        self.generic_visit(node)
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🛡️  코드 정책 테스트")
+    print("=" * 60)
+
+    policy = CodePolicy()
+    samples = {
+        'list.remove (허용)': "items = [1, 2]\nitems.remove(1)\nprint(items)",
+        '별칭 우회': "import os as o\no.system('ls')",
+        'from import': "from os import system as run\nrun('ls')",
+        'getattr 우회': "import os\ngetattr(os, 'system')('ls')",
+        '참조만': "f = eval\nf('1+1')",
+        'dunder 탈출': "().__class__.__bases__[0].__subclasses__()",
+        '금지 import': "import subprocess\nsubprocess.run(['ls'])",
+        'Path 쓰기': "from pathlib import Path\nPath('x').open('w').write('1')\nPath('y').write_text('1')",
+        '__builtins__ 이름': "__builtins__.__dict__['ev' + 'al']('1')"
+    }
+    for title, code in samples.items():
+        violations = policy.check(ast.parse(code))
+        print(f"\n{title}:")
+        for v in violations:
+            print(f"   line {v['line']}:{v['col']} [{v['rule']}] {v['name']}")
+        if not violations:
+            print("   ✅ 통과")
@@ -4,13 +4,51 @@ Python 코드의 syntax, import, 일반적인 오류 사전 탐지
 """
 
 import ast
+import copy
 import sys
 from typing import Dict, List, Optional
 
+from .parsed_module import ParsedModule
+from .module_index import ModuleIndex
+from .static_checker import StaticChecker
+
 
 class CodeValidator:
     """Python 코드 정적 분석 및 검증"""
     
+    @staticmethod
+    def parse_module(code: str) -> ParsedModule:
+        """
+        코드를 한 번만 파싱한 ParsedModule 반환 (내용 해시 기준 캐시)
+        검증 단계와 CodePolicy가 같은 객체를 공유하므로 트리를 수정하지 말 것
+        
+        Args:
+            code: Python 코드
+            
+        Returns:
+            ParsedModule (파싱 실패 시 .error에 예외 보관)
+        """
+        return ParsedModule.get(code)
+    
+    @staticmethod
+    def parse(code: str) -> ast.Module:
+        """
+        코드를 AST로 파싱 (parse_module의 트리)
+        
+        Args:
+            code: Python 코드
+            
+        Returns:
+            ast.Module
+            
+        Raises:
+            SyntaxError 등 ast.parse와 동일
+        """
+        parsed = ParsedModule.get(code)
+        if parsed.error is not None:
+            raise parsed.error.with_traceback(None)
+        return parsed.tree
+    
     @staticmethod
     def validate_syntax(code: str) -> Dict[str, any]:
         """
@@ -27,13 +65,17 @@ class CodeValidator:
                 'error_type': str
             }
         """
-        try:
-            ast.parse(code)
+        return CodeValidator._syntax_result(ParsedModule.get(code))
+    
+    @staticmethod
+    def _syntax_result(parsed: ParsedModule) -> Dict[str, any]:
+        e = parsed.error
+        if e is None:
             return {
                 'valid': True,
                 'message': 'Syntax가 올바릅니다'
             }
-        except SyntaxError as e:
+        if isinstance(e, SyntaxError):
             return {
                 'valid': False,
                 'error': str(e.msg),
@@ -42,12 +84,11 @@ class CodeValidator:
                 'error_type': 'SyntaxError',
                 'text': e.text
             }
-        except Exception as e:
-            return {
-                'valid': False,
-                'error': str(e),
-                'error_type': type(e).__name__
-            }
+        return {
+            'valid': False,
+            'error': str(e),
+            'error_type': type(e).__name__
+        }
     
     @staticmethod
     def extract_imports(code: str) -> Dict[str, any]:
@@ -64,12 +105,36 @@ class CodeValidator:
                 'from_imports': {module: [names]}
             }
         """
-        try:
-            tree = ast.parse(code)
-            imports = []
-            from_imports = {}
-            
-            for node in ast.walk(tree):
+        return CodeValidator._imports_result(ParsedModule.get(code))
+    
+    @staticmethod
+    def _imports_result(parsed: ParsedModule) -> Dict[str, any]:
+        if parsed.error is not None:
+            return {
+                'success': False,
+                'error': str(parsed.error)
+            }
+        
+        imports, from_imports = CodeValidator.collect_imports(parsed.tree.body)
+        return {
+            'success': True,
+            'imports': imports,
+            'from_imports': from_imports
+        }
+    
+    @staticmethod
+    def collect_imports(nodes: List[ast.AST]):
+        """
+        AST 노드들(하위 노드 포함)의 import 수집
+        
+        Returns:
+            (import 모듈 리스트, {from 모듈: [names]})
+        """
+        imports = []
+        from_imports = {}
+        
+        for root in nodes:
+            for node in ast.walk(root):
                 if isinstance(node, ast.Import):
                     for alias in node.names:
                         imports.append(alias.name)
@@ -77,17 +142,8 @@ class CodeValidator:
                     module = node.module or ''
                     names = [alias.name for alias in node.names]
                     from_imports[module] = names
-            
-            return {
-                'success': True,
-                'imports': imports,
-                'from_imports': from_imports
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        
+        return imports, from_imports
     
     @staticmethod
     def check_imports_available(imports: List[str]) -> Dict[str, any]:
@@ -107,14 +163,12 @@ class CodeValidator:
         missing = []
         available = []
         
+        # 서버 프로세스에서 import 하지 않도록 설치 모듈 인덱스로 확인 (서브모듈은 최상위 기준)
+        index = ModuleIndex.shared()
         for module_name in imports:
-            # 서브모듈 처리 (예: os.path -> os)
-            base_module = module_name.split('.')[0]
-            
-            try:
-                __import__(base_module)
+            if index.is_available(module_name):
                 available.append(module_name)
-            except ImportError:
+            else:
                 missing.append(module_name)
         
         return {
@@ -134,50 +188,72 @@ class CodeValidator:
         Returns:
             이슈 리스트
         """
-        issues = []
+        return CodeValidator._common_issues(ParsedModule.get(code))
+    
+    @staticmethod
+    def _common_issues(parsed: ParsedModule) -> List[Dict[str, any]]:
+        if parsed.error is not None:
+            return []
+        return CodeValidator.detect_source_issues(parsed.source)
+    
+    @staticmethod
+    def detect_source_issues(code: str) -> List[Dict[str, any]]:
+        """
+        소스 텍스트만으로 확인하는 이슈 (파싱 없음, 문법이 올바른 코드에 사용)
         
-        try:
-            tree = ast.parse(code)
-            
-            # 1. 사용하지 않는 변수 탐지
-            # 2. 정의되지 않은 변수 사용 탐지
-            # 3. 들여쓰기 문제 (이미 syntax에서 잡힘)
-            
-            # 간단한 체크: print 함수 없이 한글 사용
-            if '한글' in code and 'print' not in code:
-                issues.append({
-                    'type': 'suggestion',
-                    'message': '한글이 포함되어 있지만 출력문이 없습니다. print()를 사용하세요.',
-                    'severity': 'low'
-                })
-            
-            # TODO: 더 정교한 분석 추가
+        Args:
+            code: Python 코드
             
-        except:
-            pass
+        Returns:
+            이슈 리스트
+        """
+        issues = []
+        
+        # 1. 사용하지 않는 변수 탐지
+        # 2. 정의되지 않은 변수 사용 탐지
+        # 3. 들여쓰기 문제 (이미 syntax에서 잡힘)
+        
+        # 간단한 체크: print 함수 없이 한글 사용
+        if '한글' in code and 'print' not in code:
+            issues.append({
+                'type': 'suggestion',
+                'message': '한글이 포함되어 있지만 출력문이 없습니다. print()를 사용하세요.',
+                'severity': 'low'
+            })
+        
+        # TODO: 더 정교한 분석 추가
         
         return issues
     
     @staticmethod
     def full_validation(code: str) -> Dict[str, any]:
         """
-        전체 검증 (syntax + imports + 일반 이슈)
+        전체 검증 (syntax + imports + 일반 이슈 + 정적 검사)
+        코드는 한 번만 파싱하고, 같은 내용의 코드는 이전 검증 결과를 재사용
         
         Args:
             code: Python 코드
             
         Returns:
-            종합 검증 결과
+            종합 검증 결과 (호출자별 복사본)
         """
+        parsed = ParsedModule.get(code)
+        # import 가능 여부는 설치 환경에 따라 바뀌므로 모듈 인덱스 세대별로 보관
+        key = ('validation', ModuleIndex.shared().current_generation())
+        return copy.deepcopy(parsed.cached(key, CodeValidator._full_validation))
+    
+    @staticmethod
+    def _full_validation(parsed: ParsedModule) -> Dict[str, any]:
         result = {
             'overall_valid': True,
             'syntax': None,
             'imports': None,
-            'issues': []
+            'issues': [],
+            'static': None
         }
         
         # 1. Syntax 검증
-        syntax_result = CodeValidator.validate_syntax(code)
+        syntax_result = CodeValidator._syntax_result(parsed)
         result['syntax'] = syntax_result
         
         if not syntax_result['valid']:
@@ -185,7 +261,7 @@ class CodeValidator:
             return result
         
         # 2. Import 검증
-        import_result = CodeValidator.extract_imports(code)
+        import_result = CodeValidator._imports_result(parsed)
         if import_result['success']:
             all_imports = import_result['imports'] + list(import_result['from_imports'].keys())
             availability = CodeValidator.check_imports_available(all_imports)
@@ -198,6 +274,12 @@ class CodeValidator:
                 result['overall_valid'] = False
         
         # 3. 일반 이슈 탐지
-        result['issues'] = CodeValidator.detect_common_issues(code)
+        result['issues'] = CodeValidator._common_issues(parsed)
+        
+        # 4. 정적 검사 (pyflakes, 실행 없이 확정되는 NameError / ModuleNotFoundError 등)
+        static_result = StaticChecker.check(parsed, ModuleIndex.shared().is_available)
+        result['static'] = static_result
+        if static_result['deterministic_error']:
+            result['overall_valid'] = False
         
         return result
@@ -38,20 +38,75 @@ class Config:
     
     # ========== 데이터베이스 설정 ==========
     SQLITE_DB_PATH = './data/error_history.db'
+    SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', '8'))  # 보관할 유휴 연결 수
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))  # 잠금 대기 (밀리초)
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')  # 읽기와 쓰기가 서로 막지 않음
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')  # WAL에서는 NORMAL도 손상 없음
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '8192'))  # 연결별 페이지 캐시
+    SQLITE_MMAP_SIZE_MB = int(os.getenv('SQLITE_MMAP_SIZE_MB', '64'))  # 0이면 메모리 매핑 사용 안 함
+    DB_WRITE_MODE = os.getenv('DB_WRITE_MODE', 'async')  # 'async': 쓰기 큐 + 배치 커밋 / 'sync': 요청 안에서 커밋
+    DB_WRITE_QUEUE_SIZE = int(os.getenv('DB_WRITE_QUEUE_SIZE', '1024'))  # 가득 차면 save_error 대기 (백프레셔)
+    DB_WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', '256'))  # 트랜잭션 하나에 묶을 최대 에러 수
+    HISTORY_RETENTION_DAYS = int(os.getenv('HISTORY_RETENTION_DAYS', '180'))  # 마지막 발생 후 이 기간이 지난 에러는 아카이브 (0이면 무기한 보관)
+    HISTORY_ARCHIVE_PATH = os.getenv('HISTORY_ARCHIVE_PATH', './data/error_history_archive.db')  # 비우면 일별 집계만 남기고 삭제
+    HOURLY_STATS_RETENTION_DAYS = int(os.getenv('HOURLY_STATS_RETENTION_DAYS', '30'))  # 시간별 통계 보관 기간 (0이면 무기한)
+    MAINTENANCE_INTERVAL_HOURS = float(os.getenv('MAINTENANCE_INTERVAL_HOURS', '0'))  # 웹 서버 백그라운드 정리 주기 (0이면 끔)
+    MAINTENANCE_BATCH_SIZE = int(os.getenv('MAINTENANCE_BATCH_SIZE', '200'))  # 정리 트랜잭션 하나에서 옮기거나 지울 행 수
+    MAINTENANCE_PAUSE_MS = int(os.getenv('MAINTENANCE_PAUSE_MS', '20'))  # 배치 사이 대기 (쓰기 큐 커밋에 양보)
+    VACUUM_STEP_PAGES = int(os.getenv('VACUUM_STEP_PAGES', '256'))  # 증분 VACUUM 한 번에 반환할 페이지 수
+    TRANSFER_BATCH_SIZE = int(os.getenv('TRANSFER_BATCH_SIZE', '5000'))  # 내보내기 / 가져오기에서 한 번에 읽고 커밋할 행 수
+    TRANSFER_CHUNK_ROWS = int(os.getenv('TRANSFER_CHUNK_ROWS', '100000'))  # 번들 조각 파일 하나의 최대 행 수
     
     # ========== 캐싱 설정 ==========
     ENABLE_CACHE = os.getenv('ENABLE_CACHE', 'true').lower() == 'true'
     CACHE_TTL = int(os.getenv('CACHE_TTL', '3600'))  # 1시간
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '256'))  # 메모리 LRU 크기
+    CACHE_DB_PATH = './data/execution_cache.db'
+    MODULE_INDEX_PATH = os.getenv('MODULE_INDEX_PATH', './data/module_index.json')  # 설치 모듈 인덱스 (import 없이 조회)
     
     # ========== 성능 설정 ==========
     MAX_CODE_LENGTH = 10 * 1024 * 1024  # 10MB
     EXECUTION_TIMEOUT = 30  # 초
+    EXECUTION_TRANSPORT = os.getenv('EXECUTION_TRANSPORT', 'auto')  # 'auto' | 'memfd' | 'pipe' | 'tempfile'
+    OUTPUT_HEAD_BYTES = int(os.getenv('OUTPUT_HEAD_BYTES', str(64 * 1024)))  # 스트림별 앞부분 보관 (바이트)
+    OUTPUT_TAIL_BYTES = int(os.getenv('OUTPUT_TAIL_BYTES', str(64 * 1024)))  # 스트림별 뒷부분 보관 (바이트)
+    PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', '15'))  # 프로파일 요약 항목 수
+    
+    # ========== 샌드박스 리소스 제한 (POSIX rlimit, Windows 미지원) ==========
+    SANDBOX_LIMITS_ENABLED = os.getenv('SANDBOX_LIMITS_ENABLED', 'true').lower() == 'true'
+    LIMIT_CPU_TIME = int(os.getenv('LIMIT_CPU_TIME', '30'))  # CPU 시간 (초)
+    LIMIT_MEMORY_MB = int(os.getenv('LIMIT_MEMORY_MB', '2048'))  # 주소 공간 (MB)
+    LIMIT_FILE_SIZE_MB = int(os.getenv('LIMIT_FILE_SIZE_MB', '10'))  # 쓸 수 있는 파일 크기 (MB)
+    LIMIT_PROCESSES = int(os.getenv('LIMIT_PROCESSES', '256'))  # 사용자 단위 프로세스 수
+    
+    # ========== 코드 정책 (실행 전 차단 규칙) ==========
+    CODE_POLICY_FILE = os.getenv('CODE_POLICY_FILE', '')  # JSON 규칙 파일 (비어 있으면 CodePolicy.DEFAULT_RULES)
+    
+    # ========== 실행 워커 풀 설정 ==========
+    WORKER_POOL_ENABLED = os.getenv('WORKER_POOL_ENABLED', 'true').lower() == 'true'
+    WORKER_POOL_SIZE = int(os.getenv('WORKER_POOL_SIZE', '4'))
+    WORKER_MAX_RUNS = int(os.getenv('WORKER_MAX_RUNS', '100'))  # 워커당 실행 횟수 (0이면 무제한)
+    WORKER_MAX_LIFETIME = int(os.getenv('WORKER_MAX_LIFETIME', '3600'))  # 초 (0이면 무제한)
+    WORKER_RECYCLE_ON_TIMEOUT = os.getenv('WORKER_RECYCLE_ON_TIMEOUT', 'true').lower() == 'true'
+    WORKER_ACQUIRE_TIMEOUT = float(os.getenv('WORKER_ACQUIRE_TIMEOUT', '0.5'))  # 초과 시 cold 실행
+    
+    # ========== 비동기 실행기 설정 ==========
+    ASYNC_MAX_CONCURRENCY = int(os.getenv('ASYNC_MAX_CONCURRENCY', str(os.cpu_count() or 4)))  # 동시 실행 자식 수
+    ASYNC_MAX_QUEUE_DEPTH = int(os.getenv('ASYNC_MAX_QUEUE_DEPTH', '64'))  # 초과 시 요청 거부
+    
+    # ========== 실시간 검증 세션 (/api/validate-incremental) ==========
+    VALIDATION_SESSION_MAX = int(os.getenv('VALIDATION_SESSION_MAX', '128'))  # 동시 보관 세션 수
+    VALIDATION_SESSION_TTL = int(os.getenv('VALIDATION_SESSION_TTL', '1800'))  # 유휴 만료 (초)
     
     # ========== 디렉토리 ==========
     BASE_DIR = Path(__file__).parent.parent
     DATA_DIR = BASE_DIR / 'data'
     UPLOAD_DIR = BASE_DIR / 'uploads'
     
+    # ========== 에러 분석 규칙 ==========
+    # JSON 규칙 파일 / 디렉토리 (os.pathsep으로 여러 개, 뒤에 오는 규칙은 같은 priority에서 나중에 적용)
+    ERROR_RULES_PATHS = os.getenv('ERROR_RULES_PATHS', str(DATA_DIR / 'error_rules'))
+    
     @classmethod
     def ensure_directories(cls):
         """필요한 디렉토리 생성"""
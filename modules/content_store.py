@@ -0,0 +1,91 @@
+"""
+내용 주소 저장소 - 코드 / stderr 본문을 해시로 한 번만 저장
+같은 코드나 같은 stderr가 반복 제출되어도 content_blobs에는 한 행만 있고,
+error_history는 해시(code_blob / stderr_blob)로 참조 (본문은 zlib 압축)
+"""
+
+import zlib
+import hashlib
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+
+class ContentStore:
+    """content_blobs 테이블 읽기 / 쓰기 (호출하는 쪽의 연결 / 트랜잭션 안에서 실행)"""
+
+    COMPRESS_LEVEL = 6
+    LOOKUP_CHUNK = 500  # IN (...) 한 번에 넣을 해시 수 (SQLite 변수 개수 제한 아래)
+
+    @staticmethod
+    def digest(text: str) -> str:
+        """본문 해시 (sha1 hex)"""
+        return hashlib.sha1(text.encode('utf-8', 'replace')).hexdigest()
+
+    @staticmethod
+    def compress(text: str) -> bytes:
+        return zlib.compress(text.encode('utf-8', 'replace'), ContentStore.COMPRESS_LEVEL)
+
+    @staticmethod
+    def decompress(data: Optional[bytes]) -> Optional[str]:
+        if data is None:
+            return None
+        return zlib.decompress(data).decode('utf-8', 'replace')
+
+    @staticmethod
+    def _existing(cursor: sqlite3.Cursor, hashes: List[str]) -> set:
+        found = set()
+        for i in range(0, len(hashes), ContentStore.LOOKUP_CHUNK):
+            chunk = hashes[i:i + ContentStore.LOOKUP_CHUNK]
+            cursor.execute(
+                f"SELECT hash FROM content_blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    @staticmethod
+    def store(cursor: sqlite3.Cursor, texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        본문 여러 개 저장 (이미 있는 해시는 압축하지 않고 건너뜀)
+
+        Args:
+            cursor: 쓰기 트랜잭션의 커서
+            texts: 저장할 본문 (None / 빈 문자열은 저장하지 않음)
+
+        Returns:
+            입력 순서대로 해시 (None / 빈 문자열은 None)
+        """
+        texts = list(texts)
+        hashes = [ContentStore.digest(text) if text else None for text in texts]
+
+        pending = {}
+        for text, digest in zip(texts, hashes):
+            if digest is not None and digest not in pending:
+                pending[digest] = text
+        if not pending:
+            return hashes
+
+        existing = ContentStore._existing(cursor, list(pending))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO content_blobs (hash, size, data)
+            VALUES (?, ?, ?)
+        ''', [
+            (digest, len(text), ContentStore.compress(text))
+            for digest, text in pending.items() if digest not in existing
+        ])
+        return hashes
+
+    @staticmethod
+    def load(cursor: sqlite3.Cursor, hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+        """
+        해시 → 본문 (압축 해제, 없는 해시는 결과에서 빠짐)
+        """
+        hashes = list({h for h in hashes if h})
+        contents = {}
+        for i in range(0, len(hashes), ContentStore.LOOKUP_CHUNK):
+            chunk = hashes[i:i + ContentStore.LOOKUP_CHUNK]
+            cursor.execute(
+                f"SELECT hash, data FROM content_blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for digest, data in cursor.fetchall():
+                contents[digest] = ContentStore.decompress(data)
+        return contents
@@ -0,0 +1,203 @@
+"""
+에러 DB 자동 점검 - 임시 DB에서 빠르게 실행되고 실패하면 AssertionError
+(python __main__.py check / CI에서 종료 코드로 회귀 확인)
+"""
+
+import os
+import time
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .db_connection import ConnectionManager
+from .error_analyzer import ErrorAnalyzer
+from .error_database import ErrorDatabase
+
+
+class DatabaseChecks:
+    """임시 DB 대상 점검 모음 (각 점검은 성공 시 요약 dict, 실패 시 AssertionError)"""
+
+    STRESS_THREADS = 16
+    STRESS_OPS = 50
+
+    # 쿼리 → 플랜에 반드시 나와야 하는 인덱스 (대체 인덱스로 넘어가도 실패하도록 고정)
+    EXPECTED_INDEXES = {
+        'similar_errors': ['idx_error_history_type_created', 'idx_solutions_error_covering'],
+        'count_by_type': ['idx_stats_error_types_occurrences'],
+        'top_patterns': ['idx_error_patterns_count'],
+        'recent_errors': ['idx_error_history_created'],
+        'fingerprint_lookup': ['idx_error_fingerprints_fingerprint'],
+        'fingerprint_solutions': ['idx_error_history_fingerprint_created', 'idx_solutions_error_covering'],
+        'history_page': ['idx_error_history_created'],
+        'history_type': ['idx_error_history_type_created'],
+        'history_fingerprint': ['idx_error_history_fingerprint_created']
+    }
+
+    SAMPLE_ERROR = (
+        'Traceback (most recent call last):\n'
+        '  File "main.py", line 2, in <module>\n'
+        "NameError: name 'value' is not defined"
+    )
+
+    @staticmethod
+    def _run_threads(threads: int, target: Callable[[int], None]) -> List[BaseException]:
+        """스레드 threads개에서 target(n) 실행 (발생한 예외 목록 반환)"""
+        errors = []
+
+        def worker(n):
+            try:
+                target(n)
+            except BaseException as e:
+                errors.append(e)
+
+        pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        return errors
+
+    @staticmethod
+    def check_concurrent_writes(threads: int = STRESS_THREADS, ops: int = STRESS_OPS) -> Dict:
+        """
+        동시 쓰기 스트레스 (database is locked 등 오류 없이 정확한 행 수가 남는지)
+        - transaction(): 스레드마다 ops번 같은 카운터 증가 + 행 추가
+        - save_error: 동기 / 비동기(쓰기 큐) 모드에서 스레드마다 서로 다른 코드 ops개 저장
+
+        Returns:
+            {'threads', 'ops', 'elapsed'}
+        """
+        started = time.perf_counter()
+        expected = threads * ops
+        analysis = ErrorAnalyzer.analyze_error(DatabaseChecks.SAMPLE_ERROR)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = ConnectionManager(os.path.join(tmp, 'stress.db'))
+            with manager.transaction() as conn:
+                conn.execute('CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)')
+                conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, worker INTEGER NOT NULL)')
+                conn.execute('INSERT INTO counter (id, value) VALUES (1, 0)')
+
+            def increment(n):
+                for _ in range(ops):
+                    with manager.transaction() as conn:
+                        conn.execute('UPDATE counter SET value = value + 1 WHERE id = 1')
+                        conn.execute('INSERT INTO items (worker) VALUES (?)', (n,))
+
+            errors = DatabaseChecks._run_threads(threads, increment)
+            assert not errors, f"transaction() 동시 실행 오류: {errors[:3]}"
+            with manager.connection() as conn:
+                value = conn.execute('SELECT value FROM counter WHERE id = 1').fetchone()[0]
+                items = conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+            assert value == expected, f"카운터 {value} (기대값 {expected}) - 갱신 유실"
+            assert items == expected, f"행 {items}개 (기대값 {expected})"
+            manager.close_all()
+
+            for mode in ('sync', 'async'):
+                path = os.path.join(tmp, f'history_{mode}.db')
+                manager = ConnectionManager(path)
+                db = ErrorDatabase(path, connections=manager, write_mode=mode)
+
+                def save(n):
+                    for i in range(ops):
+                        db.save_error(f'# worker {n}\nprint(value_{i})', analysis)
+
+                errors = DatabaseChecks._run_threads(threads, save)
+                assert not errors, f"save_error ({mode}) 동시 실행 오류: {errors[:3]}"
+                assert db.flush(timeout=60), f"쓰기 큐가 60초 안에 비워지지 않음 ({mode})"
+                if db.writer is not None:
+                    failed = db.writer.get_statistics()['failed']
+                    assert failed == 0, f"쓰기 큐 기록 실패 {failed}건"
+
+                with manager.connection() as conn:
+                    rows, occurrences = conn.execute(
+                        'SELECT COUNT(*), SUM(occurrence_count) FROM error_history'
+                    ).fetchone()
+                assert rows == expected, f"error_history {rows}행 (기대값 {expected}, {mode})"
+                assert occurrences == expected, f"발생 횟수 합 {occurrences} (기대값 {expected}, {mode})"
+                total = db.get_statistics()['total_errors']
+                assert total == expected, f"통계 총 발생 {total} (기대값 {expected}, {mode})"
+                db.close()
+                manager.close_all()
+
+        return {'threads': threads, 'ops': ops, 'elapsed': time.perf_counter() - started}
+
+    @staticmethod
+    def check_query_plans(rows: int = 30) -> Dict:
+        """
+        조회 쿼리 인덱스 사용 (인덱스가 빠지면 실패)
+        새로 마이그레이션한 작은 DB에 rows건 저장 + ANALYZE 후 QUERY_PLAN_CHECKS 전부
+        전체 스캔 / 허용되지 않은 임시 정렬이 없고 각 쿼리가 EXPECTED_INDEXES의 인덱스를 쓰는지 확인
+
+        Returns:
+            {'queries', 'rows', 'elapsed'}
+        """
+        started = time.perf_counter()
+        analysis = ErrorAnalyzer.analyze_error(DatabaseChecks.SAMPLE_ERROR)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'plans.db')
+            manager = ConnectionManager(path)
+            db = ErrorDatabase(path, connections=manager, write_mode='sync')
+            for i in range(rows):
+                db.save_error(f'print(value_{i})', analysis)
+            with manager.connection() as conn:
+                conn.execute('ANALYZE')
+
+            plans = db.explain_query_plans()
+            db.close()
+            manager.close_all()
+
+        failures = [f"{name}: {report['plan']}" for name, report in plans.items() if not report['ok']]
+        assert not failures, "인덱스 없는 스캔 / 임시 정렬:\n" + '\n'.join(failures)
+        unindexed = [
+            name for name, report in plans.items()
+            if not any(key in step for step in report['plan'] for key in ('INDEX', 'PRIMARY KEY'))
+        ]
+        assert not unindexed, f"인덱스를 쓰지 않는 쿼리: {unindexed}"
+        missing = [
+            f"{name}: {index}"
+            for name, indexes in DatabaseChecks.EXPECTED_INDEXES.items()
+            for index in indexes
+            if not any(f'INDEX {index} ' in f'{step} ' for step in plans[name]['plan'])
+        ]
+        assert not missing, f"기대한 인덱스를 쓰지 않음: {missing}"
+
+        return {'queries': len(plans), 'rows': rows, 'elapsed': time.perf_counter() - started}
+
+    # 점검 이름 → 메서드 이름
+    CHECKS = {
+        'concurrency': 'check_concurrent_writes',
+        'query_plans': 'check_query_plans'
+    }
+
+    @staticmethod
+    def run(names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        점검 실행 (하나가 실패해도 나머지는 계속)
+
+        Returns:
+            {점검: {'ok': bool, 'elapsed': float, 'error': str (실패 시), ...점검 요약}}
+        """
+        results = {}
+        for name in names or list(DatabaseChecks.CHECKS):
+            started = time.perf_counter()
+            try:
+                summary = getattr(DatabaseChecks, DatabaseChecks.CHECKS[name])()
+                results[name] = {'ok': True, **summary}
+            except AssertionError as e:
+                results[name] = {'ok': False, 'error': str(e)}
+            results[name]['elapsed'] = time.perf_counter() - started
+        return results
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🩺 에러 DB 점검")
+    print("=" * 60)
+
+    for name, result in DatabaseChecks.run().items():
+        print(f"\n{'✅' if result['ok'] else '❌'} {name} ({result['elapsed']:.2f}초)")
+        if not result['ok']:
+            print(f"   {result['error']}")
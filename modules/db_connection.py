@@ -0,0 +1,254 @@
+"""
+SQLite 연결 관리자 - ErrorDatabase / PatternLearner / CLI가 공유하는 연결 풀
+메서드마다 connect / close 하지 않고 연결을 재사용하며,
+WAL 저널 모드 + pragma 튜닝 + busy timeout으로 동시 요청이 'database is locked' 없이 처리되도록 함
+"""
+
+import os
+import time
+import queue
+import atexit
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class ConnectionManager:
+    """DB 파일별 SQLite 연결 풀"""
+
+    BEGIN_RETRIES = 5       # busy timeout 후에도 쓰기 잠금을 못 얻으면 재시도할 횟수
+    RETRY_BACKOFF = 0.05    # 재시도 대기 (초, 시도마다 2배)
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 db_path: str,
+                 pool_size: Optional[int] = None,
+                 busy_timeout_ms: Optional[int] = None,
+                 journal_mode: Optional[str] = None,
+                 synchronous: Optional[str] = None,
+                 cache_size_kb: Optional[int] = None,
+                 mmap_size_mb: Optional[int] = None):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로
+            pool_size: 보관할 유휴 연결 수 (초과분은 반환 시 닫음, None이면 Config)
+            busy_timeout_ms: 잠금 대기 시간 (밀리초)
+            journal_mode: 'WAL' | 'DELETE' | ...
+            synchronous: 'OFF' | 'NORMAL' | 'FULL'
+            cache_size_kb: 연결별 페이지 캐시 크기 (KB)
+            mmap_size_mb: 메모리 매핑 크기 (MB, 0이면 사용 안 함)
+        """
+        from .config import Config
+
+        self.db_path = db_path
+        self.pool_size = pool_size if pool_size is not None else Config.SQLITE_POOL_SIZE
+        self.busy_timeout_ms = busy_timeout_ms if busy_timeout_ms is not None else Config.SQLITE_BUSY_TIMEOUT_MS
+        self.journal_mode = (journal_mode or Config.SQLITE_JOURNAL_MODE).upper()
+        self.synchronous = (synchronous or Config.SQLITE_SYNCHRONOUS).upper()
+        self.cache_size_kb = cache_size_kb if cache_size_kb is not None else Config.SQLITE_CACHE_SIZE_KB
+        self.mmap_size_mb = mmap_size_mb if mmap_size_mb is not None else Config.SQLITE_MMAP_SIZE_MB
+
+        self._idle = queue.LifoQueue()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'reused': 0, 'closed': 0, 'busy_retries': 0}
+        self._active_journal_mode = None
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+    @staticmethod
+    def shared(db_path: str) -> 'ConnectionManager':
+        """DB 파일별 공용 관리자 (같은 파일이면 경로 표기와 무관하게 같은 풀)"""
+        key = os.path.abspath(db_path)
+        with ConnectionManager._shared_lock:
+            manager = ConnectionManager._shared.get(key)
+            if manager is None:
+                if not ConnectionManager._shared:
+                    atexit.register(ConnectionManager.close_all_shared)
+                manager = ConnectionManager(db_path)
+                ConnectionManager._shared[key] = manager
+        return manager
+
+    @staticmethod
+    def close_all_shared():
+        """공용 관리자의 유휴 연결 모두 닫기 (프로세스 종료 시 WAL 체크포인트)"""
+        with ConnectionManager._shared_lock:
+            managers = list(ConnectionManager._shared.values())
+        for manager in managers:
+            manager.close_all()
+
+    # ========== 연결 ==========
+
+    def _open(self) -> sqlite3.Connection:
+        # 풀에서 스레드 간에 넘겨 쓰므로 check_same_thread 해제 (한 번에 한 스레드만 사용)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        if self._active_journal_mode is None:
+            # 새 파일이면 삭제로 빈 페이지를 조금씩 반환할 수 있게 (기존 파일은 VACUUM 전까지 그대로)
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            # 저널 모드는 파일에 기록되므로 최초 연결에서 한 번만 설정
+            self._active_journal_mode = conn.execute(f'PRAGMA journal_mode = {self.journal_mode}').fetchone()[0]
+        conn.execute(f'PRAGMA synchronous = {self.synchronous}')
+        conn.execute(f'PRAGMA cache_size = {-int(self.cache_size_kb)}')
+        conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size_mb) * 1024 * 1024}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        with self._lock:
+            self._stats['created'] += 1
+        return conn
+
+    def _check_fork(self):
+        """fork된 자식은 부모의 연결을 쓰면 안 되므로 풀을 새로 시작"""
+        if os.getpid() != self._pid:
+            with self._lock:
+                if os.getpid() != self._pid:
+                    self._idle = queue.LifoQueue()
+                    self._pid = os.getpid()
+
+    def _acquire(self) -> sqlite3.Connection:
+        self._check_fork()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._open()
+        with self._lock:
+            self._stats['reused'] += 1
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        if os.getpid() == self._pid and self._idle.qsize() < self.pool_size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+            with self._lock:
+                self._stats['closed'] += 1
+
+    @contextmanager
+    def connection(self):
+        """
+        읽기용 연결 (autocommit, row_factory=sqlite3.Row)
+
+        with manager.connection() as conn:
+            conn.execute('SELECT ...')
+        """
+        conn = self._acquire()
+        healthy = True
+        try:
+            yield conn
+        except sqlite3.Error:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._release(conn)
+            else:
+                # 상태를 알 수 없는 연결은 풀에 돌려보내지 않음
+                conn.close()
+                with self._lock:
+                    self._stats['closed'] += 1
+
+    @contextmanager
+    def transaction(self):
+        """
+        쓰기 트랜잭션 (BEGIN IMMEDIATE로 시작해 정상 종료 시 COMMIT, 예외 시 ROLLBACK)
+        쓰기 잠금을 처음에 잡아 읽기 → 쓰기 승격 중 교착 없이 busy timeout만큼 대기
+
+        with manager.transaction() as conn:
+            conn.execute('INSERT ...')
+        """
+        with self.connection() as conn:
+            self._begin(conn)
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def _begin(self, conn: sqlite3.Connection):
+        delay = self.RETRY_BACKOFF
+        for attempt in range(self.BEGIN_RETRIES + 1):
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e) or attempt == self.BEGIN_RETRIES:
+                    raise
+                with self._lock:
+                    self._stats['busy_retries'] += 1
+                time.sleep(delay)
+                delay *= 2
+
+    def close_all(self):
+        """유휴 연결 모두 닫기 (사용 중인 연결은 반환 시 다시 풀에 들어감)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._stats['closed'] += 1
+
+    def get_statistics(self) -> Dict[str, any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            'db_path': self.db_path,
+            'idle': self._idle.qsize(),
+            'pool_size': self.pool_size,
+            'journal_mode': self._active_journal_mode
+        })
+        return stats
+
+
+# 테스트 (동시 쓰기 / 읽기 스트레스)
+if __name__ == '__main__':
+    import tempfile
+
+    print("=" * 60)
+    print("🔌 SQLite 연결 관리자 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ConnectionManager(os.path.join(tmp, 'stress.db'))
+        with manager.transaction() as conn:
+            conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, worker INTEGER, value TEXT)')
+
+        threads, per_thread = 16, 200
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(per_thread):
+                    with manager.transaction() as conn:
+                        conn.execute('INSERT INTO items (worker, value) VALUES (?, ?)', (n, f'value {i}'))
+                    with manager.connection() as conn:
+                        conn.execute('SELECT COUNT(*) FROM items WHERE worker = ?', (n,)).fetchone()
+            except Exception as e:
+                errors.append(e)
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        with manager.connection() as conn:
+            count = conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+        print(f"\n{threads}스레드 x {per_thread}회 쓰기+읽기: {elapsed:.2f}초 ({count / elapsed:.0f} 쓰기/초)")
+        print(f"행 {count}개 (기대값 {threads * per_thread}), 오류 {len(errors)}개")
+        print(f"통계: {manager.get_statistics()}")
+        manager.close_all()
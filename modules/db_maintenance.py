@@ -0,0 +1,476 @@
+"""
+에러 히스토리 정리 작업 - 보관 기간 / 일별 롤업 / 아카이브 / 고아 행 정리 / 증분 VACUUM
+모든 단계를 작은 배치의 짧은 쓰기 트랜잭션으로 나누고 배치 사이에 쉬어,
+정리 중에도 save_error(쓰기 큐)의 커밋이 잠금을 오래 기다리지 않음
+"""
+
+import time
+import threading
+from typing import Dict, List, Optional
+
+from .db_connection import ConnectionManager
+
+
+class HistoryMaintenance:
+    """error_history.db 보관 정책 실행 (CLI maintain / 웹 서버 백그라운드 스레드)"""
+
+    # 아카이브 DB로 옮기는 테이블 (컬럼은 원본 스키마를 따라 만들고 늘어나면 추가)
+    ARCHIVE_TABLES = ('error_history', 'solutions', 'content_blobs')
+    SCAN_FACTOR = 10      # 고아 행 검사 시 트랜잭션 하나에서 확인할 행 수 = batch_size * SCAN_FACTOR
+    STARTUP_DELAY = 60    # 백그라운드 첫 실행까지 대기 (초, 서버 시작 직후 부하와 겹치지 않게)
+
+    # 마지막 발생이 보관 기간 전인 에러 (idx_error_history_last_seen 순서대로 오래된 것부터)
+    EXPIRED_ERRORS_SQL = '''
+        SELECT * FROM error_history
+        WHERE last_seen < ?
+        ORDER BY last_seen
+        LIMIT ?
+    '''
+
+    # 아카이브한 에러를 마지막 발생일 기준으로 일별 집계에 합산
+    DAILY_ROLLUP_SQL = '''
+        INSERT INTO stats_daily (day, error_type, occurrences, errors)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(day, error_type) DO UPDATE SET
+            occurrences = occurrences + excluded.occurrences,
+            errors = errors + excluded.errors
+    '''
+
+    # 어떤 에러도 참조하지 않는 본문 (참조 인덱스로 해시마다 확인)
+    ORPHAN_BLOB_CONDITION = '''
+        NOT EXISTS (SELECT 1 FROM error_history WHERE code_blob = content_blobs.hash)
+        AND NOT EXISTS (SELECT 1 FROM error_history WHERE stderr_blob = content_blobs.hash)
+    '''
+
+    ORPHAN_SOLUTION_CONDITION = 'NOT EXISTS (SELECT 1 FROM error_history WHERE id = solutions.error_id)'
+
+    def __init__(self,
+                 db,
+                 retention_days: Optional[int] = None,
+                 hourly_retention_days: Optional[int] = None,
+                 archive_path: Optional[str] = None,
+                 batch_size: Optional[int] = None,
+                 pause_ms: Optional[int] = None,
+                 vacuum_pages: Optional[int] = None):
+        """
+        Args:
+            db: 정리할 ErrorDatabase
+            retention_days: 마지막 발생 후 보관 기간 (일, 0이면 아카이브 안 함, None이면 Config)
+            hourly_retention_days: stats_hourly 보관 기간 (일, 0이면 무기한)
+            archive_path: 아카이브 DB 경로 (빈 문자열이면 일별 집계만 남기고 삭제)
+            batch_size: 트랜잭션 하나에서 옮기거나 지울 행 수
+            pause_ms: 배치 사이 대기 (밀리초)
+            vacuum_pages: 증분 VACUUM 한 번에 반환할 페이지 수
+        """
+        from .config import Config
+
+        self.db = db
+        self.retention_days = Config.HISTORY_RETENTION_DAYS if retention_days is None else retention_days
+        self.hourly_retention_days = (
+            Config.HOURLY_STATS_RETENTION_DAYS if hourly_retention_days is None else hourly_retention_days
+        )
+        self.archive_path = Config.HISTORY_ARCHIVE_PATH if archive_path is None else archive_path
+        self.batch_size = max(1, batch_size or Config.MAINTENANCE_BATCH_SIZE)
+        self.pause = max(0, Config.MAINTENANCE_PAUSE_MS if pause_ms is None else pause_ms) / 1000
+        self.vacuum_pages = max(1, vacuum_pages or Config.VACUUM_STEP_PAGES)
+
+        self.archive = ConnectionManager.shared(self.archive_path) if self.archive_path else None
+        self._archive_ready = False
+
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.last_report = None
+
+    # ========== 실행 ==========
+
+    def run(self, full_vacuum: bool = False) -> Dict:
+        """
+        정리 작업 한 번 실행 (아카이브 → 시간별 통계 정리 → 고아 행 정리 → 증분 VACUUM)
+
+        Args:
+            full_vacuum: 마지막에 전체 VACUUM 실행 (auto_vacuum 전환용, 끝날 때까지 쓰기가 대기하므로 CLI에서만)
+
+        Returns:
+            {'success', 'archived_errors', 'archived_solutions', 'daily_rollups', 'hourly_pruned',
+             'orphan_solutions', 'orphan_blobs', 'vacuumed_pages', 'freed_bytes', 'batches', 'elapsed'}
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return {'success': False, 'error': '정리 작업이 이미 실행 중'}
+
+        started = time.perf_counter()
+        report = {
+            'success': True,
+            'archived_errors': 0,
+            'archived_solutions': 0,
+            'daily_rollups': 0,
+            'hourly_pruned': 0,
+            'orphan_solutions': 0,
+            'orphan_blobs': 0,
+            'vacuumed_pages': 0,
+            'freed_bytes': 0,
+            'batches': 0,
+            'archive_path': self.archive_path or None
+        }
+        try:
+            size_before = self._file_size()
+            self._archive_expired(report)
+            self._prune_hourly(report)
+            self._prune_orphan_solutions(report)
+            self._prune_orphan_blobs(report)
+            if full_vacuum:
+                self._full_vacuum(report)
+            else:
+                self._incremental_vacuum(report)
+            report['freed_bytes'] = max(0, size_before - self._file_size())
+        except Exception as e:
+            report['success'] = False
+            report['error'] = str(e)
+        finally:
+            self._run_lock.release()
+
+        report['elapsed'] = time.perf_counter() - started
+        self.last_report = report
+        return report
+
+    def plan(self) -> Dict:
+        """
+        실행하지 않고 정리 대상 개수만 확인 (maintain --dry-run)
+
+        Returns:
+            {'expired_errors', 'expired_hourly', 'orphan_solutions', 'orphan_blobs', 'free_pages', 'auto_vacuum'}
+        """
+        with self.db.connections.connection() as conn:
+            expired = 0
+            cutoff = self._cutoff(conn, self.retention_days)
+            if cutoff:
+                expired = conn.execute('SELECT COUNT(*) FROM error_history WHERE last_seen < ?', (cutoff,)).fetchone()[0]
+            expired_hourly = 0
+            hourly_cutoff = self._cutoff(conn, self.hourly_retention_days)
+            if hourly_cutoff:
+                expired_hourly = conn.execute(
+                    'SELECT COUNT(*) FROM stats_hourly WHERE bucket < ?', (hourly_cutoff,)
+                ).fetchone()[0]
+            return {
+                'retention_days': self.retention_days,
+                'cutoff': cutoff,
+                'expired_errors': expired,
+                'expired_hourly': expired_hourly,
+                'orphan_solutions': conn.execute(
+                    f'SELECT COUNT(*) FROM solutions WHERE {self.ORPHAN_SOLUTION_CONDITION}'
+                ).fetchone()[0],
+                'orphan_blobs': conn.execute(
+                    f'SELECT COUNT(*) FROM content_blobs WHERE {self.ORPHAN_BLOB_CONDITION}'
+                ).fetchone()[0],
+                'free_pages': conn.execute('PRAGMA freelist_count').fetchone()[0],
+                'auto_vacuum': self._auto_vacuum_mode(conn),
+                'archive_path': self.archive_path or None
+            }
+
+    @staticmethod
+    def _cutoff(conn, days: int) -> Optional[str]:
+        """보관 기간 경계 시각 (CURRENT_TIMESTAMP와 같은 UTC 'YYYY-MM-DD HH:MM:SS', 0 이하이면 None)"""
+        if not days or days <= 0:
+            return None
+        return conn.execute("SELECT datetime('now', ?)", (f'-{int(days)} days',)).fetchone()[0]
+
+    def _yield(self):
+        """배치 사이 대기 (쓰기 큐가 잠금을 잡을 틈)"""
+        if self.pause:
+            time.sleep(self.pause)
+
+    # ========== 아카이브 + 일별 롤업 ==========
+
+    def _archive_expired(self, report: Dict):
+        with self.db.connections.connection() as conn:
+            cutoff = self._cutoff(conn, self.retention_days)
+        if not cutoff:
+            return
+        while True:
+            moved = self._archive_batch(cutoff, report)
+            report['batches'] += 1
+            if moved < self.batch_size:
+                return
+            self._yield()
+
+    def _archive_batch(self, cutoff: str, report: Dict) -> int:
+        """
+        보관 기간이 지난 에러 batch_size개를 아카이브로 옮김
+        원본 쓰기 트랜잭션 안에서 읽고 → 아카이브에 기록 → 원본에서 삭제하므로 그 사이 반복 제출이 끼어들지 않음
+        (아카이브 커밋 후 원본 커밋 전에 중단되면 다음 실행에서 같은 ID로 덮어씀)
+        """
+        with self.db.connections.transaction() as conn:
+            cursor = conn.cursor()
+            rows = cursor.execute(self.EXPIRED_ERRORS_SQL, (cutoff, self.batch_size)).fetchall()
+            if not rows:
+                return 0
+            ids = [row['id'] for row in rows]
+            id_marks = ','.join('?' * len(ids))
+            solutions = cursor.execute(f'SELECT * FROM solutions WHERE error_id IN ({id_marks})', ids).fetchall()
+            hashes = list({h for row in rows for h in (row['code_blob'], row['stderr_blob']) if h})
+
+            if self.archive is not None:
+                blobs = []
+                if hashes:
+                    blobs = cursor.execute(
+                        f"SELECT * FROM content_blobs WHERE hash IN ({','.join('?' * len(hashes))})", hashes
+                    ).fetchall()
+                self._ensure_archive(conn)
+                with self.archive.transaction() as archive_conn:
+                    self._copy_rows(archive_conn, 'error_history', rows)
+                    self._copy_rows(archive_conn, 'solutions', solutions)
+                    self._copy_rows(archive_conn, 'content_blobs', blobs)
+
+            # 일별 집계 (발생 횟수는 마지막 발생일에 합산)
+            daily = {}
+            for row in rows:
+                key = (str(row['last_seen'])[:10], row['error_type'])
+                occurrences, errors = daily.get(key, (0, 0))
+                daily[key] = (occurrences + (row['occurrence_count'] or 1), errors + 1)
+            cursor.executemany(self.DAILY_ROLLUP_SQL, [
+                (day, error_type, occurrences, errors) for (day, error_type), (occurrences, errors) in daily.items()
+            ])
+
+            # 삭제 트리거가 error_search / stats_error_types를 함께 갱신 (빠진 발생 횟수는 위 stats_daily로 통계에 합산)
+            # (에러 행을 먼저 지워야 해결책 삭제 트리거가 사라진 검색 행의 해결책을 다시 모으지 않음)
+            cursor.execute(f'DELETE FROM error_history WHERE id IN ({id_marks})', ids)
+            cursor.execute(f'DELETE FROM solutions WHERE error_id IN ({id_marks})', ids)
+
+            # 이 에러들만 쓰던 본문은 바로 정리
+            if hashes:
+                cursor.execute(f'''
+                    DELETE FROM content_blobs
+                    WHERE hash IN ({','.join('?' * len(hashes))}) AND {self.ORPHAN_BLOB_CONDITION}
+                ''', hashes)
+                report['orphan_blobs'] += cursor.rowcount
+
+        report['archived_errors'] += len(rows)
+        report['archived_solutions'] += len(solutions)
+        report['daily_rollups'] += len(daily)
+        return len(rows)
+
+    def _ensure_archive(self, conn):
+        """아카이브 DB에 원본과 같은 컬럼의 테이블 준비 (원본에 컬럼이 늘었으면 추가)"""
+        if self._archive_ready:
+            return
+        with self.archive.transaction() as archive_conn:
+            for table in self.ARCHIVE_TABLES:
+                columns = conn.execute(f'PRAGMA table_info({table})').fetchall()
+                existing = {row['name'] for row in archive_conn.execute(f'PRAGMA table_info({table})')}
+                if not existing:
+                    keys = [row['name'] for row in sorted(columns, key=lambda c: c['pk']) if row['pk']]
+                    definitions = [f"{row['name']} {row['type']}" for row in columns]
+                    definitions.append(f"PRIMARY KEY ({', '.join(keys)})")
+                    archive_conn.execute(f"CREATE TABLE {table} ({', '.join(definitions)})")
+                    continue
+                for row in columns:
+                    if row['name'] not in existing:
+                        archive_conn.execute(f"ALTER TABLE {table} ADD COLUMN {row['name']} {row['type']}")
+            archive_conn.execute('CREATE INDEX IF NOT EXISTS idx_solutions_error_id ON solutions(error_id)')
+            archive_conn.execute('CREATE INDEX IF NOT EXISTS idx_error_history_last_seen ON error_history(last_seen)')
+        self._archive_ready = True
+
+    @staticmethod
+    def _copy_rows(conn, table: str, rows: List):
+        """행을 그대로 기록 (같은 키가 있으면 최신 값으로 덮어씀)"""
+        if not rows:
+            return
+        columns = rows[0].keys()
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [tuple(row) for row in rows]
+        )
+
+    # ========== 보관 기간 / 고아 행 정리 ==========
+
+    def _prune_hourly(self, report: Dict):
+        with self.db.connections.connection() as conn:
+            cutoff = self._cutoff(conn, self.hourly_retention_days)
+        if not cutoff:
+            return
+        while True:
+            with self.db.connections.transaction() as conn:
+                cursor = conn.execute('''
+                    DELETE FROM stats_hourly
+                    WHERE (bucket, error_type) IN (
+                        SELECT bucket, error_type FROM stats_hourly WHERE bucket < ? LIMIT ?
+                    )
+                ''', (cutoff, self.batch_size))
+                deleted = cursor.rowcount
+            report['hourly_pruned'] += deleted
+            report['batches'] += 1
+            if deleted < self.batch_size:
+                return
+            self._yield()
+
+    def _prune_orphan_solutions(self, report: Dict):
+        """에러 행이 없는 해결책 삭제 (ID 순으로 구간을 나눠 검사)"""
+        last_id = 0
+        while True:
+            with self.db.connections.transaction() as conn:
+                ids = [row[0] for row in conn.execute(
+                    'SELECT id FROM solutions WHERE id > ? ORDER BY id LIMIT ?',
+                    (last_id, self.batch_size * self.SCAN_FACTOR)
+                )]
+                if not ids:
+                    return
+                last_id = ids[-1]
+                cursor = conn.execute(f'''
+                    DELETE FROM solutions
+                    WHERE id IN ({','.join('?' * len(ids))}) AND {self.ORPHAN_SOLUTION_CONDITION}
+                ''', ids)
+                report['orphan_solutions'] += cursor.rowcount
+            report['batches'] += 1
+            self._yield()
+
+    def _prune_orphan_blobs(self, report: Dict):
+        """어떤 에러도 참조하지 않는 본문 삭제 (확인과 삭제가 같은 트랜잭션이라 동시에 저장된 참조를 지우지 않음)"""
+        last_hash = ''
+        while True:
+            with self.db.connections.transaction() as conn:
+                hashes = [row[0] for row in conn.execute(
+                    'SELECT hash FROM content_blobs WHERE hash > ? ORDER BY hash LIMIT ?',
+                    (last_hash, self.batch_size * self.SCAN_FACTOR)
+                )]
+                if not hashes:
+                    return
+                last_hash = hashes[-1]
+                cursor = conn.execute(f'''
+                    DELETE FROM content_blobs
+                    WHERE hash IN ({','.join('?' * len(hashes))}) AND {self.ORPHAN_BLOB_CONDITION}
+                ''', hashes)
+                report['orphan_blobs'] += cursor.rowcount
+            report['batches'] += 1
+            self._yield()
+
+    # ========== 파일 크기 ==========
+
+    @staticmethod
+    def _auto_vacuum_mode(conn) -> str:
+        return {0: 'none', 1: 'full', 2: 'incremental'}.get(conn.execute('PRAGMA auto_vacuum').fetchone()[0], 'unknown')
+
+    def _file_size(self) -> int:
+        with self.db.connections.connection() as conn:
+            return (conn.execute('PRAGMA page_count').fetchone()[0] *
+                    conn.execute('PRAGMA page_size').fetchone()[0])
+
+    def _incremental_vacuum(self, report: Dict):
+        """
+        빈 페이지를 vacuum_pages개씩 파일에서 반환 (auto_vacuum=INCREMENTAL인 파일만)
+        auto_vacuum이 꺼진 기존 파일은 maintain --full-vacuum으로 한 번 전환해야 함
+        """
+        with self.db.connections.connection() as conn:
+            report['auto_vacuum'] = self._auto_vacuum_mode(conn)
+            if report['auto_vacuum'] == 'incremental':
+                free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                while free:
+                    # 페이지마다 한 단계씩 실행되는데 결과 행이 없어 execute는 첫 단계만 실행하므로 executescript로 끝까지
+                    conn.executescript(f'PRAGMA incremental_vacuum({self.vacuum_pages})')
+                    remaining = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                    if remaining >= free:
+                        break
+                    report['vacuumed_pages'] += free - remaining
+                    free = remaining
+                    self._yield()
+            # 쓰기를 막지 않는 체크포인트 (WAL 파일이 계속 커지지 않게)
+            conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchall()
+
+    def _full_vacuum(self, report: Dict):
+        """auto_vacuum=INCREMENTAL로 전환하며 파일 전체 재작성 (끝날 때까지 다른 쓰기가 대기)"""
+        with self.db.connections.connection() as conn:
+            report['vacuumed_pages'] = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            report['auto_vacuum'] = self._auto_vacuum_mode(conn)
+
+    # ========== 백그라운드 스레드 ==========
+
+    def start(self, interval_hours: Optional[float] = None) -> bool:
+        """
+        주기적 정리 스레드 시작 (데몬, 시작 STARTUP_DELAY초 후 첫 실행)
+
+        Args:
+            interval_hours: 실행 주기 (시간, None이면 Config.MAINTENANCE_INTERVAL_HOURS, 0 이하이면 시작 안 함)
+
+        Returns:
+            스레드를 시작했으면 True
+        """
+        from .config import Config
+
+        interval = Config.MAINTENANCE_INTERVAL_HOURS if interval_hours is None else interval_hours
+        if interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval * 3600,), name='history-maintenance', daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _loop(self, interval: float):
+        delay = min(self.STARTUP_DELAY, interval)
+        while not self._stop.wait(delay):
+            report = self.run()
+            if report['success']:
+                if report['archived_errors'] or report['orphan_solutions'] or report['orphan_blobs']:
+                    print(f"🧹 에러 히스토리 정리: 아카이브 {report['archived_errors']}개, "
+                          f"고아 해결책 {report['orphan_solutions']}개 / 본문 {report['orphan_blobs']}개, "
+                          f"{report['freed_bytes'] / 1024:.0f}KB 반환 ({report['elapsed']:.1f}초)")
+            else:
+                print(f"⚠️ 에러 히스토리 정리 실패: {report.get('error')}")
+            delay = interval
+
+    def stop(self, timeout: Optional[float] = None):
+        """정리 스레드 종료 (실행 중인 배치는 끝까지 진행)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+# 테스트 (임시 DB에 오래된 에러를 넣고 정리)
+if __name__ == '__main__':
+    import os
+    import tempfile
+    from .error_database import ErrorDatabase
+
+    print("=" * 60)
+    print("🧹 에러 히스토리 정리 작업 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ErrorDatabase(os.path.join(tmp, 'history.db'), write_mode='sync')
+        for i in range(300):
+            db.save_error(f"value_{i} = compute(item_{i})", {
+                'error_type': 'NameError' if i % 2 else 'TypeError',
+                'error_message': f"name 'item_{i}' is not defined",
+                'line_number': 1,
+                'raw_error': f"Traceback...\nNameError: name 'item_{i}' is not defined",
+                'solutions': [f'item_{i} 정의 확인']
+            })
+        # 절반을 1년 전 발생으로 + 에러 행이 없는 해결책 하나
+        with db.connections.transaction() as conn:
+            conn.execute("UPDATE error_history SET last_seen = datetime('now', '-365 days') WHERE id % 2 = 0")
+            conn.execute("INSERT INTO solutions (error_id, solution_text) VALUES (999999, 'orphan')")
+
+        maintenance = HistoryMaintenance(
+            db, retention_days=90, archive_path=os.path.join(tmp, 'archive.db'), batch_size=64, pause_ms=0
+        )
+        print(f"\n📋 정리 대상: {maintenance.plan()}")
+        total_before = db.get_statistics()['total_errors']
+        report = maintenance.run()
+        print(f"\n✅ 결과: {report}")
+
+        with db.connections.connection() as conn:
+            remaining = conn.execute('SELECT COUNT(*) FROM error_history').fetchone()[0]
+            daily = conn.execute('SELECT SUM(errors) FROM stats_daily').fetchone()[0]
+            totals = conn.execute('SELECT SUM(errors) FROM stats_error_types').fetchone()[0]
+            search = conn.execute('SELECT COUNT(*) FROM error_search').fetchone()[0]
+        with maintenance.archive.connection() as conn:
+            archived = conn.execute('SELECT COUNT(*) FROM error_history').fetchone()[0]
+        print(f"\n남은 에러 {remaining}개 / 아카이브 {archived}개 / 일별 집계 {daily}개")
+        print(f"stats_error_types 에러 수 {totals}개, error_search 행 {search}개 (남은 에러와 같아야 함)")
+        print(f"통계 총 발생 {total_before}회 → {db.get_statistics()['total_errors']}회 (아카이브 후에도 같아야 함)")
+        print(f"다시 실행: {maintenance.plan()}")
+        maintenance.archive.close_all()
+        db.connections.close_all()
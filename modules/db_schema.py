@@ -0,0 +1,480 @@
+"""
+에러 히스토리 DB 스키마 - 버전별 마이그레이션
+PRAGMA user_version에 적용된 버전을 기록하고, ErrorDatabase 초기화 시 남은 단계만 순서대로 적용
+(버전 도입 전 DB도 각 단계가 IF NOT EXISTS / 컬럼 확인으로 멱등이라 그대로 올라감)
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+
+class ErrorSchema:
+    """error_history.db 스키마 마이그레이션"""
+
+    @staticmethod
+    def _columns(cursor: sqlite3.Cursor, table: str) -> set:
+        return {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+
+    @staticmethod
+    def _v1_base_tables(cursor: sqlite3.Cursor):
+        # 에러 히스토리 테이블
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS error_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code_hash TEXT NOT NULL,
+                error_type TEXT NOT NULL,
+                error_message TEXT,
+                line_number INTEGER,
+                code_snippet TEXT,
+                full_stderr TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # 해결책 테이블
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS solutions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                error_id INTEGER NOT NULL,
+                solution_text TEXT NOT NULL,
+                solution_type TEXT,
+                applied BOOLEAN DEFAULT 0,
+                success BOOLEAN DEFAULT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (error_id) REFERENCES error_history(id)
+            )
+        ''')
+
+        # 에러 패턴 테이블 (자주 발생하는 패턴)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS error_patterns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                error_type TEXT NOT NULL,
+                pattern TEXT NOT NULL,
+                occurrence_count INTEGER DEFAULT 1,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(error_type, pattern)
+            )
+        ''')
+
+    @staticmethod
+    def _v2_fingerprints(cursor: sqlite3.Cursor):
+        # 에러 지문 테이블 (같은 원인의 에러당 한 행, 마지막 분석 결과와 AI 해결책 보관)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS error_fingerprints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fingerprint TEXT NOT NULL,
+                error_type TEXT NOT NULL,
+                message_template TEXT,
+                analysis TEXT NOT NULL,
+                ai_solution TEXT,
+                occurrence_count INTEGER DEFAULT 1,
+                first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_error_id INTEGER
+            )
+        ''')
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_error_fingerprints_fingerprint
+            ON error_fingerprints(fingerprint)
+        ''')
+
+        if 'fingerprint' not in ErrorSchema._columns(cursor, 'error_history'):
+            cursor.execute('ALTER TABLE error_history ADD COLUMN fingerprint TEXT')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_fingerprint
+            ON error_history(fingerprint)
+        ''')
+
+    @staticmethod
+    def _v3_access_path_indexes(cursor: sqlite3.Cursor):
+        # 타입별 최근 에러 (find_similar_errors) + 타입별 개수 (get_statistics, 커버링)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_type_created
+            ON error_history(error_type, created_at)
+        ''')
+        # 최근 에러 (get_recent_errors / PatternLearner)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_created
+            ON error_history(created_at)
+        ''')
+        # 타입 + 메시지별 개수 (PatternLearner, 커버링)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_type_message
+            ON error_history(error_type, error_message)
+        ''')
+        # 에러별 해결책 (JOIN + 해결책 / 성공 여부까지 커버링) - error_id 단일 인덱스 대체
+        cursor.execute('DROP INDEX IF EXISTS idx_solutions_error_id')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_solutions_error_covering
+            ON solutions(error_id, solution_text, success)
+        ''')
+        # 자주 발생하는 패턴 상위 N개
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_patterns_count
+            ON error_patterns(occurrence_count)
+        ''')
+        cursor.execute('ANALYZE')
+
+    @staticmethod
+    def _v4_content_blobs(cursor: sqlite3.Cursor):
+        from .content_store import ContentStore
+
+        # 코드 / stderr 본문 (sha1 → zlib 압축 본문)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS content_blobs (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+        ''')
+
+        columns = ErrorSchema._columns(cursor, 'error_history')
+        for name, definition in (('code_blob', 'TEXT'),
+                                 ('stderr_blob', 'TEXT'),
+                                 ('occurrence_count', 'INTEGER NOT NULL DEFAULT 1'),
+                                 ('last_seen', 'TIMESTAMP')):
+            if name not in columns:
+                cursor.execute(f'ALTER TABLE error_history ADD COLUMN {name} {definition}')
+
+        # 기존 행의 본문을 content_blobs로 옮기고 원래 컬럼은 비움 (1000행씩)
+        last_id = 0
+        while True:
+            rows = cursor.execute('''
+                SELECT id, code_snippet, full_stderr FROM error_history
+                WHERE id > ? AND (code_snippet IS NOT NULL OR full_stderr IS NOT NULL)
+                ORDER BY id LIMIT 1000
+            ''', (last_id,)).fetchall()
+            if not rows:
+                break
+            code_blobs = ContentStore.store(cursor, [row[1] for row in rows])
+            stderr_blobs = ContentStore.store(cursor, [row[2] for row in rows])
+            cursor.executemany('''
+                UPDATE error_history
+                SET code_blob = ?, stderr_blob = ?, code_snippet = NULL, full_stderr = NULL
+                WHERE id = ?
+            ''', [(code, stderr, row[0]) for row, code, stderr in zip(rows, code_blobs, stderr_blobs)])
+            last_id = rows[-1][0]
+        cursor.execute('UPDATE error_history SET last_seen = created_at WHERE last_seen IS NULL')
+
+        # 같은 코드 + 같은 지문으로 중복된 행을 가장 오래된 행 하나로 합침 (발생 횟수 / 마지막 발생 시각 보존)
+        cursor.execute('''
+            CREATE TEMP TABLE merge_groups AS
+            SELECT code_hash, fingerprint, MIN(id) AS keep_id, SUM(occurrence_count) AS occurrences,
+                   MAX(last_seen) AS last_seen
+            FROM error_history
+            WHERE fingerprint IS NOT NULL
+            GROUP BY code_hash, fingerprint
+            HAVING COUNT(*) > 1
+        ''')
+        cursor.execute('''
+            CREATE TEMP TABLE merge_ids AS
+            SELECT eh.id AS error_id, g.keep_id
+            FROM error_history eh
+            JOIN merge_groups g ON g.code_hash = eh.code_hash AND g.fingerprint = eh.fingerprint
+            WHERE eh.id != g.keep_id
+        ''')
+        cursor.execute('''
+            UPDATE error_history
+            SET occurrence_count = (SELECT occurrences FROM merge_groups WHERE keep_id = error_history.id),
+                last_seen = (SELECT last_seen FROM merge_groups WHERE keep_id = error_history.id)
+            WHERE id IN (SELECT keep_id FROM merge_groups)
+        ''')
+        # 해결책은 남는 행으로 옮기고, 적용 기록이 없는 같은 문구는 하나만 남김
+        cursor.execute('''
+            UPDATE solutions
+            SET error_id = (SELECT keep_id FROM merge_ids WHERE merge_ids.error_id = solutions.error_id)
+            WHERE error_id IN (SELECT error_id FROM merge_ids)
+        ''')
+        cursor.execute('''
+            DELETE FROM solutions
+            WHERE error_id IN (SELECT keep_id FROM merge_groups)
+              AND applied = 0 AND success IS NULL
+              AND id NOT IN (
+                  SELECT MIN(id) FROM solutions
+                  WHERE error_id IN (SELECT keep_id FROM merge_groups)
+                  GROUP BY error_id, solution_text
+              )
+        ''')
+        cursor.execute('DELETE FROM error_history WHERE id IN (SELECT error_id FROM merge_ids)')
+        cursor.execute('''
+            UPDATE error_fingerprints
+            SET last_error_id = (SELECT keep_id FROM merge_ids WHERE merge_ids.error_id = error_fingerprints.last_error_id)
+            WHERE last_error_id IN (SELECT error_id FROM merge_ids)
+        ''')
+        cursor.execute('DROP TABLE merge_ids')
+        cursor.execute('DROP TABLE merge_groups')
+
+        # 반복 제출 판별 (코드 해시 + 지문이 같으면 새 행 대신 발생 횟수 증가)
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_error_history_code_fingerprint
+            ON error_history(code_hash, fingerprint)
+        ''')
+
+    @staticmethod
+    def _v5_full_text_search(cursor: sqlite3.Cursor):
+        from .content_store import ContentStore
+        from .error_search import ErrorSearch
+
+        if 'code_terms' not in ErrorSchema._columns(cursor, 'error_history'):
+            cursor.execute('ALTER TABLE error_history ADD COLUMN code_terms TEXT')
+
+        # 기존 행의 코드 식별자 (본문은 content_blobs에서 1000행씩)
+        last_id = 0
+        while True:
+            rows = cursor.execute('''
+                SELECT id, code_blob FROM error_history
+                WHERE id > ? AND code_blob IS NOT NULL
+                ORDER BY id LIMIT 1000
+            ''', (last_id,)).fetchall()
+            if not rows:
+                break
+            texts = ContentStore.load(cursor, (row[1] for row in rows))
+            cursor.executemany('UPDATE error_history SET code_terms = ? WHERE id = ?', [
+                (ErrorSearch.code_terms(texts.get(row[1])), row[0]) for row in rows
+            ])
+            last_id = rows[-1][0]
+
+        # 전문 검색 색인 (rowid = error_history.id, 식별자의 '_'는 단어의 일부)
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS error_search USING fts5(
+                error_type, message, code, solutions,
+                tokenize = "unicode61 tokenchars '_'"
+            )
+        ''')
+        cursor.execute('DELETE FROM error_search')
+        cursor.execute('''
+            INSERT INTO error_search (rowid, error_type, message, code, solutions)
+            SELECT eh.id, eh.error_type, eh.error_message, eh.code_terms,
+                   (SELECT GROUP_CONCAT(s.solution_text, ' ') FROM solutions s WHERE s.error_id = eh.id)
+            FROM error_history eh
+        ''')
+
+        # 색인 동기화 트리거 (반복 제출로 메시지가 그대로면 색인을 다시 쓰지 않음)
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS error_history_search_insert AFTER INSERT ON error_history
+            BEGIN
+                INSERT INTO error_search (rowid, error_type, message, code, solutions)
+                VALUES (NEW.id, NEW.error_type, NEW.error_message, NEW.code_terms, NULL);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS error_history_search_update
+            AFTER UPDATE OF error_type, error_message, code_terms ON error_history
+            WHEN OLD.error_type IS NOT NEW.error_type
+              OR OLD.error_message IS NOT NEW.error_message
+              OR OLD.code_terms IS NOT NEW.code_terms
+            BEGIN
+                UPDATE error_search
+                SET error_type = NEW.error_type, message = NEW.error_message, code = NEW.code_terms
+                WHERE rowid = NEW.id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS error_history_search_delete AFTER DELETE ON error_history
+            BEGIN
+                DELETE FROM error_search WHERE rowid = OLD.id;
+            END
+        ''')
+        solutions_of = '''
+                UPDATE error_search
+                SET solutions = (SELECT GROUP_CONCAT(solution_text, ' ') FROM solutions WHERE error_id = {row}.error_id)
+                WHERE rowid = {row}.error_id;
+        '''
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS solutions_search_insert AFTER INSERT ON solutions
+            BEGIN {solutions_of.format(row='NEW')} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS solutions_search_delete AFTER DELETE ON solutions
+            BEGIN {solutions_of.format(row='OLD')} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS solutions_search_update AFTER UPDATE OF error_id, solution_text ON solutions
+            BEGIN {solutions_of.format(row='OLD')} {solutions_of.format(row='NEW')} END
+        ''')
+
+    # 발생 시각 → 시간 버킷 ('YYYY-MM-DD HH:00:00')
+    HOUR_BUCKET = "strftime('%Y-%m-%d %H:00:00', COALESCE({row}.last_seen, {row}.created_at, CURRENT_TIMESTAMP))"
+
+    @staticmethod
+    def _v6_statistics_rollups(cursor: sqlite3.Cursor):
+        # 타입별 발생 횟수 / 에러 수 (전체 개수 = 이 테이블의 합, 타입 수만큼의 행)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_error_types (
+                error_type TEXT PRIMARY KEY,
+                occurrences INTEGER NOT NULL DEFAULT 0,
+                errors INTEGER NOT NULL DEFAULT 0,
+                last_seen TIMESTAMP
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_stats_error_types_occurrences
+            ON stats_error_types(occurrences)
+        ''')
+        # 시간별 발생 횟수 (발생 기록이므로 에러 행을 지워도 줄지 않음)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_hourly (
+                bucket TEXT NOT NULL,
+                error_type TEXT NOT NULL,
+                occurrences INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bucket, error_type)
+            ) WITHOUT ROWID
+        ''')
+
+        # 기존 히스토리로 채움 (v4 이전의 반복 발생 시각은 남아 있지 않아 마지막 발생 시각에 합산)
+        cursor.execute('DELETE FROM stats_error_types')
+        cursor.execute('''
+            INSERT INTO stats_error_types (error_type, occurrences, errors, last_seen)
+            SELECT error_type, SUM(occurrence_count), COUNT(*), MAX(COALESCE(last_seen, created_at))
+            FROM error_history
+            GROUP BY error_type
+        ''')
+        cursor.execute('DELETE FROM stats_hourly')
+        cursor.execute(f'''
+            INSERT INTO stats_hourly (bucket, error_type, occurrences)
+            SELECT {ErrorSchema.HOUR_BUCKET.format(row='error_history')}, error_type, SUM(occurrence_count)
+            FROM error_history
+            GROUP BY 1, 2
+        ''')
+
+        # 에러 행과 같은 트랜잭션에서 갱신되도록 트리거로 유지
+        add_occurrences = '''
+                INSERT INTO stats_error_types (error_type, occurrences, errors, last_seen)
+                VALUES (NEW.error_type, NEW.occurrence_count, 1, COALESCE(NEW.last_seen, NEW.created_at))
+                ON CONFLICT(error_type) DO UPDATE SET
+                    occurrences = occurrences + excluded.occurrences,
+                    errors = errors + 1,
+                    last_seen = MAX(COALESCE(last_seen, ''), COALESCE(excluded.last_seen, ''));
+                INSERT INTO stats_hourly (bucket, error_type, occurrences)
+                VALUES ({bucket}, NEW.error_type, {delta})
+                ON CONFLICT(bucket, error_type) DO UPDATE SET occurrences = occurrences + excluded.occurrences;
+        '''
+        remove_occurrences = '''
+                UPDATE stats_error_types
+                SET occurrences = occurrences - OLD.occurrence_count, errors = errors - 1
+                WHERE error_type = OLD.error_type;
+        '''
+        bucket = ErrorSchema.HOUR_BUCKET.format(row='NEW')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS error_history_stats_insert AFTER INSERT ON error_history
+            BEGIN
+                {add_occurrences.format(bucket=bucket, delta='NEW.occurrence_count')}
+            END
+        ''')
+        # 반복 제출 (발생 횟수 증가분만 마지막 발생 시각의 버킷에 추가)
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS error_history_stats_update
+            AFTER UPDATE OF occurrence_count, error_type ON error_history
+            WHEN OLD.occurrence_count IS NOT NEW.occurrence_count OR OLD.error_type IS NOT NEW.error_type
+            BEGIN
+                {remove_occurrences}
+                {add_occurrences.format(bucket=bucket, delta='MAX(NEW.occurrence_count - OLD.occurrence_count, 0)')}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS error_history_stats_delete AFTER DELETE ON error_history
+            BEGIN
+                {remove_occurrences}
+            END
+        ''')
+
+    @staticmethod
+    def _v7_retention(cursor: sqlite3.Cursor):
+        # 보관 기간이 지나 아카이브로 옮긴 에러의 일별 집계 (원본 행이 없어도 날짜 / 타입별 추이는 남김)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_daily (
+                day TEXT NOT NULL,
+                error_type TEXT NOT NULL,
+                occurrences INTEGER NOT NULL DEFAULT 0,
+                errors INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, error_type)
+            ) WITHOUT ROWID
+        ''')
+        # 보관 기간 지난 행을 오래된 순으로 조금씩 꺼내기 위한 인덱스
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_last_seen
+            ON error_history(last_seen)
+        ''')
+        # 본문 참조 확인 (고아 content_blobs 정리 시 해시마다 인덱스 조회)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_code_blob
+            ON error_history(code_blob) WHERE code_blob IS NOT NULL
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_stderr_blob
+            ON error_history(stderr_blob) WHERE stderr_blob IS NOT NULL
+        ''')
+
+    @staticmethod
+    def _v8_history_browsing(cursor: sqlite3.Cursor):
+        # 지문별 히스토리를 시간 역순으로 페이지 조회 (지문 조회 쿼리도 같은 인덱스의 앞부분을 사용)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_error_history_fingerprint_created
+            ON error_history(fingerprint, created_at)
+        ''')
+        cursor.execute('DROP INDEX IF EXISTS idx_error_history_fingerprint')
+
+    @staticmethod
+    def _v9_import_tracking(cursor: sqlite3.Cursor):
+        # 가져온 번들 (같은 번들을 다시 가져와도 횟수가 두 번 합산되지 않게, 에러 ID 구간은 재개할 때 재사용)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS imported_bundles (
+                bundle_id TEXT PRIMARY KEY,
+                id_offset INTEGER NOT NULL,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP
+            ) WITHOUT ROWID
+        ''')
+        # 테이블별로 반영한 행 수 (배치와 같은 트랜잭션에서 갱신 - 중간에 실패하면 그 다음 행부터 재개)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS imported_bundle_progress (
+                bundle_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                rows_done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bundle_id, table_name)
+            ) WITHOUT ROWID
+        ''')
+
+    # (버전, 설명, 적용 함수) - 새 단계는 끝에만 추가하고 기존 단계는 수정하지 않음
+    MIGRATIONS: List[Tuple[int, str, Callable]] = [
+        (1, '기본 테이블 (error_history / solutions / error_patterns)', _v1_base_tables),
+        (2, '에러 지문 (error_fingerprints, error_history.fingerprint)', _v2_fingerprints),
+        (3, '조회 경로 인덱스', _v3_access_path_indexes),
+        (4, '코드 / stderr 본문 분리 (content_blobs) + 반복 제출 병합', _v4_content_blobs),
+        (5, '전문 검색 (error_search FTS5 + 동기화 트리거)', _v5_full_text_search),
+        (6, '통계 롤업 (stats_error_types / stats_hourly + 갱신 트리거)', _v6_statistics_rollups),
+        (7, '보관 정책 (stats_daily + 정리 작업용 인덱스)', _v7_retention),
+        (8, '히스토리 페이지 조회 (지문 + 생성 시각 인덱스)', _v8_history_browsing),
+        (9, '번들 가져오기 기록 (imported_bundles / imported_bundle_progress)', _v9_import_tracking),
+    ]
+
+    VERSION = MIGRATIONS[-1][0]
+
+    @staticmethod
+    def current_version(conn: sqlite3.Connection) -> int:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+
+    @staticmethod
+    def migrate(conn: sqlite3.Connection) -> List[int]:
+        """
+        남은 마이그레이션 적용 (호출하는 쪽의 쓰기 트랜잭션 안에서 실행 - 동시에 여러 프로세스가 열어도 한 번만 적용)
+
+        Args:
+            conn: BEGIN IMMEDIATE로 시작한 트랜잭션의 연결
+
+        Returns:
+            적용한 버전 리스트 (최신이면 빈 리스트)
+        """
+        version = ErrorSchema.current_version(conn)
+        applied = []
+        cursor = conn.cursor()
+        for target, _, apply in ErrorSchema.MIGRATIONS:
+            if target <= version:
+                continue
+            apply.__func__(cursor)
+            # user_version도 트랜잭션에 포함되어 실패 시 함께 롤백
+            cursor.execute(f'PRAGMA user_version = {int(target)}')
+            applied.append(target)
+        return applied
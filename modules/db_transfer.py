@@ -0,0 +1,634 @@
+"""
+에러 지식 베이스 내보내기 / 가져오기 - 환경 간 이동, 새 노드 초기 데이터
+테이블과 벡터 임베딩을 번들 디렉토리(manifest.json + 조각 파일)로 스트리밍 기록하고,
+가져올 때는 batch_size개씩 트랜잭션 / 임베딩 upsert로 묶어 메모리 사용량이 데이터 크기와 무관
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import uuid
+import base64
+import hashlib
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from .content_store import ContentStore
+from .db_schema import ErrorSchema
+from .error_search import ErrorSearch
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pyarrow 미설치 시 JSONL만 사용
+    pyarrow = None
+
+
+class _ChunkWriter:
+    """테이블 하나의 조각 파일 작성기 (chunk_rows행마다 새 파일)"""
+
+    def __init__(self, directory: str, name: str, fmt: str, compress: bool, chunk_rows: int, schema=None):
+        self.directory = directory
+        self.name = name
+        self.fmt = fmt
+        self.compress = compress
+        self.chunk_rows = chunk_rows
+        self.schema = schema
+        self.files = []
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._chunk_rows = 0
+
+    def _open(self):
+        extension = 'jsonl' if self.fmt == 'jsonl' else 'arrow'
+        filename = f'{self.name}.{len(self.files):05d}.{extension}' + ('.gz' if self.compress else '')
+        path = os.path.join(self.directory, filename)
+        self._file = gzip.open(path, 'wb', compresslevel=6) if self.compress else open(path, 'wb')
+        if self.fmt == 'arrow':
+            self._writer = pyarrow.ipc.new_stream(self._file, self.schema)
+        self.files.append(filename)
+        self._chunk_rows = 0
+
+    def _close_file(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, rows: List[Dict]):
+        while rows:
+            if self._file is None or self._chunk_rows >= self.chunk_rows:
+                self._close_file()
+                self._open()
+            part = rows[:self.chunk_rows - self._chunk_rows]
+            rows = rows[len(part):]
+            if self.fmt == 'arrow':
+                self._writer.write_batch(pyarrow.RecordBatch.from_pylist(part, schema=self.schema))
+            else:
+                self._file.write(''.join(
+                    json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n' for row in part
+                ).encode('utf-8'))
+            self._chunk_rows += len(part)
+            self.rows += len(part)
+
+    def close(self):
+        self._close_file()
+
+
+class HistoryTransfer:
+    """error_history.db + 벡터 DB 번들 내보내기 / 가져오기"""
+
+    MANIFEST = 'manifest.json'
+    BUNDLE_VERSION = 1
+    FORMATS = ('jsonl', 'arrow')
+    # JSONL의 임베딩 - float 목록을 10진수 문자열로 쓰는 대신 float32 바이트(little-endian)를 base64로 (크기 / 인코딩 시간 약 1/4)
+    EMBEDDING_ENCODING = 'float32-base64'
+
+    # 내보내는 순서 = 가져오는 순서 (본문 → 에러 → 에러를 참조하는 테이블)
+    TABLES = ('content_blobs', 'error_history', 'solutions', 'error_patterns', 'error_fingerprints', 'stats_daily')
+
+    # 다른 테이블에서 다시 만들 수 있거나 v4 이후 비어 있는 컬럼 (통계 / 검색 색인은 가져올 때 트리거가 생성)
+    SKIP_COLUMNS = {
+        'error_history': {'code_snippet', 'full_stderr'},
+        'content_blobs': {'size', 'data'}
+    }
+
+    # 번들 파일의 키 순서 (content_blobs는 압축 해제한 본문을 text로)
+    EXPORT_ORDER = {
+        'content_blobs': 'hash',
+        'error_history': 'id',
+        'solutions': 'id',
+        'error_patterns': 'id',
+        'error_fingerprints': 'fingerprint',
+        'stats_daily': 'day, error_type'
+    }
+
+    def __init__(self, db, vector_db=None, batch_size: Optional[int] = None, chunk_rows: Optional[int] = None):
+        """
+        Args:
+            db: 대상 ErrorDatabase
+            vector_db: 임베딩을 함께 옮길 VectorDatabase (None이면 테이블만)
+            batch_size: 읽기 / 트랜잭션 / upsert 한 번에 처리할 행 수 (None이면 Config)
+            chunk_rows: 조각 파일 하나의 최대 행 수 (None이면 Config)
+        """
+        from .config import Config
+
+        self.db = db
+        self.vector_db = vector_db
+        self.batch_size = max(1, batch_size or Config.TRANSFER_BATCH_SIZE)
+        self.chunk_rows = max(1, chunk_rows or Config.TRANSFER_CHUNK_ROWS)
+
+    # ========== 내보내기 ==========
+
+    @staticmethod
+    def _pack_embedding(embedding: List[float]) -> str:
+        values = array('f', embedding)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return base64.b64encode(values.tobytes()).decode('ascii')
+
+    @staticmethod
+    def _unpack_embedding(encoded: str) -> List[float]:
+        values = array('f')
+        values.frombytes(base64.b64decode(encoded))
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values.tolist()
+
+    def _export_columns(self, conn, table: str) -> List[str]:
+        columns = [row['name'] for row in conn.execute(f'PRAGMA table_info({table})')]
+        columns = [c for c in columns if c not in self.SKIP_COLUMNS.get(table, ())]
+        return columns + (['text'] if table == 'content_blobs' else [])
+
+    @staticmethod
+    def _arrow_schema(conn, table: str, columns: List[str]):
+        """SQLite 선언 타입 → Arrow 스키마 (정수형 / 실수형 외에는 문자열)"""
+        declared = {row['name']: (row['type'] or '').upper() for row in conn.execute(f'PRAGMA table_info({table})')}
+        fields = []
+        for column in columns:
+            kind = declared.get(column, 'TEXT')
+            if 'INT' in kind or 'BOOL' in kind:
+                arrow_type = pyarrow.int64()
+            elif 'REAL' in kind or 'FLOA' in kind or 'DOUB' in kind:
+                arrow_type = pyarrow.float64()
+            else:
+                arrow_type = pyarrow.string()
+            fields.append(pyarrow.field(column, arrow_type))
+        return pyarrow.schema(fields)
+
+    def _iter_table(self, conn, table: str, columns: List[str]) -> Iterator[List[Dict]]:
+        """테이블을 키 순서로 batch_size행씩 (한 SELECT를 fetchmany로 이어 읽음)"""
+        selected = [c for c in columns if c != 'text'] + (['data'] if table == 'content_blobs' else [])
+        cursor = conn.execute(f"SELECT {', '.join(selected)} FROM {table} ORDER BY {self.EXPORT_ORDER[table]}")
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            batch = [dict(row) for row in rows]
+            if table == 'content_blobs':
+                for row in batch:
+                    row['text'] = ContentStore.decompress(row.pop('data'))
+            yield batch
+
+    def export_bundle(self, path: str, fmt: str = 'jsonl', compress: bool = False,
+                      include_embeddings: bool = True) -> Dict:
+        """
+        번들 디렉토리로 내보내기 (모든 테이블을 한 읽기 트랜잭션에서 - 같은 시점의 스냅샷)
+
+        Args:
+            path: 번들 디렉토리 (없으면 생성, 이미 manifest.json이 있으면 거부)
+            fmt: 'jsonl' | 'arrow' (arrow는 pyarrow 필요)
+            compress: 조각 파일 gzip 압축
+            include_embeddings: vector_db가 있으면 임베딩도 내보냄
+
+        Returns:
+            manifest (+ 'elapsed')
+
+        Raises:
+            ValueError: 지원하지 않는 형식 / 이미 번들이 있는 디렉토리
+            RuntimeError: arrow 형식인데 pyarrow가 없는 경우
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"지원하지 않는 형식: {fmt} ({' | '.join(self.FORMATS)})")
+        if fmt == 'arrow' and pyarrow is None:
+            raise RuntimeError('arrow 형식에는 pyarrow가 필요합니다 (pip install pyarrow)')
+        if os.path.exists(os.path.join(path, self.MANIFEST)):
+            raise ValueError(f"이미 번들이 있는 디렉토리: {path}")
+        os.makedirs(path, exist_ok=True)
+
+        started = time.perf_counter()
+        manifest = {
+            'bundle_version': self.BUNDLE_VERSION,
+            'bundle_id': uuid.uuid4().hex,
+            'schema_version': ErrorSchema.VERSION,
+            'format': fmt,
+            'compression': 'gzip' if compress else None,
+            'exported_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'tables': {}
+        }
+
+        with self.db.connections.connection() as conn:
+            # 읽기 트랜잭션 - 내보내는 동안 기록된 에러는 포함하지 않음 (테이블 간 참조가 어긋나지 않게)
+            conn.execute('BEGIN')
+            try:
+                for table in self.TABLES:
+                    columns = self._export_columns(conn, table)
+                    schema = self._arrow_schema(conn, table, columns) if fmt == 'arrow' else None
+                    writer = _ChunkWriter(path, table, fmt, compress, self.chunk_rows, schema)
+                    try:
+                        for batch in self._iter_table(conn, table, columns):
+                            writer.write(batch)
+                    finally:
+                        writer.close()
+                    manifest['tables'][table] = {'files': writer.files, 'rows': writer.rows, 'columns': columns}
+                # 가져오는 쪽이 ID 구간을 미리 잡아 둘 수 있게
+                manifest['tables']['error_history']['max_id'] = conn.execute(
+                    'SELECT COALESCE(MAX(id), 0) FROM error_history'
+                ).fetchone()[0]
+            finally:
+                conn.rollback()
+
+        if include_embeddings and self.vector_db is not None:
+            schema = None
+            if fmt == 'arrow':
+                schema = pyarrow.schema([
+                    pyarrow.field('id', pyarrow.string()),
+                    pyarrow.field('embedding', pyarrow.list_(pyarrow.float32())),
+                    pyarrow.field('document', pyarrow.string()),
+                    pyarrow.field('metadata', pyarrow.string())
+                ])
+            writer = _ChunkWriter(path, 'embeddings', fmt, compress, self.chunk_rows, schema)
+            try:
+                for batch in self.vector_db.iter_records(self.batch_size):
+                    if fmt == 'arrow':
+                        # Arrow는 열 타입이 고정이라 메타데이터(키가 제각각)는 JSON 문자열로
+                        batch = [{**r, 'metadata': json.dumps(r['metadata'], ensure_ascii=False)} for r in batch]
+                    else:
+                        batch = [{**r, 'embedding': self._pack_embedding(r['embedding'])} for r in batch]
+                    writer.write(batch)
+            finally:
+                writer.close()
+            manifest['embeddings'] = {
+                'files': writer.files,
+                'rows': writer.rows,
+                'collection': self.vector_db.collection_name,
+                'encoding': 'float32' if fmt == 'arrow' else self.EMBEDDING_ENCODING
+            }
+
+        with open(os.path.join(path, self.MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        manifest['elapsed'] = time.perf_counter() - started
+        return manifest
+
+    # ========== 가져오기 ==========
+
+    def _read_rows(self, path: str, manifest: Dict, files: List[str]) -> Iterator[List[Dict]]:
+        """조각 파일들을 batch_size행씩 (파일 전체를 메모리에 올리지 않음)"""
+        compress = manifest.get('compression') == 'gzip'
+        for filename in files:
+            full_path = os.path.join(path, filename)
+            opener = gzip.open if compress else open
+            if manifest['format'] == 'arrow':
+                if pyarrow is None:
+                    raise RuntimeError('arrow 번들을 읽으려면 pyarrow가 필요합니다 (pip install pyarrow)')
+                with opener(full_path, 'rb') as f:
+                    for record_batch in pyarrow.ipc.open_stream(f):
+                        rows = record_batch.to_pylist()
+                        for i in range(0, len(rows), self.batch_size):
+                            yield rows[i:i + self.batch_size]
+                continue
+            with opener(full_path, 'rb') as f:
+                batch = []
+                for line in f:
+                    if line.strip():
+                        batch.append(json.loads(line))
+                    if len(batch) >= self.batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+
+    def _iter_embeddings(self, path: str, manifest: Dict) -> Iterator[List[Dict]]:
+        """번들의 임베딩을 VectorDatabase.upsert_records 형식으로 batch_size개씩"""
+        for batch in self._read_rows(path, manifest, manifest['embeddings']['files']):
+            for record in batch:
+                if isinstance(record['metadata'], str):
+                    record['metadata'] = json.loads(record['metadata'])
+                if isinstance(record['embedding'], str):
+                    record['embedding'] = self._unpack_embedding(record['embedding'])
+            yield batch
+
+    def import_bundle(self, path: str, include_embeddings: bool = True) -> Dict:
+        """
+        번들 가져오기 (기존 데이터에 병합, 같은 번들은 한 번만 반영)
+
+        - 에러 ID는 대상 DB의 마지막 ID 뒤로 옮겨 붙임 (빈 DB면 원래 ID 유지)
+        - 대상에 이미 있는 (코드 해시, 지문) 에러는 새 행 대신 발생 횟수를 합산하고, 없던 해결책만 추가
+          (지문이 없는 v2 이전 에러는 저장할 때처럼 병합하지 않음)
+        - 패턴 / 지문 / 일별 집계는 횟수 합산, 통계 롤업과 검색 색인은 트리거가 함께 갱신
+        - 번들 ID(manifest의 bundle_id, 없으면 manifest 해시)와 테이블별 반영 행 수를 배치와 같은 트랜잭션에 기록
+          → 끝까지 가져온 번들을 다시 가져오면 아무것도 바꾸지 않고 'already_imported'로 반환,
+            중간에 실패한 번들은 다시 실행하면 반영된 행 다음부터 이어서 가져옴 (횟수가 두 번 합산되지 않음)
+        - 다른 DB에서 내보낸 번들끼리는 같은 에러라도 각각 합산 (서로 다른 발생 기록이므로)
+
+        Args:
+            path: export_bundle로 만든 번들 디렉토리
+            include_embeddings: vector_db가 있고 번들에 임베딩이 있으면 upsert
+
+        Returns:
+            {'bundle_id': str, 'already_imported': bool,
+             'tables': {테이블: {'rows', 'inserted', 'merged', 'resumed'}}, 'embeddings': int, 'id_offset': int, 'elapsed': float}
+            (resumed: 이전 실행에서 이미 반영되어 건너뛴 행 수)
+
+        Raises:
+            ValueError: 번들이 아니거나 이 버전보다 새 스키마에서 내보낸 번들인 경우
+        """
+        manifest_path = os.path.join(path, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise ValueError(f"번들이 아님 ({self.MANIFEST} 없음): {path}")
+        with open(manifest_path, 'rb') as f:
+            raw_manifest = f.read()
+        manifest = json.loads(raw_manifest)
+        if manifest.get('bundle_version', 0) > self.BUNDLE_VERSION or manifest.get('schema_version', 0) > ErrorSchema.VERSION:
+            raise ValueError(
+                f"더 새 버전에서 내보낸 번들 (번들 v{manifest.get('bundle_version')}, "
+                f"스키마 v{manifest.get('schema_version')}) - 이 설치본을 먼저 업데이트하세요"
+            )
+
+        started = time.perf_counter()
+        # bundle_id가 없는 이전 번들은 manifest 내용으로 구분 (내보낸 시각 / 파일 목록이 들어 있음)
+        bundle_id = manifest.get('bundle_id') or hashlib.sha256(raw_manifest).hexdigest()
+        offset, progress, completed = self._begin_import(
+            bundle_id, manifest['tables'].get('error_history', {}).get('max_id', 0)
+        )
+        report = {'bundle_id': bundle_id, 'already_imported': completed, 'tables': {}, 'embeddings': 0, 'id_offset': offset}
+        if completed:
+            report['elapsed'] = time.perf_counter() - started
+            return report
+        state = {'offset': offset, 'remap': {}}
+
+        importers = {
+            'content_blobs': self._import_blobs,
+            'error_history': self._import_errors,
+            'solutions': self._import_solutions,
+            'error_patterns': self._import_patterns,
+            'error_fingerprints': self._import_fingerprints,
+            'stats_daily': self._import_daily
+        }
+        for table in self.TABLES:
+            entry = manifest['tables'].get(table)
+            if not entry:
+                continue
+            done = progress.get(table, 0)
+            counts = {'rows': 0, 'inserted': 0, 'merged': 0, 'resumed': 0}
+            for batch in self._read_rows(path, manifest, entry['files']):
+                skip = min(max(done - counts['rows'], 0), len(batch))
+                if skip:
+                    # 이전 실행에서 반영된 행 - 병합된 에러의 ID 대응만 다시 계산
+                    if table == 'error_history':
+                        self._restore_remap(batch[:skip], state)
+                    counts['rows'] += skip
+                    counts['resumed'] += skip
+                    batch = batch[skip:]
+                    if not batch:
+                        continue
+                with self.db.connections.transaction() as conn:
+                    inserted, merged = importers[table](conn.cursor(), batch, state)
+                    counts['rows'] += len(batch)
+                    conn.execute(self.PROGRESS_SQL, (bundle_id, table, counts['rows']))
+                counts['inserted'] += inserted
+                counts['merged'] += merged
+            report['tables'][table] = counts
+
+        embeddings = manifest.get('embeddings')
+        if include_embeddings and embeddings and self.vector_db is not None:
+            for batch in self._iter_embeddings(path, manifest):
+                report['embeddings'] += self.vector_db.upsert_records(batch)
+
+        with self.db.connections.transaction() as conn:
+            conn.execute(
+                'UPDATE imported_bundles SET completed_at = CURRENT_TIMESTAMP WHERE bundle_id = ?', (bundle_id,)
+            )
+
+        # 지문 조회 캐시는 가져온 해결책을 반영하도록 비움
+        with self.db._known_lock:
+            self.db._known.clear()
+
+        report['elapsed'] = time.perf_counter() - started
+        return report
+
+    PROGRESS_SQL = '''
+        INSERT INTO imported_bundle_progress (bundle_id, table_name, rows_done)
+        VALUES (?, ?, ?)
+        ON CONFLICT(bundle_id, table_name) DO UPDATE SET rows_done = excluded.rows_done
+    '''
+
+    def _begin_import(self, bundle_id: str, max_id: int):
+        """
+        가져오기 시작 기록 + 가져올 에러의 ID 구간 확보
+        (sqlite_sequence를 올려 두어 동시에 저장되는 에러와 겹치지 않게, 한 쓰기 트랜잭션이라 같은 번들을 동시에 가져와도 한 번만 확보)
+
+        Returns:
+            (번들 ID에 더할 값, {테이블: 이미 반영한 행 수}, 이미 끝까지 가져왔는지)
+        """
+        with self.db.connections.transaction() as conn:
+            row = conn.execute(
+                'SELECT id_offset, completed_at FROM imported_bundles WHERE bundle_id = ?', (bundle_id,)
+            ).fetchone()
+            if row is not None:
+                progress = {
+                    table: rows_done for table, rows_done in conn.execute(
+                        'SELECT table_name, rows_done FROM imported_bundle_progress WHERE bundle_id = ?', (bundle_id,)
+                    )
+                }
+                return row['id_offset'], progress, row['completed_at'] is not None
+
+            offset = conn.execute('''
+                SELECT MAX(
+                    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'error_history'), 0),
+                    COALESCE((SELECT MAX(id) FROM error_history), 0)
+                )
+            ''').fetchone()[0]
+            if max_id:
+                if conn.execute("SELECT 1 FROM sqlite_sequence WHERE name = 'error_history'").fetchone():
+                    conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'error_history'", (offset + max_id,))
+                else:
+                    conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('error_history', ?)", (offset + max_id,))
+            conn.execute('INSERT INTO imported_bundles (bundle_id, id_offset) VALUES (?, ?)', (bundle_id, offset))
+        return offset, {}, False
+
+    def _restore_remap(self, rows: List[Dict], state: Dict):
+        """재개 시 이미 반영된 에러 행의 ID 대응 복원 (기존 에러에 병합된 행은 번들 ID + offset이 아닌 그 에러 ID로)"""
+        with self.db.connections.connection() as conn:
+            existing = self._existing_errors(conn.cursor(), rows)
+        for row in rows:
+            error_id = existing.get((row['code_hash'], row.get('fingerprint')))
+            if error_id is not None and error_id != row['id'] + state['offset']:
+                state['remap'][row['id']] = error_id
+
+    @staticmethod
+    def _map_error_id(state: Dict, error_id: Optional[int]) -> Optional[int]:
+        if error_id is None:
+            return None
+        return state['remap'].get(error_id, error_id + state['offset'])
+
+    @staticmethod
+    def _import_blobs(cursor, batch: List[Dict], state: Dict):
+        rows = []
+        for row in batch:
+            text = row['text'] or ''
+            if ContentStore.digest(text) != row['hash']:
+                raise ValueError(f"본문 해시 불일치 (손상된 번들): {row['hash']}")
+            rows.append((row['hash'], len(text), ContentStore.compress(text), row.get('created_at')))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO content_blobs (hash, size, data, created_at)
+            VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', rows)
+        inserted = cursor.rowcount if cursor.rowcount >= 0 else len(rows)
+        return inserted, len(rows) - inserted
+
+    @staticmethod
+    def _existing_errors(cursor, batch: List[Dict]) -> Dict[tuple, int]:
+        """대상 DB에 이미 있는 (코드 해시, 지문) → 에러 ID (배치 전체를 IN 조회 몇 번으로)"""
+        keys = {(row['code_hash'], row.get('fingerprint')) for row in batch if row.get('fingerprint') is not None}
+        hashes = list({code_hash for code_hash, _ in keys})
+        found = {}
+        for i in range(0, len(hashes), ContentStore.LOOKUP_CHUNK):
+            chunk = hashes[i:i + ContentStore.LOOKUP_CHUNK]
+            for error_id, code_hash, fingerprint in cursor.execute(
+                f"SELECT id, code_hash, fingerprint FROM error_history WHERE code_hash IN ({','.join('?' * len(chunk))})",
+                chunk
+            ):
+                if (code_hash, fingerprint) in keys:
+                    found[(code_hash, fingerprint)] = error_id
+        return found
+
+    def _import_errors(self, cursor, batch: List[Dict], state: Dict):
+        columns = [c for c in batch[0] if c not in self.SKIP_COLUMNS['error_history']]
+        if 'code_terms' not in columns:
+            # code_terms가 없는 번들 - 본문에서 다시 추출
+            columns.append('code_terms')
+            texts = ContentStore.load(cursor, [row.get('code_blob') for row in batch])
+            for row in batch:
+                row['code_terms'] = ErrorSearch.code_terms(texts.get(row.get('code_blob')))
+
+        existing = self._existing_errors(cursor, batch)
+        inserts, merges = [], []
+        for row in batch:
+            error_id = existing.get((row['code_hash'], row.get('fingerprint')))
+            if error_id is not None:
+                state['remap'][row['id']] = error_id
+                merges.append((row.get('occurrence_count') or 1, row.get('last_seen'), row.get('last_seen'), error_id))
+            else:
+                inserts.append(tuple(
+                    row['id'] + state['offset'] if column == 'id' else row.get(column) for column in columns
+                ))
+
+        cursor.executemany(f'''
+            INSERT INTO error_history ({', '.join(columns)})
+            VALUES ({', '.join('?' * len(columns))})
+        ''', inserts)
+        cursor.executemany('''
+            UPDATE error_history
+            SET occurrence_count = occurrence_count + ?,
+                last_seen = MAX(COALESCE(last_seen, ?), COALESCE(?, last_seen))
+            WHERE id = ?
+        ''', merges)
+        return len(inserts), len(merges)
+
+    def _import_solutions(self, cursor, batch: List[Dict], state: Dict):
+        inserted = merged = 0
+        rows = []
+        for row in batch:
+            error_id = self._map_error_id(state, row['error_id'])
+            if row['error_id'] in state['remap']:
+                # 병합된 에러 - 같은 해결책이 이미 있으면 건너뜀
+                if cursor.execute(
+                    'SELECT 1 FROM solutions WHERE error_id = ? AND solution_text = ?', (error_id, row['solution_text'])
+                ).fetchone():
+                    merged += 1
+                    continue
+            rows.append((error_id, row['solution_text'], row.get('solution_type'),
+                         row.get('applied'), row.get('success'), row.get('created_at')))
+            inserted += 1
+        cursor.executemany('''
+            INSERT INTO solutions (error_id, solution_text, solution_type, applied, success, created_at)
+            VALUES (?, ?, ?, COALESCE(?, 0), ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', rows)
+        return inserted, merged
+
+    @staticmethod
+    def _upsert_counts(cursor, sql: str, rows: List[tuple], key_sql: str, keys: List[tuple]):
+        """합산 upsert (반환: 새 행 수, 합산된 행 수)"""
+        existing = sum(1 for key in keys if cursor.execute(key_sql, key).fetchone())
+        cursor.executemany(sql, rows)
+        return len(rows) - existing, existing
+
+    def _import_patterns(self, cursor, batch: List[Dict], state: Dict):
+        return self._upsert_counts(cursor, '''
+            INSERT INTO error_patterns (error_type, pattern, occurrence_count, last_seen)
+            VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ON CONFLICT(error_type, pattern) DO UPDATE SET
+                occurrence_count = occurrence_count + excluded.occurrence_count,
+                last_seen = MAX(COALESCE(last_seen, ''), excluded.last_seen)
+        ''', [
+            (row['error_type'], row['pattern'], row.get('occurrence_count') or 1, row.get('last_seen'))
+            for row in batch
+        ], 'SELECT 1 FROM error_patterns WHERE error_type = ? AND pattern = ?', [
+            (row['error_type'], row['pattern']) for row in batch
+        ])
+
+    def _import_fingerprints(self, cursor, batch: List[Dict], state: Dict):
+        return self._upsert_counts(cursor, '''
+            INSERT INTO error_fingerprints
+            (fingerprint, error_type, message_template, analysis, ai_solution, occurrence_count,
+             first_seen, last_seen, last_error_id)
+            VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP), ?)
+            ON CONFLICT(fingerprint) DO UPDATE SET
+                ai_solution = COALESCE(ai_solution, excluded.ai_solution),
+                occurrence_count = occurrence_count + excluded.occurrence_count,
+                first_seen = MIN(first_seen, excluded.first_seen),
+                last_seen = MAX(last_seen, excluded.last_seen),
+                last_error_id = CASE WHEN excluded.last_seen > last_seen THEN excluded.last_error_id ELSE last_error_id END
+        ''', [
+            (row['fingerprint'], row.get('error_type'), row.get('message_template'), row.get('analysis'),
+             row.get('ai_solution'), row.get('occurrence_count') or 1, row.get('first_seen'), row.get('last_seen'),
+             self._map_error_id(state, row.get('last_error_id')))
+            for row in batch
+        ], 'SELECT 1 FROM error_fingerprints WHERE fingerprint = ?', [(row['fingerprint'],) for row in batch])
+
+    def _import_daily(self, cursor, batch: List[Dict], state: Dict):
+        return self._upsert_counts(cursor, '''
+            INSERT INTO stats_daily (day, error_type, occurrences, errors)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(day, error_type) DO UPDATE SET
+                occurrences = occurrences + excluded.occurrences,
+                errors = errors + excluded.errors
+        ''', [
+            (row['day'], row['error_type'], row['occurrences'], row['errors']) for row in batch
+        ], 'SELECT 1 FROM stats_daily WHERE day = ? AND error_type = ?', [
+            (row['day'], row['error_type']) for row in batch
+        ])
+
+
+# 테스트 (임시 DB 내보내기 → 빈 DB로 가져오기 → 같은 DB로 다시 가져오기)
+if __name__ == '__main__':
+    import tempfile
+    from .error_database import ErrorDatabase
+
+    print("=" * 60)
+    print("📦 에러 지식 베이스 내보내기 / 가져오기 테스트")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = ErrorDatabase(os.path.join(tmp, 'source.db'), write_mode='sync')
+        for i in range(200):
+            source.save_error(f"value_{i} = compute(item_{i % 50})", {
+                'error_type': 'NameError',
+                'error_message': f"name 'item_{i % 50}' is not defined",
+                'line_number': 1,
+                'raw_error': f"Traceback...\nNameError: name 'item_{i % 50}' is not defined",
+                'solutions': [f'item_{i % 50} 정의 확인']
+            })
+
+        bundle = os.path.join(tmp, 'bundle')
+        manifest = HistoryTransfer(source, batch_size=64, chunk_rows=150).export_bundle(bundle, compress=True)
+        print(f"\n📤 내보내기: {({t: e['rows'] for t, e in manifest['tables'].items()})}")
+        print(f"   파일: {sorted(os.listdir(bundle))}")
+
+        target = ErrorDatabase(os.path.join(tmp, 'target.db'), write_mode='sync')
+        transfer = HistoryTransfer(target, batch_size=64)
+        print(f"\n📥 빈 DB로 가져오기: {transfer.import_bundle(bundle)['tables']}")
+        again = transfer.import_bundle(bundle)
+        print(f"📥 같은 번들 다시 가져오기: 이미 가져옴 = {again['already_imported']}")
+
+        stats = target.get_statistics()
+        print(f"\n📊 대상 DB: 총 {stats['total_errors']}회 (원본 {source.get_statistics()['total_errors']}회와 같아야 함)")
+        print(f"🔍 검색: {len(target.find_similar_errors({'error_type': 'NameError', 'error_message': 'item_7'}))}개")
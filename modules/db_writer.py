@@ -0,0 +1,167 @@
+"""
+에러 히스토리 쓰기 큐 - 요청 경로에서 디스크 커밋을 빼는 write-behind 작성기
+save_error는 항목을 큐에 넣고 바로 반환하며, 백그라운드 스레드가 쌓인 항목을
+트랜잭션 하나(executemany)로 묶어 기록 (쓰기가 몰릴수록 배치가 커져 커밋 수가 줄어듦)
+"""
+
+import os
+import time
+import queue
+import atexit
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class HistoryWriter:
+    """크기 제한 큐 + 백그라운드 배치 기록 스레드"""
+
+    _STOP = object()
+
+    def __init__(self,
+                 write_batch: Callable[[List], None],
+                 queue_size: int = 1024,
+                 batch_size: int = 256,
+                 name: str = 'history-writer'):
+        """
+        Args:
+            write_batch: 항목 리스트를 한 트랜잭션으로 기록하는 함수 (기록 스레드에서 호출)
+            queue_size: 큐 최대 크기 (가득 차면 put이 빈자리가 생길 때까지 대기 - 백프레셔)
+            batch_size: 트랜잭션 하나에 묶을 최대 항목 수
+            name: 기록 스레드 이름
+        """
+        self.write_batch = write_batch
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {'queued': 0, 'written': 0, 'batches': 0, 'failed': 0, 'backpressure_waits': 0}
+
+    def _ensure_thread(self):
+        """기록 스레드 시작 (최초 put 시, fork된 자식에서는 큐와 스레드를 새로 만듦)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # 부모의 스레드는 자식에 없으므로 남은 항목은 부모가 기록
+                self._queue = queue.Queue(maxsize=self.queue_size)
+            else:
+                atexit.register(self.close)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def put(self, item):
+        """
+        항목을 큐에 넣음 (큐가 가득 차면 기록 스레드가 비울 때까지 대기)
+
+        Raises:
+            RuntimeError: close() 이후 호출한 경우
+        """
+        if self._closed:
+            raise RuntimeError('HistoryWriter가 이미 종료됨')
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self._stats['backpressure_waits'] += 1
+            self._queue.put(item)
+        with self._lock:
+            self._stats['queued'] += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                return
+
+            # 기록하는 동안 쌓인 항목까지 한 번에 (대기 없이 꺼낼 수 있는 만큼)
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List):
+        try:
+            self.write_batch(batch)
+            written, failed = len(batch), 0
+        except Exception as e:
+            # 배치 전체가 롤백되었으므로 항목별로 다시 기록해 문제 항목만 버림
+            print(f"⚠️ 에러 히스토리 배치 기록 실패 ({len(batch)}개, 항목별 재시도): {e}")
+            written, failed = 0, 0
+            for item in batch:
+                try:
+                    self.write_batch([item])
+                    written += 1
+                except Exception as item_error:
+                    failed += 1
+                    print(f"⚠️ 에러 히스토리 항목 버림: {item_error}")
+        with self._lock:
+            self._stats['written'] += written
+            self._stats['failed'] += failed
+            self._stats['batches'] += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        지금까지 넣은 항목이 모두 기록될 때까지 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            모두 기록되었으면 True
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        if timeout is None:
+            self._queue.join()
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """남은 항목을 기록하고 스레드 종료 (프로세스 종료 시 atexit로도 호출)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread if self._pid == os.getpid() else None
+        if thread is None:
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+
+    def get_statistics(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            'pending': self._queue.unfinished_tasks,
+            'queue_size': self.queue_size,
+            'batch_size': self.batch_size
+        })
+        return stats
@@ -4,104 +4,54 @@
 """
 
 import re
-import traceback
 from typing import Dict, List, Optional
 
+from .error_rules import ErrorRuleRegistry
+from .traceback_parser import TracebackParser
+from .error_fingerprint import ErrorFingerprint
+
 
 class ErrorAnalyzer:
     """에러 분석 및 해결책 제시"""
     
-    # 일반적인 에러 패턴과 해결책
-    ERROR_PATTERNS = {
-        'ModuleNotFoundError': {
-            'pattern': r"No module named '(\w+)'",
-            'description': '필요한 패키지가 설치되지 않았습니다',
-            'solution_template': 'pip install {package}'
-        },
-        'ImportError': {
-            'pattern': r"cannot import name '(\w+)' from '(\w+)'",
-            'description': '모듈에서 해당 이름을 import할 수 없습니다',
-            'solutions': [
-                '철자가 올바른지 확인하세요',
-                '해당 함수/클래스가 실제로 존재하는지 확인하세요',
-                '패키지 버전이 호환되는지 확인하세요'
-            ]
-        },
-        'NameError': {
-            'pattern': r"name '(\w+)' is not defined",
-            'description': '변수 또는 함수가 정의되지 않았습니다',
-            'solutions': [
-                '변수/함수 이름의 철자를 확인하세요',
-                '변수를 사용하기 전에 정의했는지 확인하세요',
-                'import문이 누락되지 않았는지 확인하세요'
-            ]
-        },
-        'SyntaxError': {
-            'pattern': r'invalid syntax',
-            'description': '문법 오류가 있습니다',
-            'solutions': [
-                '괄호가 제대로 닫혔는지 확인하세요',
-                '콜론(:)이 누락되지 않았는지 확인하세요',
-                '들여쓰기가 올바른지 확인하세요',
-                '따옴표가 제대로 닫혔는지 확인하세요'
-            ]
-        },
-        'IndentationError': {
-            'pattern': r'unexpected indent|expected an indented block',
-            'description': '들여쓰기 오류',
-            'solutions': [
-                '들여쓰기를 일관되게 사용하세요 (탭 또는 스페이스 4칸)',
-                '함수/클래스 정의 후 콜론(:) 다음 줄은 들여쓰기 해야 합니다',
-                '같은 블록 내에서 들여쓰기 레벨을 맞추세요'
-            ]
-        },
-        'TypeError': {
-            'pattern': r"unsupported operand type|'(\w+)' object",
-            'description': '타입이 맞지 않습니다',
-            'solutions': [
-                '변수의 타입을 확인하세요 (int, str, list 등)',
-                '타입 변환이 필요한지 확인하세요 (예: str()int())',
-                '해당 연산이 그 타입에서 지원되는지 확인하세요'
-            ]
-        },
-        'AttributeError': {
-            'pattern': r"'(\w+)' object has no attribute '(\w+)'",
-            'description': '객체가 해당 속성/메서드를 가지고 있지 않습니다',
-            'solutions': [
-                '속성/메서드 이름의 철자를 확인하세요',
-                '객체 타입이 올바른지 확인하세요',
-                '해당 버전에서 지원하는 기능인지 확인하세요'
-            ]
-        },
-        'IndexError': {
-            'pattern': r'list index out of range',
-            'description': '리스트 인덱스가 범위를 벗어났습니다',
-            'solutions': [
-                '리스트의 길이를 확인하세요 (len())',
-                '인덱스가 0부터 시작함을 확인하세요',
-                '빈 리스트가 아닌지 확인하세요'
-            ]
-        }
+    # traceback 구조가 없는 텍스트용 폴백
+    ERROR_TYPE = re.compile(r'(\w+Error):')
+    LINE_NUMBER = re.compile(r'line (\d+)')
+    
+    # 규칙이 없는 예외에 대한 기본 안내
+    UNKNOWN_ERROR = {
+        'description': '알 수 없는 에러입니다',
+        'solutions': [
+            '에러 메시지를 주의 깊게 읽어보세요',
+            '온라인에서 에러 메시지를 검색해보세요',
+            '관련 문서를 확인하세요'
+        ],
+        'severity': 'medium'
     }
     
     @staticmethod
-    def analyze_error(stderr: str, code: str = '') -> Dict[str, any]:
+    def analyze_error(stderr: str, code: str = '', rules: Optional[ErrorRuleRegistry] = None) -> Dict[str, any]:
         """
         에러 메시지 분석
         
         Args:
             stderr: 에러 출력 (traceback 포함)
             code: 원본 코드 (선택)
+            rules: 사용할 규칙 레지스트리 (None이면 ErrorRuleRegistry.default())
             
         Returns:
             {
                 'error_detected': bool,
                 'error_type': str,
                 'error_message': str,
-                'line_number': int,
+                'line_number': int (최종 예외의 가장 안쪽 사용자 코드 프레임),
                 'description': str,
                 'solutions': [해결책 리스트],
-                'severity': str (low/medium/high)
+                'severity': str (low/medium/high),
+                'frames': [{'file', 'line', 'function', 'source', 'repeated'}] (최종 예외의 스택),
+                'frames_omitted': int (보관 한도로 생략된 중간 프레임 수),
+                'exception_chain': [{'type', 'message', 'relation'}] (최종 예외 이전의 연쇄 예외),
+                'fingerprint': str (같은 원인의 에러를 묶는 지문, ErrorFingerprint)
             }
         """
         if not stderr or not stderr.strip():
@@ -110,61 +60,64 @@ class ErrorAnalyzer:
                 'message': '에러가 없습니다'
             }
         
+        rules = rules or ErrorRuleRegistry.default()
         result = {
             'error_detected': True,
             'raw_error': stderr
         }
         
-        # 에러 타입 추출
-        error_type_match = re.search(r'(\w+Error):', stderr)
-        if error_type_match:
-            error_type = error_type_match.group(1)
-            result['error_type'] = error_type
-        else:
-            result['error_type'] = 'Unknown'
-        
-        # 에러 메시지 추출
-        error_lines = stderr.strip().split('\n')
-        if error_lines:
-            result['error_message'] = error_lines[-1]
+        # stderr를 한 번만 훑어 프레임 / 연쇄 예외 / 최종 예외로 구조화
+        parsed = TracebackParser.parse(stderr)
+        final = parsed['final']
+        frames = final['frames'] if final else []
         
-        # 라인 번호 추출
-        line_match = re.search(r'line (\d+)', stderr)
-        if line_match:
-            result['line_number'] = int(line_match.group(1))
+        error_type = final['type'].rsplit('.', 1)[-1] if final else None
+        # traceback 없이 예외 형식만 맞는 줄은 알려진 예외일 때만 인정
+        if error_type is not None and not frames and not (
+                rules.has_rules(error_type) or error_type.endswith(('Error', 'Exception'))):
+            error_type = None
         
-        # 패턴 매칭으로 해결책 찾기
-        error_type = result.get('error_type', 'Unknown')
-        if error_type in ErrorAnalyzer.ERROR_PATTERNS:
-            pattern_info = ErrorAnalyzer.ERROR_PATTERNS[error_type]
-            result['description'] = pattern_info['description']
-            
-            # 구체적인 해결책 생성
-            if 'solution_template' in pattern_info:
-                # 에러 메시지에서 패키지 이름 추출
-                match = re.search(pattern_info['pattern'], stderr)
-                if match:
-                    package = match.group(1)
-                    specific_solution = pattern_info['solution_template'].format(package=package)
-                    result['solutions'] = [specific_solution]
-            elif 'solutions' in pattern_info:
-                result['solutions'] = pattern_info['solutions']
+        if error_type is not None:
+            error_message = final['text']
         else:
-            # 알려지지 않은 에러
-            result['description'] = '알 수 없는 에러입니다'
-            result['solutions'] = [
-                '에러 메시지를 주의 깊게 읽어보세요',
-                '온라인에서 에러 메시지를 검색해보세요',
-                '관련 문서를 확인하세요'
-            ]
-        
-        # 심각도 판단
-        if error_type in ['SyntaxError', 'IndentationError']:
-            result['severity'] = 'high'
-        elif error_type in ['ModuleNotFoundError', 'ImportError', 'NameError']:
-            result['severity'] = 'high'
+            error_type_match = ErrorAnalyzer.ERROR_TYPE.search(stderr)
+            error_type = error_type_match.group(1) if error_type_match else 'Unknown'
+            stripped = stderr.rstrip()
+            error_message = stripped[stripped.rfind('\n') + 1:].strip()
+        result['error_type'] = error_type
+        result['error_message'] = error_message
+        
+        # 라인 번호: 최종 예외의 가장 안쪽 사용자 코드 프레임 (구조가 없으면 첫 'line N')
+        frame = TracebackParser.user_frame(frames)
+        if frame is not None:
+            result['line_number'] = frame['line']
+        else:
+            line_match = ErrorAnalyzer.LINE_NUMBER.search(stderr)
+            if line_match:
+                result['line_number'] = int(line_match.group(1))
+        
+        result['frames'] = frames
+        result['frames_omitted'] = final['frames_omitted'] if final else 0
+        # relation: 다음 예외와의 관계 (cause: raise ... from, context: 처리 중 다른 예외 발생)
+        chain = parsed['chain']
+        result['exception_chain'] = [
+            {'type': e['type'], 'message': e['message'], 'relation': chain[i + 1]['relation']}
+            for i, e in enumerate(chain[:-1])
+        ]
+        result['fingerprint'] = ErrorFingerprint.compute(result)
+        
+        # 해당 예외 타입의 규칙만 최종 예외 줄에 적용
+        found = rules.match(error_type, error_message)
+        if found:
+            rule, groups = found
+            result.update(rule.render(groups))
         else:
-            result['severity'] = 'medium'
+            # 알려지지 않은 에러
+            result.update({
+                'description': ErrorAnalyzer.UNKNOWN_ERROR['description'],
+                'solutions': list(ErrorAnalyzer.UNKNOWN_ERROR['solutions']),
+                'severity': ErrorAnalyzer.UNKNOWN_ERROR['severity']
+            })
         
         return result
     
@@ -193,6 +146,11 @@ class ErrorAnalyzer:
         lines.append(f"\n❌ 에러 메시지:")
         lines.append(f"   {analysis.get('error_message', 'N/A')}")
         
+        if analysis.get('exception_chain'):
+            lines.append(f"\n🔗 연쇄 예외:")
+            for exception in analysis['exception_chain']:
+                lines.append(f"   {exception['type']}: {exception['message']}")
+        
         if 'description' in analysis:
             lines.append(f"\n📖 설명:")
             lines.append(f"   {analysis['description']}")
@@ -257,3 +215,24 @@ NameError: name 'resultado' is not defined"""
     print("=" * 60)
     analysis2 = ErrorAnalyzer.analyze_error(test_stderr2)
     print(ErrorAnalyzer.format_analysis_report(analysis2))
+    
+    # 테스트 3: 연쇄 예외 (최종 예외와 안쪽 프레임 기준)
+    test_stderr3 = """Traceback (most recent call last):
+  File "main.py", line 3, in load
+    return config["path"]
+KeyError: 'path'
+
+The above exception was the direct cause of the following exception:
+
+Traceback (most recent call last):
+  File "main.py", line 9, in <module>
+    load({})
+  File "main.py", line 5, in load
+    raise ValueError("설정 파일 경로가 없습니다") from e
+ValueError: 설정 파일 경로가 없습니다"""
+    
+    print("\n" + "=" * 60)
+    print("테스트 3: 연쇄 예외")
+    print("=" * 60)
+    analysis3 = ErrorAnalyzer.analyze_error(test_stderr3)
+    print(ErrorAnalyzer.format_analysis_report(analysis3))
@@ -3,189 +3,544 @@
 에러 히스토리 저장, 검색, 학습
 """
 
-import sqlite3
 import json
+import base64
+import sqlite3
 import hashlib
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 import os
 
+from .error_fingerprint import ErrorFingerprint
+from .db_connection import ConnectionManager
+from .db_schema import ErrorSchema
+from .db_writer import HistoryWriter
+from .content_store import ContentStore
+from .error_search import ErrorSearch
+
 
 class ErrorDatabase:
     """에러 히스토리 데이터베이스"""
     
-    def __init__(self, db_path: str = 'data/error_history.db'):
+    FINGERPRINT_CACHE_SIZE = 512  # 지문 조회 결과 메모리 캐시 항목 수
+    BEST_SOLUTIONS = 5            # 지문 조회 시 돌려줄 해결책 수
+    HISTORY_PAGE_MAX = 200        # 히스토리 조회 페이지 최대 크기
+    HISTORY_SCAN_MAX = 5000       # 히스토리 조회 한 페이지에서 확인할 최대 행 수 (페이지 비용 상한)
+    
+    # ========== 조회 쿼리 (explain_query_plans로 인덱스 사용 여부 확인) ==========
+    
+    SIMILAR_COLUMNS = '''
+            eh.id, eh.code_hash, eh.fingerprint, eh.error_type, eh.error_message, eh.line_number, eh.code_blob,
+            eh.occurrence_count, eh.created_at,
+            (SELECT GROUP_CONCAT(s.solution_text, '|||') FROM solutions s WHERE s.error_id = eh.id) as solutions,
+            (SELECT GROUP_CONCAT(s.success, ',') FROM solutions s WHERE s.error_id = eh.id) as success_flags
+    '''
+    
+    # 검색어가 없을 때: 같은 타입의 최근 에러 N개를 인덱스 순서로 먼저 고르고, 그 행들의 해결책만 모음
+    SIMILAR_ERRORS_SQL = f'''
+        SELECT {SIMILAR_COLUMNS}
+        FROM error_history eh
+        WHERE eh.error_type = ?
+        ORDER BY eh.created_at DESC, eh.id DESC
+        LIMIT ?
+    '''
+    
+    # 같은 타입 중 메시지 / 코드 / 해결책이 비슷한 에러 (error_search FTS5, BM25 순)
+    SEARCH_SQL = '''
+        SELECT rowid, bm25(error_search, {}, {}, {}, {}) as rank
+        FROM error_search
+        WHERE error_search MATCH ?
+        ORDER BY rank, rowid DESC
+        LIMIT ?
+    '''.format(*ErrorSearch.BM25_WEIGHTS)
+    
+    # 검색어의 문서 빈도 (limit에서 멈추므로 흔한 단어도 비용이 일정)
+    TERM_DOCS_SQL = '''
+        SELECT COUNT(*) FROM (
+            SELECT rowid FROM error_search WHERE error_search MATCH ? LIMIT ?
+        )
+    '''
+    
+    SIMILAR_BY_ID_SQL = f'''
+        SELECT {SIMILAR_COLUMNS}
+        FROM error_history eh
+        WHERE eh.id IN (%s)
+    '''
+    
+    # ========== 통계 (롤업 테이블 - 히스토리 크기와 무관하게 타입 수 / 시간 수만큼만 읽음) ==========
+    
+    # 아카이브로 옮긴 에러는 삭제 트리거가 stats_error_types에서 빼고 stats_daily에 남으므로 둘을 합산
+    TOTAL_ERRORS_SQL = '''
+        SELECT (SELECT COALESCE(SUM(occurrences), 0) FROM stats_error_types)
+             + (SELECT COALESCE(SUM(occurrences), 0) FROM stats_daily)
+    '''
+    
+    COUNT_BY_TYPE_SQL = '''
+        SELECT error_type, occurrences as count
+        FROM stats_error_types
+        WHERE occurrences > 0
+        ORDER BY occurrences DESC
+        LIMIT ?
+    '''
+    
+    # 아카이브된 발생 횟수 (타입별, 일별 집계 크기만큼만 읽음)
+    ARCHIVED_BY_TYPE_SQL = '''
+        SELECT error_type, SUM(occurrences) as count
+        FROM stats_daily
+        GROUP BY error_type
+    '''
+    
+    HOURLY_COUNTS_SQL = '''
+        SELECT bucket, SUM(occurrences) as count
+        FROM stats_hourly
+        WHERE bucket >= strftime('%Y-%m-%d %H:00:00', 'now', ?)
+        GROUP BY bucket
+        ORDER BY bucket
+    '''
+    
+    TOP_PATTERNS_SQL = '''
+        SELECT error_type, pattern, occurrence_count
+        FROM error_patterns
+        ORDER BY occurrence_count DESC
+        LIMIT ?
+    '''
+    
+    RECENT_ERRORS_SQL = '''
+        SELECT * FROM error_history
+        ORDER BY created_at DESC
+        LIMIT ?
+    '''
+    
+    # ========== 히스토리 페이지 조회 (키셋 페이지네이션 - 페이지 비용이 위치와 무관) ==========
+    
+    # 필터 인덱스 순서대로 (created_at, id) 역순 범위를 읽음 - {where}는 지문 / 타입 / 기간 / 커서 조건
+    HISTORY_WINDOW_SQL = '''
+        SELECT id, created_at FROM error_history
+        WHERE {where}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    '''
+    
+    # 텍스트 검색: 일치하는 에러를 ID(저장 순서) 역순으로 (FTS5가 rowid 범위 / 순서를 직접 처리)
+    HISTORY_SEARCH_SQL = '''
+        SELECT rowid as id FROM error_search
+        WHERE error_search MATCH ? AND rowid < ?
+        ORDER BY rowid DESC
+        LIMIT ?
+    '''
+    
+    HISTORY_COLUMNS = '''
+            id, error_type, error_message, line_number, fingerprint, code_blob,
+            occurrence_count, created_at, last_seen
+    '''
+    
+    # 같은 지문의 에러에 기록된 해결책 (적용 성공이 많은 순)
+    FINGERPRINT_SOLUTIONS_SQL = '''
+        SELECT
+            MAX(s.id) as solution_id,
+            s.solution_text,
+            SUM(s.success = 1) as success_count,
+            SUM(s.success = 0) as failure_count
+        FROM error_history eh
+        JOIN solutions s ON s.error_id = eh.id
+        WHERE eh.fingerprint = ?
+        GROUP BY s.solution_text
+        ORDER BY success_count DESC, failure_count ASC, COUNT(*) DESC
+        LIMIT ?
+    '''
+    
+    # 이름 → (쿼리, 예시 파라미터, 허용하는 임시 B-tree 용도)
+    # 집계 결과를 개수 순으로 정렬하는 것은 인덱스로 피할 수 없으므로 ORDER BY용만 허용
+    QUERY_PLAN_CHECKS = {
+        'similar_errors': (SIMILAR_ERRORS_SQL, ('NameError', 5), ()),
+        'similar_search': (SEARCH_SQL, ('error_type : "NameError" AND "foo"', 5), ('ORDER BY',)),
+        'count_by_type': (COUNT_BY_TYPE_SQL, (-1,), ()),
+        'hourly_counts': (HOURLY_COUNTS_SQL, ('-23 hours',), ()),
+        'top_patterns': (TOP_PATTERNS_SQL, (10,), ()),
+        'recent_errors': (RECENT_ERRORS_SQL, (10,), ()),
+        'fingerprint_lookup': ('SELECT * FROM error_fingerprints WHERE fingerprint = ?', ('0' * 40,), ()),
+        'fingerprint_solutions': (FINGERPRINT_SOLUTIONS_SQL, ('0' * 40, 5), ('GROUP BY', 'ORDER BY')),
+        'history_page': (HISTORY_WINDOW_SQL.format(where='(created_at, id) < (?, ?)'), ('9999', 0, 51), ()),
+        'history_type': (
+            HISTORY_WINDOW_SQL.format(where='error_type = ? AND created_at >= ? AND (created_at, id) < (?, ?)'),
+            ('NameError', '2024-01-01', '9999', 0, 51), ()
+        ),
+        'history_fingerprint': (
+            HISTORY_WINDOW_SQL.format(where='fingerprint = ? AND (created_at, id) < (?, ?)'), ('0' * 40, '9999', 0, 51), ()
+        ),
+        'history_search': (HISTORY_SEARCH_SQL, ('"foo"', 2 ** 62, 51), ())
+    }
+    
+    def __init__(self,
+                 db_path: str = 'data/error_history.db',
+                 connections: Optional[ConnectionManager] = None,
+                 write_mode: Optional[str] = None):
         """
         Args:
             db_path: 데이터베이스 파일 경로
+            connections: 사용할 연결 관리자 (None이면 파일별 공용 관리자)
+            write_mode: 'async' (쓰기 큐 + 백그라운드 배치 커밋) | 'sync' (save_error 안에서 커밋, CLI)
+                        None이면 Config.DB_WRITE_MODE
         """
+        from .config import Config
+        
         self.db_path = db_path
+        self.write_mode = (write_mode or Config.DB_WRITE_MODE).lower()
+        if self.write_mode not in ('async', 'sync'):
+            raise ValueError(f"지원하지 않는 write_mode: {self.write_mode} (async | sync)")
+        
+        # 지문 → 조회 결과 (없음도 None으로 캐시, 저장 / 해결책 결과 기록 시 무효화)
+        self._known = OrderedDict()
+        self._known_lock = threading.Lock()
         
         # 디렉토리 생성
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
+        # 같은 파일을 쓰는 인스턴스(웹 서버 / CLI / 오케스트레이터)는 연결 풀 공유
+        self.connections = connections or ConnectionManager.shared(db_path)
+        
         # 데이터베이스 초기화
         self._init_database()
+        
+        # 비동기 모드: 요청 경로에서는 큐에 넣기만 하고 기록 스레드가 모아서 커밋
+        self.writer = None
+        if self.write_mode == 'async':
+            self.writer = HistoryWriter(
+                self._write_records,
+                queue_size=Config.DB_WRITE_QUEUE_SIZE,
+                batch_size=Config.DB_WRITE_BATCH_SIZE
+            )
     
     def _init_database(self):
-        """데이터베이스 테이블 생성"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 에러 히스토리 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS error_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                code_hash TEXT NOT NULL,
-                error_type TEXT NOT NULL,
-                error_message TEXT,
-                line_number INTEGER,
-                code_snippet TEXT,
-                full_stderr TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 해결책 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS solutions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                error_id INTEGER NOT NULL,
-                solution_text TEXT NOT NULL,
-                solution_type TEXT,
-                applied BOOLEAN DEFAULT 0,
-                success BOOLEAN DEFAULT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (error_id) REFERENCES error_history(id)
-            )
-        ''')
-        
-        # 에러 패턴 테이블 (자주 발생하는 패턴)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS error_patterns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                error_type TEXT NOT NULL,
-                pattern TEXT NOT NULL,
-                occurrence_count INTEGER DEFAULT 1,
-                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(error_type, pattern)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """스키마를 최신 버전으로 마이그레이션 (PRAGMA user_version 기준, ErrorSchema)"""
+        with self.connections.transaction() as conn:
+            applied = ErrorSchema.migrate(conn)
+        if applied:
+            print(f"🗄️  에러 DB 스키마 v{applied[0] - 1} → v{applied[-1]} 적용 ({self.db_path})")
     
     @staticmethod
     def _hash_code(code: str) -> str:
         """코드의 해시값 생성"""
         return hashlib.md5(code.encode()).hexdigest()
     
-    def save_error(self, code: str, error_analysis: Dict) -> int:
+    def save_error(self, code: str, error_analysis: Dict, ai_solution: Optional[str] = None) -> Optional[int]:
         """
-        에러 저장
+        에러 저장 (비동기 모드는 쓰기 큐에 넣고 바로 반환, 기록 스레드가 모아서 커밋)
         
         Args:
             code: 에러가 발생한 코드
             error_analysis: ErrorAnalyzer.analyze_error() 결과
+            ai_solution: LLM이 생성한 해결책 (있으면 지문에 보관해 같은 에러에 재사용)
             
         Returns:
-            error_id
+            error_id (비동기 모드는 아직 기록 전이므로 None)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        code_hash = self._hash_code(code)
-        
-        cursor.execute('''
-            INSERT INTO error_history 
-            (code_hash, error_type, error_message, line_number, code_snippet, full_stderr)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            code_hash,
-            error_analysis.get('error_type', 'Unknown'),
-            error_analysis.get('error_message', ''),
-            error_analysis.get('line_number'),
-            code[:500],  # 처음 500자만
-            error_analysis.get('raw_error', '')
-        ))
-        
-        error_id = cursor.lastrowid
-        
-        # 해결책 저장
-        if 'solutions' in error_analysis:
-            for solution in error_analysis['solutions']:
-                cursor.execute('''
-                    INSERT INTO solutions (error_id, solution_text, solution_type)
-                    VALUES (?, ?, ?)
-                ''', (error_id, solution, 'auto_generated'))
-        
-        # 패턴 업데이트
+        record = self._prepare_record(code, error_analysis, ai_solution)
+        
+        if self.writer is None:
+            return self._write_records([record])[0]
+        
+        self.writer.put(record)
+        return None
+    
+    def _prepare_record(self, code: str, error_analysis: Dict, ai_solution: Optional[str]) -> Dict:
+        """저장할 값 계산 (요청 스레드에서 미리 해 두어 기록 스레드는 SQL만 실행)"""
         error_type = error_analysis.get('error_type', 'Unknown')
-        pattern = error_analysis.get('error_message', '')[:200]
+        error_message = error_analysis.get('error_message', '')
+        fingerprint = error_analysis.get('fingerprint') or ErrorFingerprint.compute(error_analysis)
         
-        cursor.execute('''
-            INSERT INTO error_patterns (error_type, pattern, occurrence_count)
-            VALUES (?, ?, 1)
-            ON CONFLICT(error_type, pattern) 
-            DO UPDATE SET 
-                occurrence_count = occurrence_count + 1,
-                last_seen = CURRENT_TIMESTAMP
-        ''', (error_type, pattern))
+        # 지문에 보관할 분석 결과는 원본 stderr 없이
+        analysis = {k: v for k, v in error_analysis.items() if k != 'raw_error'}
+        analysis['fingerprint'] = fingerprint
         
-        conn.commit()
-        conn.close()
+        return {
+            'code_hash': self._hash_code(code),
+            'error_type': error_type,
+            'error_message': error_message,
+            'line_number': error_analysis.get('line_number'),
+            'code': code,
+            'full_stderr': error_analysis.get('raw_error', ''),
+            'fingerprint': fingerprint,
+            'message_template': ErrorFingerprint.normalize_message(error_type, error_message),
+            'analysis': json.dumps(analysis, ensure_ascii=False, default=str),
+            'ai_solution': ai_solution,
+            'solutions': list(error_analysis.get('solutions') or []),
+            'pattern': error_message[:200]
+        }
+    
+    def _write_records(self, records: List[Dict]) -> List[int]:
+        """
+        레코드 여러 개를 트랜잭션 하나로 기록 (테이블별 executemany)
+        코드 / stderr 본문은 content_blobs에 해시로 한 번만 저장하고,
+        이미 있는 (코드 해시, 지문) 조합은 새 행 대신 발생 횟수만 증가
+        
+        Returns:
+            레코드 순서대로 error_id (반복 제출이면 기존 행 ID)
+        """
+        with self.connections.transaction() as conn:
+            cursor = conn.cursor()
+            
+            code_blobs = ContentStore.store(cursor, [r['code'] for r in records])
+            stderr_blobs = ContentStore.store(cursor, [r['full_stderr'] for r in records])
+            
+            # 쓰기 잠금을 잡은 상태이므로 AUTOINCREMENT 다음 값부터 ID를 직접 배정
+            cursor.execute('''
+                SELECT MAX(
+                    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'error_history'), 0),
+                    COALESCE((SELECT MAX(id) FROM error_history), 0)
+                )
+            ''')
+            next_id = cursor.fetchone()[0] + 1
+            
+            error_ids, inserts, repeats = [], [], []
+            known_ids = {}  # 배치 안에서 앞서 나온 같은 조합
+            for r, code_blob, stderr_blob in zip(records, code_blobs, stderr_blobs):
+                key = (r['code_hash'], r['fingerprint'])
+                error_id = known_ids.get(key)
+                if error_id is None:
+                    cursor.execute(
+                        'SELECT id FROM error_history WHERE code_hash = ? AND fingerprint = ?', key
+                    )
+                    row = cursor.fetchone()
+                    error_id = row[0] if row else None
+                
+                if error_id is None:
+                    error_id = next_id
+                    next_id += 1
+                    inserts.append((error_id, r, code_blob, stderr_blob))
+                else:
+                    repeats.append((r['error_message'], r['line_number'], stderr_blob, error_id))
+                known_ids[key] = error_id
+                error_ids.append(error_id)
+            
+            cursor.executemany('''
+                INSERT INTO error_history 
+                (id, code_hash, error_type, error_message, line_number, code_blob, stderr_blob, fingerprint,
+                 code_terms, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', [
+                (error_id, r['code_hash'], r['error_type'], r['error_message'], r['line_number'],
+                 code_blob, stderr_blob, r['fingerprint'], ErrorSearch.code_terms(r['code']))
+                for error_id, r, code_blob, stderr_blob in inserts
+            ])
+            
+            # 반복 제출: 발생 횟수 / 마지막 발생만 갱신 (stderr는 주소 등이 다를 수 있어 최신으로)
+            cursor.executemany('''
+                UPDATE error_history
+                SET occurrence_count = occurrence_count + 1,
+                    last_seen = CURRENT_TIMESTAMP,
+                    error_message = ?,
+                    line_number = ?,
+                    stderr_blob = ?
+                WHERE id = ?
+            ''', repeats)
+            
+            # 지문 갱신
+            cursor.executemany('''
+                INSERT INTO error_fingerprints
+                (fingerprint, error_type, message_template, analysis, ai_solution, last_error_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(fingerprint)
+                DO UPDATE SET
+                    analysis = excluded.analysis,
+                    ai_solution = COALESCE(excluded.ai_solution, ai_solution),
+                    occurrence_count = occurrence_count + 1,
+                    last_seen = CURRENT_TIMESTAMP,
+                    last_error_id = excluded.last_error_id
+            ''', [
+                (r['fingerprint'], r['error_type'], r['message_template'], r['analysis'], r['ai_solution'], error_id)
+                for error_id, r in zip(error_ids, records)
+            ])
+            
+            # 해결책 저장 (새 행만 - 반복 제출은 같은 자동 해결책이 이미 있음)
+            cursor.executemany('''
+                INSERT INTO solutions (error_id, solution_text, solution_type)
+                VALUES (?, ?, ?)
+            ''', [
+                (error_id, solution, 'auto_generated')
+                for error_id, r, _, _ in inserts
+                for solution in r['solutions']
+            ])
+            
+            # 패턴 업데이트
+            cursor.executemany('''
+                INSERT INTO error_patterns (error_type, pattern, occurrence_count)
+                VALUES (?, ?, 1)
+                ON CONFLICT(error_type, pattern) 
+                DO UPDATE SET 
+                    occurrence_count = occurrence_count + 1,
+                    last_seen = CURRENT_TIMESTAMP
+            ''', [(r['error_type'], r['pattern']) for r in records])
+        
+        with self._known_lock:
+            for r in records:
+                self._known.pop(r['fingerprint'], None)
+        
+        return error_ids
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        쓰기 큐에 남은 에러를 모두 기록할 때까지 대기 (동기 모드는 항상 True)
         
-        return error_id
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+    
+    def close(self):
+        """쓰기 큐를 비우고 기록 스레드 종료 (이후 save_error는 사용 불가)"""
+        if self.writer is not None:
+            self.writer.close()
     
-    def find_similar_errors(self, error_analysis: Dict, limit: int = 5) -> List[Dict]:
+    def lookup_fingerprint(self, fingerprint: Optional[str]) -> Optional[Dict]:
         """
-        유사한 에러 검색
+        지문으로 이미 본 에러 조회 (LLM / 벡터 검색 전에 사용, 반복 조회는 메모리 캐시)
+        
+        Args:
+            fingerprint: ErrorFingerprint.compute() 결과 (analyze_error 결과의 'fingerprint')
+            
+        Returns:
+            {
+                'fingerprint': str,
+                'error_type': str,
+                'message_template': str,
+                'analysis': 마지막으로 저장된 분석 결과,
+                'ai_solution': str 또는 None,
+                'occurrence_count': int,
+                'first_seen': str, 'last_seen': str,
+                'best_solutions': [{'solution_id', 'solution_text', 'success_count', 'failure_count'}]
+            }
+            처음 보는 지문이면 None (반환값은 캐시와 공유되므로 수정하지 말 것)
+        """
+        if not fingerprint:
+            return None
+        
+        with self._known_lock:
+            if fingerprint in self._known:
+                self._known.move_to_end(fingerprint)
+                return self._known[fingerprint]
+        
+        known = self._load_fingerprint(fingerprint)
+        
+        with self._known_lock:
+            self._known[fingerprint] = known
+            while len(self._known) > self.FINGERPRINT_CACHE_SIZE:
+                self._known.popitem(last=False)
+        return known
+    
+    def _load_fingerprint(self, fingerprint: str) -> Optional[Dict]:
+        with self.connections.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM error_fingerprints WHERE fingerprint = ?
+            ''', (fingerprint,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            
+            cursor.execute(self.FINGERPRINT_SOLUTIONS_SQL, (fingerprint, self.BEST_SOLUTIONS))
+            best_solutions = [
+                {
+                    'solution_id': s['solution_id'],
+                    'solution_text': s['solution_text'],
+                    'success_count': s['success_count'] or 0,
+                    'failure_count': s['failure_count'] or 0
+                }
+                for s in cursor.fetchall()
+            ]
+        
+        return {
+            'fingerprint': row['fingerprint'],
+            'error_type': row['error_type'],
+            'message_template': row['message_template'],
+            'analysis': json.loads(row['analysis']),
+            'ai_solution': row['ai_solution'],
+            'occurrence_count': row['occurrence_count'],
+            'first_seen': row['first_seen'],
+            'last_seen': row['last_seen'],
+            'best_solutions': best_solutions
+        }
+    
+    def find_similar_errors(self, error_analysis: Dict, limit: int = 5, code: Optional[str] = None) -> List[Dict]:
+        """
+        유사한 에러 검색 (같은 타입 중 메시지 / 코드 / 해결책 BM25 순, 검색어가 없거나 결과가 없으면 최근 순)
         
         Args:
             error_analysis: 현재 에러 분석 결과
             limit: 최대 결과 수
+            code: 에러가 난 코드 (있으면 코드 식별자도 검색하고, 같은 코드로 저장된 이 에러 자체는 제외)
             
         Returns:
-            유사 에러 리스트
+            유사 에러 리스트 ('score': BM25 점수, 'relevance': 1위 대비 비율 - 최근 순이면 None)
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
         error_type = error_analysis.get('error_type', 'Unknown')
+        terms = ErrorSearch.query_terms(error_analysis, code)
         
-        # 같은 에러 타입 검색
-        cursor.execute('''
-            SELECT 
-                eh.*,
-                GROUP_CONCAT(s.solution_text, '|||') as solutions,
-                GROUP_CONCAT(s.success, ',') as success_flags
-            FROM error_history eh
-            LEFT JOIN solutions s ON eh.id = s.error_id
-            WHERE eh.error_type = ?
-            GROUP BY eh.id
-            ORDER BY eh.created_at DESC
-            LIMIT ?
-        ''', (error_type, limit))
+        # 저장 후에 검색하는 호출자(웹 / CLI)를 위해 방금 저장한 자기 자신은 건너뜀
+        current = None
+        if code:
+            current = (self._hash_code(code),
+                       error_analysis.get('fingerprint') or ErrorFingerprint.compute(error_analysis))
+        fetch = limit + 1 if current else limit
         
+        with self.connections.connection() as conn:
+            cursor = conn.cursor()
+            
+            scores = {}
+            query = ErrorSearch.match_query(error_type, self._selective_terms(cursor, terms))
+            if query:
+                cursor.execute(self.SEARCH_SQL, (query, fetch))
+                scores = {row['rowid']: -row['rank'] for row in cursor.fetchall()}
+            
+            if scores:
+                cursor.execute(self.SIMILAR_BY_ID_SQL % ','.join('?' * len(scores)), list(scores))
+                order = {error_id: i for i, error_id in enumerate(scores)}
+                rows = sorted(cursor.fetchall(), key=lambda row: order[row['id']])
+            else:
+                # 같은 타입의 최근 에러
+                cursor.execute(self.SIMILAR_ERRORS_SQL, (error_type, fetch))
+                rows = cursor.fetchall()
+            
+            rows = [row for row in rows if (row['code_hash'], row['fingerprint']) != current][:limit]
+            code_texts = ContentStore.load(cursor, (row['code_blob'] for row in rows))
+        
+        best = max((scores[row['id']] for row in rows), default=0) if scores else 0
         results = []
-        for row in cursor.fetchall():
+        for row in rows:
             solutions = row['solutions'].split('|||') if row['solutions'] else []
-            success_flags = row['success_flags'].split(',') if row['success_flags'] else []
+            score = scores.get(row['id'])
             
             results.append({
                 'id': row['id'],
                 'error_type': row['error_type'],
                 'error_message': row['error_message'],
                 'line_number': row['line_number'],
-                'code_snippet': row['code_snippet'],
+                'code_snippet': code_texts.get(row['code_blob'], '')[:500],
                 'solutions': solutions,
-                'created_at': row['created_at']
+                'occurrence_count': row['occurrence_count'],
+                'created_at': row['created_at'],
+                'score': score,
+                'relevance': score / best if score is not None and best > 0 else None
             })
         
-        conn.close()
         return results
     
+    def _selective_terms(self, cursor, terms: List[str]) -> List[str]:
+        """색인에 있고 너무 흔하지 않은 검색어만 문서 빈도가 낮은 순으로 (ErrorSearch.MAX_QUERY_TERMS개)"""
+        counted = []
+        for term in terms:
+            cursor.execute(self.TERM_DOCS_SQL, (ErrorSearch.term_query(term), ErrorSearch.MAX_TERM_DOCS + 1))
+            docs = cursor.fetchone()[0]
+            if 0 < docs <= ErrorSearch.MAX_TERM_DOCS:
+                counted.append((docs, term))
+        counted.sort()
+        return [term for _, term in counted[:ErrorSearch.MAX_QUERY_TERMS]]
+    
     def mark_solution_result(self, solution_id: int, success: bool):
         """
         해결책 적용 결과 기록
@@ -194,86 +549,269 @@ class ErrorDatabase:
             solution_id: 해결책 ID
             success: 성공 여부
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE solutions
-            SET applied = 1, success = ?
-            WHERE id = ?
-        ''', (1 if success else 0, solution_id))
-        
-        conn.commit()
-        conn.close()
+        with self.connections.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE solutions
+                SET applied = 1, success = ?
+                WHERE id = ?
+            ''', (1 if success else 0, solution_id))
+        
+        # 해결책 순위가 바뀌므로 지문 조회 캐시 무효화
+        with self._known_lock:
+            self._known.clear()
     
     def get_statistics(self) -> Dict:
         """
-        통계 정보 조회
+        통계 정보 조회 (롤업 테이블에서 읽음)
         
         Returns:
             {
                 'total_errors': int,
                 'error_by_type': {...},
-                'most_common_patterns': [...]
+                'most_common_patterns': [...],
+                'hourly': [{'hour', 'count'}] (최근 24시간, 발생한 시간만)
             }
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # 전체 에러 개수
-        cursor.execute('SELECT COUNT(*) as count FROM error_history')
-        total_errors = cursor.fetchone()['count']
-        
-        # 타입별 에러 개수
-        cursor.execute('''
-            SELECT error_type, COUNT(*) as count
-            FROM error_history
-            GROUP BY error_type
-            ORDER BY count DESC
-        ''')
-        error_by_type = {row['error_type']: row['count'] for row in cursor.fetchall()}
-        
-        # 가장 흔한 패턴
-        cursor.execute('''
-            SELECT error_type, pattern, occurrence_count
-            FROM error_patterns
-            ORDER BY occurrence_count DESC
-            LIMIT 10
-        ''')
-        most_common_patterns = [
-            {
-                'error_type': row['error_type'],
-                'pattern': row['pattern'],
-                'count': row['occurrence_count']
-            }
-            for row in cursor.fetchall()
-        ]
-        
-        conn.close()
+        with self.connections.connection() as conn:
+            cursor = conn.cursor()
+            
+            # 전체 에러 개수 (반복 제출 포함)
+            cursor.execute(self.TOTAL_ERRORS_SQL)
+            total_errors = cursor.fetchone()[0]
+            
+            # 타입별 에러 개수 (아카이브 포함)
+            error_by_type = self.count_by_type(cursor)
+            
+            # 가장 흔한 패턴
+            cursor.execute(self.TOP_PATTERNS_SQL, (10,))
+            most_common_patterns = [
+                {
+                    'error_type': row['error_type'],
+                    'pattern': row['pattern'],
+                    'count': row['occurrence_count']
+                }
+                for row in cursor.fetchall()
+            ]
         
         return {
             'total_errors': total_errors,
             'error_by_type': error_by_type,
-            'most_common_patterns': most_common_patterns
+            'most_common_patterns': most_common_patterns,
+            'hourly': self.get_hourly_counts()
         }
     
+    @staticmethod
+    def count_by_type(cursor: sqlite3.Cursor, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        타입별 발생 횟수 (현재 히스토리 stats_error_types + 아카이브 stats_daily, 많은 순)
+        
+        Args:
+            cursor: 사용할 커서 (호출한 쪽의 연결)
+            limit: 상위 N개 (None이면 전체)
+        """
+        counts = {row[0]: row[1] for row in cursor.execute(ErrorDatabase.COUNT_BY_TYPE_SQL, (-1,))}
+        for error_type, archived in cursor.execute(ErrorDatabase.ARCHIVED_BY_TYPE_SQL):
+            counts[error_type] = counts.get(error_type, 0) + archived
+        ranked = sorted(((t, c) for t, c in counts.items() if c > 0), key=lambda item: item[1], reverse=True)
+        return dict(ranked[:limit] if limit is not None else ranked)
+    
+    def get_hourly_counts(self, hours: int = 24) -> List[Dict]:
+        """
+        시간별 발생 횟수 (stats_hourly, UTC 기준 시간 버킷)
+        
+        Args:
+            hours: 현재 시간을 포함해 거슬러 올라갈 시간 수
+        """
+        with self.connections.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.HOURLY_COUNTS_SQL, (f'-{max(0, int(hours) - 1)} hours',))
+            return [{'hour': row['bucket'], 'count': row['count']} for row in cursor.fetchall()]
+    
     def get_recent_errors(self, limit: int = 10) -> List[Dict]:
         """최근 에러 조회"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with self.connections.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(self.RECENT_ERRORS_SQL, (limit,))
+            
+            results = [dict(row) for row in cursor.fetchall()]
+            
+            # 본문은 content_blobs에서
+            texts = ContentStore.load(cursor, [r['code_blob'] for r in results] + [r['stderr_blob'] for r in results])
+            for result in results:
+                result['code_snippet'] = texts.get(result['code_blob'], '')[:500]
+                result['full_stderr'] = texts.get(result['stderr_blob'], '')
         
-        cursor.execute('''
-            SELECT * FROM error_history
-            ORDER BY created_at DESC
-            LIMIT ?
-        ''', (limit,))
+        return results
+    
+    @staticmethod
+    def _encode_cursor(created_at: str, error_id: int) -> str:
+        return base64.urlsafe_b64encode(f'{created_at}|{error_id}'.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, int]:
+        try:
+            created_at, error_id = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().rsplit('|', 1)
+            return created_at, int(error_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError(f"잘못된 cursor: {cursor}")
+    
+    @staticmethod
+    def _normalize_time(value: Optional[str], name: str) -> Optional[str]:
+        """ISO 8601 시각 → created_at과 같은 UTC 'YYYY-MM-DD HH:MM:SS' (시간대가 없으면 UTC로 간주)"""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError(f"{name}: ISO 8601 형식이 아닌 시각 ({value})")
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed.strftime('%Y-%m-%d %H:%M:%S')
+    
+    def query_history(self,
+                      error_type: Optional[str] = None,
+                      since: Optional[str] = None,
+                      until: Optional[str] = None,
+                      fingerprint: Optional[str] = None,
+                      text: Optional[str] = None,
+                      limit: int = 50,
+                      cursor: Optional[str] = None) -> Dict:
+        """
+        에러 히스토리 페이지 조회 (필터 + 키셋 페이지네이션)
         
-        results = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        한 페이지에서 읽는 행은 최대 HISTORY_SCAN_MAX개 (인덱스로 거를 수 없는 필터가 겹치면
+        페이지가 덜 차더라도 next_cursor를 돌려주고, 이어서 요청하면 그 다음부터 읽음)
+        - 텍스트 없음: 지문 → 타입 → 전체 순으로 인덱스를 골라 생성 시각 역순
+        - 텍스트 있음: error_search에서 ID(저장 순서) 역순, 나머지 필터는 읽은 범위 안에서 확인
         
-        return results
+        Args:
+            error_type: 예외 타입
+            since / until: 생성 시각 범위 [since, until) (ISO 8601)
+            fingerprint: 에러 지문
+            text: 타입 / 메시지 / 코드 / 해결책 검색어 (모든 단어 포함)
+            limit: 페이지 크기 (1 ~ HISTORY_PAGE_MAX)
+            cursor: 이전 페이지의 next_cursor
+            
+        Returns:
+            {'items': [...], 'next_cursor': str | None, 'has_more': bool, 'scanned': int, 'limit': int}
+            
+        Raises:
+            ValueError: 시각 / cursor 형식이 잘못된 경우
+        """
+        limit = max(1, min(int(limit), self.HISTORY_PAGE_MAX))
+        since = self._normalize_time(since, 'since')
+        until = self._normalize_time(until, 'until')
+        after = self._decode_cursor(cursor) if cursor else None
+        match = ErrorSearch.text_query(text) if text else None
+        if text and match is None:
+            return {'items': [], 'next_cursor': None, 'has_more': False, 'scanned': 0, 'limit': limit}
+        
+        # 인덱스 범위로 처리하지 못하는 조건 (읽은 범위 안에서 확인)
+        residual, residual_params = [], []
+        if match:
+            for column, value in (('error_type', error_type), ('fingerprint', fingerprint)):
+                if value:
+                    residual.append(f'{column} = ?')
+                    residual_params.append(value)
+            if since:
+                residual.append('created_at >= ?')
+                residual_params.append(since)
+            if until:
+                residual.append('created_at < ?')
+                residual_params.append(until)
+            window_sql = self.HISTORY_SEARCH_SQL
+            window_params = [match, after[1] if after else 2 ** 63 - 1]
+        else:
+            # 지문이 있으면 지문 인덱스, 타입은 그 안에서 확인
+            where, window_params = [], []
+            if fingerprint:
+                where.append('fingerprint = ?')
+                window_params.append(fingerprint)
+                if error_type:
+                    residual.append('error_type = ?')
+                    residual_params.append(error_type)
+            elif error_type:
+                where.append('error_type = ?')
+                window_params.append(error_type)
+            if since:
+                where.append('created_at >= ?')
+                window_params.append(since)
+            if until:
+                where.append('created_at < ?')
+                window_params.append(until)
+            if after:
+                where.append('(created_at, id) < (?, ?)')
+                window_params.extend(after)
+            window_sql = self.HISTORY_WINDOW_SQL.format(where=' AND '.join(where) or '1')
+        
+        # 남는 조건이 없으면 페이지 + 1행만, 있으면 HISTORY_SCAN_MAX행까지 읽고 그 안에서 거름
+        scan = self.HISTORY_SCAN_MAX if residual else limit + 1
+        with self.connections.connection() as conn:
+            db_cursor = conn.cursor()
+            window = [row['id'] for row in db_cursor.execute(window_sql, window_params + [scan]).fetchall()]
+            
+            rows = []
+            if window:
+                order = 'id DESC' if match else 'created_at DESC, id DESC'
+                db_cursor.execute(f'''
+                    SELECT {self.HISTORY_COLUMNS} FROM error_history
+                    WHERE id IN ({','.join('?' * len(window))}){''.join(f' AND {c}' for c in residual)}
+                    ORDER BY {order}
+                    LIMIT ?
+                ''', window + residual_params + [limit + 1])
+                rows = [dict(row) for row in db_cursor.fetchall()]
+            
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = self._encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+            elif len(window) == scan and residual:
+                # 읽은 범위를 다 확인했지만 더 있을 수 있음 - 범위의 마지막 행부터 이어서
+                db_cursor.execute('SELECT created_at FROM error_history WHERE id = ?', (window[-1],))
+                next_cursor = self._encode_cursor(db_cursor.fetchone()[0], window[-1])
+            
+            texts = ContentStore.load(db_cursor, [r['code_blob'] for r in rows])
+        
+        for row in rows:
+            row['code_snippet'] = texts.get(row.pop('code_blob'), '')[:500]
+        
+        return {
+            'items': rows,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+            'scanned': len(window),
+            'limit': limit
+        }
+    
+    def explain_query_plans(self, queries: Optional[Dict] = None) -> Dict[str, Dict]:
+        """
+        조회 쿼리의 EXPLAIN QUERY PLAN 검사 (인덱스 회귀 확인용)
+        
+        Args:
+            queries: {이름: (쿼리, 파라미터, 허용 임시 B-tree 용도)} (None이면 QUERY_PLAN_CHECKS)
+            
+        Returns:
+            {이름: {'plan': [단계], 'full_scans': [인덱스 없는 테이블 스캔], 'temp_btrees': [허용되지 않은 임시 정렬], 'ok': bool}}
+        """
+        report = {}
+        with self.connections.connection() as conn:
+            for name, (sql, params, allowed_temp) in (queries or self.QUERY_PLAN_CHECKS).items():
+                plan = [row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+                full_scans = [step for step in plan if step.startswith('SCAN') and 'INDEX' not in step]
+                temp_btrees = [
+                    step for step in plan
+                    if 'TEMP B-TREE' in step and not any(step.endswith(f'FOR {use}') for use in allowed_temp)
+                ]
+                report[name] = {
+                    'plan': plan,
+                    'full_scans': full_scans,
+                    'temp_btrees': temp_btrees,
+                    'ok': not full_scans and not temp_btrees
+                }
+        return report
 
 
 # 테스트
@@ -294,13 +832,27 @@ if __name__ == '__main__':
         'solutions': ['pip install numpy', '철자 확인']
     }
     
-    error_id = db.save_error("import numpy", test_error)
-    print(f"✅ 에러 저장됨 (ID: {error_id})")
+    db.save_error("import numpy", test_error)
+    db.flush()
+    print(f"✅ 에러 저장됨 (쓰기 큐: {db.writer.get_statistics() if db.writer else '동기 모드'})")
+    
+    # 지문 조회 (같은 에러를 다시 저장하면 발생 횟수 증가)
+    fingerprint = ErrorFingerprint.compute(test_error)
+    known = db.lookup_fingerprint(fingerprint)
+    print(f"\n🔖 지문 {fingerprint[:12]}... → {known['occurrence_count']}회, "
+          f"해결책 {len(known['best_solutions'])}개")
     
     # 유사 에러 검색
     similar = db.find_similar_errors(test_error)
     print(f"\n🔍 유사 에러 {len(similar)}개 발견")
     
+    # 인덱스 사용 확인
+    plans = db.explain_query_plans()
+    print(f"\n🧭 쿼리 플랜: {sum(p['ok'] for p in plans.values())}/{len(plans)} 통과")
+    for name, plan in plans.items():
+        if not plan['ok']:
+            print(f"   ❌ {name}: {plan['plan']}")
+    
     # 통계
     stats = db.get_statistics()
     print(f"\n📊 통계:")
@@ -0,0 +1,102 @@
+"""
+에러 지문 - 같은 원인의 에러를 하나로 묶는 식별자
+정규화한 예외 타입 + 메시지 템플릿 + 가장 안쪽 사용자 코드 프레임 몇 개의 해시
+(줄 번호 대신 함수 이름과 소스 줄을 사용해 위쪽 코드가 바뀌어도 같은 지문 유지)
+"""
+
+import os
+import re
+import hashlib
+from typing import Dict, List
+
+from .traceback_parser import TracebackParser
+
+
+class ErrorFingerprint:
+    """Sentry 방식 에러 지문 계산"""
+
+    VERSION = 1           # 계산 방식이 바뀌면 올려서 이전 지문과 섞이지 않게 함
+    USER_FRAMES = 3       # 지문에 포함할 사용자 코드 프레임 수 (안쪽부터)
+    MAX_TEMPLATE = 300    # 메시지 템플릿 최대 길이
+
+    # 메시지에서 실행마다 달라지는 부분 → 자리표시자
+    NORMALIZERS = (
+        (re.compile(r'0x[0-9a-fA-F]+'), '<addr>'),
+        (re.compile(r"'[^'\n]*'|\"[^\"\n]*\""), '<str>'),
+        (re.compile(r'(?<![\w<])-?\d+(?:\.\d+)?(?![\w>])'), '<num>'),
+        (re.compile(r'\s+'), ' ')
+    )
+
+    @staticmethod
+    def normalize_message(error_type: str, message: str) -> str:
+        """
+        예외 메시지 → 템플릿 ("name 'foo' is not defined" → "name <str> is not defined")
+
+        Args:
+            error_type: 예외 타입 (메시지 앞의 "[모듈.]타입: " 접두어 제거용)
+            message: 예외 메시지 (error_message)
+        """
+        message = (message or '').split('\n', 1)[0]
+        head, separator, rest = message.partition(': ')
+        if head.rsplit('.', 1)[-1] == error_type:
+            message = rest if separator else ''
+        for pattern, placeholder in ErrorFingerprint.NORMALIZERS:
+            message = pattern.sub(placeholder, message)
+        return message.strip()[:ErrorFingerprint.MAX_TEMPLATE]
+
+    @staticmethod
+    def frame_key(frame: Dict[str, any]) -> str:
+        """프레임 → 지문 구성요소 (파일 이름 + 함수 + 공백 정리한 소스, 소스가 없으면 줄 번호)"""
+        filename = os.path.basename(frame.get('file') or '')
+        source = ' '.join((frame.get('source') or '').split())
+        location = source or f"line {frame.get('line')}"
+        return f"{filename}:{frame.get('function') or ''}:{location}"
+
+    @staticmethod
+    def components(error_analysis: Dict[str, any]) -> List[str]:
+        """지문을 이루는 정규화된 구성요소 (디버깅 / 표시용)"""
+        error_type = error_analysis.get('error_type') or 'Unknown'
+        parts = [
+            f'v{ErrorFingerprint.VERSION}',
+            error_type,
+            ErrorFingerprint.normalize_message(error_type, error_analysis.get('error_message', ''))
+        ]
+
+        user_frames = [f for f in error_analysis.get('frames') or () if not TracebackParser.is_library_frame(f)]
+        parts.extend(ErrorFingerprint.frame_key(f) for f in reversed(user_frames[-ErrorFingerprint.USER_FRAMES:]))
+        return parts
+
+    @staticmethod
+    def compute(error_analysis: Dict[str, any]) -> str:
+        """
+        에러 분석 결과의 지문
+
+        Args:
+            error_analysis: ErrorAnalyzer.analyze_error() 결과 (frames가 없으면 타입 + 메시지만 사용)
+
+        Returns:
+            40자리 16진수 문자열
+        """
+        joined = '\x1f'.join(ErrorFingerprint.components(error_analysis))
+        return hashlib.sha1(joined.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🔖 에러 지문 테스트")
+    print("=" * 60)
+
+    base = {
+        'error_type': 'NameError',
+        'error_message': "NameError: name 'foo' is not defined",
+        'frames': [{'file': 'main.py', 'line': 3, 'function': '<module>', 'source': 'print(foo)'}]
+    }
+    moved = dict(base, frames=[dict(base['frames'][0], line=10)])
+    other = dict(base, error_message="NameError: name 'bar' is not defined",
+                 frames=[{'file': 'main.py', 'line': 3, 'function': '<module>', 'source': 'print(bar)'}])
+
+    print(f"\n구성요소: {ErrorFingerprint.components(base)}")
+    print(f"지문: {ErrorFingerprint.compute(base)}")
+    print(f"줄 번호만 다름 → 같은 지문: {ErrorFingerprint.compute(base) == ErrorFingerprint.compute(moved)}")
+    print(f"다른 이름 → 다른 지문: {ErrorFingerprint.compute(base) != ErrorFingerprint.compute(other)}")
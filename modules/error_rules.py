@@ -0,0 +1,193 @@
+"""
+에러 규칙 레지스트리 - ErrorAnalyzer가 사용하는 진단 규칙
+data/error_rules/*.json 규칙을 한 번 컴파일해 예외 타입별로 색인하고,
+분석 시에는 해당 예외 타입의 규칙만 마지막 예외 메시지에 적용
+"""
+
+import os
+import re
+import json
+import glob
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class ErrorRule:
+    """컴파일된 규칙 하나"""
+
+    __slots__ = ('exception', 'pattern', 'description', 'solutions', 'severity', 'priority', 'source')
+
+    def __init__(self, spec: Dict[str, any], source: str = ''):
+        """
+        Args:
+            spec: {
+                'exception': str (예외 타입 이름, 필수),
+                'pattern': str (메시지 정규식, 없으면 해당 타입 전체에 적용),
+                'description': str, 'solutions': [str] (named group으로 {이름} 치환),
+                'severity': 'low' | 'medium' | 'high', 'priority': int (클수록 먼저)
+            }
+            source: 규칙 파일 경로 (오류 메시지용)
+
+        Raises:
+            ValueError: 필수 항목이 없거나 정규식이 잘못된 경우
+        """
+        if not spec.get('exception'):
+            raise ValueError(f"{source}: 규칙에 'exception'이 없습니다: {spec}")
+
+        self.exception = spec['exception']
+        try:
+            self.pattern = re.compile(spec['pattern']) if spec.get('pattern') else None
+        except re.error as e:
+            raise ValueError(f"{source}: {self.exception} 규칙 정규식 오류: {e}")
+        self.description = spec.get('description', '')
+        self.solutions = spec.get('solutions')
+        self.severity = spec.get('severity', 'medium')
+        self.priority = int(spec.get('priority', 0))
+        self.source = source
+
+    def match(self, message: str) -> Optional[Dict[str, str]]:
+        """메시지에 적용 (일치하면 named group dict, 패턴 없는 규칙은 항상 {})"""
+        if self.pattern is None:
+            return {}
+        found = self.pattern.search(message)
+        if found is None:
+            return None
+        return {k: v for k, v in found.groupdict().items() if v is not None}
+
+    @staticmethod
+    def _fill(template: str, groups: Dict[str, str]) -> str:
+        try:
+            return template.format_map(groups)
+        except (KeyError, IndexError, ValueError):
+            return template
+
+    def render(self, groups: Dict[str, str]) -> Dict[str, any]:
+        """일치한 그룹으로 설명 / 해결책 채우기"""
+        rendered = {
+            'description': self._fill(self.description, groups),
+            'severity': self.severity
+        }
+        if self.solutions is not None:
+            rendered['solutions'] = [self._fill(s, groups) for s in self.solutions]
+        return rendered
+
+
+class ErrorRuleRegistry:
+    """예외 타입별로 색인된 규칙 모음"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, specs: Optional[List[Tuple[Dict[str, any], str]]] = None):
+        """
+        Args:
+            specs: [(규칙 dict, 출처)] - 같은 예외 타입 안에서는 priority 내림차순, 같으면 등록 순서
+        """
+        self._index = {}
+        self._count = 0
+        for spec, source in specs or []:
+            self.add(ErrorRule(spec, source))
+
+    def add(self, rule: ErrorRule):
+        rules = self._index.setdefault(rule.exception, [])
+        rules.append(rule)
+        # 안정 정렬이므로 같은 priority는 등록 순서 유지
+        rules.sort(key=lambda r: -r.priority)
+        self._count += 1
+
+    @staticmethod
+    def load(paths: List[str]) -> 'ErrorRuleRegistry':
+        """
+        JSON 규칙 파일 / 디렉토리에서 레지스트리 생성 (디렉토리는 *.json을 이름 순으로)
+
+        Args:
+            paths: 파일 또는 디렉토리 경로 리스트
+
+        Returns:
+            ErrorRuleRegistry
+        """
+        return ErrorRuleRegistry(ErrorRuleRegistry.read_specs(paths))
+
+    @staticmethod
+    def read_specs(paths: List[str]) -> List[Tuple[Dict[str, any], str]]:
+        """규칙 파일을 읽어 [(규칙 dict, 파일 경로)] 반환 (컴파일 전)"""
+        specs = []
+        for path in paths:
+            files = sorted(glob.glob(os.path.join(path, '*.json'))) if os.path.isdir(path) else [path]
+            for file_path in files:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    rules = json.load(f)
+                if not isinstance(rules, list):
+                    raise ValueError(f"{file_path}: 규칙 파일은 JSON 리스트여야 합니다")
+                specs.extend((spec, file_path) for spec in rules)
+        return specs
+
+    @staticmethod
+    def default() -> 'ErrorRuleRegistry':
+        """Config.ERROR_RULES_PATHS 기준 공용 레지스트리 (최초 호출 시 로드)"""
+        with ErrorRuleRegistry._default_lock:
+            if ErrorRuleRegistry._default is None:
+                ErrorRuleRegistry._default = ErrorRuleRegistry.load(ErrorRuleRegistry.default_paths())
+        return ErrorRuleRegistry._default
+
+    @staticmethod
+    def default_paths() -> List[str]:
+        """Config.ERROR_RULES_PATHS (os.pathsep 구분)"""
+        from .config import Config
+
+
+        return [p for p in Config.ERROR_RULES_PATHS.split(os.pathsep) if p]
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def exception_types(self) -> List[str]:
+        return list(self._index)
+
+    def has_rules(self, exception: str) -> bool:
+        return exception in self._index
+
+    def rules_for(self, exception: str) -> List[ErrorRule]:
+        return self._index.get(exception, [])
+
+    def match(self, exception: str, message: str) -> Optional[Tuple[ErrorRule, Dict[str, str]]]:
+        """
+        예외 타입의 규칙을 순서대로 메시지에 적용해 처음 일치한 규칙 반환
+
+        Args:
+            exception: 예외 타입 이름
+            message: 마지막 예외 줄 (타입 포함 가능)
+
+        Returns:
+            (규칙, named group dict) 또는 None
+        """
+        for rule in self._index.get(exception, ()):
+            groups = rule.match(message)
+            if groups is not None:
+                return rule, groups
+        return None
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("📚 에러 규칙 레지스트리 테스트")
+    print("=" * 60)
+
+    registry = ErrorRuleRegistry.default()
+    print(f"\n규칙 {len(registry)}개, 예외 타입 {len(registry.exception_types)}개")
+
+    samples = [
+        ('ModuleNotFoundError', "ModuleNotFoundError: No module named 'numpyy'"),
+        ('TypeError', 'TypeError: can only concatenate str (not "int") to str'),
+        ('TypeError', "TypeError: unsupported operand type(s) for +: 'int' and 'list'"),
+        ('SomeCustomError', 'SomeCustomError: boom')
+    ]
+    for exception, message in samples:
+        found = registry.match(exception, message)
+        if found:
+            rule, groups = found
+            print(f"\n{message}\n   → {rule.render(groups)}")
+        else:
+            print(f"\n{message}\n   → 일치하는 규칙 없음")
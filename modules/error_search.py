@@ -0,0 +1,131 @@
+"""
+에러 전문 검색 - FTS5(error_search) 색인어 추출 / BM25 검색식 생성
+벡터 DB / API 키 없이 SQLite만으로 메시지 · 코드 · 해결책이 비슷한 과거 에러를 순위화
+"""
+
+import re
+import keyword
+from typing import Dict, List, Optional
+
+
+class ErrorSearch:
+    """error_search 색인어 / MATCH 검색식"""
+
+    MAX_CODE_TERMS = 64       # 에러 1개당 색인할 코드 식별자 수
+    MAX_MESSAGE_TERMS = 12    # 검색어 후보에 넣을 메시지 단어 수
+    MAX_QUERY_CODE_TERMS = 8  # 검색어 후보에 넣을 코드 식별자 수
+    MAX_QUERY_TERMS = 8       # 검색식에 실제로 넣을 검색어 수 (문서 빈도가 낮은 순)
+    MAX_TERM_DOCS = 1000      # 이보다 많은 에러에 나오는 검색어는 구분력이 없어 제외 (BM25 점수 계산량 제한)
+
+    # bm25() 컬럼 가중치 (error_type, message, code, solutions) - 타입은 필터로만 사용
+    BM25_WEIGHTS = (0.0, 10.0, 2.0, 1.0)
+
+    IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]+')
+    # 사용자가 입력한 검색어 (unicode61 토큰 규칙과 같게 문자 / 숫자 / '_')
+    WORD = re.compile(r'\w+')
+    # 실행마다 달라지는 부분 (주소 / 숫자)은 검색어에서 제외
+    VOLATILE = re.compile(r'0x[0-9a-fA-F]+|\d+')
+
+    STOPWORDS = frozenset({
+        'the', 'an', 'of', 'to', 'in', 'on', 'at', 'for', 'and', 'or', 'is', 'are', 'be', 'was', 'with', 'by'
+    })
+    # 코드라면 어디에나 나오는 이름 (색인해도 구분력이 없음)
+    COMMON_NAMES = frozenset(keyword.kwlist) | frozenset({
+        'self', 'cls', 'print', 'len', 'range', 'str', 'int', 'float', 'list', 'dict', 'set', 'tuple'
+    })
+
+    @staticmethod
+    def message_terms(error_type: str, message: str) -> List[str]:
+        """
+        예외 메시지 → 검색어 (타입 접두어 / 주소 / 숫자 제거, 따옴표 안의 이름은 유지)
+        "NameError: name 'foo' is not defined" → ['name', 'foo', 'not', 'defined']
+        """
+        message = (message or '').split('\n', 1)[0]
+        head, separator, rest = message.partition(': ')
+        if separator and head.rsplit('.', 1)[-1] == error_type:
+            message = rest
+        message = ErrorSearch.VOLATILE.sub(' ', message)
+
+        terms = []
+        for term in ErrorSearch.IDENTIFIER.findall(message):
+            term = term.lower()
+            if term not in ErrorSearch.STOPWORDS and term not in terms:
+                terms.append(term)
+        return terms[:ErrorSearch.MAX_MESSAGE_TERMS]
+
+    @staticmethod
+    def code_terms(code: Optional[str]) -> str:
+        """
+        코드 → 색인할 식별자 (등장 순서, 중복 / 예약어 / 흔한 내장 이름 제외, 공백으로 연결)
+        error_history.code_terms에 저장되어 트리거가 error_search.code로 색인
+        """
+        terms = []
+        seen = set()
+        for term in ErrorSearch.IDENTIFIER.findall(code or ''):
+            lowered = term.lower()
+            if lowered in seen or term in ErrorSearch.COMMON_NAMES:
+                continue
+            seen.add(lowered)
+            terms.append(term)
+            if len(terms) >= ErrorSearch.MAX_CODE_TERMS:
+                break
+        return ' '.join(terms)
+
+    @staticmethod
+    def _quote(term: str) -> str:
+        return '"' + term.replace('"', '""') + '"'
+
+    @staticmethod
+    def query_terms(error_analysis: Dict, code: Optional[str] = None) -> List[str]:
+        """
+        검색어 후보 (메시지 단어 + 코드 식별자 일부)
+
+        Args:
+            error_analysis: ErrorAnalyzer.analyze_error() 결과
+            code: 에러가 난 코드 (있으면 식별자도 검색어에 포함)
+        """
+        error_type = error_analysis.get('error_type') or 'Unknown'
+        terms = ErrorSearch.message_terms(error_type, error_analysis.get('error_message', ''))
+        if code:
+            code_terms = ErrorSearch.code_terms(code).split()
+            terms += [t for t in code_terms if t.lower() not in terms][:ErrorSearch.MAX_QUERY_CODE_TERMS]
+        return terms
+
+    @staticmethod
+    def term_query(term: str) -> str:
+        """검색어 하나의 MATCH 식 (문서 빈도 확인용)"""
+        return '{message code solutions} : %s' % ErrorSearch._quote(term)
+
+    @staticmethod
+    def match_query(error_type: str, terms: List[str]) -> Optional[str]:
+        """
+        FTS5 MATCH 검색식 (같은 예외 타입 AND 메시지 / 코드 / 해결책 중 하나라도 일치)
+
+        Returns:
+            검색식 (검색어가 없으면 None - 최근 에러 조회로 대체)
+        """
+        if not terms:
+            return None
+        return '{error_type} : %s AND {message code solutions} : (%s)' % (
+            ErrorSearch._quote(error_type or 'Unknown'),
+            ' OR '.join(ErrorSearch._quote(term) for term in terms)
+        )
+
+    @staticmethod
+    def text_query(text: Optional[str]) -> Optional[str]:
+        """
+        자유 입력 검색어 → MATCH 식 (모든 단어가 타입 / 메시지 / 코드 / 해결책 중 어딘가에 있는 에러)
+        "numpy import" → '{error_type message code solutions} : ("numpy" AND "import")'
+
+        Returns:
+            검색식 (단어가 없으면 None)
+        """
+        words = []
+        for word in ErrorSearch.WORD.findall(text or ''):
+            if word.lower() not in words:
+                words.append(word.lower())
+        if not words:
+            return None
+        return '{error_type message code solutions} : (%s)' % ' AND '.join(
+            ErrorSearch._quote(word) for word in words[:ErrorSearch.MAX_QUERY_TERMS]
+        )
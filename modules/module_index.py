@@ -0,0 +1,305 @@
+"""
+설치 모듈 인덱스 - import 하지 않고 모듈 설치 여부 확인
+sys.path 디렉토리 / zip과 배포 메타데이터(top_level.txt, RECORD)에서 최상위 모듈 이름을 모아
+디스크에 저장하고, 경로 디렉토리 mtime이 바뀌면 다시 생성
+(인덱스에 없는 이름은 importlib.util.find_spec으로 한 번 더 확인 - 최상위 이름은 import 없이 탐색)
+"""
+
+import os
+import sys
+import json
+import time
+import zipfile
+import threading
+import importlib.util
+import importlib.machinery
+from typing import Dict, List, Optional, Set
+
+
+class ModuleIndex:
+    """최상위 모듈 이름 인덱스 (O(1) 조회, 부작용 없음)"""
+
+    FORMAT_VERSION = 1
+    STALE_CHECK_INTERVAL = 5.0  # 초 (조회 시 mtime 재확인 간격)
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, index_path: Optional[str] = None, search_path: Optional[List[str]] = None):
+        """
+        Args:
+            index_path: 인덱스 저장 파일 (None이면 저장하지 않음)
+            search_path: 탐색할 경로 목록 (None이면 sys.path)
+        """
+        self.index_path = index_path
+        self.search_path = search_path
+        self._modules = set()
+        self._fallback = {}  # find_spec으로 확인한 이름 → bool
+        self._mtimes = []
+        self._last_check = 0.0
+        self.generation = 0  # 인덱스를 다시 만들거나 로드할 때마다 증가 (검증 결과 캐시 키)
+        self._lock = threading.Lock()
+        self._stats = {'builds': 0, 'loads': 0, 'fallback_lookups': 0}
+
+        self.load_or_build()
+
+    @staticmethod
+    def shared() -> 'ModuleIndex':
+        """Config 기준 공용 인덱스 (최초 호출 시 로드 또는 생성)"""
+        from .config import Config
+
+        with ModuleIndex._shared_lock:
+            if ModuleIndex._shared is None:
+                ModuleIndex._shared = ModuleIndex(Config.MODULE_INDEX_PATH)
+        return ModuleIndex._shared
+
+    def _paths(self) -> List[str]:
+        paths = []
+        for entry in (self.search_path if self.search_path is not None else sys.path):
+            path = os.path.abspath(entry or os.getcwd())
+            if path not in paths:
+                paths.append(path)
+        return paths
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _current_mtimes(self) -> List[List]:
+        """[[경로, mtime_ns 또는 None]] (없는 경로도 기록 - 나중에 생기면 무효화)"""
+        return [[path, self._mtime(path)] for path in self._paths()]
+
+    # ========== 생성 ==========
+
+    @staticmethod
+    def _module_name(filename: str) -> Optional[str]:
+        """파일 이름 → 최상위 모듈 이름 (.py / .pyc / 확장 모듈)"""
+        for suffix in importlib.machinery.all_suffixes():
+            if filename.endswith(suffix):
+                name = filename[:-len(suffix)]
+                return name if name.isidentifier() else None
+        return None
+
+    @staticmethod
+    def _scan_distribution(path: str) -> Set[str]:
+        """*.dist-info / *.egg-info 에서 배포가 제공하는 최상위 이름"""
+        names = set()
+        try:
+            with open(os.path.join(path, 'top_level.txt'), 'r', encoding='utf-8') as f:
+                names.update(line.strip() for line in f if line.strip())
+            return names
+        except OSError:
+            pass
+
+        # top_level.txt가 없으면 RECORD의 첫 경로 구성요소 사용
+        try:
+            with open(os.path.join(path, 'RECORD'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    first = line.split(',', 1)[0].split('/', 1)
+                    if len(first) == 2:
+                        top = first[0]
+                    else:
+                        top = ModuleIndex._module_name(first[0])
+                    if top and top.isidentifier() and top != '__pycache__':
+                        names.add(top)
+        except OSError:
+            pass
+        return names
+
+    @staticmethod
+    def _scan_directory(path: str) -> Set[str]:
+        names = set()
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return names
+
+        for entry in entries:
+            filename = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if is_dir:
+                if filename.endswith(('.dist-info', '.egg-info')):
+                    names.update(ModuleIndex._scan_distribution(entry.path))
+                elif filename.isidentifier() and filename != '__pycache__':
+                    # 일반 패키지 / namespace 패키지 모두 import 가능
+                    names.add(filename)
+            else:
+                name = ModuleIndex._module_name(filename)
+                if name:
+                    names.add(name)
+        return names
+
+    @staticmethod
+    def _scan_zip(path: str) -> Set[str]:
+        names = set()
+        try:
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.namelist():
+                    parts = member.split('/', 1)
+                    if len(parts) == 2:
+                        if parts[0].isidentifier():
+                            names.add(parts[0])
+                    else:
+                        name = ModuleIndex._module_name(parts[0])
+                        if name:
+                            names.add(name)
+        except (OSError, zipfile.BadZipFile):
+            pass
+        return names
+
+    def build(self) -> Set[str]:
+        """
+        경로를 탐색해 인덱스 생성 (모듈은 import 하지 않음)
+
+        Returns:
+            최상위 모듈 이름 집합
+        """
+        names = set(sys.builtin_module_names)
+        names.update(getattr(sys, 'stdlib_module_names', ()))
+
+        for path in self._paths():
+            if os.path.isdir(path):
+                names.update(self._scan_directory(path))
+            elif zipfile.is_zipfile(path):
+                names.update(self._scan_zip(path))
+
+        self._stats['builds'] += 1
+        return names
+
+    # ========== 저장 / 로드 ==========
+
+    def _signature(self) -> Dict[str, str]:
+        return {
+            'format': self.FORMAT_VERSION,
+            'executable': sys.executable,
+            'python': sys.version
+        }
+
+    def _load(self) -> bool:
+        """저장된 인덱스가 현재 인터프리터 / 경로 / mtime과 일치하면 로드"""
+        if not self.index_path:
+            return False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get('signature') != self._signature() or data.get('mtimes') != self._current_mtimes():
+            return False
+
+        self._modules = set(data.get('modules', []))
+        self._mtimes = data['mtimes']
+        self._stats['loads'] += 1
+        return True
+
+    def _save(self):
+        if not self.index_path:
+            return
+        data = {
+            'signature': self._signature(),
+            'mtimes': self._mtimes,
+            'modules': sorted(self._modules),
+            'built_at': time.time()
+        }
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ 모듈 인덱스 저장 실패: {e}")
+
+    def load_or_build(self):
+        """저장된 인덱스를 쓰거나, 유효하지 않으면 새로 생성해 저장"""
+        with self._lock:
+            if not self._load():
+                self._mtimes = self._current_mtimes()
+                self._modules = self.build()
+                self._save()
+            self._fallback = {}
+            self._last_check = time.monotonic()
+            self.generation += 1
+
+    def is_stale(self) -> bool:
+        """경로 목록이나 디렉토리 mtime이 인덱스 생성 시점과 다른지"""
+        return self._current_mtimes() != self._mtimes
+
+    def _refresh_if_stale(self):
+        now = time.monotonic()
+        if now - self._last_check < self.STALE_CHECK_INTERVAL:
+            return
+        self._last_check = now
+        if self.is_stale():
+            self.load_or_build()
+
+    # ========== 조회 ==========
+
+    def current_generation(self) -> int:
+        """경로가 바뀌었으면 다시 만든 뒤 현재 세대 반환"""
+        self._refresh_if_stale()
+        return self.generation
+
+    def is_available(self, module_name: str) -> bool:
+        """
+        모듈 설치 여부 (서브모듈은 최상위 패키지 기준, 예: os.path -> os)
+
+        Args:
+            module_name: 모듈 이름
+
+        Returns:
+            bool
+        """
+        base_module = module_name.split('.')[0]
+        if not base_module.isidentifier():
+            return False
+
+        self._refresh_if_stale()
+
+        if base_module in self._modules or base_module in sys.modules:
+            return True
+
+        cached = self._fallback.get(base_module)
+        if cached is not None:
+            return cached
+
+        # editable 설치 등 sys.meta_path 파인더가 제공하는 이름
+        self._stats['fallback_lookups'] += 1
+        try:
+            found = importlib.util.find_spec(base_module) is not None
+        except (ImportError, ValueError):
+            found = False
+        self._fallback[base_module] = found
+        return found
+
+    def get_statistics(self) -> Dict[str, any]:
+        return {
+            'modules': len(self._modules),
+            'paths': len(self._mtimes),
+            'fallback_cached': len(self._fallback),
+            **self._stats
+        }
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("📦 모듈 인덱스 테스트")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    index = ModuleIndex()
+    print(f"\n생성: {(time.perf_counter() - start) * 1000:.1f}ms, {index.get_statistics()}")
+
+    for name in ['os', 'os.path', 'json', 'flask', 'numpy', 'not_a_real_module_xyz']:
+        start = time.perf_counter()
+        available = index.is_available(name)
+        print(f"   {name:<24} {'✅' if available else '❌'} ({(time.perf_counter() - start) * 1e6:.1f}µs)")
@@ -0,0 +1,161 @@
+"""
+파싱된 모듈 - 소스 / AST / 줄 테이블을 한 번만 만들어 검증 단계와 AST 검사가 공유
+내용 해시(sha256)를 키로 최근 결과를 보관하므로 같은 코드를 다시 검증하면 파싱하지 않음
+"""
+
+import ast
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ParsedModule:
+    """한 번 파싱된 Python 소스 (트리는 공유되므로 수정하지 말 것)"""
+
+    CACHE_SIZE = 64  # 내용 해시 기준 보관 개수
+
+    _cache = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    def __init__(self, source: str, content_hash: Optional[str] = None):
+        """
+        Args:
+            source: Python 코드
+            content_hash: 미리 계산한 sha256 hex (없으면 계산)
+        """
+        self.source = source
+        self.content_hash = content_hash or ParsedModule.hash_source(source)
+        self.tree = None
+        self.error = None  # 파싱 실패 시 SyntaxError / ValueError 등
+
+        try:
+            self.tree = ast.parse(source)
+        except (SyntaxError, ValueError) as e:
+            self.error = e
+
+        self._lines = None
+        self._line_offsets = None
+        self._results = {}
+        self._results_lock = threading.Lock()
+
+    @staticmethod
+    def hash_source(source: str) -> str:
+        """소스 내용 해시 (캐시 키)"""
+        return hashlib.sha256(source.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    @staticmethod
+    def get(source: str) -> 'ParsedModule':
+        """
+        캐시된 ParsedModule 반환 (없으면 파싱 후 저장, 파싱 실패도 그대로 캐시)
+
+        Args:
+            source: Python 코드
+
+        Returns:
+            ParsedModule
+        """
+        key = ParsedModule.hash_source(source)
+
+        with ParsedModule._cache_lock:
+            parsed = ParsedModule._cache.get(key)
+            if parsed is not None:
+                ParsedModule._cache.move_to_end(key)
+                return parsed
+
+        parsed = ParsedModule(source, key)
+
+        with ParsedModule._cache_lock:
+            # 동시에 파싱한 경우 먼저 저장된 객체를 사용 (분석 결과 공유)
+            parsed = ParsedModule._cache.setdefault(key, parsed)
+            ParsedModule._cache.move_to_end(key)
+            while len(ParsedModule._cache) > ParsedModule.CACHE_SIZE:
+                ParsedModule._cache.popitem(last=False)
+        return parsed
+
+    @staticmethod
+    def clear_cache():
+        with ParsedModule._cache_lock:
+            ParsedModule._cache.clear()
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    @property
+    def lines(self) -> List[str]:
+        """줄 테이블 (줄바꿈 포함, 처음 접근 시 생성)"""
+        if self._lines is None:
+            self._lines = self.source.splitlines(keepends=True)
+        return self._lines
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """각 줄의 시작 문자 위치 (lines와 같은 인덱스)"""
+        if self._line_offsets is None:
+            offsets = []
+            position = 0
+            for line in self.lines:
+                offsets.append(position)
+                position += len(line)
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    def line(self, lineno: int) -> str:
+        """1부터 시작하는 줄 번호의 내용 (줄바꿈 제외, 범위 밖이면 빈 문자열)"""
+        if 1 <= lineno <= len(self.lines):
+            return self.lines[lineno - 1].rstrip('\r\n')
+        return ''
+
+    def offset(self, lineno: int, col: int = 0) -> int:
+        """(줄 번호, 0부터 시작하는 열) → 소스 문자 위치"""
+        if not self.lines:
+            return 0
+        lineno = min(max(lineno, 1), len(self.lines))
+        return self.line_offsets[lineno - 1] + col
+
+    def position(self, offset: int) -> Dict[str, int]:
+        """소스 문자 위치 → {'line': 1부터, 'col': 0부터}"""
+        if not self.lines:
+            return {'line': 1, 'col': 0}
+        index = bisect.bisect_right(self.line_offsets, offset) - 1
+        return {'line': index + 1, 'col': offset - self.line_offsets[index]}
+
+    def cached(self, key: Any, compute: Callable[['ParsedModule'], Any]) -> Any:
+        """
+        이 소스에 대한 분석 결과를 한 번만 계산해 보관 (검증 결과, 정책 검사 등)
+
+        Args:
+            key: 분석 종류 키
+            compute: ParsedModule을 받아 결과를 반환하는 함수
+
+        Returns:
+            저장된 결과 (호출자가 수정하지 말 것)
+        """
+        with self._results_lock:
+            if key in self._results:
+                return self._results[key]
+
+        value = compute(self)
+
+        with self._results_lock:
+            return self._results.setdefault(key, value)
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🌳 ParsedModule 테스트")
+    print("=" * 60)
+
+    code = "import os\n\ndef f(x):\n    return x * 2\n"
+    first = ParsedModule.get(code)
+    second = ParsedModule.get(code)
+    print(f"\n캐시 재사용: {first is second}")
+    print(f"해시: {first.content_hash[:16]}...")
+    print(f"줄 수: {len(first.lines)}, 3번째 줄: {first.line(3)!r}")
+    print(f"offset(4, 4) → {first.offset(4, 4)} → {first.position(first.offset(4, 4))}")
+
+    broken = ParsedModule.get("def f(:\n    pass")
+    print(f"\n문법 오류: valid={broken.valid}, {type(broken.error).__name__} line {broken.error.lineno}")
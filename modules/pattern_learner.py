@@ -9,10 +9,31 @@ from .error_database import ErrorDatabase
 class PatternLearner:
     """에러 패턴 학습 및 통계"""
     
+    # 타입 + 메시지(앞 200자)별 발생 횟수 - 저장 시 갱신되는 error_patterns에서 읽음
+    COMMON_PATTERNS_SQL = """
+        SELECT error_type, pattern as error_message, occurrence_count as count
+        FROM error_patterns
+        ORDER BY occurrence_count DESC
+        LIMIT ?
+    """
+    
+    RECENT_ERRORS_SQL = """
+        SELECT error_type, error_message, created_at
+        FROM error_history
+        ORDER BY created_at DESC
+        LIMIT ?
+    """
+    
+    # ErrorDatabase.explain_query_plans()에 넘길 검사 목록
+    QUERY_PLAN_CHECKS = {
+        'common_patterns': (COMMON_PATTERNS_SQL, (10,), ()),
+        'recent_patterns': (RECENT_ERRORS_SQL, (10,), ())
+    }
+    
     @staticmethod
     def get_error_statistics(db: ErrorDatabase, limit: int = 10) -> Dict[str, Any]:
         """
-        에러 통계 조회
+        에러 통계 조회 (롤업 테이블 + 인덱스 조회만 사용 - 분석마다 호출되어도 히스토리 크기와 무관)
         
         Args:
             db: ErrorDatabase 인스턴스
@@ -21,8 +42,6 @@ class PatternLearner:
         Returns:
             통계 딕셔너리
         """
-        import sqlite3
-        
         stats = {
             'total_errors': 0,
             'error_types': {},
@@ -30,36 +49,19 @@ class PatternLearner:
             'recent_errors': []
         }
         
-        # DB 연결
-        conn = sqlite3.connect(db.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            # 총 에러 개수
-            cursor.execute("SELECT COUNT(*) FROM error_history")
-            stats['total_errors'] = cursor.fetchone()[0]
+        # 공유 연결 풀에서 연결 사용
+        with db.connections.connection() as conn:
+            cursor = conn.cursor()
             
-            # 에러 타입별 통계
-            cursor.execute("""
-                SELECT error_type, COUNT(*) as count
-                FROM error_history
-                GROUP BY error_type
-                ORDER BY count DESC
-                LIMIT ?
-            """, (limit,))
+            # 총 에러 개수 (반복 제출 포함)
+            cursor.execute(ErrorDatabase.TOTAL_ERRORS_SQL)
+            stats['total_errors'] = cursor.fetchone()[0]
             
-            for row in cursor.fetchall():
-                error_type, count = row
-                stats['error_types'][error_type] = count
+            # 에러 타입별 통계 (아카이브된 발생 횟수 포함)
+            stats['error_types'] = ErrorDatabase.count_by_type(cursor, limit)
             
             # 자주 발생하는 패턴 (에러 메시지 기준)
-            cursor.execute("""
-                SELECT error_type, error_message, COUNT(*) as count
-                FROM error_history
-                GROUP BY error_type, error_message
-                ORDER BY count DESC
-                LIMIT ?
-            """, (limit,))
+            cursor.execute(PatternLearner.COMMON_PATTERNS_SQL, (limit,))
             
             for row in cursor.fetchall():
                 error_type, error_message, count = row
@@ -70,12 +72,7 @@ class PatternLearner:
                 })
             
             # 최근 에러
-            cursor.execute("""
-                SELECT error_type, error_message, created_at
-                FROM error_history
-                ORDER BY created_at DESC
-                LIMIT ?
-            """, (limit,))
+            cursor.execute(PatternLearner.RECENT_ERRORS_SQL, (limit,))
             
             for row in cursor.fetchall():
                 error_type, error_message, created_at = row
@@ -84,8 +81,6 @@ class PatternLearner:
                     'error_message': error_message,
                     'timestamp': created_at
                 })
-        finally:
-            conn.close()
         
         return stats
     
@@ -101,19 +96,10 @@ class PatternLearner:
         Returns:
             패턴 리스트
         """
-        import sqlite3
-        
-        conn = sqlite3.connect(db.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
-                SELECT error_type, error_message, COUNT(*) as count
-                FROM error_history
-                GROUP BY error_type, error_message
-                ORDER BY count DESC
-                LIMIT ?
-            """, (limit,))
+        with db.connections.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(PatternLearner.COMMON_PATTERNS_SQL, (limit,))
             
             patterns = []
             for row in cursor.fetchall():
@@ -123,7 +109,5 @@ class PatternLearner:
                     'error_message': error_message,
                     'count': count
                 })
-        finally:
-            conn.close()
         
         return patterns
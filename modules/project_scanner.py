@@ -8,6 +8,7 @@ from typing import List, Dict, Any
 from .file_handler import FileHandler
 from .code_validator import CodeValidator
 from .code_executor import CodeExecutor
+from .async_executor import AsyncCodeExecutor
 from .error_analyzer import ErrorAnalyzer
 
 
@@ -50,16 +51,19 @@ class ProjectScanner:
         return sorted([str(f) for f in files])
     
     @staticmethod
-    def analyze_multiple_files(file_list: List[str], save_history: bool = False) -> Dict[str, Any]:
+    def analyze_multiple_files(file_list: List[str],
+                               save_history: bool = False,
+                               concurrency: int = 1) -> Dict[str, Any]:
         """
         여러 파일을 분석하여 결과 요약 반환
         
         Args:
             file_list: 분석할 파일 경로 리스트
             save_history: DB에 저장 여부
+            concurrency: 동시에 실행할 파일 수 (1이면 순차 실행, 2 이상이면 AsyncCodeExecutor 사용)
         
         Returns:
-            분석 결과 딕셔너리
+            분석 결과 딕셔너리 (details는 file_list 순서 유지)
         """
         results = {
             'total_files': len(file_list),
@@ -69,39 +73,72 @@ class ProjectScanner:
             'files_with_errors': [],
             'files_without_errors': [],
             'error_types': {},
+            'cache_hits': 0,
             'details': []
         }
         
+        # 1단계: 파일 읽기 + 정적 분석
+        entries = []
         for filepath in file_list:
             try:
-                # 파일 읽기
                 file_result = FileHandler.read_file(filepath)
                 
                 if not file_result['success']:
-                    results['details'].append({
+                    entries.append({'detail': {
                         'file': filepath,
                         'status': 'read_error',
                         'error': file_result.get('error', 'Unknown')
-                    })
+                    }})
                     continue
                 
                 code = file_result['content']
-                
-                # 정적 분석
                 validation = CodeValidator.full_validation(code)
                 
-                file_analysis = {
+                entries.append({'code': code, 'detail': {
                     'file': filepath,
                     'validation': validation,
                     'execution': None,
                     'error_analysis': None
-                }
+                }})
+            except Exception as e:
+                entries.append({'detail': {
+                    'file': filepath,
+                    'status': 'exception',
+                    'error': str(e)
+                }})
+        
+        # 2단계: 정적 분석을 통과한 코드 실행 (concurrency > 1이면 동시 실행)
+        runnable = [entry for entry in entries
+                    if 'code' in entry and entry['detail']['validation']['overall_valid']]
+        if concurrency > 1 and len(runnable) > 1:
+            executions = AsyncCodeExecutor.shared().map(
+                [entry['code'] for entry in runnable], concurrency=concurrency
+            )
+        else:
+            executions = [CodeExecutor.safe_execute(entry['code']) for entry in runnable]
+        for entry, exec_result in zip(runnable, executions):
+            entry['execution'] = exec_result
+        
+        # 3단계: 결과 집계 + 에러 분석
+        for entry in entries:
+            file_analysis = entry['detail']
+            filepath = file_analysis['file']
+            
+            if 'code' not in entry:
+                results['details'].append(file_analysis)
+                continue
+            
+            try:
+                validation = file_analysis['validation']
                 
-                # 코드 실행 및 에러 분석
+                # 코드 실행 결과 및 에러 분석
                 if validation['overall_valid']:
-                    exec_result = CodeExecutor.safe_execute(code)
+                    exec_result = entry['execution']
                     file_analysis['execution'] = exec_result
                     
+                    if exec_result.get('cache_hit'):
+                        results['cache_hits'] += 1
+                    
                     if exec_result['success']:
                         results['success'] += 1
                         results['files_without_errors'].append(filepath)
@@ -111,7 +148,7 @@ class ProjectScanner:
                         if exec_result['stderr']:
                             error_analysis = ErrorAnalyzer.analyze_error(
                                 exec_result['stderr'], 
-                                code
+                                entry['code']
                             )
                             file_analysis['error_analysis'] = error_analysis
                             
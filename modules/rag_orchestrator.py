@@ -9,7 +9,9 @@ from datetime import datetime
 # 기존 엔진들
 from .code_validator import CodeValidator
 from .code_executor import CodeExecutor
+from .static_checker import StaticChecker
 from .error_analyzer import ErrorAnalyzer
+from .error_fingerprint import ErrorFingerprint
 from .error_database import ErrorDatabase
 from .pattern_learner import PatternLearner
 
@@ -76,6 +78,7 @@ class RAGOrchestrator:
         print("\n🔍 1단계: 7개 엔진 실행 중...")
         engine_results = self._run_all_engines(code, file_type)
         result['engine_results'] = engine_results
+        result['execution_cache_hit'] = engine_results.get('executor', {}).get('cache_hit', False)
         
         # 에러가 없으면 종료
         if engine_results.get('executor', {}).get('success', True):
@@ -93,8 +96,20 @@ class RAGOrchestrator:
             result['message'] = '⚠️ 에러 정보를 추출할 수 없습니다'
             return result
         
-        # 3단계: RAG 검색 (활성화된 경우)
-        similar_cases = []
+        # 지문 조회: 이미 AI 해결책을 만든 에러면 벡터 검색 / LLM 없이 재사용
+        known = self.error_db.lookup_fingerprint(error_info['fingerprint'])
+        result['fingerprint_hit'] = bool(known and known['ai_solution'])
+        if known:
+            result['known_issue'] = known
+        if result['fingerprint_hit']:
+            print(f"🔖 알려진 에러 (지문 일치, 이전 {known['occurrence_count']}회 발생) - 저장된 해결책 사용")
+            result['ai_solution'] = known['ai_solution']
+            self._save_results(code, error_info, known['ai_solution'], store_vector=False)
+            result['status'] = 'analyzed'
+            return result
+        
+        # 3단계: RAG 검색 (활성화된 경우, 아니면 / 실패 시 에러 히스토리 전문 검색)
+        similar_cases = None
         if self.use_rag:
             print("🔎 3단계: Vector DB 검색 중...")
             try:
@@ -102,21 +117,30 @@ class RAGOrchestrator:
                     error_info,
                     top_k=Config.TOP_K_SIMILAR_ERRORS
                 )
-                result['similar_cases'] = similar_cases
-                print(f"   → {len(similar_cases)}개의 유사 사례 발견")
             except Exception as e:
                 print(f"   ⚠️ Vector 검색 실패: {e}")
+        if similar_cases is None:
+            print("🔎 3단계: 에러 히스토리 전문 검색 중...")
+            try:
+                similar_cases = self._history_cases(code, error_info)
+            except Exception as e:
+                print(f"   ⚠️ 히스토리 검색 실패: {e}")
+                similar_cases = []
+        result['similar_cases'] = similar_cases
+        print(f"   → {len(similar_cases)}개의 유사 사례 발견")
         
         # 4단계: 컨텍스트 구성
         print("📝 4단계: 컨텍스트 구성 중...")
         context = self._build_context(engine_results, error_info, similar_cases)
         
         # 5단계: LLM 해결책 생성 (RAG 모드)
+        ai_generated = False
         if self.use_rag and self.llm.available:
             print("🤖 5단계: AI 해결책 생성 중...")
             try:
                 ai_solution = self.llm.generate_solution(context)
                 result['ai_solution'] = ai_solution
+                ai_generated = True
                 print("   ✅ AI 해결책 생성 완료")
             except Exception as e:
                 print(f"   ⚠️ AI 생성 실패: {e}")
@@ -127,7 +151,7 @@ class RAGOrchestrator:
         
         # 6단계: 결과 저장
         print("💾 6단계: 결과 저장 중...")
-        self._save_results(code, error_info, result.get('ai_solution', ''))
+        self._save_results(code, error_info, result.get('ai_solution', ''), ai_generated=ai_generated)
         
         result['status'] = 'analyzed'
         print("✅ 분석 완료!")
@@ -145,14 +169,20 @@ class RAGOrchestrator:
             except Exception as e:
                 results['validator'] = {'error': str(e)}
         
-        # Engine 2: Code Executor (실행)
-        try:
-            results['executor'] = CodeExecutor.safe_execute(code)
-        except Exception as e:
-            results['executor'] = {'success': False, 'error': str(e)}
+        # 정적 검사로 확정된 오류가 있으면 실행해도 같은 오류이므로 실행 / 에러 분석 생략
+        static_error = (results.get('validator', {}).get('static') or {}).get('deterministic_error')
+        if static_error:
+            results['executor'] = StaticChecker.execution_result(static_error)
+            results['analyzer'] = static_error
+        else:
+            # Engine 2: Code Executor (실행)
+            try:
+                results['executor'] = CodeExecutor.safe_execute(code)
+            except Exception as e:
+                results['executor'] = {'success': False, 'error': str(e)}
         
         # Engine 3: Error Analyzer (에러 분석)
-        if not results['executor'].get('success', False):
+        if 'analyzer' not in results and not results['executor'].get('success', False):
             stderr = results['executor'].get('stderr', '')
             if stderr:
                 try:
@@ -181,9 +211,27 @@ class RAGOrchestrator:
             'line_number': analyzer.get('line_number', 0),
             'description': analyzer.get('description', ''),
             'code_snippet': analyzer.get('code_snippet', ''),
-            'severity': analyzer.get('severity', 'medium')
+            'severity': analyzer.get('severity', 'medium'),
+            'fingerprint': analyzer.get('fingerprint') or ErrorFingerprint.compute(analyzer)
         }
     
+    def _history_cases(self, code: str, error_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """에러 히스토리 BM25 검색 결과를 Vector DB 검색 결과 형식으로 (벡터 DB / API 키 없이 사용)"""
+        cases = []
+        for similar in self.error_db.find_similar_errors(error_info, limit=Config.TOP_K_SIMILAR_ERRORS, code=code):
+            cases.append({
+                'id': f"history_{similar['id']}",
+                'document': similar['error_message'],
+                'metadata': {
+                    'error_type': similar['error_type'],
+                    'error_message': similar['error_message'],
+                    'solution_preview': similar['solutions'][0] if similar['solutions'] else ''
+                },
+                'distance': None,
+                'similarity_score': similar['relevance'] or 0
+            })
+        return cases
+    
     def _build_context(self, 
                       engine_results: Dict[str, Any],
                       error_info: Dict[str, Any],
@@ -214,15 +262,23 @@ class RAGOrchestrator:
         
         return solution
     
-    def _save_results(self, code: str, error_info: Dict[str, Any], solution: str):
-        """결과 저장 (SQLite + Vector DB)"""
+    def _save_results(self, code: str, error_info: Dict[str, Any], solution: str,
+                      ai_generated: bool = False, store_vector: bool = True):
+        """
+        결과 저장 (SQLite + Vector DB)
+        
+        Args:
+            ai_generated: LLM이 만든 해결책이면 지문에 보관해 같은 에러에 재사용
+            store_vector: 지문 일치로 재사용한 경우 이미 벡터 DB에 있으므로 False
+        """
         try:
-            # SQLite 저장
-            error_id = self.error_db.save_error(code, error_info)
+            # SQLite 저장 (비동기 쓰기 모드면 ID 없이 큐에만 들어감)
+            error_id = self.error_db.save_error(code, error_info, ai_solution=solution if ai_generated else None)
             
             # Vector DB 저장 (RAG 모드)
-            if self.use_rag:
-                error_id_str = f"error_{error_id}_{hashlib.md5(code.encode()).hexdigest()[:8]}"
+            if self.use_rag and store_vector:
+                record_key = error_id if error_id is not None else datetime.now().strftime('%Y%m%d%H%M%S%f')
+                error_id_str = f"error_{record_key}_{hashlib.md5(code.encode()).hexdigest()[:8]}"
                 self.vector_db.add_error(
                     error_id_str,
                     error_info,
@@ -0,0 +1,262 @@
+"""
+실행 결과 캐시 모듈 - 같은 코드의 반복 실행 방지
+코드 + 실행 한도 + 작업 디렉토리 + 인터프리터 버전 + 설치 패키지 지문의 해시를 키로
+메모리 LRU → SQLite(TTL) 2단계로 결과 저장
+(작업 디렉토리의 모듈을 import하는 코드는 그 파일이 바뀔 수 있으므로 캐시하지 않음)
+"""
+
+import ast
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from importlib.machinery import all_suffixes
+from typing import Dict, Optional
+
+from .parsed_module import ParsedModule
+
+
+class ExecutionCache:
+    """내용 주소 기반 실행 결과 캐시 (메모리 LRU + SQLite)"""
+
+    PURGE_INTERVAL = 100  # put N번마다 만료 항목 정리
+
+    _environment_fingerprint = None
+    _fingerprint_lock = threading.Lock()
+
+    def __init__(self,
+                 db_path: str = 'data/execution_cache.db',
+                 max_entries: int = 256,
+                 ttl: int = 3600):
+        """
+        Args:
+            db_path: 디스크 캐시 파일 경로
+            max_entries: 메모리 LRU 최대 항목 수
+            ttl: 캐시 유효 시간 (초)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_database(self):
+        """캐시 테이블 생성"""
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS execution_cache (
+                cache_key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def environment_fingerprint() -> str:
+        """
+        인터프리터 버전 + 설치된 패키지 목록의 지문 (프로세스당 1회 계산)
+
+        Returns:
+            sha256 hex
+        """
+        with ExecutionCache._fingerprint_lock:
+            if ExecutionCache._environment_fingerprint is None:
+                from importlib import metadata
+
+                packages = sorted(
+                    f"{dist.metadata['Name']}=={dist.version}"
+                    for dist in metadata.distributions()
+                )
+                digest = hashlib.sha256()
+                digest.update(sys.executable.encode())
+                digest.update(sys.version.encode())
+                for package in packages:
+                    digest.update(package.encode('utf-8', errors='replace'))
+                ExecutionCache._environment_fingerprint = digest.hexdigest()
+
+        return ExecutionCache._environment_fingerprint
+
+    @staticmethod
+    def _top_level_imports(parsed: ParsedModule) -> frozenset:
+        """코드가 import하는 최상위 모듈 이름 (상대 import 제외)"""
+        names = set()
+        for node in ast.walk(parsed.tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names.add(node.module.split('.')[0])
+        return frozenset(names)
+
+    @staticmethod
+    def imports_local_module(code: str, cwd: str) -> bool:
+        """
+        작업 디렉토리(자식 프로세스의 sys.path[0])의 모듈 / 패키지를 import하는지
+
+        Args:
+            code: Python 코드
+            cwd: 작업 디렉토리
+        """
+        parsed = ParsedModule.get(code)
+        if not parsed.valid:
+            return False
+        suffixes = all_suffixes()
+        for name in parsed.cached(('top_level_imports',), ExecutionCache._top_level_imports):
+            base = os.path.join(cwd, name)
+            if os.path.isdir(base) or any(os.path.isfile(base + suffix) for suffix in suffixes):
+                return True
+        return False
+
+    @staticmethod
+    def make_key(code: str,
+                 timeout: float,
+                 limits: Optional[Dict[str, int]] = None,
+                 output_limits: Optional[Dict[str, int]] = None) -> Optional[str]:
+        """
+        캐시 키 생성
+
+        Args:
+            code: Python 코드
+            timeout: 타임아웃 (결과에 영향을 주므로 키에 포함)
+            limits: 적용할 rlimit (CodeExecutor.get_resource_limits(), MemoryError 등 결과가 달라짐)
+            output_limits: 출력 캡처 한도 (CodeExecutor.get_output_limits(), 잘리는 위치가 달라짐)
+
+        Returns:
+            sha256 hex 또는 None (작업 디렉토리의 모듈을 import해 캐시하면 안 되는 코드)
+        """
+        cwd = os.getcwd()
+        if ExecutionCache.imports_local_module(code, cwd):
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(ExecutionCache.environment_fingerprint().encode())
+        digest.update(str(timeout).encode())
+        digest.update(json.dumps([limits, output_limits], sort_keys=True).encode())
+        digest.update(cwd.encode('utf-8', errors='surrogateescape'))
+        digest.update(code.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def _remember(self, key: str, result: Dict, expires_at: float):
+        """메모리 LRU에 추가 (lock 안에서 호출)"""
+        self._memory[key] = (result, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        캐시 조회
+
+        Returns:
+            결과 dict 복사본 ('cache_hit': True 포함) 또는 None
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return dict(result, cache_hit=True)
+                del self._memory[key]
+
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT result, expires_at FROM execution_cache WHERE cache_key = ?',
+                (key,)
+            ).fetchone()
+
+            if row is not None and row[1] <= now:
+                conn.execute('DELETE FROM execution_cache WHERE cache_key = ?', (key,))
+                conn.commit()
+                row = None
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+
+            result = json.loads(row[0])
+            self._remember(key, result, row[1])
+            self._stats['disk_hits'] += 1
+
+        return dict(result, cache_hit=True)
+
+    def put(self, key: str, result: Dict):
+        """캐시 저장 (타임아웃 결과는 저장하지 않음)"""
+        if result.get('timed_out'):
+            return
+
+        result = {k: v for k, v in result.items() if k != 'cache_hit'}
+        expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._remember(key, result, expires_at)
+            self._puts += 1
+            purge = self._puts % self.PURGE_INTERVAL == 0
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO execution_cache (cache_key, result, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(result, ensure_ascii=False), expires_at)
+            )
+            if purge:
+                conn.execute('DELETE FROM execution_cache WHERE expires_at <= ?', (time.time(),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+
+        conn = self._connect()
+        conn.execute('DELETE FROM execution_cache')
+        conn.commit()
+        conn.close()
+
+    def get_statistics(self) -> Dict:
+        """캐시 통계"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        return stats
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🗃️  실행 결과 캐시 테스트")
+    print("=" * 60)
+
+    cache = ExecutionCache('data/execution_cache_test.db', max_entries=2, ttl=60)
+    key = ExecutionCache.make_key("print('hi')", 30)
+
+    print(f"조회 (저장 전): {cache.get(key)}")
+    cache.put(key, {'success': True, 'stdout': 'hi\n', 'stderr': '', 'exit_code': 0})
+    print(f"조회 (저장 후): {cache.get(key)}")
+    print(f"통계: {cache.get_statistics()}")
+
+    cache.clear()
+    os.remove('data/execution_cache_test.db')
@@ -0,0 +1,841 @@
+"""
+샌드박스 런타임 - 사용자 코드를 실행하는 자식 프로세스 측 코드
+웜 워커(worker_pool)와 임시 파일 없는 cold 실행(--run)이 스크립트로 직접 실행하므로
+표준 라이브러리만 사용
+"""
+
+import os
+import sys
+import time
+import errno
+import types
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# json, signal, selectors, traceback 등은 필요한 시점에 import
+# (--run 으로 한 번 실행하는 경우 인터프리터 기동 비용을 늘리지 않기 위해)
+
+
+# 워커 부팅 시 미리 import 해두는 표준 라이브러리 (fork된 자식이 그대로 물려받음)
+WARM_MODULES = [
+    'abc', 'collections', 'copy', 'dataclasses', 'datetime', 'decimal',
+    'enum', 'fractions', 'functools', 'heapq', 'itertools', 'json', 'math',
+    'operator', 'random', 're', 'statistics', 'string', 'textwrap', 'typing'
+]
+
+# traceback에 표시될 스니펫 파일 이름
+SNIPPET_FILENAME = 'main.py'
+
+_HEADER_SIZE = 4
+_READ_CHUNK = 65536
+
+
+def read_message(stream) -> Optional[Dict]:
+    """길이(4바이트) + JSON 형식의 메시지 읽기 (EOF면 None)"""
+    import json
+
+    header = stream.read(_HEADER_SIZE)
+    if len(header) < _HEADER_SIZE:
+        return None
+    length = int.from_bytes(header, 'big')
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return json.loads(payload.decode('utf-8'))
+
+
+def write_message(stream, message: Dict):
+    """길이(4바이트) + JSON 형식의 메시지 쓰기"""
+    import json
+
+    payload = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    stream.write(len(payload).to_bytes(_HEADER_SIZE, 'big') + payload)
+    stream.flush()
+
+
+def apply_limits(limits: Optional[Dict]):
+    """
+    현재 프로세스에 rlimit 적용 (자식 프로세스에서 코드 실행 직전에 호출)
+
+    Args:
+        limits: {'cpu_time': 초, 'address_space': 바이트,
+                 'file_size': 바이트, 'processes': 개수} (0/None이면 미적용)
+    """
+    if not limits or resource is None:
+        return
+
+    rlimits = {
+        'cpu_time': resource.RLIMIT_CPU,
+        'address_space': resource.RLIMIT_AS,
+        'file_size': resource.RLIMIT_FSIZE,
+        'processes': getattr(resource, 'RLIMIT_NPROC', None)
+    }
+
+    for name, value in limits.items():
+        rlimit = rlimits.get(name)
+        if rlimit is None or not value:
+            continue
+
+        soft = int(value)
+        _, hard = resource.getrlimit(rlimit)
+        if name == 'cpu_time':
+            # soft 초과 시 SIGXCPU, 1초 뒤 hard에서 SIGKILL
+            new_hard = soft + 1
+        else:
+            new_hard = soft
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+            new_hard = min(new_hard, hard)
+
+        try:
+            resource.setrlimit(rlimit, (soft, new_hard))
+        except (ValueError, OSError):
+            pass
+
+
+def format_limits(limits: Optional[Dict]) -> str:
+    """rlimit dict → --limits 인자 ('cpu_time=30,address_space=536870912,...')"""
+    return ','.join(f'{name}={int(value)}' for name, value in (limits or {}).items() if value)
+
+
+def parse_limits(text: str) -> Dict:
+    """--limits 인자 → apply_limits()에 넘길 dict (format_limits의 역)"""
+    limits = {}
+    for item in text.split(','):
+        name, _, value = item.partition('=')
+        if name and value:
+            limits[name] = int(value)
+    return limits
+
+
+def usage_from_rusage(rusage, wall_time: float) -> Dict:
+    """
+    os.wait4()의 rusage를 결과용 dict로 변환
+
+    Returns:
+        {'peak_rss_kb', 'user_time', 'sys_time', 'wall_time'}
+    """
+    if rusage is None:
+        return {
+            'peak_rss_kb': None,
+            'user_time': None,
+            'sys_time': None,
+            'wall_time': wall_time
+        }
+
+    peak_rss = rusage.ru_maxrss
+    if sys.platform == 'darwin':
+        peak_rss //= 1024  # macOS는 바이트 단위
+
+    return {
+        'peak_rss_kb': peak_rss,
+        'user_time': rusage.ru_utime,
+        'sys_time': rusage.ru_stime,
+        'wall_time': wall_time
+    }
+
+
+def describe_limit_exit(exit_code: int, stderr: str) -> Optional[str]:
+    """
+    종료 상태로부터 초과한 리소스 제한 판단
+
+    Returns:
+        'cpu_time' / 'file_size' / 'address_space' 또는 None
+    """
+    import signal
+
+    # Windows에는 SIGXCPU / SIGXFSZ가 없음
+    signals = {
+        'cpu_time': getattr(signal, 'SIGXCPU', None),
+        'file_size': getattr(signal, 'SIGXFSZ', None)
+    }
+    for name, signum in signals.items():
+        if signum is not None and exit_code == -signum:
+            return name
+    last_line = stderr.rstrip().rsplit('\n', 1)[-1] if stderr else ''
+    if last_line.startswith('MemoryError'):
+        return 'address_space'
+    # Python은 SIGXFSZ를 무시하므로 EFBIG OSError로 나타남
+    if last_line.startswith('OSError') and f'[Errno {errno.EFBIG}]' in last_line:
+        return 'file_size'
+    return None
+
+
+LIMIT_MESSAGES = {
+    'cpu_time': 'CPU 시간 제한을 초과하여 중단되었습니다.',
+    'file_size': '파일 크기 제한을 초과하여 중단되었습니다.',
+    'address_space': '메모리 제한을 초과하였습니다.'
+}
+
+
+# 출력 캡처 기본 한도 (스트림별 앞부분 / 뒷부분 바이트)
+DEFAULT_HEAD_BYTES = 64 * 1024
+DEFAULT_TAIL_BYTES = 64 * 1024
+# stderr는 ErrorAnalyzer가 쓰는 traceback이 잘리지 않도록 뒷부분을 최소 이만큼 보관
+TRACEBACK_TAIL_BYTES = 16 * 1024
+
+
+def _split_incomplete_utf8(data: bytes):
+    """끝에 잘린 UTF-8 문자가 있으면 (완성된 부분, 잘린 부분)으로 분리"""
+    for i in range(1, min(4, len(data)) + 1):
+        byte = data[-i]
+        if byte & 0xC0 == 0x80:  # continuation byte
+            continue
+        if byte >= 0xF0:
+            need = 4
+        elif byte >= 0xE0:
+            need = 3
+        elif byte >= 0xC0:
+            need = 2
+        else:
+            need = 1
+        if need > i:
+            return data[:-i], data[-i:]
+        break
+    return data, b''
+
+
+class OutputCapture:
+    """
+    출력 스트림 하나의 앞부분(head)과 뒷부분(tail)만 보관하는 캡처 버퍼
+    (보관하는 바이트는 head_limit + tail_limit + 읽기 청크 하나를 넘지 않음)
+    """
+
+    def __init__(self, head_limit: int = DEFAULT_HEAD_BYTES, tail_limit: int = DEFAULT_TAIL_BYTES):
+        import collections
+        import codecs
+
+        self.head_limit = head_limit
+        self.tail_limit = tail_limit
+        self.total_bytes = 0
+
+        self._head = bytearray()
+        self._tail = collections.deque()
+        self._tail_size = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def write(self, data: bytes) -> str:
+        """
+        청크 추가
+
+        Returns:
+            head에 들어간 부분의 텍스트 (실시간 전달용, head가 가득 차면 '')
+        """
+        self.total_bytes += len(data)
+
+        live = b''
+        room = self.head_limit - len(self._head)
+        if room > 0:
+            live = data[:room]
+            self._head += live
+            data = data[room:]
+
+        if data and self.tail_limit > 0:
+            self._tail.append(data)
+            self._tail_size += len(data)
+            # 맨 앞 청크를 버려도 tail_limit 이상 남으면 버림 (링 버퍼)
+            while self._tail_size - len(self._tail[0]) >= self.tail_limit:
+                self._tail_size -= len(self._tail.popleft())
+
+        return self._decoder.decode(live) if live else ''
+
+    @property
+    def truncated_bytes(self) -> int:
+        """head와 tail 사이에서 버려진 바이트 수"""
+        return max(self.total_bytes - len(self._head) - self.tail_limit, 0)
+
+    def _remainder(self, pending: bytes) -> str:
+        """head 이후 부분의 텍스트 (pending: head 끝에서 잘린 UTF-8 바이트)"""
+        tail = b''.join(self._tail)[-self.tail_limit:] if self._tail else b''
+
+        if not self.truncated_bytes:
+            return (pending + tail).decode('utf-8', errors='replace')
+
+        # 잘린 지점이 문자 중간이면 나머지 바이트는 버림
+        start = 0
+        while start < len(tail) and start < 3 and tail[start] & 0xC0 == 0x80:
+            start += 1
+        marker = f'\n... [출력 {self.truncated_bytes}바이트 생략] ...\n'
+        return marker + tail[start:].decode('utf-8', errors='replace')
+
+    def finish(self) -> str:
+        """
+        실시간 전달이 끝난 뒤 남은 텍스트
+        (write()로 돌려준 텍스트 + finish() == getvalue())
+        """
+        if self.total_bytes <= self.head_limit:
+            return self._decoder.decode(b'', final=True)
+        _, pending = _split_incomplete_utf8(bytes(self._head))
+        return self._remainder(pending)
+
+    def getvalue(self) -> str:
+        """보관 중인 출력 전체 (생략된 구간은 표시로 대체)"""
+        head = bytes(self._head)
+        if self.total_bytes <= self.head_limit:
+            return head.decode('utf-8', errors='replace')
+        head, pending = _split_incomplete_utf8(head)
+        return head.decode('utf-8', errors='replace') + self._remainder(pending)
+
+
+def create_captures(output_limits: Optional[Dict] = None) -> Dict[str, OutputCapture]:
+    """
+    stdout / stderr 캡처 버퍼 생성
+
+    Args:
+        output_limits: {'head': 바이트, 'tail': 바이트} (None이면 기본값)
+
+    Returns:
+        {'stdout': OutputCapture, 'stderr': OutputCapture}
+    """
+    output_limits = output_limits or {}
+    head = output_limits.get('head', DEFAULT_HEAD_BYTES)
+    tail = output_limits.get('tail', DEFAULT_TAIL_BYTES)
+    return {
+        'stdout': OutputCapture(head, tail),
+        'stderr': OutputCapture(head, max(tail, TRACEBACK_TAIL_BYTES))
+    }
+
+
+class SnippetProfiler:
+    """
+    프로파일 모드: 스니펫 실행 구간만 cProfile + tracemalloc으로 측정
+    (with 블록으로 감싸고 report()로 요약)
+    """
+
+    def __init__(self, top_n: int = 15):
+        import cProfile
+        import tracemalloc
+
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        self.allocation_stats = None
+        self.peak_memory = 0
+        self.wall_time = 0.0
+        self._tracemalloc = tracemalloc
+
+    def __enter__(self):
+        self._tracemalloc.start()
+        self._start = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.wall_time = time.perf_counter() - self._start
+        _, self.peak_memory = self._tracemalloc.get_traced_memory()
+
+        # 집계 중 할당까지 추적되지 않도록 스냅샷 직후 중지하고, 상위 항목만 남김
+        snapshot = self._tracemalloc.take_snapshot()
+        self._tracemalloc.stop()
+        internal = (self._tracemalloc.__file__, __file__)
+        self.allocation_stats = [
+            stat for stat in snapshot.statistics('lineno')
+            if stat.traceback[0].filename not in internal
+        ][:self.top_n]
+        return False
+
+    def report(self) -> Dict:
+        """
+        핫스팟 요약
+
+        Returns:
+            {
+                'wall_time': float (초, 프로파일러 오버헤드 포함),
+                'peak_memory_kb': float,
+                'functions': [{'function', 'file', 'line', 'calls', 'primitive_calls',
+                               'total_time', 'cumulative_time'}] (누적 시간 순),
+                'allocations': [{'file', 'line', 'size_kb', 'count'}] (종료 시점 점유 메모리 순)
+            }
+        """
+        import pstats
+
+        def is_internal(file, name, callers):
+            # sandbox 자신의 프레임, 측정 시작 지점(호출자 없음), 모듈 실행을 감싸는 exec는 제외
+            # (exec 아래의 <module> 항목에 같은 시간이 잡힘)
+            return (file == __file__ or not callers
+                    or name == '<built-in method builtins.exec>'
+                    or name.startswith("<method 'disable' of '_lsprof"))
+
+        functions = []
+        stats = pstats.Stats(self.profile).stats
+        for (file, line, name), (cc, nc, tt, ct, callers) in sorted(
+                stats.items(), key=lambda item: item[1][3], reverse=True):
+            if is_internal(file, name, callers):
+                continue
+            functions.append({
+                'function': name,
+                'file': file,
+                'line': line,
+                'calls': nc,
+                'primitive_calls': cc,
+                'total_time': tt,
+                'cumulative_time': ct
+            })
+            if len(functions) >= self.top_n:
+                break
+
+        allocations = []
+        for stat in self.allocation_stats:
+            frame = stat.traceback[0]
+            allocations.append({
+                'file': frame.filename,
+                'line': frame.lineno,
+                'size_kb': stat.size / 1024,
+                'count': stat.count
+            })
+
+        return {
+            'wall_time': self.wall_time,
+            'peak_memory_kb': self.peak_memory / 1024,
+            'functions': functions,
+            'allocations': allocations
+        }
+
+
+def _write_profile_report(profiler: SnippetProfiler, fd: int):
+    """프로파일 요약을 JSON으로 fd에 쓰고 닫기"""
+    import json
+
+    try:
+        data = json.dumps(profiler.report(), ensure_ascii=False).encode('utf-8')
+        while data:
+            data = data[os.write(fd, data):]
+    except Exception:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_profile_report(fd: int) -> Optional[Dict]:
+    """
+    자식이 쓴 프로파일 요약 읽기 (자식 종료 후 호출, fd는 닫음)
+
+    Returns:
+        SnippetProfiler.report() 결과 또는 None (타임아웃 등으로 요약이 없는 경우)
+    """
+    import json
+
+    # 자식이 fork한 프로세스가 fd를 물고 있어도 막히지 않도록 non-blocking
+    os.set_blocking(fd, False)
+    chunks = []
+    try:
+        while True:
+            chunk = os.read(fd, _READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except BlockingIOError:
+        pass
+    finally:
+        os.close(fd)
+
+    try:
+        return json.loads(b''.join(chunks).decode('utf-8')) if chunks else None
+    except ValueError:
+        return None
+
+
+def run_snippet(code: str,
+                filename: str = SNIPPET_FILENAME,
+                profile_fd: Optional[int] = None,
+                profile_top_n: int = 15) -> int:
+    """
+    현재 프로세스에서 코드를 __main__ 으로 실행
+    (인터프리터가 스크립트를 실행할 때와 같은 traceback / exit code 재현)
+
+    Args:
+        code: Python 코드
+        filename: traceback에 표시될 파일 이름
+        profile_fd: 프로파일 모드 - 요약(JSON)을 쓸 fd (None이면 프로파일 안 함)
+        profile_top_n: 프로파일 요약 항목 수
+
+    Returns:
+        exit code
+    """
+    main_module = types.ModuleType('__main__')
+    main_module.__file__ = filename
+    main_module.__builtins__ = __builtins__
+    sys.modules['__main__'] = main_module
+    sys.argv = [filename]
+
+    profiler = SnippetProfiler(profile_top_n) if profile_fd is not None else None
+
+    try:
+        code_obj = compile(code, filename, 'exec')
+        if profiler is not None:
+            with profiler:
+                exec(code_obj, main_module.__dict__)
+        else:
+            exec(code_obj, main_module.__dict__)
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException as e:
+        import linecache
+        import traceback
+
+        # traceback에 소스 라인이 나오도록 linecache에 등록 (mtime None → 갱신 안 함)
+        linecache.cache[filename] = (len(code), None, code.splitlines(True), filename)
+
+        # run_snippet 자신의 프레임은 traceback에서 제외
+        tb = e.__traceback__.tb_next if e.__traceback__ else None
+        traceback.print_exception(type(e), e, tb)
+        return 1
+    finally:
+        if profiler is not None and profiler.allocation_stats is not None:
+            _write_profile_report(profiler, profile_fd)
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+
+
+def run_from_fd(fd: int,
+                filename: str = SNIPPET_FILENAME,
+                profile_fd: Optional[int] = None,
+                profile_top_n: int = 15) -> int:
+    """
+    fd(파이프 또는 memfd)에서 코드를 읽어 실행 (임시 파일 없이 실행)
+
+    Args:
+        fd: 코드를 읽을 파일 디스크립터 (0이면 stdin)
+        filename: traceback에 표시될 파일 이름
+        profile_fd / profile_top_n: 프로파일 모드 (run_snippet 참고)
+
+    Returns:
+        exit code
+    """
+    chunks = []
+    while True:
+        chunk = os.read(fd, _READ_CHUNK)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    # stdin은 EOF 상태로 남겨두어 input()이 EOFError를 내도록 함
+    if fd != 0:
+        os.close(fd)
+
+    # 이 스크립트 디렉토리 대신 작업 디렉토리를 import 경로로 사용
+    sys.path[0] = os.getcwd()
+
+    return run_snippet(b''.join(chunks).decode('utf-8'), filename, profile_fd, profile_top_n)
+
+
+def run_from_path(path: str) -> int:
+    """
+    파일의 코드를 실행 ('python PATH'와 같게 파일 디렉토리를 import 경로로)
+
+    Returns:
+        exit code
+    """
+    with open(path, encoding='utf-8') as f:
+        code = f.read()
+    sys.path[0] = os.path.dirname(os.path.abspath(path))
+    return run_snippet(code, path)
+
+
+def _close_inherited_fds(keep: Optional[int] = None):
+    """표준 입출력(0-2)과 keep을 제외한 상속 fd를 모두 닫음"""
+    try:
+        max_fd = os.sysconf('SC_OPEN_MAX')
+    except (AttributeError, ValueError, OSError):
+        max_fd = 65536
+    if keep is None:
+        os.closerange(3, max_fd)
+    else:
+        os.closerange(3, keep)
+        os.closerange(keep + 1, max_fd)
+
+
+def _child_main(code: str,
+                out_w: int,
+                err_w: int,
+                limits: Optional[Dict],
+                profile_w: Optional[int] = None,
+                profile_top_n: int = 15):
+    """fork된 자식: 표준 입출력을 파이프로 연결하고 rlimit 적용 후 코드 실행"""
+    import signal
+
+    exit_code = 1
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # 스니펫이 만든 자식까지 한 번에 종료할 수 있도록 별도 프로세스 그룹
+        os.setpgid(0, 0)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(out_w, 1)
+        os.dup2(err_w, 2)
+        os.close(devnull)
+        os.close(out_w)
+        os.close(err_w)
+        # 워커의 프로토콜 파이프 등 (스니펫이 os.write로 응답을 위조하거나 다른 요청의 결과를 읽지 못하게)
+        _close_inherited_fds(keep=profile_w)
+
+        sys.stdin = open(0, 'r', closefd=False)
+        sys.stdout = open(1, 'w', encoding='utf-8', errors='replace', closefd=False)
+        sys.stderr = open(2, 'w', encoding='utf-8', errors='backslashreplace', closefd=False)
+
+        # 워커 스크립트 디렉토리 대신 작업 디렉토리를 import 경로로 사용
+        sys.path[0] = os.getcwd()
+
+        apply_limits(limits)
+        exit_code = run_snippet(code, profile_fd=profile_w, profile_top_n=profile_top_n)
+    finally:
+        os._exit(exit_code)
+
+
+# 워커가 실행 중인 스니펫 자식 (워커 종료 시 함께 정리)
+_running_child = None
+
+
+def _kill_group(pid: int):
+    """스니펫 자식의 프로세스 그룹 강제 종료 (그룹이 없으면 자식만)"""
+    import signal
+
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def _wait_child(pid: int, deadline: float):
+    """
+    스니펫 자식 종료 대기 (fd 1 / 2를 닫고 계속 실행되는 경우도 deadline이 지나면 강제 종료)
+
+    Returns:
+        (wait status, rusage, deadline 초과 여부)
+    """
+    timed_out = False
+    delay = 0.0005
+    while True:
+        waited, status, rusage = os.wait4(pid, os.WNOHANG)
+        if waited:
+            return status, rusage, timed_out
+
+        if not timed_out and time.time() >= deadline:
+            _kill_group(pid)
+            timed_out = True
+
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+def timed_out_result(timeout: float,
+                     stdout: str = '',
+                     stderr: str = '',
+                     resource_usage: Optional[Dict] = None,
+                     truncated: Optional[Dict] = None) -> Dict:
+    """타임아웃 결과 (그때까지의 출력은 유지)"""
+    if stderr and not stderr.endswith('\n'):
+        stderr += '\n'
+    return {
+        'success': False,
+        'stdout': stdout,
+        'stderr': stderr + f'코드 실행이 {timeout}초를 초과하여 중단되었습니다.',
+        'exit_code': -1,
+        'execution_time': timeout,
+        'timed_out': True,
+        'resource_usage': resource_usage or usage_from_rusage(None, timeout),
+        'limit_exceeded': None,
+        'truncated_bytes': truncated or {'stdout': 0, 'stderr': 0}
+    }
+
+
+def fork_and_run(code: str,
+                 timeout: float,
+                 limits: Optional[Dict] = None,
+                 output_limits: Optional[Dict] = None,
+                 profile_top_n: int = 0) -> Dict:
+    """
+    fork한 자식에서 코드를 실행하고 결과 수집
+
+    Args:
+        code: Python 코드
+        timeout: 타임아웃 (초)
+        limits: 자식에 적용할 rlimit (apply_limits 참고)
+        output_limits: 출력 캡처 한도 (create_captures 참고)
+        profile_top_n: 0보다 크면 프로파일 모드 (결과에 'profile' 추가)
+
+    Returns:
+        CodeExecutor.execute_python_code()와 같은 형식의 결과
+    """
+    import selectors
+
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    profile_r, profile_w = os.pipe() if profile_top_n else (None, None)
+
+    global _running_child
+
+    start_time = time.time()
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(out_r)
+        os.close(err_r)
+        if profile_r is not None:
+            os.close(profile_r)
+        _child_main(code, out_w, err_w, limits, profile_w, profile_top_n)
+
+    _running_child = pid
+    try:
+        # 자식의 setpgid보다 먼저 종료 신호를 보내게 되는 경우를 대비해 부모에서도 설정
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    os.close(out_w)
+    os.close(err_w)
+    if profile_w is not None:
+        os.close(profile_w)
+
+    captures = create_captures(output_limits)
+    streams = {out_r: captures['stdout'], err_r: captures['stderr']}
+    deadline = start_time + timeout
+    timed_out = False
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(out_r, selectors.EVENT_READ)
+        selector.register(err_r, selectors.EVENT_READ)
+
+        while selector.get_map():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                timed_out = True
+                break
+
+            for key, _ in selector.select(remaining):
+                chunk = os.read(key.fd, _READ_CHUNK)
+                if chunk:
+                    streams[key.fd].write(chunk)
+                else:
+                    selector.unregister(key.fd)
+
+    if timed_out:
+        _kill_group(pid)
+
+    status, rusage, reap_timed_out = _wait_child(pid, deadline)
+    _running_child = None
+    timed_out = timed_out or reap_timed_out
+    execution_time = time.time() - start_time
+    os.close(out_r)
+    os.close(err_r)
+
+    stdout = captures['stdout'].getvalue()
+    stderr = captures['stderr'].getvalue()
+    truncated = {name: capture.truncated_bytes for name, capture in captures.items()}
+    resource_usage = usage_from_rusage(rusage, execution_time)
+    extra = {}
+    if profile_r is not None:
+        extra['profile'] = read_profile_report(profile_r)
+
+    if timed_out:
+        return {**timed_out_result(timeout, stdout, stderr, resource_usage, truncated), **extra}
+
+    exit_code = os.waitstatus_to_exitcode(status)
+    limit_exceeded = describe_limit_exit(exit_code, stderr)
+    if limit_exceeded and exit_code < 0:
+        stderr += LIMIT_MESSAGES[limit_exceeded]
+
+    return {
+        'success': exit_code == 0,
+        'stdout': stdout,
+        'stderr': stderr,
+        'exit_code': exit_code,
+        'execution_time': execution_time,
+        'timed_out': False,
+        'resource_usage': resource_usage,
+        'limit_exceeded': limit_exceeded,
+        'truncated_bytes': truncated,
+        **extra
+    }
+
+
+def serve():
+    """
+    웜 워커 메인 루프
+    stdin으로 {'code', 'timeout', 'limits', 'output_limits', 'profile_top_n'} 요청을 받아 fork_and_run 결과를 stdout으로 반환
+    """
+    for name in WARM_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    import signal
+
+    def terminate(signum, frame):
+        # 워커 재시작 시 실행 중이던 스니펫 자식도 고아로 남기지 않음
+        if _running_child:
+            _kill_group(_running_child)
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+
+    # 프로토콜 채널은 별도 fd로 분리하고, 실수로 찍히는 출력은 stderr로 보냄
+    requests = os.fdopen(os.dup(0), 'rb')
+    responses = os.fdopen(os.dup(1), 'wb')
+    os.dup2(2, 1)
+
+    write_message(responses, {'ready': True, 'pid': os.getpid()})
+
+    while True:
+        request = read_message(requests)
+        if request is None:
+            break
+
+        try:
+            result = fork_and_run(request['code'], request['timeout'],
+                                  request.get('limits'), request.get('output_limits'),
+                                  request.get('profile_top_n', 0))
+        except Exception as e:
+            result = {
+                'success': False,
+                'stdout': '',
+                'stderr': f'실행 중 오류: {str(e)}',
+                'exit_code': -1,
+                'execution_time': 0,
+                'timed_out': False,
+                'resource_usage': usage_from_rusage(None, 0),
+                'limit_exceeded': None,
+                'truncated_bytes': {'stdout': 0, 'stderr': 0}
+            }
+
+        write_message(responses, result)
+
+
+if __name__ == '__main__':
+    # python sandbox.py --run FILENAME [FD] [--limits SPEC] [--profile REPORT_FD TOP_N]
+    # : fd(기본 stdin)의 코드를 한 번 실행 (--profile이면 요약을 REPORT_FD로 전달)
+    # python sandbox.py --run-file PATH [--limits SPEC] : 파일을 스크립트처럼 실행 (tempfile 전달 방식)
+    # --limits는 코드를 읽기 전에 가장 먼저 적용
+    args = sys.argv[1:]
+    if '--limits' in args:
+        i = args.index('--limits')
+        apply_limits(parse_limits(args[i + 1]))
+        del args[i:i + 2]
+    if len(args) >= 2 and args[0] == '--run':
+        profile_fd, profile_top_n = None, 15
+        if '--profile' in args:
+            i = args.index('--profile')
+            profile_fd, profile_top_n = int(args[i + 1]), int(args[i + 2])
+            del args[i:i + 3]
+        code_fd = int(args[2]) if len(args) > 2 else 0
+        sys.exit(run_from_fd(code_fd, args[1], profile_fd, profile_top_n))
+    if len(args) == 2 and args[0] == '--run-file':
+        sys.exit(run_from_path(args[1]))
+
+    serve()
@@ -0,0 +1,309 @@
+"""
+정적 검사기 - pyflakes를 프로세스 안에서 실행해 실행 없이 찾을 수 있는 오류 탐지
+CodeValidator가 파싱한 트리를 그대로 사용하고, 결과는 ErrorAnalyzer.analyze_error와 같은 형식
+(실행하면 반드시 같은 오류로 끝나는 경우 'deterministic': True → 실행 생략 가능)
+"""
+
+import ast
+import sys
+import importlib.util
+from typing import Dict, List, Optional
+
+from .parsed_module import ParsedModule
+from .error_analyzer import ErrorAnalyzer
+from .sandbox import SNIPPET_FILENAME
+
+try:
+    from pyflakes import checker as pyflakes_checker
+except ImportError:  # pyflakes 미설치 시 정적 단계 생략
+    pyflakes_checker = None
+
+
+class StaticChecker:
+    """pyflakes 기반 정적 오류 탐지"""
+
+    # 컴파일 단계에서 SyntaxError가 나는 메시지 (위치와 무관하게 항상 실패)
+    COMPILE_ERRORS = {
+        'ReturnOutsideFunction', 'YieldOutsideFunction',
+        'ContinueOutsideLoop', 'BreakOutsideLoop',
+        'DefaultExceptNotLast', 'TwoStarredExpressions',
+        'TooManyExpressionsInStarredAssignment', 'ImportStarNotPermitted',
+        'DuplicateArgument', 'LateFutureImport', 'FutureFeatureNotDefined'
+    }
+
+    # 실행 시 발생하는 예외로 대응되는 메시지
+    RUNTIME_ERRORS = {
+        'UndefinedName': ('NameError', "name '{0}' is not defined"),
+        'UndefinedLocal': ('UnboundLocalError', "cannot access local variable '{0}' where it is not associated with a value")
+    }
+
+    # 이 노드 안쪽은 실행되지 않을 수도 있음 (지연 / 조건부 실행)
+    CONDITIONAL_NODES = (
+        ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp,
+        ast.BoolOp, ast.IfExp
+    )
+
+    @staticmethod
+    def available() -> bool:
+        return pyflakes_checker is not None
+
+    @staticmethod
+    def check(parsed: ParsedModule, module_available=None) -> Dict[str, any]:
+        """
+        정적 검사 실행 (결과는 parsed에 보관되므로 같은 코드는 한 번만 검사)
+
+        Args:
+            parsed: 문법 검사를 통과한 ParsedModule
+            module_available: 모듈 이름 → 설치 여부 함수 (누락 import를 확정 오류로 판단, None이면 생략)
+
+        Returns:
+            {
+                'available': bool (pyflakes 사용 가능 여부),
+                'findings': [ErrorAnalyzer 결과 형식 + 'source', 'message_class', 'column', 'deterministic'],
+                'deterministic_error': 실행하면 반드시 발생하는 첫 오류 또는 None
+            }
+        """
+        if not parsed.valid:
+            return {'available': StaticChecker.available(), 'findings': [], 'deterministic_error': None}
+
+        findings = []
+        if pyflakes_checker is not None:
+            messages = parsed.cached('pyflakes', StaticChecker._run_pyflakes)
+            findings = [StaticChecker._to_finding(parsed, m) for m in messages]
+
+        if module_available is not None:
+            findings.extend(StaticChecker._missing_imports(parsed, module_available))
+
+        findings.sort(key=lambda f: (f.get('line_number', 0), f.get('column', 0)))
+
+        return {
+            'available': StaticChecker.available(),
+            'findings': findings,
+            'deterministic_error': StaticChecker._first_deterministic(parsed, findings, module_available)
+        }
+
+    @staticmethod
+    def _run_pyflakes(parsed: ParsedModule) -> List:
+        # pyflakes는 노드에 부모 정보 속성만 추가하므로 공유 트리를 그대로 사용
+        return pyflakes_checker.Checker(parsed.tree, filename=SNIPPET_FILENAME).messages
+
+    @staticmethod
+    def _traceback(parsed: ParsedModule, line: int, error_type: str, message: str, compile_time: bool) -> str:
+        """실행 시 traceback과 같은 모양의 에러 텍스트 (ErrorAnalyzer / DB 저장 형식 유지)"""
+        source_line = parsed.line(line).strip()
+        if compile_time:
+            header = f'  File "{SNIPPET_FILENAME}", line {line}\n'
+        else:
+            header = f'Traceback (most recent call last):\n  File "{SNIPPET_FILENAME}", line {line}, in <module>\n'
+        body = f'    {source_line}\n' if source_line else ''
+        return f'{header}{body}{error_type}: {message}'
+
+    @staticmethod
+    def _make_finding(parsed: ParsedModule, line: int, column: int, error_type: str,
+                      message: str, message_class: str, compile_time: bool = False) -> Dict[str, any]:
+        raw_error = StaticChecker._traceback(parsed, line, error_type, message, compile_time)
+        finding = ErrorAnalyzer.analyze_error(raw_error, parsed.source)
+        finding.update({
+            'error_type': error_type,
+            'error_message': f'{error_type}: {message}',
+            'line_number': line,
+            'column': column,
+            'source': 'pyflakes',
+            'message_class': message_class,
+            'deterministic': False
+        })
+        return finding
+
+    @staticmethod
+    def _to_finding(parsed: ParsedModule, message) -> Dict[str, any]:
+        message_class = type(message).__name__
+        text = message.message % message.message_args
+        line = message.lineno
+        column = message.col + 1
+
+        if message_class in StaticChecker.COMPILE_ERRORS:
+            finding = StaticChecker._make_finding(parsed, line, column, 'SyntaxError', text, message_class, True)
+            finding['deterministic'] = True
+            return finding
+
+        if message_class in StaticChecker.RUNTIME_ERRORS:
+            error_type, template = StaticChecker.RUNTIME_ERRORS[message_class]
+            return StaticChecker._make_finding(
+                parsed, line, column, error_type, template.format(*message.message_args), message_class
+            )
+
+        # 실행을 멈추지 않는 경고 (사용하지 않는 import / 변수 등)
+        return {
+            'error_detected': True,
+            'error_type': message_class,
+            'error_message': text,
+            'line_number': line,
+            'column': column,
+            'description': text,
+            'solutions': [],
+            'severity': 'low',
+            'source': 'pyflakes',
+            'message_class': message_class,
+            'deterministic': False
+        }
+
+    @staticmethod
+    def _missing_imports(parsed: ParsedModule, module_available) -> List[Dict[str, any]]:
+        """최상위에서 바로 실행되는 import 중 설치되지 않은 모듈 → ModuleNotFoundError"""
+        findings = []
+        for node in parsed.tree.body:
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+
+            for name in names:
+                if not module_available(name):
+                    base_module = name.split('.')[0]
+                    findings.append(StaticChecker._make_finding(
+                        parsed, node.lineno, node.col_offset + 1, 'ModuleNotFoundError',
+                        f"No module named '{base_module}'", 'MissingModule'
+                    ))
+                    break
+        return findings
+
+    @staticmethod
+    def _import_resolves(name: str, module_available) -> bool:
+        """
+        'import name'이 성공하는지 (확인할 수 없으면 False)
+        하위 모듈은 상위 패키지가 이미 import되어 있을 때만 find_spec으로 확인 (검사 중 패키지 코드를 실행하지 않음)
+        """
+        if module_available is None or not module_available(name.split('.')[0]):
+            return False
+        parent = name.rpartition('.')[0]
+        if not parent:
+            return True
+        if parent not in sys.modules:
+            return False
+        try:
+            return importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            return False
+
+    @staticmethod
+    def _is_safe_statement(node: ast.stmt, module_available=None) -> bool:
+        """실행해도 예외가 나지 않는 최상위 문장 (확정 오류 앞에 와도 되는 것)"""
+        if isinstance(node, ast.Pass):
+            return True
+        if isinstance(node, ast.Import):
+            return all(StaticChecker._import_resolves(alias.name, module_available) for alias in node.names)
+        if isinstance(node, ast.ImportFrom):
+            return False  # 가져올 이름이 없으면 ImportError (모듈 내용은 확인하지 않음)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return not node.decorator_list and not node.args.defaults and not node.args.kw_defaults
+        if isinstance(node, ast.Expr):
+            value = node.value
+            if isinstance(value, ast.Constant):
+                return True
+            # 리터럴만 출력하는 print
+            return (isinstance(value, ast.Call) and isinstance(value.func, ast.Name)
+                    and value.func.id == 'print' and not value.keywords
+                    and all(isinstance(arg, ast.Constant) for arg in value.args))
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if node.value is None or not all(isinstance(t, ast.Name) for t in targets):
+                return False
+            try:
+                ast.literal_eval(node.value)
+                return True
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                return False
+        return False
+
+    @staticmethod
+    def _runs_unconditionally(statement: ast.stmt, line: int, column: int) -> bool:
+        """최상위 문장 안의 (line, column) 위치가 조건 없이 바로 평가되는지"""
+        if not isinstance(statement, (ast.Expr, ast.Assign, ast.AugAssign, ast.AnnAssign,
+                                      ast.Return, ast.Raise, ast.Delete, ast.Import, ast.ImportFrom)):
+            return False
+
+        def visit(node: ast.AST, conditional: bool) -> Optional[bool]:
+            if (getattr(node, 'lineno', None) == line and getattr(node, 'col_offset', None) == column - 1
+                    and isinstance(node, (ast.Name, ast.stmt))):
+                return not conditional
+            conditional = conditional or isinstance(node, StaticChecker.CONDITIONAL_NODES)
+            for child in ast.iter_child_nodes(node):
+                found = visit(child, conditional)
+                if found is not None:
+                    return found
+            return None
+
+        return bool(visit(statement, False))
+
+    @staticmethod
+    def _first_deterministic(parsed: ParsedModule, findings: List[Dict[str, any]],
+                             module_available=None) -> Optional[Dict[str, any]]:
+        """
+        실행하면 반드시 발생하는 첫 오류
+        - 컴파일 오류: 항상 (아무것도 실행되지 않음)
+        - NameError / ModuleNotFoundError: 최상위에서 조건 없이 실행되고 앞선 문장이 모두 안전한 경우
+        """
+        for finding in findings:
+            if finding['deterministic']:
+                return finding
+
+        safe_prefix = True
+        candidates = {}
+        for finding in findings:
+            if finding['message_class'] in ('UndefinedName', 'MissingModule'):
+                candidates.setdefault(finding['line_number'], []).append(finding)
+
+        for statement in parsed.tree.body:
+            if not safe_prefix:
+                break
+            for line in range(statement.lineno, (statement.end_lineno or statement.lineno) + 1):
+                for finding in candidates.get(line, []):
+                    if StaticChecker._runs_unconditionally(statement, line, finding['column']):
+                        finding['deterministic'] = True
+                        return finding
+            safe_prefix = StaticChecker._is_safe_statement(statement, module_available)
+        return None
+
+    @staticmethod
+    def execution_result(finding: Dict[str, any]) -> Dict[str, any]:
+        """확정 오류를 실행 결과 형식으로 (실행을 생략한 경우 /api/analyze 응답에 사용)"""
+        return {
+            'success': False,
+            'stdout': '',
+            'stderr': finding['raw_error'],
+            'exit_code': 1,
+            'execution_time': 0,
+            'timed_out': False,
+            'warm': False,
+            'skipped': True,
+            'skip_reason': 'static'
+        }
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🔬 정적 검사기 테스트")
+    print("=" * 60)
+
+    samples = {
+        '정의되지 않은 이름': "import os\nprint('start')\nprint(undefined_value)",
+        '함수 안 (실행 필요)': "def f():\n    return missing\nprint(1)",
+        '앞 문장이 실패할 수 있음': "x = 1 / 0\nprint(y)",
+        '함수 밖 return': "x = 1\nreturn x",
+        '누락 모듈': "import not_a_real_module_xyz\nprint(1)",
+        '경고만': "import os\nimport sys\nprint(sys.argv)",
+        'from import (실행 필요)': "from os import nonexistent_thing\nprint(y)",
+        '없는 하위 모듈 (실행 필요)': "import os.nothere_mod\nprint(y)"
+    }
+    for title, code in samples.items():
+        parsed = ParsedModule.get(code)
+        result = StaticChecker.check(parsed, module_available=lambda name: name.split('.')[0] in ('os', 'sys'))
+        print(f"\n{title}:")
+        for f in result['findings']:
+            print(f"   line {f['line_number']}:{f['column']} {f['error_type']} - {f['error_message']}"
+                  f"{' (확정)' if f['deterministic'] else ''}")
+        error = result['deterministic_error']
+        print(f"   → 실행 생략: {error['error_type'] if error else '아니오'}")
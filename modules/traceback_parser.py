@@ -0,0 +1,292 @@
+"""
+Traceback 파서 - stderr를 한 번 훑으며 프레임 / 예외 체인 / 최종 예외로 구조화
+줄 단위 상태 기계라 청크로 나눠 넣어도 되고(feed), 프레임 / 메시지 / 체인 길이에
+상한이 있어 수 MB stderr도 일정한 메모리로 처리
+"""
+
+import re
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class TracebackParser:
+    """스트리밍 traceback 파서"""
+
+    HEAD_FRAMES = 10      # 예외마다 앞쪽 프레임 보관 수
+    TAIL_FRAMES = 40      # 예외마다 뒤쪽 프레임 보관 수 (사이 구간은 개수만 기록)
+    MAX_CHAIN = 8         # 보관할 연쇄 예외 수 (마지막 N개)
+    MAX_MESSAGE = 4096    # 예외 메시지 최대 길이 (문자)
+    MAX_SOURCE = 300      # 프레임 소스 줄 최대 길이 (문자)
+    MAX_LINE = 8192       # 한 줄 최대 길이 (넘는 부분은 버림)
+
+    TRACEBACK_HEADER = 'Traceback (most recent call last):'
+    CONTEXT_SEPARATOR = 'During handling of the above exception'
+    CAUSE_SEPARATOR = 'The above exception was the direct cause'
+
+    FRAME_LINE = re.compile(r'  File "(?P<file>.*)", line (?P<line>\d+)(?:, in (?P<function>.*))?$')
+    REPEATED_LINE = re.compile(r'  \[Previous line repeated (\d+) more times?\]')
+    # 모듈 경로를 포함할 수 있고 마지막 이름은 대문자로 시작 (예: json.decoder.JSONDecodeError)
+    EXCEPTION_LINE = re.compile(r'((?:[A-Za-z_]\w*\.)*[A-Z]\w*)(?:: (.*)|:?)$')
+
+    # 라이브러리 프레임 판별 (사용자 코드 줄 번호를 고를 때 제외)
+    LIBRARY_MARKERS = ('site-packages', 'dist-packages', '/lib/python', '\\lib\\', '<frozen')
+
+    def __init__(self):
+        self._partial = ''
+        self._chain = deque(maxlen=self.MAX_CHAIN)
+        self._chain_dropped = 0
+        self._current = None         # 진행 중인 예외 레코드
+        self._state = 'idle'         # idle | frames | message
+        self._pending_relation = None
+        self._bare_exception = None  # traceback 없이 나온 예외 형식 줄 (마지막 것)
+        self._lines = 0
+
+    # ========== 입력 ==========
+
+    def feed(self, text: str):
+        """stderr 일부를 입력 (줄 경계와 무관하게 나눠 넣어도 됨)"""
+        start = 0
+        length = len(text)
+        while start < length:
+            end = text.find('\n', start)
+            if end == -1:
+                room = self.MAX_LINE - len(self._partial)
+                if room > 0:
+                    self._partial += text[start:start + room]
+                return
+            if self._partial:
+                line = self._partial + text[start:min(end, start + self.MAX_LINE)]
+                self._partial = ''
+            else:
+                line = text[start:min(end, start + self.MAX_LINE)]
+            self._process(line.rstrip('\r'))
+            start = end + 1
+
+    def close(self) -> Dict[str, any]:
+        """
+        입력 종료 후 결과 반환
+
+        Returns:
+            {
+                'final': 최종 예외 레코드 또는 None,
+                'chain': [예외 레코드] (발생 순서, 마지막이 final),
+                'chain_dropped': 보관 한도로 버린 앞쪽 예외 수
+            }
+            예외 레코드: {'type', 'message', 'text', 'relation' (cause | context | None),
+                          'frames': [{'file', 'line', 'function', 'source', 'repeated'}], 'frames_omitted'}
+        """
+        if self._partial:
+            self._process(self._partial.rstrip('\r'))
+            self._partial = ''
+        self._finish_current()
+
+        chain = [self._export(record) for record in self._chain]
+        if not chain and self._bare_exception is not None:
+            chain = [self._export(self._bare_exception)]
+
+        return {
+            'final': chain[-1] if chain else None,
+            'chain': chain,
+            'chain_dropped': self._chain_dropped
+        }
+
+    @staticmethod
+    def parse(stderr: str) -> Dict[str, any]:
+        """stderr 전체를 한 번에 파싱 (feed + close)"""
+        parser = TracebackParser()
+        parser.feed(stderr)
+        return parser.close()
+
+    # ========== 상태 기계 ==========
+
+    def _new_record(self) -> Dict[str, any]:
+        record = {
+            'type': None,
+            'message': '',
+            'relation': self._pending_relation,
+            'head': [],
+            'tail': deque(maxlen=self.TAIL_FRAMES),
+            'frames_seen': 0
+        }
+        self._pending_relation = None
+        return record
+
+    def _finish_current(self):
+        """예외 줄까지 나온 레코드만 체인에 추가 (잘린 traceback은 버림)"""
+        record = self._current
+        self._current = None
+        if record is not None and record['type'] is not None:
+            if len(self._chain) == self._chain.maxlen:
+                self._chain_dropped += 1
+            self._chain.append(record)
+
+    def _add_frame(self, frame: Dict[str, any]):
+        record = self._current
+        record['frames_seen'] += 1
+        if len(record['head']) < self.HEAD_FRAMES:
+            record['head'].append(frame)
+        else:
+            record['tail'].append(frame)
+
+    def _last_frame(self) -> Optional[Dict[str, any]]:
+        record = self._current
+        if record is None:
+            return None
+        if record['tail']:
+            return record['tail'][-1]
+        return record['head'][-1] if record['head'] else None
+
+    def _process(self, line: str):
+        self._lines += 1
+
+        # 가장 흔한 줄(프레임 소스 / 위치 표시)은 정규식 없이 처리
+        if line.startswith('    ') and self._state == 'frames':
+            frame = self._last_frame()
+            if frame is not None and frame['source'] is None:
+                source = line.strip()
+                # 3.11+ 위치 표시(^^^ / ~~~) 줄은 소스가 아님
+                if source.strip('^~ '):
+                    frame['source'] = source[:self.MAX_SOURCE]
+            return
+
+        if line.startswith('  File "'):
+            frame_match = self.FRAME_LINE.match(line)
+            if frame_match:
+                # SyntaxError는 "Traceback" 줄 없이 위치 프레임부터 시작
+                if self._current is None or self._state == 'message':
+                    self._finish_current()
+                    self._current = self._new_record()
+                self._add_frame({
+                    'file': frame_match.group('file'),
+                    'line': int(frame_match.group('line')),
+                    'function': frame_match.group('function'),
+                    'source': None,
+                    'repeated': 0
+                })
+                self._state = 'frames'
+                return
+
+        if line == self.TRACEBACK_HEADER:
+            self._finish_current()
+            self._current = self._new_record()
+            self._state = 'frames'
+            return
+
+        if line.startswith(self.CONTEXT_SEPARATOR) or line.startswith(self.CAUSE_SEPARATOR):
+            self._finish_current()
+            self._pending_relation = 'context' if line.startswith(self.CONTEXT_SEPARATOR) else 'cause'
+            self._state = 'idle'
+            return
+
+        if self._state == 'frames':
+            if line.startswith('  '):
+                repeated = self.REPEATED_LINE.match(line)
+                frame = self._last_frame()
+                if repeated and frame is not None:
+                    frame['repeated'] = int(repeated.group(1))
+                return
+
+            exception_match = self.EXCEPTION_LINE.match(line)
+            if exception_match and self._current is not None:
+                self._current['type'] = exception_match.group(1)
+                self._current['message'] = (exception_match.group(2) or '')[:self.MAX_MESSAGE]
+                self._state = 'message'
+            # 그 밖의 줄 (traceback 사이에 섞인 출력)은 무시
+            return
+
+        if self._state == 'message':
+            if not line.strip():
+                self._state = 'idle'
+                return
+            # 여러 줄 메시지 / add_note 내용
+            record = self._current
+            room = self.MAX_MESSAGE - len(record['message'])
+            if room > 1:
+                record['message'] += '\n' + line[:room - 1]
+            return
+
+        # traceback 밖: 예외 형식 줄만 기억 (traceback이 전혀 없을 때 최종 예외로 사용)
+        exception_match = self.EXCEPTION_LINE.match(line)
+        if exception_match:
+            self._bare_exception = {
+                'type': exception_match.group(1),
+                'message': (exception_match.group(2) or '')[:self.MAX_MESSAGE],
+                'relation': None,
+                'head': [],
+                'tail': (),
+                'frames_seen': 0
+            }
+
+    @staticmethod
+    def _export(record: Dict[str, any]) -> Dict[str, any]:
+        frames = list(record['head']) + list(record['tail'])
+        message = record['message']
+        return {
+            'type': record['type'],
+            'message': message,
+            'text': f"{record['type']}: {message}" if message else record['type'],
+            'relation': record['relation'],
+            'frames': frames,
+            'frames_omitted': record['frames_seen'] - len(frames)
+        }
+
+    # ========== 결과 해석 ==========
+
+    @staticmethod
+    def is_library_frame(frame: Dict[str, any]) -> bool:
+        filename = frame.get('file') or ''
+        return any(marker in filename for marker in TracebackParser.LIBRARY_MARKERS)
+
+    @staticmethod
+    def user_frame(frames: List[Dict[str, any]]) -> Optional[Dict[str, any]]:
+        """가장 안쪽의 사용자 코드 프레임 (없으면 가장 안쪽 프레임)"""
+        for frame in reversed(frames):
+            if not TracebackParser.is_library_frame(frame):
+                return frame
+        return frames[-1] if frames else None
+
+
+# 테스트
+if __name__ == '__main__':
+    import time
+
+    print("=" * 60)
+    print("🧵 Traceback 파서 테스트")
+    print("=" * 60)
+
+    chained = '''Traceback (most recent call last):
+  File "main.py", line 3, in load
+    return data["key"]
+           ~~~~^^^^^^^
+KeyError: 'key'
+
+During handling of the above exception, another exception occurred:
+
+Traceback (most recent call last):
+  File "main.py", line 8, in <module>
+    load({})
+  File "main.py", line 5, in load
+    raise ValueError("설정을 읽을 수 없습니다")
+ValueError: 설정을 읽을 수 없습니다'''
+
+    result = TracebackParser.parse(chained)
+    print(f"\n체인: {[(e['type'], e['relation']) for e in result['chain']]}")
+    final = result['final']
+    print(f"최종 예외: {final['text']}")
+    print(f"사용자 프레임: {TracebackParser.user_frame(final['frames'])}")
+
+    deep = 'Traceback (most recent call last):\n' + '  File "main.py", line 2, in f\n    return f(n + 1)\n' * 200000 \
+        + 'RecursionError: maximum recursion depth exceeded'
+    started = time.perf_counter()
+    parser = TracebackParser()
+    for offset in range(0, len(deep), 65536):
+        parser.feed(deep[offset:offset + 65536])
+    result = parser.close()
+    elapsed = (time.perf_counter() - started) * 1000
+    final = result['final']
+    print(f"\n{len(deep) / 1024 / 1024:.1f}MB 깊은 스택: {elapsed:.0f}ms, "
+          f"프레임 {len(final['frames'])}개 보관 / {final['frames_omitted']}개 생략, {final['text']}")
+
+    syntax = '  File "main.py", line 1\n    def f(:\n          ^\nSyntaxError: invalid syntax'
+    final = TracebackParser.parse(syntax)['final']
+    print(f"\nSyntaxError: {final['text']} (line {final['frames'][-1]['line']})")
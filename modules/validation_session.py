@@ -0,0 +1,339 @@
+"""
+실시간 검증 세션 - 입력 중인 코드를 편집 단위로 받아 바뀐 최상위 문장만 다시 파싱
+코드를 최상위 문장 단위 블록(줄 범위 + AST + import)으로 나눠 보관하고,
+편집이 닿은 블록(블록 첫 줄이면 앞 블록 포함)만 다시 파싱한 뒤 뒤쪽 블록은 줄 번호만 이동
+"""
+
+import ast
+import time
+import uuid
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .parsed_module import ParsedModule
+from .code_validator import CodeValidator
+
+
+class _Block:
+    """최상위 문장 묶음 (줄 범위는 0부터, end 미포함)"""
+
+    __slots__ = ('start', 'end', 'line_offset', 'nodes', 'error', '_imports')
+
+    def __init__(self, start: int, end: int, line_offset: int, nodes: List[ast.stmt], error=None):
+        self.start = start
+        self.end = end
+        self.line_offset = line_offset  # 노드 lineno + line_offset = 현재 줄 번호 (1부터)
+        self.nodes = nodes
+        self.error = error  # 블록을 파싱하지 못한 경우 예외 (lineno는 블록 기준)
+        self._imports = None
+
+    @property
+    def imports(self):
+        """(import 리스트, from_imports) - 블록이 바뀌기 전까지 재사용"""
+        if self._imports is None:
+            self._imports = CodeValidator.collect_imports(self.nodes)
+        return self._imports
+
+    def shift(self, delta: int):
+        self.start += delta
+        self.end += delta
+        self.line_offset += delta
+
+
+class ValidationSession:
+    """편집을 반영하며 증분 검증하는 세션 (한 편집기 = 한 세션)"""
+
+    MAX_EXPAND = 2  # 다시 파싱한 범위가 문법 오류일 때 뒤 블록을 붙여 재시도하는 횟수
+
+    def __init__(self, code: str):
+        self.session_id = uuid.uuid4().hex
+        self.version = 0
+        self.last_access = time.monotonic()
+        self.lock = threading.Lock()
+        self.reset(code)
+
+    def reset(self, code: str):
+        """전체 코드로 다시 시작 (블록 전체 재구성)"""
+        self.lines = code.split('\n')
+        self.version += 1
+        self.reparsed_lines = len(self.lines)
+
+        parsed = ParsedModule.get(code)
+        if parsed.valid:
+            self.blocks = self._make_blocks(parsed.tree.body, 0, len(self.lines), 0)
+        else:
+            self.blocks = [_Block(0, len(self.lines), 0, [], parsed.error)]
+
+    @staticmethod
+    def _first_line(node: ast.stmt) -> int:
+        """데코레이터를 포함한 문장 시작 줄"""
+        decorators = getattr(node, 'decorator_list', None) or []
+        return min([node.lineno] + [d.lineno for d in decorators])
+
+    @staticmethod
+    def _make_blocks(nodes: List[ast.stmt], start: int, end: int, line_offset: int) -> List[_Block]:
+        """
+        파싱한 문장들을 블록으로 (문장 사이의 빈 줄 / 주석은 앞 블록에 포함)
+
+        Args:
+            nodes: 최상위 문장
+            start, end: 문장들이 차지하는 줄 범위 (0부터)
+            line_offset: 노드 lineno → 현재 줄 번호 보정값
+        """
+        if not nodes:
+            return [_Block(start, end, line_offset, [])] if end > start else []
+
+        groups = []
+        for node in nodes:
+            # 이전 문장이 끝난 줄에서 시작하면 (a = 1; b = 2) 같은 블록
+            if groups and ValidationSession._first_line(node) <= groups[-1][-1].end_lineno:
+                groups[-1].append(node)
+            else:
+                groups.append([node])
+
+        blocks = []
+        for index, group in enumerate(groups):
+            block_start = start if index == 0 else ValidationSession._first_line(group[0]) + line_offset - 1
+            if blocks:
+                blocks[-1].end = block_start
+            blocks.append(_Block(block_start, end, line_offset, group))
+        return blocks
+
+    def _block_index(self, line: int) -> int:
+        starts = [block.start for block in self.blocks]
+        return max(bisect.bisect_right(starts, line) - 1, 0)
+
+    def apply_edit(self, start: int, end: int, new_lines: List[str]):
+        """
+        줄 범위 [start, end)를 new_lines로 교체하고 영향받은 블록만 다시 파싱
+
+        Args:
+            start, end: 0부터 시작하는 줄 번호 (end 미포함)
+            new_lines: 새 줄 목록 (줄바꿈 없이)
+
+        Raises:
+            ValueError: 범위가 잘못된 경우
+        """
+        if not (0 <= start <= end <= len(self.lines)):
+            raise ValueError(f'잘못된 편집 범위: [{start}, {end}) / {len(self.lines)}줄')
+
+        self.lines[start:end] = new_lines
+        if not self.lines or not self.blocks:
+            self.reset('\n'.join(self.lines))
+            return
+
+        delta = len(new_lines) - (end - start)
+
+        # 편집이 닿은 블록 (블록 첫 줄을 고치면 들여쓰기 변화로 앞 블록에 붙을 수 있으므로 앞 블록도)
+        first = self._block_index(start)
+        if first > 0 and start <= self.blocks[first].start:
+            first -= 1
+        # 앞쪽의 문법 오류 블록은 뒤의 편집으로 풀릴 수 있음 (닫히지 않은 괄호 / 문자열)
+        for index in range(first - 1, -1, -1):
+            if self.blocks[index].error is not None:
+                first = index
+                break
+        last = self._block_index(max(end - 1, start))
+        for block in self.blocks[last + 1:]:
+            block.shift(delta)
+
+        region_start = self.blocks[first].start
+        region_end = self.blocks[last].end + delta
+        self._reparse(first, last, region_start, region_end)
+
+    def _reparse(self, first: int, last: int, region_start: int, region_end: int):
+        """blocks[first:last + 1]을 [region_start, region_end) 줄을 다시 파싱한 블록으로 교체"""
+        end = region_end
+        extra = 0
+        first_error = None
+
+        while True:
+            parsed = ParsedModule.get('\n'.join(self.lines[region_start:end]))
+            self.reparsed_lines += end - region_start
+            if parsed.valid:
+                new_blocks = self._make_blocks(parsed.tree.body, region_start, end, region_start)
+                break
+            if first_error is None:
+                first_error = parsed.error
+            # 열린 괄호 / 데코레이터 등이 다음 블록과 이어질 수 있으므로 뒤 블록을 붙여 재시도
+            if last + extra + 1 >= len(self.blocks) or extra >= self.MAX_EXPAND:
+                end = region_end
+                extra = 0
+                new_blocks = [_Block(region_start, end, region_start, [], first_error)] if end > region_start else []
+                break
+            extra += 1
+            end = self.blocks[last + extra].end
+
+        self.blocks[first:last + extra + 1] = new_blocks
+
+    def apply_edits(self, edits: List[Dict[str, any]]):
+        """
+        편집 목록 적용 (순서대로)
+
+        Args:
+            edits: [{'start': int, 'end': int, 'lines': [str]}]
+        """
+        self.reparsed_lines = 0
+        for edit in edits:
+            new_lines = edit.get('lines')
+            if not isinstance(new_lines, list) or not all(isinstance(line, str) for line in new_lines):
+                raise ValueError("편집의 'lines'는 문자열 리스트여야 합니다")
+            self.apply_edit(int(edit['start']), int(edit['end']), new_lines)
+        self.version += 1
+
+    @property
+    def code(self) -> str:
+        return '\n'.join(self.lines)
+
+    def validate(self) -> Dict[str, any]:
+        """
+        현재 코드의 검증 결과 (CodeValidator.full_validation과 같은 형식, 정적 검사 제외)
+
+        Returns:
+            {'overall_valid', 'syntax', 'imports', 'issues', 'static': None}
+        """
+        result = {
+            'overall_valid': True,
+            'syntax': None,
+            'imports': None,
+            'issues': [],
+            'static': None
+        }
+
+        broken = next((block for block in self.blocks if block.error is not None), None)
+        if broken is not None:
+            result['syntax'] = self._syntax_error(broken)
+            result['overall_valid'] = False
+            return result
+        result['syntax'] = {'valid': True, 'message': 'Syntax가 올바릅니다'}
+
+        imports = []
+        from_imports = {}
+        for block in self.blocks:
+            block_imports, block_from_imports = block.imports
+            imports.extend(block_imports)
+            from_imports.update(block_from_imports)
+
+        availability = CodeValidator.check_imports_available(imports + list(from_imports.keys()))
+        result['imports'] = {
+            'extracted': {'success': True, 'imports': imports, 'from_imports': from_imports},
+            'availability': availability
+        }
+        if not availability['all_available']:
+            result['overall_valid'] = False
+
+        result['issues'] = CodeValidator.detect_source_issues(self.code)
+        return result
+
+    @staticmethod
+    def _syntax_error(block: _Block) -> Dict[str, any]:
+        """블록 기준 예외를 validate_syntax 형식으로 (줄 번호는 전체 코드 기준)"""
+        e = block.error
+        if isinstance(e, SyntaxError):
+            return {
+                'valid': False,
+                'error': str(e.msg),
+                'line': e.lineno + block.line_offset if e.lineno else None,
+                'offset': e.offset,
+                'error_type': type(e).__name__,
+                'text': e.text
+            }
+        return {
+            'valid': False,
+            'error': str(e),
+            'error_type': type(e).__name__
+        }
+
+
+class ValidationSessionStore:
+    """세션 보관소 (개수 제한 LRU + 유휴 시간 만료)"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_sessions: int = 128, ttl: int = 1800):
+        """
+        Args:
+            max_sessions: 최대 세션 수 (초과 시 오래 안 쓴 세션부터 제거)
+            ttl: 유휴 만료 시간 (초)
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def shared() -> 'ValidationSessionStore':
+        """Config 기준 공용 보관소"""
+        from .config import Config
+
+        with ValidationSessionStore._shared_lock:
+            if ValidationSessionStore._shared is None:
+                ValidationSessionStore._shared = ValidationSessionStore(
+                    max_sessions=Config.VALIDATION_SESSION_MAX,
+                    ttl=Config.VALIDATION_SESSION_TTL
+                )
+        return ValidationSessionStore._shared
+
+    def _expire(self, now: float):
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access < self.ttl and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+    def create(self, code: str) -> ValidationSession:
+        session = ValidationSession(code)
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._expire(time.monotonic())
+        return session
+
+    def get(self, session_id: str) -> Optional[ValidationSession]:
+        """세션 조회 (없거나 만료되면 None)"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_access = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("⌨️  실시간 검증 세션 테스트")
+    print("=" * 60)
+
+    block = "def func_{0}(x):\n    total = 0\n    for i in range(x):\n        total += i * {0}\n    return total\n"
+    code = "import os\nimport json\n\n" + "\n".join(block.format(i) for i in range(1000))
+    session = ValidationSession(code)
+    print(f"\n{len(session.lines)}줄, 블록 {len(session.blocks)}개")
+
+    edits = [
+        ('함수 안 한 줄 수정', 2502, 2503, ['        total += i * 2 +']),
+        ('오류 수정', 2502, 2503, ['        total += i * 2 + 1']),
+        ('import 추가', 2, 2, ['import not_a_real_module_xyz']),
+        ('괄호 열기', 100, 100, ['value = (']),
+        ('괄호 닫기', 100, 101, ['value = (1, 2)'])
+    ]
+    for title, start, end, lines in edits:
+        began = time.perf_counter()
+        session.apply_edits([{'start': start, 'end': end, 'lines': lines}])
+        result = session.validate()
+        elapsed = (time.perf_counter() - began) * 1000
+        syntax = result['syntax']
+        status = '✅' if syntax['valid'] else f"❌ line {syntax['line']}: {syntax['error']}"
+        missing = result['imports']['availability']['missing'] if result['imports'] else []
+        print(f"   {title:<16} {elapsed:6.2f}ms  다시 파싱 {session.reparsed_lines}줄  {status} {missing or ''}")
+
+    full = CodeValidator.validate_syntax(session.code)
+    print(f"\n전체 파싱 결과와 일치: {full['valid'] == session.validate()['syntax']['valid']}")
@@ -6,7 +6,7 @@ ChromaDB 기본 임베딩 사용 (의존성 최소화)
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 import os
 import json
 from pathlib import Path
@@ -231,6 +231,56 @@ Code: {code_snippet}
             print(f"❌ 초기화 실패: {e}")
             return False
     
+    def iter_records(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        저장된 임베딩을 batch_size개씩 읽기 (내보내기용, 임베딩 재계산 없음)
+        
+        Yields:
+            [{'id', 'embedding', 'document', 'metadata'}] (최대 batch_size개)
+        """
+        offset = 0
+        while True:
+            results = self.collection.get(
+                limit=batch_size,
+                offset=offset,
+                include=['embeddings', 'documents', 'metadatas']
+            )
+            ids = results['ids']
+            if not ids:
+                return
+            embeddings = results['embeddings']
+            yield [
+                {
+                    'id': ids[i],
+                    'embedding': [float(x) for x in embeddings[i]],
+                    'document': results['documents'][i],
+                    'metadata': results['metadatas'][i]
+                }
+                for i in range(len(ids))
+            ]
+            offset += len(ids)
+    
+    def upsert_records(self, records: List[Dict[str, Any]]) -> int:
+        """
+        임베딩을 그대로 일괄 저장 (가져오기용 - 같은 ID는 덮어쓰고, 임베딩 함수는 호출하지 않음)
+        
+        Args:
+            records: iter_records 형식의 리스트
+            
+        Returns:
+            저장한 개수
+        """
+        max_batch = self.client.get_max_batch_size()
+        for i in range(0, len(records), max_batch):
+            chunk = records[i:i + max_batch]
+            self.collection.upsert(
+                ids=[r['id'] for r in chunk],
+                embeddings=[r['embedding'] for r in chunk],
+                documents=[r['document'] for r in chunk],
+                metadatas=[r['metadata'] or None for r in chunk]
+            )
+        return len(records)
+    
     def delete_by_id(self, error_id: str):
         """ID로 에러 삭제"""
         try:
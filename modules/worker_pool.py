@@ -0,0 +1,306 @@
+"""
+웜 워커 풀 모듈 - 미리 띄워둔 인터프리터에서 코드 실행
+매 요청마다 python을 새로 띄우는 대신, 표준 라이브러리를 미리 import 한
+워커 프로세스가 요청마다 자식을 fork하여 코드를 실행 (forkserver 방식)
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import selectors
+import threading
+import subprocess
+from typing import Dict, Optional
+
+from . import sandbox
+
+
+class WorkerError(Exception):
+    """워커 프로세스 통신 실패"""
+
+
+class WorkerTimeout(WorkerError):
+    """제한 시간 안에 워커 응답이 없음"""
+
+
+class _Worker:
+    """샌드박스 워커 프로세스 하나"""
+
+    STARTUP_TIMEOUT = 10  # 초
+    RESPONSE_GRACE = 5  # 코드 타임아웃 이후 응답 대기 여유 (초)
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, '-u', sandbox.__file__],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self.runs = 0
+        self.started_at = time.time()
+
+        ready = self._receive(self.STARTUP_TIMEOUT)
+        if not ready.get('ready'):
+            self.kill()
+            raise WorkerError('워커 초기화 실패')
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def _receive(self, timeout: float) -> Dict:
+        """응답 수신 (timeout 안에 응답이 없으면 WorkerError)"""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.process.stdout, selectors.EVENT_READ)
+            if not selector.select(timeout):
+                raise WorkerTimeout('워커 응답 시간 초과')
+
+        message = sandbox.read_message(self.process.stdout)
+        if message is None:
+            raise WorkerError('워커 프로세스가 종료되었습니다')
+        return message
+
+    def run(self,
+            code: str,
+            timeout: float,
+            limits: Optional[Dict] = None,
+            output_limits: Optional[Dict] = None,
+            profile_top_n: int = 0) -> Dict:
+        """코드 실행 요청"""
+        try:
+            sandbox.write_message(self.process.stdin, {
+                'code': code,
+                'timeout': timeout,
+                'limits': limits,
+                'output_limits': output_limits,
+                'profile_top_n': profile_top_n
+            })
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f'워커 요청 전송 실패: {e}')
+
+        self.runs += 1
+        return self._receive(timeout + self.RESPONSE_GRACE)
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def kill(self):
+        """워커 종료 (SIGTERM을 받은 워커가 실행 중인 스니펫 자식도 종료, 응답이 없으면 강제 종료)"""
+        try:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait(timeout=5)
+        except Exception:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+class WarmWorkerPool:
+    """미리 fork된 샌드박스 워커 풀"""
+
+    def __init__(self,
+                 size: int = 4,
+                 max_runs: int = 100,
+                 max_lifetime: float = 3600,
+                 recycle_on_timeout: bool = True,
+                 acquire_timeout: float = 0.5):
+        """
+        Args:
+            size: 워커 개수
+            max_runs: 워커당 최대 실행 횟수 (초과 시 재시작, 0이면 무제한)
+            max_lifetime: 워커 최대 수명 (초, 초과 시 재시작, 0이면 무제한)
+            recycle_on_timeout: 타임아웃이 발생한 워커를 재시작할지 여부
+            acquire_timeout: 유휴 워커 대기 시간 (초과하면 cold 실행으로 전환)
+        """
+        self.size = size
+        self.max_runs = max_runs
+        self.max_lifetime = max_lifetime
+        self.recycle_on_timeout = recycle_on_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            'warm_runs': 0,
+            'unavailable': 0,
+            'spawned': 0,
+            'recycled': 0,
+            'failures': 0
+        }
+
+        for _ in range(size):
+            self._spawn_async()
+
+        atexit.register(self.shutdown)
+
+    @staticmethod
+    def is_supported() -> bool:
+        """현재 플랫폼에서 사용 가능 여부 (fork 필요 → Windows 미지원)"""
+        return hasattr(os, 'fork')
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _spawn(self):
+        """워커 하나를 띄워 유휴 큐에 추가"""
+        if self._closed:
+            return
+        try:
+            worker = _Worker()
+        except Exception as e:
+            print(f"⚠️ 워커 시작 실패: {e}")
+            self._count('failures')
+            return
+
+        self._count('spawned')
+        if self._closed:
+            worker.kill()
+        else:
+            self._idle.put(worker)
+
+    def _spawn_async(self):
+        """요청 경로를 막지 않도록 백그라운드에서 워커 생성"""
+        threading.Thread(target=self._spawn, daemon=True).start()
+
+    def _should_recycle(self, worker: _Worker, result: Optional[Dict]) -> bool:
+        """재시작 정책 판단"""
+        if not worker.is_alive():
+            return True
+        if self.max_runs and worker.runs >= self.max_runs:
+            return True
+        if self.max_lifetime and time.time() - worker.started_at >= self.max_lifetime:
+            return True
+        if self.recycle_on_timeout and result is not None and result.get('timed_out'):
+            return True
+        return False
+
+    def _recycle(self, worker: _Worker):
+        worker.kill()
+        self._count('recycled')
+        self._spawn_async()
+
+    def execute(self,
+                code: str,
+                timeout: float,
+                limits: Optional[Dict] = None,
+                output_limits: Optional[Dict] = None,
+                profile_top_n: int = 0) -> Optional[Dict]:
+        """
+        웜 워커에서 코드 실행
+
+        Args:
+            code: Python 코드
+            timeout: 타임아웃 (초)
+            limits: 자식에 적용할 rlimit (sandbox.apply_limits 참고)
+            output_limits: 출력 캡처 한도 (sandbox.create_captures 참고)
+            profile_top_n: 0보다 크면 프로파일 모드 (sandbox.fork_and_run 참고)
+
+        Returns:
+            실행 결과 (execute_python_code와 동일 + 'warm', 'worker_pid')
+            유휴 워커가 없거나 워커가 실패하면 None (호출자가 cold 실행, 응답 시간 초과는 타임아웃 결과)
+        """
+        if self._closed:
+            return None
+
+        try:
+            worker = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            self._count('unavailable')
+            return None
+
+        result = None
+        try:
+            result = worker.run(code, timeout, limits, output_limits, profile_top_n)
+        except WorkerTimeout as e:
+            # 스니펫이 시간을 넘긴 것이므로 cold로 다시 실행하지 않고 타임아웃 결과 반환
+            print(f"⚠️ 워커 실행 실패: {e}")
+            self._count('failures')
+            self._recycle(worker)
+            result = sandbox.timed_out_result(timeout)
+            result['warm'] = True
+            result['worker_pid'] = worker.pid
+            return result
+        except WorkerError as e:
+            print(f"⚠️ 워커 실행 실패: {e}")
+            self._count('failures')
+            self._recycle(worker)
+            return None
+
+        if self._should_recycle(worker, result):
+            self._recycle(worker)
+        else:
+            self._idle.put(worker)
+
+        self._count('warm_runs')
+        result['warm'] = True
+        result['worker_pid'] = worker.pid
+        return result
+
+    def get_statistics(self) -> Dict:
+        """풀 상태 및 통계"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['size'] = self.size
+        stats['idle'] = self._idle.qsize()
+        return stats
+
+    def shutdown(self):
+        """모든 워커 종료"""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.kill()
+
+
+# 테스트
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🔥 웜 워커 풀 테스트")
+    print("=" * 60)
+
+    pool = WarmWorkerPool(size=2, max_runs=3)
+    time.sleep(1)
+
+    for i in range(5):
+        result = pool.execute(f"print('run {i}')\nprint(undefined_{i})", timeout=5)
+        if result is None:
+            print(f"{i}: 워커 없음 (cold 실행 필요)")
+            continue
+        print(f"{i}: pid={result['worker_pid']} time={result['execution_time']*1000:.1f}ms")
+        print(f"   stdout: {result['stdout'].strip()}")
+        print(f"   stderr: {result['stderr'].strip().splitlines()[-1]}")
+
+    # 스니펫에 열려 있는 fd (표준 입출력 외에는 없어야 함 - 워커 프로토콜 파이프가 보이면 응답 위조 가능)
+    fd_check = """
+import os
+open_fds = []
+for name in os.listdir('/proc/self/fd'):
+    try:
+        os.fstat(int(name))
+        open_fds.append(int(name))
+    except OSError:
+        pass
+print(sorted(open_fds))
+"""
+    if os.path.isdir('/proc/self/fd'):
+        result = pool.execute(fd_check, timeout=5)
+        if result is not None:
+            open_fds = result['stdout'].strip()
+            print(f"\n{'✅' if open_fds == '[0, 1, 2]' else '❌'} 스니펫의 열린 fd: {open_fds}")
+
+    print(f"\n📊 {pool.get_statistics()}")
+    pool.shutdown()
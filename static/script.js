@@ -9,6 +9,7 @@ const analyzeBtn = document.getElementById('analyzeBtn');
 const executeCode = document.getElementById('executeCode');
 const saveHistory = document.getElementById('saveHistory');
 const lineCount = document.getElementById('lineCount');
+const lintStatus = document.getElementById('lintStatus');
 const totalErrors = document.getElementById('totalErrors');
 
 // Sections
@@ -17,6 +18,7 @@ const progressText = document.getElementById('progressText');
 const progressFill = document.getElementById('progressFill');
 const resultSection = document.getElementById('resultSection');
 const resultContent = document.getElementById('resultContent');
+const resultTitle = document.getElementById('resultTitle');
 const errorSection = document.getElementById('errorSection');
 const errorDetails = document.getElementById('errorDetails');
 const solutionsSection = document.getElementById('solutionsSection');
@@ -28,6 +30,12 @@ const similarList = document.getElementById('similarList');
 let currentCode = '';
 let currentFileType = 'python';
 
+// Live validation state (입력 중 증분 검증)
+const LIVE_VALIDATE_DELAY = 300;  // ms, 입력이 멈춘 뒤 요청
+let liveSession = { id: null, version: 0, lines: null };
+let liveTimer = null;
+let liveController = null;
+
 // Initialize
 document.addEventListener('DOMContentLoaded', () => {
     setupEventListeners();
@@ -51,6 +59,7 @@ function setupEventListeners() {
 
     // Code input
     codeInput.addEventListener('input', updateLineCount);
+    codeInput.addEventListener('input', scheduleLiveValidation);
 
     // File upload
     fileUpload.addEventListener('click', () => fileInput.click());
@@ -74,6 +83,116 @@ function updateLineCount() {
     lineCount.textContent = `${lines} ${lines === 1 ? 'line' : 'lines'}`;
 }
 
+// Live validation
+function scheduleLiveValidation() {
+    clearTimeout(liveTimer);
+    liveTimer = setTimeout(() => runLiveValidation(), LIVE_VALIDATE_DELAY);
+}
+
+// 이전에 보낸 줄과 현재 줄의 공통 앞/뒤를 제외한 구간을 하나의 편집으로
+function computeLineEdit(oldLines, newLines) {
+    let start = 0;
+    const maxPrefix = Math.min(oldLines.length, newLines.length);
+    while (start < maxPrefix && oldLines[start] === newLines[start]) {
+        start++;
+    }
+
+    let oldEnd = oldLines.length;
+    let newEnd = newLines.length;
+    while (oldEnd > start && newEnd > start && oldLines[oldEnd - 1] === newLines[newEnd - 1]) {
+        oldEnd--;
+        newEnd--;
+    }
+
+    return { start: start, end: oldEnd, lines: newLines.slice(start, newEnd) };
+}
+
+async function runLiveValidation(forceFull = false) {
+    // 진행 중인 요청은 취소 (응답이 늦게 와도 최신 입력만 표시)
+    if (liveController) {
+        liveController.abort();
+    }
+
+    const code = codeInput.value;
+    if (!code.trim()) {
+        liveSession = { id: null, version: 0, lines: null };
+        showLiveLint(null);
+        return;
+    }
+
+    const lines = code.split('\n');
+    let body;
+    if (!forceFull && liveSession.id && liveSession.lines) {
+        const edit = computeLineEdit(liveSession.lines, lines);
+        if (edit.start === edit.end && edit.lines.length === 0) {
+            return;
+        }
+        body = { session_id: liveSession.id, version: liveSession.version, edits: [edit] };
+    } else {
+        body = { session_id: liveSession.id, code: code };
+    }
+
+    const controller = new AbortController();
+    liveController = controller;
+
+    try {
+        const response = await fetch('/api/validate-incremental', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body),
+            signal: controller.signal
+        });
+        const data = await response.json();
+
+        if (!response.ok) {
+            // 세션 만료 / 버전 불일치 / 잘못된 편집 → 전체 코드로 재동기화
+            liveSession = { id: null, version: 0, lines: null };
+            if (!forceFull && (data.resync || response.status === 400)) {
+                liveController = null;
+                await runLiveValidation(true);
+            }
+            return;
+        }
+
+        liveSession = { id: data.session_id, version: data.version, lines: lines };
+        showLiveLint(data.validation);
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            // 취소되지 않은 실패는 서버 상태를 알 수 없으므로 다음 요청에서 재동기화
+            liveSession = { id: null, version: 0, lines: null };
+        }
+    } finally {
+        if (liveController === controller) {
+            liveController = null;
+        }
+    }
+}
+
+function showLiveLint(validation) {
+    lintStatus.className = 'editor-lint';
+    if (!validation) {
+        lintStatus.textContent = '';
+        return;
+    }
+
+    const syntax = validation.syntax;
+    if (!syntax.valid) {
+        lintStatus.classList.add('lint-error');
+        lintStatus.textContent = `✗ ${syntax.line ? `Line ${syntax.line}: ` : ''}${syntax.error}`;
+        return;
+    }
+
+    const missing = validation.imports ? validation.imports.availability.missing : [];
+    if (missing.length > 0) {
+        lintStatus.classList.add('lint-warning');
+        lintStatus.textContent = `⚠ 누락된 패키지: ${missing.join(', ')}`;
+        return;
+    }
+
+    lintStatus.classList.add('lint-ok');
+    lintStatus.textContent = '✓ Syntax OK';
+}
+
 // File handling
 function handleFileSelect(e) {
     const file = e.target.files[0];
@@ -100,6 +219,7 @@ function loadFile(file) {
         fileName.textContent = file.name;
         fileName.classList.remove('hidden');
         updateLineCount();
+        scheduleLiveValidation();
     };
     reader.readAsText(file);
 }
@@ -118,6 +238,12 @@ async function analyzeCode() {
     analyzeBtn.disabled = true;
 
     try {
+        // 실행하는 경우 출력을 실시간으로 받아서 표시
+        if (executeCode.checked && currentFileType === 'python') {
+            await analyzeCodeStreaming(code);
+            return;
+        }
+
         // API 호출
         const response = await fetch('/api/analyze', {
             method: 'POST',
@@ -149,6 +275,115 @@ async function analyzeCode() {
     }
 }
 
+// Streaming analysis (Server-Sent Events over fetch)
+async function analyzeCodeStreaming(code) {
+    const response = await fetch('/api/execute-stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            code: code,
+            save_history: saveHistory.checked
+        })
+    });
+
+    if (!response.ok) {
+        const data = await response.json();
+        showError(data.error || '분석 실패');
+        return;
+    }
+
+    const analysis = {};
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            handleStreamEvent(parseSseEvent(rawEvent), analysis);
+        }
+    }
+
+    if (analysis.execution && analysis.execution.success) {
+        resultTitle.textContent = '✅ 분석 완료';
+    }
+    displayResults({ analysis });
+}
+
+function parseSseEvent(rawEvent) {
+    let event = 'message';
+    const dataLines = [];
+
+    rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event:')) {
+            event = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            dataLines.push(line.slice(5).trimStart());
+        }
+    });
+
+    return {
+        event: event,
+        data: dataLines.length ? JSON.parse(dataLines.join('\n')) : null
+    };
+}
+
+function handleStreamEvent({ event, data }, analysis) {
+    switch (event) {
+        case 'validation':
+            analysis.validation = data;
+            if (data.syntax && data.syntax.valid) {
+                hideProgress();
+                showLiveOutput();
+            }
+            break;
+        case 'stdout':
+        case 'stderr':
+            appendLiveOutput(event, data);
+            break;
+        case 'result':
+            analysis.execution = data;
+            resultTitle.textContent = '📤 실행 출력';
+            break;
+        case 'analysis':
+            Object.assign(analysis, data);
+            break;
+        case 'error':
+            throw new Error(data.error);
+    }
+}
+
+// Live output
+function showLiveOutput() {
+    resultTitle.textContent = '⏳ 실행 중...';
+    resultSection.classList.remove('hidden');
+    resultContent.innerHTML = `
+        <div class="output-section">
+            <pre class="live-output"><code id="liveOutput"></code></pre>
+        </div>
+    `;
+}
+
+function appendLiveOutput(stream, text) {
+    const liveOutput = document.getElementById('liveOutput');
+    if (!liveOutput) return;
+
+    const chunk = document.createElement('span');
+    chunk.className = `stream-${stream}`;
+    chunk.textContent = text;
+    liveOutput.appendChild(chunk);
+    liveOutput.parentElement.scrollTop = liveOutput.parentElement.scrollHeight;
+}
+
 // Display results
 function displayResults(data) {
     const analysis = data.analysis;
@@ -236,6 +471,9 @@ function showSuccess(exec) {
         <div class="success-message">
             <h3>✅ 코드 실행 성공!</h3>
             <p>실행 시간: <strong>${exec.execution_time.toFixed(3)}초</strong></p>
+            ${exec.resource_usage && exec.resource_usage.peak_rss_kb ? `
+                <p>최대 메모리: <strong>${(exec.resource_usage.peak_rss_kb / 1024).toFixed(1)}MB</strong></p>
+            ` : ''}
             ${exec.stdout ? `
                 <div class="output-section">
                     <h4>📤 출력:</h4>